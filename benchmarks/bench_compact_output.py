@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Compact Output Benchmark: Payload Size and Serialization Cost
+
+Encodes every input/*_Solver_Output.json sample with the compact columnar
+format and compares it against the standard document: serialized bytes
+(json and orjson, minified), gzip size, and the time to serialize, encode
+and decode. Each sample is round-tripped to check the encoding is lossless.
+
+Usage:
+    python benchmarks/bench_compact_output.py
+    python benchmarks/bench_compact_output.py --repeat 20 --out benchmarks/results/compact_output.json
+"""
+
+import sys
+import json
+import gzip
+import time
+import argparse
+import pathlib
+import statistics
+from datetime import datetime
+
+import orjson
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'scripts'))
+
+from src.compact_output import encode_compact_output
+from decode_compact_output import decode_compact_output
+
+
+def timed_ms(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(samples), 3)
+
+
+def sizes(doc):
+    text = json.dumps(doc, separators=(',', ':')).encode()
+    return {
+        'json_bytes': len(text),
+        'orjson_bytes': len(orjson.dumps(doc)),
+        'gzip_bytes': len(gzip.compress(text, compresslevel=6)),
+    }
+
+
+def bench_sample(path: pathlib.Path, repeat: int):
+    standard = json.loads(path.read_text())
+    compact = encode_compact_output(standard)
+    compact_text = orjson.dumps(compact)
+
+    lossless = decode_compact_output(json.loads(compact_text)) == standard
+
+    return {
+        'sample': path.name,
+        'assignments': len(standard.get('assignments', [])),
+        'roster_employees': len(standard.get('employeeRoster', [])),
+        'lossless': lossless,
+        'standard': {
+            **sizes(standard),
+            'json_dumps_ms': timed_ms(lambda: json.dumps(standard), repeat),
+            'orjson_dumps_ms': timed_ms(lambda: orjson.dumps(standard), repeat),
+        },
+        'compact': {
+            **sizes(compact),
+            'encode_ms': timed_ms(lambda: encode_compact_output(standard), repeat),
+            'json_dumps_ms': timed_ms(lambda: json.dumps(compact), repeat),
+            'orjson_dumps_ms': timed_ms(lambda: orjson.dumps(compact), repeat),
+            'decode_ms': timed_ms(lambda: decode_compact_output(orjson.loads(compact_text)), repeat),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare standard vs compact solver output')
+    parser.add_argument('--samples', default=str(ROOT / 'input'),
+                        help='Directory containing *_Solver_Output.json files')
+    parser.add_argument('--repeat', type=int, default=10, help='Timing repetitions per measurement')
+    parser.add_argument('--out', help='Write JSON report to this path')
+    args = parser.parse_args()
+
+    paths = sorted(pathlib.Path(args.samples).glob('*_Solver_Output.json'))
+    if not paths:
+        print(f"No *_Solver_Output.json files under {args.samples}")
+        return 1
+
+    results = []
+    print(f"{'sample':<40} {'std KB':>8} {'cmp KB':>8} {'ratio':>6} {'gz std':>7} {'gz cmp':>7} {'enc ms':>7}")
+    for path in paths:
+        r = bench_sample(path, args.repeat)
+        results.append(r)
+        std, cmp = r['standard'], r['compact']
+        print(f"{r['sample']:<40} {std['json_bytes'] / 1024:>8.1f} {cmp['json_bytes'] / 1024:>8.1f} "
+              f"{cmp['json_bytes'] / std['json_bytes']:>6.3f} {std['gzip_bytes'] / 1024:>7.1f} "
+              f"{cmp['gzip_bytes'] / 1024:>7.1f} {cmp['encode_ms']:>7.1f}"
+              f"{'' if r['lossless'] else '  NOT LOSSLESS'}")
+
+    total_std = sum(r['standard']['json_bytes'] for r in results)
+    total_cmp = sum(r['compact']['json_bytes'] for r in results)
+    report = {
+        'benchmark': 'compact_output',
+        'timestamp': datetime.now().isoformat(),
+        'repeat': args.repeat,
+        'samples': results,
+        'totals': {
+            'standard_json_bytes': total_std,
+            'compact_json_bytes': total_cmp,
+            'ratio': round(total_cmp / total_std, 3),
+            'standard_gzip_bytes': sum(r['standard']['gzip_bytes'] for r in results),
+            'compact_gzip_bytes': sum(r['compact']['gzip_bytes'] for r in results),
+            'all_lossless': all(r['lossless'] for r in results),
+        },
+    }
+    print(f"\nTotal: {total_std / 1024:.1f} KB → {total_cmp / 1024:.1f} KB "
+          f"({report['totals']['ratio']:.3f}), lossless={report['totals']['all_lossless']}")
+
+    if args.out:
+        pathlib.Path(args.out).write_text(json.dumps(report, indent=2))
+        print(f"Report written to {args.out}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
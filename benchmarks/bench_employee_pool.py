@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Employee Filtering Benchmark: Large Synthetic Pools
+
+Builds a synthetic request with N employees (mixed product types, ranks,
+OUs, schemes, genders and qualifications) and R requirements, then times the
+three places that match employees against requirement criteria:
+
+  - ICPMP eligibility (ICPMPPreprocessor._filter_eligible_employees, every requirement)
+  - quick_feasibility_check
+  - validate_input
+  - validate_input followed by quick_feasibility_check, as the solve routers
+    call them
+
+Each stage records the median wall time, peak traced memory and a digest of
+its output, so a "before" report from an older tree can be checked for
+identical results.
+
+Usage:
+    python benchmarks/bench_employee_pool.py
+    python benchmarks/bench_employee_pool.py --employees 20000 --out benchmarks/results/employee_pool_after.json
+"""
+
+import io
+import sys
+import copy
+import json
+import time
+import random
+import hashlib
+import logging
+import argparse
+import pathlib
+import statistics
+import contextlib
+import tracemalloc
+from datetime import datetime
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.preprocessing.icpmp_integration import ICPMPPreprocessor
+from src.feasibility_checker import quick_feasibility_check
+from src.input_validator import validate_input
+
+PRODUCTS = ['APO', 'AVSO', 'CVSO', 'SO']
+RANKS = ['SER', 'COR', 'CPL', 'SGT', 'SSG']
+SCHEMES = ['Scheme A', 'Scheme B', 'Scheme P']
+QUALIFICATIONS = ['FRISK', 'XRAY', 'BOMB', 'K9', 'FIRST_AID']
+
+
+def build_input(num_employees, num_requirements, seed=42):
+    rng = random.Random(seed)
+    ous = [f'OU{i}' for i in range(1, 9)]
+    employees = [
+        {
+            'employeeId': f'E{i:05d}',
+            'productTypeId': rng.choice(PRODUCTS),
+            'rankId': rng.choice(RANKS),
+            'ouId': rng.choice(ous),
+            'teamId': f'T{rng.randint(1, 40)}',
+            'gender': rng.choice(['M', 'F']),
+            'scheme': rng.choice(SCHEMES),
+            'qualifications': [
+                {'code': code, 'validFrom': '2025-01-01', 'expiryDate': '2027-12-31'}
+                for code in rng.sample(QUALIFICATIONS, rng.randint(0, 3))
+            ],
+        }
+        for i in range(num_employees)
+    ]
+    demand_items = []
+    for r in range(num_requirements):
+        demand_items.append({
+            'demandId': f'D{r}',
+            'ouId': ous[r % len(ous)],
+            'shifts': [{
+                'shiftDetails': [{'shiftCode': 'D', 'start': '08:00:00', 'end': '20:00:00', 'nextDay': False}],
+                'blacklist': {'employeeIds': [f'E{rng.randrange(num_employees):05d}' for _ in range(5)]},
+            }],
+            'requirements': [{
+                'requirementId': f'R{r}',
+                'productTypeId': PRODUCTS[0],
+                'rankId': RANKS[0],
+                'Scheme': rng.choice(SCHEMES),
+                'productTypeIds': rng.sample(PRODUCTS, 2),
+                'rankIds': rng.sample(RANKS, 3),
+                'gender': rng.choice(['Any', 'M', 'F']),
+                'schemes': [rng.choice(['A', 'B', 'P'])],
+                'requiredQualifications': [{'groupId': 'G1', 'qualifications': rng.sample(QUALIFICATIONS, 2)}],
+                'workPattern': ['D', 'D', 'D', 'D', 'O', 'O'],
+                'headcount': 2,
+            }],
+        })
+    return {
+        'schemaVersion': '0.98',
+        'planningReference': 'BENCH-EMPLOYEE-POOL',
+        'planningHorizon': {'startDate': '2026-01-01', 'endDate': '2026-01-31'},
+        'schemeMap': {'A': 'Scheme A', 'B': 'Scheme B', 'P': 'Scheme P'},
+        'employees': employees,
+        'demandItems': demand_items,
+    }
+
+
+def icpmp_filter(data):
+    preprocessor = ICPMPPreprocessor(data)
+    return [
+        [emp['employeeId'] for emp in preprocessor._filter_eligible_employees(req, demand)]
+        for demand in data['demandItems']
+        for req in demand['requirements']
+    ]
+
+
+def validate(data):
+    return validate_input(data).to_dict()
+
+
+def validate_and_check(data):
+    """Router flow: the feasibility check reuses the validator's employee index"""
+    validation = validate_input(data)
+    pool = getattr(validation, 'employee_pool', None)
+    if pool is None:  # Older tree without EmployeePool ("before" report)
+        return validation.to_dict(), quick_feasibility_check(data)
+    return validation.to_dict(), quick_feasibility_check(data, pool)
+
+
+STAGES = {
+    'icpmp_filter': icpmp_filter,
+    'quick_feasibility_check': quick_feasibility_check,
+    'validate_input': validate,
+    'validate_and_feasibility': validate_and_check,
+}
+
+
+def digest(result):
+    canonical = json.dumps(result, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()[:16]
+
+
+def bench_stage(fn, data, repeat):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        payload = copy.deepcopy(data)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = fn(payload)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    payload = copy.deepcopy(data)
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn(payload)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'ms': round(statistics.median(samples), 3),
+        'peak_kib': round(peak / 1024, 1),
+        'digest': digest(result),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark employee filtering on a synthetic pool')
+    parser.add_argument('--employees', type=int, default=5000, help='Number of synthetic employees')
+    parser.add_argument('--requirements', type=int, default=40, help='Number of requirements')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing repetitions per stage')
+    parser.add_argument('--out', help='Write JSON report to this path')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    data = build_input(args.employees, args.requirements)
+
+    results = {}
+    print(f"{'stage':<26} {'ms':>10} {'peak KiB':>10} {'digest':>18}")
+    for name, fn in STAGES.items():
+        results[name] = bench_stage(fn, data, args.repeat)
+        r = results[name]
+        print(f"{name:<26} {r['ms']:>10.2f} {r['peak_kib']:>10.1f} {r['digest']:>18}")
+
+    report = {
+        'benchmark': 'employee_pool',
+        'timestamp': datetime.now().isoformat(),
+        'employees': args.employees,
+        'requirements': args.requirements,
+        'repeat': args.repeat,
+        'stages': results,
+    }
+    if args.out:
+        pathlib.Path(args.out).write_text(json.dumps(report, indent=2))
+        print(f"Report written to {args.out}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
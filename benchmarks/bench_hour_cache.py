@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Hour-Breakdown Cache Benchmark: Assignment Annotation Loop
+
+Replays the hour annotation that build_output runs per assignment over the
+work assignments of every input/*_Solver_Output.json sample (scheme and work
+pattern taken from the matching *_Solver_Input.json):
+
+- reference: time_utils.calculate_mom_compliant_hours() per assignment
+- cached:    time_utils.mom_week_position() + hour_cache.mom_hours(), as
+             build_output does now (skipped when hour_cache is not available,
+             e.g. when run on an older tree for a "before" report)
+
+Each cached record is checked against the reference numbers.
+
+Usage:
+    python benchmarks/bench_hour_cache.py
+    python benchmarks/bench_hour_cache.py --repeat 20 --out benchmarks/results/hour_cache_after.json
+"""
+
+import io
+import sys
+import json
+import time
+import argparse
+import pathlib
+import statistics
+import contextlib
+from collections import defaultdict
+from datetime import datetime
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from context.engine.time_utils import calculate_mom_compliant_hours, normalize_scheme
+
+try:
+    from context.engine import hour_cache
+    from context.engine.time_utils import mom_week_position
+except ImportError:
+    hour_cache = None
+
+HOUR_KEYS = ('gross', 'lunch', 'normal', 'ot', 'restDayPay', 'paid')
+
+
+def pattern_work_days(pattern):
+    """Same derivation as the weekly44h branch of build_output"""
+    if not pattern:
+        return 6
+    work_days = len([d for d in pattern if d != 'O'])
+    if len(pattern) <= 7:
+        return work_days
+    return max(1, min(7, round(work_days * 7 / len(pattern))))
+
+
+def load_case(output_path: pathlib.Path):
+    output = json.loads(output_path.read_text())
+    input_path = output_path.with_name(output_path.name.replace('_Solver_Output', '_Solver_Input'))
+    employees = {}
+    if input_path.exists():
+        employees = {e['employeeId']: e for e in json.loads(input_path.read_text()).get('employees', [])}
+
+    work = [
+        a for a in output.get('assignments', [])
+        if a.get('status') == 'ASSIGNED' and a.get('startDateTime') and a.get('endDateTime')
+    ]
+    by_employee = defaultdict(list)
+    for a in work:
+        by_employee[a.get('employeeId')].append(a)
+
+    rows = []
+    for a in work:
+        emp = employees.get(a.get('employeeId'), {})
+        rows.append((
+            datetime.fromisoformat(a['startDateTime']),
+            datetime.fromisoformat(a['endDateTime']),
+            a.get('employeeId'),
+            datetime.fromisoformat(a['date']).date(),
+            by_employee[a.get('employeeId')],
+            normalize_scheme(emp.get('scheme', 'A')),
+            pattern_work_days(emp.get('workPattern')),
+        ))
+    return rows
+
+
+def run_reference(rows):
+    return [
+        calculate_mom_compliant_hours(start, end, emp_id, day, context, scheme, wd)
+        for start, end, emp_id, day, context, scheme, wd in rows
+    ]
+
+
+def run_cached(rows):
+    results = []
+    for start, end, emp_id, day, context, scheme, wd in rows:
+        work_days, position = mom_week_position(emp_id, day, context, scheme, wd)
+        results.append(hour_cache.mom_hours(start, end, scheme, work_days, position))
+    return results
+
+
+def timed_ms(fn, rows, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):  # Keep solver debug prints out of the report
+            fn(rows)
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(samples), 3)
+
+
+def bench_sample(path: pathlib.Path, repeat: int):
+    rows = load_case(path)
+    result = {
+        'sample': path.name,
+        'assignments': len(rows),
+        'reference_ms': timed_ms(run_reference, rows, repeat),
+    }
+    if hour_cache is not None:
+        hour_cache.clear_caches()
+        with contextlib.redirect_stdout(io.StringIO()):
+            reference = run_reference(rows)
+        start = time.perf_counter()
+        cached = run_cached(rows)
+        result['cached_cold_ms'] = round((time.perf_counter() - start) * 1000, 3)
+        result['cached_ms'] = timed_ms(run_cached, rows, repeat)
+        result['distinct_keys'] = hour_cache.cache_stats()['mom']['size']
+        result['identical'] = all(
+            all(c[k] == r[k] for k in HOUR_KEYS) for c, r in zip(cached, reference)
+        )
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the shift-hour breakdown cache')
+    parser.add_argument('--samples', default=str(ROOT / 'input'),
+                        help='Directory containing *_Solver_Output.json files')
+    parser.add_argument('--repeat', type=int, default=10, help='Timing repetitions per measurement')
+    parser.add_argument('--out', help='Write JSON report to this path')
+    args = parser.parse_args()
+
+    paths = sorted(pathlib.Path(args.samples).glob('*_Solver_Output.json'))
+    if not paths:
+        print(f"No *_Solver_Output.json files under {args.samples}")
+        return 1
+
+    results = []
+    print(f"{'sample':<40} {'rows':>6} {'ref ms':>8} {'cached ms':>10} {'keys':>5} {'same':>5}")
+    for path in paths:
+        r = bench_sample(path, args.repeat)
+        results.append(r)
+        print(f"{r['sample']:<40} {r['assignments']:>6} {r['reference_ms']:>8.2f} "
+              f"{r.get('cached_ms', float('nan')):>10.2f} {r.get('distinct_keys', 0):>5} "
+              f"{str(r.get('identical', '-')):>5}")
+
+    totals = {'reference_ms': round(sum(r['reference_ms'] for r in results), 3)}
+    if hour_cache is not None:
+        totals['cached_ms'] = round(sum(r['cached_ms'] for r in results), 3)
+        totals['speedup'] = round(totals['reference_ms'] / totals['cached_ms'], 2)
+        totals['all_identical'] = all(r['identical'] for r in results)
+    print(f"\nTotal: {totals}")
+
+    report = {
+        'benchmark': 'hour_cache',
+        'timestamp': datetime.now().isoformat(),
+        'repeat': args.repeat,
+        'cache_available': hour_cache is not None,
+        'samples': results,
+        'totals': totals,
+    }
+    if args.out:
+        pathlib.Path(args.out).write_text(json.dumps(report, indent=2))
+        print(f"Report written to {args.out}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
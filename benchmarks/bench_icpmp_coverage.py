@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+ICPMP Coverage Simulation Benchmark: Per-Requirement Sizing
+
+Sizes every requirement of every input/*_Solver_Input.json fixture the way
+ICPMP preprocessing does (icpmp_integration._size_requirement: calendar,
+lower bound, candidate N search, post-selection offset check), with the
+persistent ratio cache disabled so each run really computes. Records the
+median cold sizing time per requirement (memoized coverage kernels are
+cleared before each repetition) and a digest of the result, so a "before"
+report from an older tree can be checked for identical outputs.
+
+--horizon-days N stretches every planning horizon to N days, which is where
+the per-(employee, date) simulation cost used to dominate.
+
+--sweep instead sizes synthetic OT-aware requirements (124h monthly OT cap)
+over a range of headcounts with both employee-count searches ("linear" and
+"bisect"), recording probes, time and the chosen count. OT capacity lowers
+the lower bound well below the feasible count, so these are the cases where
+the search strategy matters.
+
+Usage:
+    python benchmarks/bench_icpmp_coverage.py
+    python benchmarks/bench_icpmp_coverage.py --horizon-days 365 --out benchmarks/results/icpmp_coverage_after.json
+    python benchmarks/bench_icpmp_coverage.py --sweep --out benchmarks/results/icpmp_search_sweep.json
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import hashlib
+import logging
+import argparse
+import pathlib
+import statistics
+import contextlib
+from datetime import date, datetime, timedelta
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+os.environ['RATIO_CACHE_ENABLED'] = 'false'
+
+from src.preprocessing.icpmp_integration import _size_requirement
+
+try:
+    from context.engine.coverage_kernel import clear_kernel_cache
+except ImportError:  # Older tree without the coverage kernel ("before" report)
+    def clear_kernel_cache():
+        pass
+
+
+def load_requirements(path: pathlib.Path, horizon_days=None):
+    """(settings, demand_item, requirement) for each demandBased requirement with a pattern"""
+    data = json.loads(path.read_text())
+    horizon = dict(data.get('planningHorizon', {}))
+    if horizon_days:
+        start = date.fromisoformat(horizon['startDate'][:10])
+        horizon['endDate'] = (start + timedelta(days=horizon_days - 1)).isoformat()
+    settings = {
+        'planningHorizon': horizon,
+        'publicHolidays': data.get('publicHolidays', []),
+        'monthlyHourLimits': data.get('monthlyHourLimits', []),
+    }
+    return [
+        (settings, demand, req)
+        for demand in data.get('demandItems', [])
+        for req in demand.get('requirements', [])
+        if req.get('workPattern')
+    ]
+
+
+def digest(result):
+    canonical = json.dumps(result, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()[:16]
+
+
+def bench_requirement(settings, demand, req, repeat):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        clear_kernel_cache()  # Time a cold sizing, as in a fresh solve
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result, error, _ = _size_requirement(settings, demand, req)
+        samples.append((time.perf_counter() - start) * 1000)
+    if error is not None:
+        return {'error': str(error)[:200]}
+    config = result['configuration']
+    return {
+        'pattern_length': len(req['workPattern']),
+        'employees_required': config['employeesRequired'],
+        'attempts': config.get('attemptsRequired'),
+        'probes': result.get('computation', {}).get('probes'),
+        'sizing_ms': round(statistics.median(samples), 3),
+        'digest': digest(result),
+    }
+
+
+SWEEP_PATTERNS = (['D', 'O'], ['D', 'D', 'O', 'O'], ['D', 'D', 'D', 'O', 'O', 'O'])
+SWEEP_HEADCOUNTS = (5, 20, 50, 100, 200)
+
+
+def run_sweep(repeat):
+    """Linear vs bisect search on OT-aware requirements over a 31-day calendar"""
+    from context.engine.config_optimizer_v3 import calculate_optimal_with_u_slots, generate_coverage_calendar
+
+    calendar = generate_coverage_calendar('2026-01-01', '2026-01-31')
+    results = []
+    print(f"{'pattern':<8} {'HC':>4} {'lower':>6} {'N':>5} {'linear probes':>14} {'bisect probes':>14} "
+          f"{'linear ms':>10} {'bisect ms':>10}")
+    for pattern in SWEEP_PATTERNS:
+        for headcount in SWEEP_HEADCOUNTS:
+            row = {'pattern': ''.join(pattern), 'headcount': headcount}
+            for search in ('linear', 'bisect'):
+                samples = []
+                for _ in range(repeat):
+                    clear_kernel_cache()
+                    start = time.perf_counter()
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        result = calculate_optimal_with_u_slots(
+                            pattern, headcount, calendar, '2026-01-01', search=search,
+                            enable_ot_aware_icpmp=True, monthly_ot_cap=124.0
+                        )
+                    samples.append((time.perf_counter() - start) * 1000)
+                config = result['configuration']
+                row['lower_bound'] = config.get('lowerBound')
+                row[search] = {
+                    'employees_required': config['employeesRequired'],
+                    'optimality': config['optimality'],
+                    'probes': result['computation']['probes'],
+                    'ms': round(statistics.median(samples), 3),
+                }
+            row['identical'] = row['linear']['employees_required'] == row['bisect']['employees_required']
+            results.append(row)
+            print(f"{row['pattern']:<8} {headcount:>4} {str(row['lower_bound']):>6} "
+                  f"{row['bisect']['employees_required']:>5} {row['linear']['probes']:>14} "
+                  f"{row['bisect']['probes']:>14} {row['linear']['ms']:>10.2f} {row['bisect']['ms']:>10.2f}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ICPMP per-requirement sizing')
+    parser.add_argument('--samples', default=str(ROOT / 'input'),
+                        help='Directory containing *_Solver_Input.json files')
+    parser.add_argument('--horizon-days', type=int, help='Stretch every planning horizon to N days')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing repetitions per requirement')
+    parser.add_argument('--sweep', action='store_true',
+                        help='Compare linear and bisect search on synthetic OT-aware requirements')
+    parser.add_argument('--out', help='Write JSON report to this path')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    if args.sweep:
+        results = run_sweep(args.repeat)
+        report = {
+            'benchmark': 'icpmp_search_sweep',
+            'timestamp': datetime.now().isoformat(),
+            'repeat': args.repeat,
+            'samples': results,
+            'all_identical': all(r['identical'] for r in results),
+        }
+        print(f"\nSame employee count from both searches: {report['all_identical']}")
+        if args.out:
+            pathlib.Path(args.out).write_text(json.dumps(report, indent=2))
+            print(f"Report written to {args.out}")
+        return 0
+
+    paths = sorted(pathlib.Path(args.samples).glob('*_Solver_Input.json'))
+    if not paths:
+        print(f"No *_Solver_Input.json files under {args.samples}")
+        return 1
+
+    results = []
+    print(f"{'sample':<46} {'requirement':<14} {'cycle':>5} {'N':>5} {'tries':>5} {'ms':>9}")
+    for path in paths:
+        for settings, demand, req in load_requirements(path, args.horizon_days):
+            r = {'sample': path.name, 'requirement': req.get('requirementId'),
+                 **bench_requirement(settings, demand, req, args.repeat)}
+            results.append(r)
+            if 'error' in r:
+                print(f"{path.name:<46} {str(r['requirement']):<14} error: {r['error']}")
+                continue
+            print(f"{path.name:<46} {str(r['requirement']):<14} {r['pattern_length']:>5} "
+                  f"{r['employees_required']:>5} {str(r['attempts']):>5} {r['sizing_ms']:>9.2f}")
+
+    sized = [r for r in results if 'error' not in r]
+    totals = {'requirements': len(sized), 'sizing_ms': round(sum(r['sizing_ms'] for r in sized), 3)}
+    print(f"\nTotal: {totals}")
+
+    report = {
+        'benchmark': 'icpmp_coverage',
+        'timestamp': datetime.now().isoformat(),
+        'horizon_days': args.horizon_days,
+        'repeat': args.repeat,
+        'samples': results,
+        'totals': totals,
+    }
+    if args.out:
+        pathlib.Path(args.out).write_text(json.dumps(report, indent=2))
+        print(f"Report written to {args.out}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
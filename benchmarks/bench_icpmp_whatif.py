@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+ICPMP What-If Benchmark: One Batch vs One /icpmp/v3 Call per Scenario
+
+Builds a grid of sizing scenarios (work patterns x headcounts x coverage-day
+sets over one planning horizon) and times two ways of comparing them, both
+including JSON parsing and ORJSON response serialization:
+
+  - per-call: one /icpmp/v3 request body per scenario, handled as the
+    endpoint does (json.loads, optimize_multiple_requirements with a fresh
+    calendar, full result with employee patterns)
+  - batch: one /icpmp/v3/batch body (base + overrides) through
+    icpmp_whatif.evaluate_scenarios, once per ICPMP_WHATIF_WORKERS setting
+
+The persistent ratio cache is disabled and coverage kernels are cleared
+before each repetition, so every run is cold. The report records per-scenario
+timings from the batch summary and checks that both paths agree on
+employeesRequired for every scenario.
+
+Usage:
+    python benchmarks/bench_icpmp_whatif.py
+    python benchmarks/bench_icpmp_whatif.py --horizon-days 365 --out benchmarks/results/icpmp_whatif.json
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import pathlib
+import statistics
+import contextlib
+from datetime import date, datetime, timedelta
+from itertools import product
+
+import orjson
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+os.environ['RATIO_CACHE_ENABLED'] = 'false'
+os.environ['ICPMP_PARALLEL_MIN_MS'] = '0'
+
+from context.engine.config_optimizer_v3 import optimize_multiple_requirements
+from context.engine.coverage_kernel import clear_kernel_cache
+from src.icpmp_whatif import evaluate_scenarios
+from src.ratio_cache import cached_optimal_with_u_slots
+
+PATTERNS = (
+    ['D', 'D', 'D', 'D', 'O', 'O'],
+    ['D', 'D', 'D', 'D', 'D', 'O', 'O'],
+    ['D', 'D', 'O', 'O'],
+    ['D', 'D', 'D', 'O', 'O', 'O'],
+    ['D', 'D', 'N', 'N', 'O', 'O'],
+    ['D', 'D', 'D', 'D', 'D', 'D', 'O', 'D', 'D', 'D', 'D', 'D', 'O', 'O'],
+)
+COVERAGE_DAYS = (
+    None,
+    ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday'],
+)
+# Same options as fastapi.responses.ORJSONResponse
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+def build_batch(scenarios, horizon_days):
+    """/icpmp/v3/batch body: a base configuration plus one override per scenario"""
+    start = date(2026, 1, 1)
+    base = {
+        'planningHorizon': {'startDate': start.isoformat(),
+                            'endDate': (start + timedelta(days=horizon_days - 1)).isoformat()},
+        'publicHolidays': ['2026-01-01', '2026-05-01', '2026-08-09', '2026-12-25'],
+        'workPattern': list(PATTERNS[0]),
+        'headcount': 5,
+    }
+    headcounts = range(1, scenarios // (len(PATTERNS) * len(COVERAGE_DAYS)) + 2)
+    overrides = []
+    for pattern, coverage_days, headcount in product(PATTERNS, COVERAGE_DAYS, headcounts):
+        override = {'scenarioId': f'{"".join(pattern)}-{"wd" if coverage_days else "all"}-hc{headcount}',
+                    'workPattern': list(pattern), 'headcount': headcount}
+        override['coverageDays'] = coverage_days or WEEKDAYS
+        overrides.append(override)
+    return {'base': base, 'scenarios': overrides[:scenarios]}
+
+
+def per_call_bodies(batch):
+    """One /icpmp/v3 body per scenario"""
+    base = batch['base']
+    return [json.dumps({
+        'planningHorizon': base['planningHorizon'],
+        'publicHolidays': base['publicHolidays'],
+        'coverageDays': scenario['coverageDays'],
+        'demandItems': [{'demandItemId': 'whatif', 'requirements': [{
+            'requirementId': scenario['scenarioId'],
+            'workPattern': scenario['workPattern'],
+            'headcount': scenario['headcount'],
+        }]}],
+    }) for scenario in batch['scenarios']]
+
+
+def run_per_call(bodies):
+    """Handle each body like /icpmp/v3; returns employeesRequired per scenario"""
+    employees = []
+    for body in bodies:
+        data = json.loads(body)
+        requirements = [dict(req, demandItemId=item['demandItemId'])
+                        for item in data['demandItems'] for req in item['requirements']]
+        results = optimize_multiple_requirements(
+            requirements=requirements,
+            planning_horizon=data['planningHorizon'],
+            public_holidays=data.get('publicHolidays', []),
+            coverage_days=data.get('coverageDays'),
+            calculate=cached_optimal_with_u_slots
+        )
+        orjson.dumps({'results': results}, option=ORJSON_OPTIONS)
+        employees.append(results[0]['configuration']['employeesRequired'])
+    return employees
+
+
+def run_batch(body):
+    data = json.loads(body)
+    report = evaluate_scenarios(data['base'], data['scenarios'])
+    orjson.dumps(report, option=ORJSON_OPTIONS)
+    return report
+
+
+def timed(fn, *args):
+    clear_kernel_cache()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark batched ICPMP what-if scenarios')
+    parser.add_argument('--scenarios', type=int, nargs='+', default=[100, 300])
+    parser.add_argument('--horizon-days', type=int, default=365)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions per configuration')
+    parser.add_argument('--out', help='Write JSON report to this path')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    results = []
+    print(f"{'scenarios':>9} {'distinct':>8} {'per-call ms':>12} "
+          + ' '.join(f"{f'batch w={w} ms':>14}" for w in args.workers))
+    for count in args.scenarios:
+        batch = build_batch(count, args.horizon_days)
+        bodies = per_call_bodies(batch)
+        batch_body = json.dumps(batch)
+
+        per_call_samples = []
+        for _ in range(args.repeat):
+            per_call_employees, ms = timed(run_per_call, bodies)
+            per_call_samples.append(ms)
+
+        row = {'scenarios': len(bodies), 'per_call_ms': round(statistics.median(per_call_samples), 2),
+               'batch': {}}
+        for workers in args.workers:
+            os.environ['ICPMP_WHATIF_WORKERS'] = str(workers)
+            samples = []
+            for _ in range(args.repeat):
+                report, ms = timed(run_batch, batch_body)
+                samples.append(ms)
+            summary = report['summary']
+            rows = {r['scenarioId']: r for r in report['scenarios']}
+            compute = [r['computeMs'] for r in report['scenarios'] if not r['sharedEvaluation']]
+            row['distinct_evaluations'] = summary['distinctEvaluations']
+            row['batch'][str(workers)] = {
+                'ms': round(statistics.median(samples), 2),
+                'mode': summary['mode'],
+                'calendar_ms': summary['calendarMs'],
+                'evaluation_ms': summary['evaluationMs'],
+                'scenario_compute_ms': {'median': round(statistics.median(compute), 3),
+                                        'max': round(max(compute), 3)},
+                'identical': [rows[s['scenarioId']]['employeesRequired'] for s in batch['scenarios']]
+                == per_call_employees,
+            }
+        results.append(row)
+        print(f"{row['scenarios']:>9} {row['distinct_evaluations']:>8} {row['per_call_ms']:>12.2f} "
+              + ' '.join(f"{row['batch'][str(w)]['ms']:>14.2f}" for w in args.workers))
+
+    report = {
+        'benchmark': 'icpmp_whatif',
+        'timestamp': datetime.now().isoformat(),
+        'cpu_count': os.cpu_count(),
+        'horizon_days': args.horizon_days,
+        'repeat': args.repeat,
+        'samples': results,
+        'all_identical': all(b['identical'] for r in results for b in r['batch'].values()),
+    }
+    print(f"\nSame employeesRequired on both paths: {report['all_identical']}")
+    if args.out:
+        pathlib.Path(args.out).write_text(json.dumps(report, indent=2))
+        print(f"Report written to {args.out}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Job Lifecycle Micro-Benchmark for RedisJobManager
+
+Replays the Redis traffic of one async job, as issued by the API and a
+worker, against a local Redis and reports per-step latency and the number
+of Redis commands processed:
+
+    submit → dequeue → claim (cancel check, IN_PROGRESS, load job)
+           → complete (cancel check, store result, COMPLETED) → poll status → fetch result
+
+Trees that predate RedisJobManager.claim_job/complete_job are driven through
+the equivalent individual calls, so the same script produces before/after
+numbers when run on either side of a change.
+
+Keys use a dedicated prefix and are deleted afterwards, so it is safe to run
+against a development Redis. Do not point it at production.
+
+Usage:
+    python benchmarks/bench_job_lifecycle.py
+    python benchmarks/bench_job_lifecycle.py --jobs 500 --result-kb 700
+    python benchmarks/bench_job_lifecycle.py --out benchmarks/results/job_lifecycle_after.json
+"""
+
+import sys
+import json
+import time
+import argparse
+import redis
+import statistics
+import pathlib
+from datetime import datetime
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from src.redis_job_manager import RedisJobManager, JobStatus
+
+STEPS = ['submit', 'dequeue', 'claim', 'complete', 'poll_status', 'fetch_result']
+
+
+def build_payloads(result_kb: int):
+    """Synthetic input/result documents of realistic size"""
+    input_data = {
+        'schemaVersion': '0.98',
+        'planningHorizon': {'startDate': '2026-03-01', 'endDate': '2026-03-31'},
+        'employees': [{'employeeId': f'E{i:05d}', 'rankId': 'SO', 'scheme': 'A'} for i in range(200)],
+    }
+    record = {'assignmentId': 'x' * 40, 'employeeId': 'E00000', 'date': '2026-03-01', 'status': 'ASSIGNED'}
+    per_record = len(json.dumps(record))
+    result = {'assignments': [record] * max(1, result_kb * 1024 // per_record)}
+    return input_data, result
+
+
+def legacy_claim(manager, job_id):
+    """Worker start-of-job sequence before claim_job existed"""
+    if manager.check_cancellation_flag(job_id):
+        manager.update_status(job_id, JobStatus.CANCELLED)
+        return None
+    manager.update_status(job_id, JobStatus.IN_PROGRESS)
+    return manager.get_job(job_id)
+
+
+def legacy_complete(manager, job_id, result):
+    """Worker end-of-job sequence before complete_job existed"""
+    if manager.check_cancellation_flag(job_id):
+        manager.update_status(job_id, JobStatus.CANCELLED)
+        return JobStatus.CANCELLED
+    manager.store_result(job_id, result)
+    manager.update_status(job_id, JobStatus.COMPLETED)
+    return JobStatus.COMPLETED
+
+
+class RoundTripCounter:
+    """Counts client→server writes (one per command, pipeline or script call)"""
+
+    def __init__(self):
+        self.count = 0
+        self._original = redis.connection.Connection.send_packed_command
+
+    def __enter__(self):
+        counter = self
+
+        def send_packed_command(conn, command, check_health=True):
+            counter.count += 1
+            return counter._original(conn, command, check_health)
+
+        redis.connection.Connection.send_packed_command = send_packed_command
+        return self
+
+    def __exit__(self, *exc):
+        redis.connection.Connection.send_packed_command = self._original
+
+
+def commands_processed(redis_client) -> int:
+    return int(redis_client.info('stats')['total_commands_processed'])
+
+
+def run(jobs: int, result_kb: int) -> dict:
+    manager = RedisJobManager(result_ttl_seconds=600, key_prefix='ngrsbench')
+    redis_client = manager.redis
+    input_data, result = build_payloads(result_kb)
+    timings = {step: [] for step in STEPS}
+    claim = getattr(manager, 'claim_job', None) or (lambda job_id: legacy_claim(manager, job_id))
+    complete = getattr(manager, 'complete_job', None) or (
+        lambda job_id, result: legacy_complete(manager, job_id, result))
+    job_ids = []
+
+    def timed(step, fn, *args, **kwargs):
+        start = time.perf_counter()
+        value = fn(*args, **kwargs)
+        timings[step].append((time.perf_counter() - start) * 1000)
+        return value
+
+    commands_before = commands_processed(redis_client)
+    wall_start = time.perf_counter()
+
+    with RoundTripCounter() as round_trips:
+        for i in range(jobs):
+            job_input = dict(input_data, runIndex=i)
+            job_id, _ = timed('submit', manager.submit_job, job_input, dedup=True)
+            job_ids.append(job_id)
+            timed('dequeue', manager.get_next_job, 0)
+            timed('claim', claim, job_id)
+            timed('complete', complete, job_id, result)
+            timed('poll_status', manager.get_job, job_id)
+            timed('fetch_result', manager.get_result, job_id)
+
+    wall_ms = (time.perf_counter() - wall_start) * 1000
+    # INFO itself is counted once; commands run inside scripts are included
+    commands = commands_processed(redis_client) - commands_before - 1
+
+    for job_id in job_ids:
+        manager.delete_job(job_id)
+    for key in redis_client.scan_iter(match='ngrsbench:*', count=1000):
+        redis_client.delete(key)
+
+    steps = {}
+    for step in STEPS:
+        samples = sorted(timings[step])
+        steps[step] = {
+            'mean_ms': round(statistics.mean(samples), 4),
+            'p50_ms': round(samples[len(samples) // 2], 4),
+            'p95_ms': round(samples[int(len(samples) * 0.95) - 1], 4),
+        }
+
+    return {
+        'benchmark': 'job_lifecycle',
+        'timestamp': datetime.now().isoformat(),
+        'redis_version': redis_client.info('server')['redis_version'],
+        'jobs': jobs,
+        'result_kb': result_kb,
+        'lifecycle_mean_ms': round(wall_ms / jobs, 4),
+        'round_trips_per_job': round(round_trips.count / jobs, 2),
+        'redis_commands_per_job': round(commands / jobs, 2),
+        'steps': steps,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark RedisJobManager job lifecycle latency')
+    parser.add_argument('--jobs', type=int, default=200, help='Number of job lifecycles to run')
+    parser.add_argument('--result-kb', type=int, default=64, help='Approximate size of stored result')
+    parser.add_argument('--out', help='Write JSON report to this path')
+    args = parser.parse_args()
+
+    report = run(args.jobs, args.result_kb)
+
+    print(f"Job lifecycle: {report['lifecycle_mean_ms']:.3f} ms/job, "
+          f"{report['round_trips_per_job']} round trips/job, "
+          f"{report['redis_commands_per_job']} Redis commands/job "
+          f"({report['jobs']} jobs, {report['result_kb']} KB results, Redis {report['redis_version']})")
+    for step, stats in report['steps'].items():
+        print(f"  {step:<20} mean {stats['mean_ms']:8.3f} ms   p95 {stats['p95_ms']:8.3f} ms")
+
+    if args.out:
+        out_path = pathlib.Path(args.out)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(json.dumps(report, indent=2))
+        print(f"Report written to {out_path}")
+
+
+if __name__ == '__main__':
+    main()
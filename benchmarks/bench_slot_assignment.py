@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Slot Assignment Benchmark: Balanced Greedy Assignment at Scale
+
+Times the two greedy slot assigners on synthetic inputs:
+
+  - outcome: outcome_based_with_slots._assign_employees_to_slots_balanced
+    for N employees with 70% template work days, a qualification group with
+    expiries, and H positions per day over the horizon
+  - fill: solve_fill_slots (the /solve/fill-slots-mixed task) with N
+    existing employees (some unavailable days, some at the consecutive-day
+    limit), 10% new joiners, and S empty slots
+
+Each records the median wall time and a digest of the assignments, so a
+"before" report from an older tree can be checked (outcome digests should
+match; fill-slots changed from first-fit to most-hours-remaining, so its
+report also records how evenly hours were spread).
+
+Usage:
+    python benchmarks/bench_slot_assignment.py
+    python benchmarks/bench_slot_assignment.py --employees 2000 --out benchmarks/results/slot_assignment_after.json
+"""
+
+import io
+import sys
+import copy
+import json
+import time
+import random
+import hashlib
+import logging
+import argparse
+import pathlib
+import statistics
+import contextlib
+from datetime import date, datetime, timedelta
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from context.engine.outcome_based_with_slots import (
+    _assign_employees_to_slots_balanced,
+    _build_employee_licenses_map,
+)
+from src.fill_slots_solver import solve_fill_slots
+
+START = date(2026, 1, 1)
+
+
+def digest(value):
+    canonical = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()[:16]
+
+
+def build_outcome(num_employees, days, positions, seed=42):
+    rng = random.Random(seed)
+    dates = [(START + timedelta(days=d)).isoformat() for d in range(days)]
+    employees = [
+        {
+            'employeeId': f'E{i:05d}',
+            'rankId': rng.choice(['SER', 'COR']),
+            'productTypeId': 'CVSO',
+            'qualifications': [{'code': 'FRISK',
+                                'expiryDate': (START + timedelta(days=rng.randint(days // 2, 2 * days))).isoformat()}],
+        }
+        for i in range(num_employees)
+    ]
+    templates = {
+        emp['employeeId']: {'valid_work_days': {d for d in dates if rng.random() < 0.7}, 'template_result': {}}
+        for emp in employees
+    }
+    requirement = {'requirementId': 'R1', 'productTypeId': 'CVSO', 'rankIds': ['SER', 'COR'],
+                   'requiredQualifications': [{'groupId': 'g1', 'matchType': 'ALL', 'qualifications': ['FRISK']}]}
+    slots = [
+        {'id': f'{d}-{p}', 'demandId': 'D1', 'requirementId': 'R1', 'date': d, 'shiftCode': 'D',
+         'start': '08:00:00', 'end': '20:00:00', 'nextDay': False, 'position': p,
+         'rotationOffset': 0, 'patternDay': 0}
+        for d in dates for p in range(positions)
+    ]
+    return {'slots': slots, 'eligible_employees': employees, 'employee_templates': templates,
+            'requirement': requirement, 'employee_licenses_map': _build_employee_licenses_map(employees),
+            'ctx': {}}
+
+
+def build_fill(num_employees, num_slots, days, seed=42):
+    rng = random.Random(seed)
+    existing = [
+        {
+            'employeeId': f'E{i:05d}',
+            'availableHours': {'weekly': 44.0, 'monthly': float(rng.choice([48, 96, 176]))},
+            'currentState': {'consecutiveDaysWorked': rng.choice([0, 5, 12]),
+                             'lastWorkDate': (START - timedelta(days=1)).isoformat(),
+                             'rotationOffset': 0, 'patternDay': 0},
+            'availability': [{'date': (START + timedelta(days=d)).isoformat(), 'available': False}
+                             for d in rng.sample(range(days), 3)],
+        }
+        for i in range(num_employees)
+    ]
+    joiners = [
+        {'employeeId': f'N{i:05d}', 'availableFrom': (START + timedelta(days=rng.randint(0, days - 1))).isoformat()}
+        for i in range(num_employees // 10)
+    ]
+    slots = [
+        {'slotId': f'S{i}', 'date': (START + timedelta(days=rng.randint(0, days - 1))).isoformat(),
+         'shiftCode': 'D', 'startTime': '08:00:00', 'endTime': '20:00:00', 'hours': {'normal': 11.0},
+         'requirementId': 'R1'}
+        for i in range(num_slots)
+    ]
+    return {
+        'schemaVersion': '0.96', 'mode': 'fillEmptySlotsWithAvailability',
+        'planningReference': {'planningReferenceId': 'BENCH'},
+        'temporalWindow': {'cutoffDate': (START - timedelta(days=1)).isoformat(),
+                           'solveFromDate': START.isoformat(),
+                           'solveToDate': (START + timedelta(days=days - 1)).isoformat()},
+        'emptySlots': slots, 'existingEmployees': existing, 'newJoiners': joiners,
+    }
+
+
+def timed(fn, make_args, repeat):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        args = make_args()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = fn(*args)
+        samples.append((time.perf_counter() - start) * 1000)
+    return result, round(statistics.median(samples), 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark balanced greedy slot assignment')
+    parser.add_argument('--employees', type=int, default=500)
+    parser.add_argument('--days', type=int, default=31)
+    parser.add_argument('--positions', type=int, default=100, help='Outcome slots per day')
+    parser.add_argument('--slots', type=int, default=10000, help='Fill-slots empty slots')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--out', help='Write JSON report to this path')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    outcome = build_outcome(args.employees, args.days, args.positions)
+    assignments, outcome_ms = timed(
+        lambda a: _assign_employees_to_slots_balanced(**a), lambda: (copy.deepcopy(outcome),), args.repeat
+    )
+    outcome_result = {
+        'slots': len(outcome['slots']),
+        'assigned': sum(1 for a in assignments if a['status'] == 'ASSIGNED'),
+        'ms': outcome_ms,
+        'digest': digest(assignments),
+    }
+    print(f"outcome: {outcome_result}")
+
+    fill = build_fill(args.employees, args.slots, args.days)
+    response, fill_ms = timed(solve_fill_slots, lambda: (copy.deepcopy(fill),), args.repeat)
+    hours = {}
+    for a in response['assignments']:
+        hours[a['employeeId']] = hours.get(a['employeeId'], 0.0) + a['hours']['normal']
+    fill_result = {
+        'slots': len(fill['emptySlots']),
+        'assigned': response['solverRun']['numAssignments'],
+        'unmet': response['solverRun']['numUnmetSlots'],
+        'employees_used': len(hours),
+        'max_employee_hours': max(hours.values(), default=0.0),
+        'ms': fill_ms,
+        'digest': digest(response['assignments']),
+    }
+    print(f"fill:    {fill_result}")
+
+    report = {
+        'benchmark': 'slot_assignment',
+        'timestamp': datetime.now().isoformat(),
+        'employees': args.employees,
+        'days': args.days,
+        'repeat': args.repeat,
+        'outcome': outcome_result,
+        'fill': fill_result,
+    }
+    if args.out:
+        pathlib.Path(args.out).write_text(json.dumps(report, indent=2))
+        print(f"Report written to {args.out}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
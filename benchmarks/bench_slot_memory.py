@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Slot Storage Benchmark: Peak and Retained Memory of Slot Expansion
+
+For every input/*_Solver_Input.json sample, prepares the solve context the
+same way solve_problem does (ICPMP preprocessing, employee filtering), then
+expands the slots with the builder the solver would use (build_slots_v2 for
+inputs with dailyHeadcount, build_slots otherwise) under tracemalloc:
+
+- peak_kib:     tracemalloc peak while expanding
+- retained_kib: memory still held by the returned slot list
+- bytes_per_slot: retained bytes / slot count
+
+--horizon-days N additionally expands every sample over an N-day planning
+horizon (same demand, longer roster) to show how storage scales.
+
+Run it on an older tree for a "before" report and on the current tree for
+"after"; the numbers only depend on the Slot representation.
+
+Usage:
+    python benchmarks/bench_slot_memory.py
+    python benchmarks/bench_slot_memory.py --horizon-days 365 --out benchmarks/results/slot_memory_after.json
+"""
+
+import io
+import gc
+import sys
+import json
+import time
+import argparse
+import logging
+import pathlib
+import contextlib
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import src.solver as solver_module
+from context.engine.slot_builder import build_slots
+from context.engine.slot_builder_v2 import build_slots_v2
+
+
+class _ContextCaptured(Exception):
+    pass
+
+
+def prepare_context(input_path: pathlib.Path):
+    """Solve context as handed to the engine (solve() is intercepted)"""
+    captured = {}
+
+    def capture(ctx):
+        captured['ctx'] = ctx
+        raise _ContextCaptured
+
+    data = json.loads(input_path.read_text())
+    original = solver_module.solve
+    solver_module.solve = capture
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            solver_module.solve_problem(data)
+    except _ContextCaptured:
+        pass
+    finally:
+        solver_module.solve = original
+    return captured.get('ctx'), 'dailyHeadcount' in input_path.read_text()
+
+
+def measure(ctx, use_v2: bool):
+    builder = build_slots_v2 if use_v2 else build_slots
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            slots = builder(ctx)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'builder': 'v2' if use_v2 else 'v1',
+        'slots': len(slots),
+        'build_ms': round(elapsed_ms, 1),
+        'peak_kib': round(peak / 1024, 1),
+        'retained_kib': round(retained / 1024, 1),
+        'bytes_per_slot': round(retained / len(slots)) if slots else 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark memory used by slot expansion')
+    parser.add_argument('--samples', default=str(ROOT / 'input'),
+                        help='Directory containing *_Solver_Input.json files')
+    parser.add_argument('--horizon-days', type=int,
+                        help='Also measure each sample over a planning horizon of this many days')
+    parser.add_argument('--out', help='Write JSON report to this path')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    paths = sorted(p for p in pathlib.Path(args.samples).glob('*_Solver_Input.json'))
+    if not paths:
+        print(f"No *_Solver_Input.json files under {args.samples}")
+        return 1
+
+    results = []
+    for path in paths:
+        try:
+            ctx, use_v2 = prepare_context(path)
+        except Exception as e:  # Sample the current solver rejects
+            print(f"{path.name:<50} skipped: {e}")
+            continue
+        if ctx is None:
+            print(f"{path.name:<50} skipped: no solve context")
+            continue
+        results.append({'sample': path.name, **measure(ctx, use_v2)})
+        if args.horizon_days:
+            horizon = ctx['planningHorizon']
+            start = date.fromisoformat(horizon['startDate'])
+            horizon['endDate'] = (start + timedelta(days=args.horizon_days - 1)).isoformat()
+            results.append({'sample': f"{path.name} @{args.horizon_days}d", **measure(ctx, use_v2)})
+
+    results.sort(key=lambda r: r['slots'], reverse=True)
+    print(f"{'sample':<50} {'bld':>3} {'slots':>6} {'ms':>7} {'peak KiB':>9} {'kept KiB':>9} {'B/slot':>7}")
+    for r in results:
+        print(f"{r['sample']:<50} {r['builder']:>3} {r['slots']:>6} {r['build_ms']:>7.1f} "
+              f"{r['peak_kib']:>9.1f} {r['retained_kib']:>9.1f} {r['bytes_per_slot']:>7}")
+
+    totals = {
+        'slots': sum(r['slots'] for r in results),
+        'peak_kib_max': max((r['peak_kib'] for r in results), default=0),
+        'retained_kib': round(sum(r['retained_kib'] for r in results), 1),
+    }
+    print(f"\nTotal: {totals}")
+
+    report = {
+        'benchmark': 'slot_memory',
+        'timestamp': datetime.now().isoformat(),
+        'samples': results,
+        'totals': totals,
+    }
+    if args.out:
+        pathlib.Path(args.out).write_text(json.dumps(report, indent=2))
+        print(f"Report written to {args.out}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+End-to-End Solve Benchmark over the Production Fixtures
+
+Runs src.solver.solve_problem on every input/*_Solver_Input.json fixture, each
+in its own process (no Redis, no network), with a fixed CP-SAT random seed
+and search-worker count (CPSAT_RANDOM_SEED / CPSAT_NUM_THREADS). Per fixture
+it records:
+
+- phases_ms:     icpmp (ICPMP preprocessing), template (outcomeBased template
+                 roster), build_model (slots + constraints), cpsat (search),
+                 output (build_output) and total wall time. Template
+                 generation may itself run CP-SAT, so phases can overlap.
+- peak_rss_kib:  peak resident set size of the fixture's process
+- model:         variables / constraints of the largest CP-SAT model solved
+- first_feasible_ms, objective, best_bound, cpsat_status of that model
+- status:        solver status reported in the output
+
+--baseline compares the run against a stored report and lists regressions
+(slower total or first-feasible time, higher peak RSS, worse objective, status
+change); the exit code is 1 when there are any. Timing regressions need to
+exceed both the relative threshold and --min-delta-ms to count, so sub-second
+noise on small fixtures is ignored.
+
+Usage:
+    python benchmarks/bench_solve.py --time-limit 10 --out benchmarks/results/solve_baseline.json
+    python benchmarks/bench_solve.py --time-limit 10 --baseline benchmarks/results/solve_baseline.json
+    python benchmarks/bench_solve.py --only 79F62D2C --only 9654BC37 --max-slowdown 0.1
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import logging
+import pathlib
+import resource
+import functools
+import contextlib
+import subprocess
+from datetime import datetime
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+PHASES = ('icpmp', 'template', 'build_model', 'cpsat', 'output', 'total')
+
+
+def _timed(phases, name, fn):
+    """Wrap fn so its wall time accumulates into phases[name] (ms)"""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            phases[name] = phases.get(name, 0.0) + (time.perf_counter() - start) * 1000
+    return wrapper
+
+
+def run_fixture(path: pathlib.Path, time_limit=None):
+    """Solve one fixture in this process and return its measurements"""
+    from ortools.sat.python import cp_model
+    import src.solver as solver_module
+    import context.engine.solver_engine as engine
+    from src.preprocessing.icpmp_integration import ICPMPPreprocessor
+
+    phases = {}
+    solves = []
+
+    class FirstSolution(cp_model.CpSolverSolutionCallback):
+        def __init__(self, chained=None):
+            super().__init__()
+            self.chained = chained
+            self.first_ms = None
+
+        def on_solution_callback(self):
+            if self.first_ms is None:
+                self.first_ms = self.WallTime() * 1000
+            if self.chained is not None:
+                self.chained.on_solution_callback()
+
+    base_solver = cp_model.CpSolver
+
+    class TimedSolver(base_solver):
+        def Solve(self, model, solution_callback=None):
+            proto = model.Proto()
+            callback = FirstSolution(solution_callback)
+            start = time.perf_counter()
+            status = base_solver.Solve(self, model, callback)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            phases['cpsat'] = phases.get('cpsat', 0.0) + elapsed_ms
+            feasible = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+            has_objective = model.HasObjective()
+            solves.append({
+                'variables': len(proto.variables),
+                'constraints': len(proto.constraints),
+                'cpsat_status': self.StatusName(status),
+                'search_ms': round(elapsed_ms, 1),
+                'first_feasible_ms': round(callback.first_ms, 1) if callback.first_ms is not None else None,
+                'objective': round(self.ObjectiveValue(), 3) if feasible and has_objective else None,
+                'best_bound': round(self.BestObjectiveBound(), 3) if feasible and has_objective else None,
+            })
+            return status
+
+    cp_model.CpSolver = TimedSolver
+    engine.build_model = _timed(phases, 'build_model', engine.build_model)
+    ICPMPPreprocessor.preprocess_all_requirements = _timed(
+        phases, 'icpmp', ICPMPPreprocessor.preprocess_all_requirements)
+    solver_module.generate_template_validated_roster = _timed(
+        phases, 'template', solver_module.generate_template_validated_roster)
+    solver_module.build_output = _timed(phases, 'output', solver_module.build_output)
+
+    data = json.loads(path.read_text())
+    if time_limit:
+        data['solverRunTime'] = {**data.get('solverRunTime', {}), 'maxSeconds': time_limit}
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        output = solver_module.solve_problem(data)
+    phases['total'] = (time.perf_counter() - start) * 1000
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':  # Reported in bytes on macOS
+        peak_rss //= 1024
+    largest = max(solves, key=lambda s: s['variables'] + s['constraints'], default={})
+    return {
+        'status': (output.get('solverRun') or {}).get('status', output.get('status')),
+        'phases_ms': {name: round(phases.get(name, 0.0), 1) for name in PHASES},
+        'peak_rss_kib': peak_rss,
+        'model': {'variables': largest.get('variables', 0), 'constraints': largest.get('constraints', 0)},
+        'cpsat_solves': len(solves),
+        'cpsat_status': largest.get('cpsat_status'),
+        'first_feasible_ms': largest.get('first_feasible_ms'),
+        'objective': largest.get('objective'),
+        'best_bound': largest.get('best_bound'),
+    }
+
+
+def run_isolated(path: pathlib.Path, args):
+    """Run one fixture in a child process so peak RSS and caches are per fixture"""
+    env = dict(os.environ, CPSAT_RANDOM_SEED=str(args.seed), CPSAT_NUM_THREADS=str(args.workers))
+    command = [sys.executable, __file__, '--single', str(path)]
+    if args.time_limit:
+        command += ['--time-limit', str(args.time_limit)]
+    try:
+        proc = subprocess.run(command, env=env, cwd=ROOT, capture_output=True, text=True,
+                              timeout=args.timeout)
+    except subprocess.TimeoutExpired:
+        return {'error': f"timed out after {args.timeout}s"}
+    lines = [line for line in proc.stdout.splitlines() if line.startswith('{')]
+    if proc.returncode != 0 or not lines:
+        tail = (proc.stderr.strip().splitlines() or ['no output'])[-1]
+        return {'error': tail[:200]}
+    return json.loads(lines[-1])
+
+
+def compare(results, baseline, args):
+    """
+    Regressions of results against a baseline report.
+
+    Args:
+        results: Per-fixture results of this run
+        baseline: Report written by an earlier run (--out)
+        args: Parsed thresholds (max_slowdown, max_rss_growth, min_delta_ms,
+            objective_tolerance)
+
+    Returns:
+        List of {'sample', 'metric', 'baseline', 'current'} dicts
+    """
+    before = {r['sample']: r for r in baseline.get('samples', [])}
+    regressions = []
+
+    def flag(sample, metric, old, new):
+        regressions.append({'sample': sample, 'metric': metric, 'baseline': old, 'current': new})
+
+    def slower(old, new):
+        return (old is not None and new is not None
+                and new > old * (1 + args.max_slowdown) and new - old > args.min_delta_ms)
+
+    for r in results:
+        old = before.get(r['sample'])
+        if old is None or 'error' in old:
+            continue
+        if 'error' in r:
+            flag(r['sample'], 'error', None, r['error'])
+            continue
+        if r['status'] != old['status']:
+            flag(r['sample'], 'status', old['status'], r['status'])
+        if slower(old['phases_ms']['total'], r['phases_ms']['total']):
+            flag(r['sample'], 'total_ms', old['phases_ms']['total'], r['phases_ms']['total'])
+        if slower(old['first_feasible_ms'], r['first_feasible_ms']):
+            flag(r['sample'], 'first_feasible_ms', old['first_feasible_ms'], r['first_feasible_ms'])
+        if r['peak_rss_kib'] > old['peak_rss_kib'] * (1 + args.max_rss_growth):
+            flag(r['sample'], 'peak_rss_kib', old['peak_rss_kib'], r['peak_rss_kib'])
+        if (old['objective'] is not None and r['objective'] is not None
+                and r['objective'] > old['objective'] + args.objective_tolerance):
+            flag(r['sample'], 'objective', old['objective'], r['objective'])
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark solve_problem over the input/ fixtures')
+    parser.add_argument('--samples', default=str(ROOT / 'input'),
+                        help='Directory containing *_Solver_Input.json files')
+    parser.add_argument('--only', action='append', default=[],
+                        help='Only fixtures whose name contains this string (repeatable)')
+    parser.add_argument('--time-limit', type=float,
+                        help="CP-SAT time limit in seconds (default: each fixture's solverRunTime)")
+    parser.add_argument('--workers', type=int, default=4, help='CP-SAT search workers (CPSAT_NUM_THREADS)')
+    parser.add_argument('--seed', type=int, default=0, help='CP-SAT random seed (CPSAT_RANDOM_SEED)')
+    parser.add_argument('--timeout', type=float, default=900, help='Per-fixture timeout in seconds')
+    parser.add_argument('--out', help='Write JSON report to this path')
+    parser.add_argument('--baseline', help='Compare against this JSON report')
+    parser.add_argument('--max-slowdown', type=float, default=0.2,
+                        help='Allowed relative increase of total / first-feasible time (default 0.2)')
+    parser.add_argument('--min-delta-ms', type=float, default=500,
+                        help='Ignore time increases smaller than this (default 500)')
+    parser.add_argument('--max-rss-growth', type=float, default=0.2,
+                        help='Allowed relative increase of peak RSS (default 0.2)')
+    parser.add_argument('--objective-tolerance', type=float, default=0,
+                        help='Allowed increase of the (minimized) objective (default 0)')
+    parser.add_argument('--single', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    if args.single:
+        print(json.dumps(run_fixture(pathlib.Path(args.single), args.time_limit)))
+        return 0
+
+    paths = sorted(pathlib.Path(args.samples).glob('*_Solver_Input.json'))
+    if args.only:
+        paths = [p for p in paths if any(token in p.name for token in args.only)]
+    if not paths:
+        print(f"No *_Solver_Input.json files under {args.samples}")
+        return 1
+
+    print(f"{'sample':<46} {'status':<11} {'total ms':>9} {'model ms':>9} {'cpsat ms':>9} "
+          f"{'1st ms':>8} {'RSS MiB':>8} {'vars':>7} {'objective':>14}")
+    results = []
+    for path in paths:
+        r = {'sample': path.name, **run_isolated(path, args)}
+        results.append(r)
+        if 'error' in r:
+            print(f"{path.name:<46} error: {r['error']}")
+            continue
+        first = r['first_feasible_ms']
+        print(f"{path.name:<46} {str(r['status']):<11} {r['phases_ms']['total']:>9.0f} "
+              f"{r['phases_ms']['build_model']:>9.0f} {r['phases_ms']['cpsat']:>9.0f} "
+              f"{first if first is not None else '-':>8} {r['peak_rss_kib'] / 1024:>8.0f} "
+              f"{r['model']['variables']:>7} {str(r['objective']):>14}")
+
+    report = {
+        'benchmark': 'solve',
+        'timestamp': datetime.now().isoformat(),
+        'settings': {'time_limit': args.time_limit, 'workers': args.workers, 'seed': args.seed},
+        'samples': results,
+    }
+
+    exit_code = 0
+    if args.baseline:
+        baseline = json.loads(pathlib.Path(args.baseline).read_text())
+        if baseline.get('settings') != report['settings']:
+            print(f"\n⚠️  Baseline settings differ: {baseline.get('settings')} vs {report['settings']}")
+        regressions = compare(results, baseline, args)
+        report['baseline'] = args.baseline
+        report['regressions'] = regressions
+        print(f"\n{len(regressions)} regression(s) against {args.baseline}")
+        for reg in regressions:
+            print(f"  {reg['sample']:<46} {reg['metric']:<18} {reg['baseline']} → {reg['current']}")
+        exit_code = 1 if regressions else 0
+
+    if args.out:
+        pathlib.Path(args.out).write_text(json.dumps(report, indent=2))
+        print(f"Report written to {args.out}")
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
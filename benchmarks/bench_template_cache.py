@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Template Memoization Benchmark: Outcome-Based Rostering Across OUs
+
+Builds a synthetic outcome-based requirement whose employees are spread over
+--ous OUs, with OU i using rotation offset i % --offsets. OUs sharing an
+offset (and scheme/product/rank) need the same template. Times
+generate_template_validated_roster in three settings:
+
+  - uncached: template cache disabled (one template solved per OU)
+  - cold:     empty cache; OUs in the request reuse each other's templates
+  - warm:     cache already holds the templates (a resubmitted request)
+
+Each setting records the median wall time, the template counters reported in
+the roster statistics, and a digest of the assignments, so the cached runs
+can be checked against the uncached one.
+
+Usage:
+    python benchmarks/bench_template_cache.py
+    python benchmarks/bench_template_cache.py --mode incremental --out benchmarks/results/template_cache_incremental.json
+"""
+
+import io
+import sys
+import json
+import time
+import hashlib
+import logging
+import argparse
+import pathlib
+import statistics
+import contextlib
+from datetime import datetime
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from context.engine import template_cache
+from context.engine.template_cache import TemplateCache
+from context.engine.template_roster import generate_template_validated_roster
+
+
+def build_request(num_ous, num_offsets, per_ou, mode):
+    demand = {
+        'id': 'D1',
+        'demandId': 'D1',
+        'rosteringBasis': 'outcomeBased',
+        'templateGenerationMode': mode,
+        'shifts': [{
+            'shiftDetails': [{'shiftCode': 'D', 'start': '08:00:00', 'end': '20:00:00', 'nextDay': False}],
+            'coverageDays': ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'],
+        }],
+    }
+    requirement = {
+        'requirementId': 'R1', 'demandId': 'D1', 'productTypeId': 'CVSO', 'rankId': 'SER',
+        'workPattern': ['D', 'D', 'D', 'D', 'O', 'O'], 'headcount': 0,
+    }
+    employees = [
+        {
+            'employeeId': f'E{ou:03d}{n:02d}', 'ouId': f'OU{ou:03d}', 'rotationOffset': ou % num_offsets,
+            'scheme': 'Scheme A', 'productTypeId': 'CVSO', 'rankId': 'SER', 'local': 1,
+            'qualifications': [], 'unavailability': [],
+        }
+        for ou in range(num_ous)
+        for n in range(per_ou)
+    ]
+    ctx = {
+        'planningHorizon': {'startDate': '2026-03-01', 'endDate': '2026-03-31'},
+        'publicHolidays': ['2026-03-21'],
+        'demandItems': [demand],
+        'employees': employees,
+        'constraintList': [],
+        'monthlyHourLimits': [],
+        'solverConfig': {'optimizationMode': 'minimizeEmployeeCount'},
+    }
+    return ctx, employees, requirement, demand
+
+
+def digest(assignments):
+    canonical = json.dumps(assignments, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()[:16]
+
+
+def run_once(request):
+    ctx, employees, requirement, demand = request
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        assignments, stats = generate_template_validated_roster(ctx, employees, requirement, demand)
+    return (time.perf_counter() - start) * 1000, assignments, stats
+
+
+def bench_setting(request, setting, repeat):
+    samples = []
+    warm_cache = TemplateCache(1024)
+    for _ in range(repeat):
+        if setting == 'uncached':
+            template_cache._default_cache = TemplateCache(0)
+        elif setting == 'cold':
+            template_cache._default_cache = TemplateCache(1024)
+        else:
+            template_cache._default_cache = warm_cache
+            if not warm_cache._entries:
+                run_once(request)  # Fill the cache, as the first submission would
+        ms, assignments, stats = run_once(request)
+        samples.append(ms)
+    return {
+        'ms': round(statistics.median(samples), 1),
+        'templateCache': stats.get('templateCache'),
+        'assignments': len(assignments),
+        'digest': digest(assignments),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark template reuse across OUs')
+    parser.add_argument('--ous', type=int, default=24, help='Number of OUs')
+    parser.add_argument('--offsets', type=int, default=6, help='Distinct rotation offsets across OUs')
+    parser.add_argument('--per-ou', type=int, default=3, help='Employees per OU')
+    parser.add_argument('--mode', choices=('cpsat', 'incremental'), default='cpsat',
+                        help='templateGenerationMode')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions per setting')
+    parser.add_argument('--out', help='Write JSON report to this path')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    request = build_request(args.ous, args.offsets, args.per_ou, args.mode)
+
+    results = {}
+    print(f"{'setting':<10} {'ms':>10} {'templates':>10} {'solved':>7} {'hits':>5} {'digest':>18}")
+    for setting in ('uncached', 'cold', 'warm'):
+        r = results[setting] = bench_setting(request, setting, args.repeat)
+        counters = r['templateCache'] or {}
+        print(f"{setting:<10} {r['ms']:>10.1f} {counters.get('templates', 0):>10} "
+              f"{counters.get('solved', 0):>7} {counters.get('hits', 0):>5} {r['digest']:>18}")
+
+    identical = len({r['digest'] for r in results.values()}) == 1
+    print(f"\nSame assignments in every setting: {identical}")
+
+    report = {
+        'benchmark': 'template_cache',
+        'timestamp': datetime.now().isoformat(),
+        'mode': args.mode,
+        'ous': args.ous,
+        'offsets': args.offsets,
+        'employees_per_ou': args.per_ou,
+        'repeat': args.repeat,
+        'settings': results,
+        'identical': identical,
+    }
+    if args.out:
+        pathlib.Path(args.out).write_text(json.dumps(report, indent=2))
+        print(f"Report written to {args.out}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
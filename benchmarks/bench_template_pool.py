@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Parallel Template Generation Benchmark: Per-OU Templates in a Process Pool
+
+Rosters the synthetic outcome-based requirement of bench_template_cache.py
+with the template cache disabled, so every OU builds its own template, and
+times generate_template_validated_roster for each TEMPLATE_POOL_WORKERS
+count in --workers (TEMPLATE_PARALLEL_MIN_MS=0, so the pool is always used
+when workers > 1). Records the median wall time, the worker count reported
+in the roster statistics, and a digest of the assignments, so parallel runs
+can be checked against the sequential one.
+
+The speedup is bounded by the cores available (recorded as cpu_count).
+
+Usage:
+    python benchmarks/bench_template_pool.py
+    python benchmarks/bench_template_pool.py --workers 1,2,4 --out benchmarks/results/template_pool_cpsat.json
+"""
+
+import os
+import sys
+import logging
+import argparse
+import pathlib
+import statistics
+import json
+from datetime import datetime
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from bench_template_cache import build_request, run_once, digest
+from context.engine import template_cache
+from context.engine.template_cache import TemplateCache
+
+
+def bench_workers(request, workers, repeat):
+    os.environ['TEMPLATE_POOL_WORKERS'] = str(workers)
+    samples = []
+    for _ in range(repeat):
+        ms, assignments, stats = run_once(request)
+        samples.append(ms)
+    counters = stats.get('templateCache') or {}
+    return {
+        'ms': round(statistics.median(samples), 1),
+        'templates_solved': counters.get('solved'),
+        'workers_used': counters.get('workers'),
+        'assignments': len(assignments),
+        'digest': digest(assignments),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark parallel per-OU template generation')
+    parser.add_argument('--ous', type=int, default=24, help='Number of OUs')
+    parser.add_argument('--per-ou', type=int, default=3, help='Employees per OU')
+    parser.add_argument('--mode', choices=('cpsat', 'incremental'), default='cpsat',
+                        help='templateGenerationMode')
+    parser.add_argument('--workers', default='1,2,4', help='Comma-separated TEMPLATE_POOL_WORKERS values')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions per worker count')
+    parser.add_argument('--out', help='Write JSON report to this path')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    os.environ['TEMPLATE_PARALLEL_MIN_MS'] = '0'
+    template_cache._default_cache = TemplateCache(0)
+    request = build_request(args.ous, args.ous, args.per_ou, args.mode)
+
+    results = {}
+    print(f"{'workers':<8} {'ms':>10} {'solved':>7} {'used':>5} {'digest':>18}")
+    for workers in (int(w) for w in args.workers.split(',')):
+        r = results[str(workers)] = bench_workers(request, workers, args.repeat)
+        print(f"{workers:<8} {r['ms']:>10.1f} {r['templates_solved']:>7} {r['workers_used']:>5} {r['digest']:>18}")
+
+    identical = len({r['digest'] for r in results.values()}) == 1
+    print(f"\nSame assignments for every worker count: {identical}")
+
+    report = {
+        'benchmark': 'template_pool',
+        'timestamp': datetime.now().isoformat(),
+        'cpu_count': os.cpu_count(),
+        'mode': args.mode,
+        'ous': args.ous,
+        'employees_per_ou': args.per_ou,
+        'repeat': args.repeat,
+        'workers': results,
+        'identical': identical,
+    }
+    if args.out:
+        pathlib.Path(args.out).write_text(json.dumps(report, indent=2))
+        print(f"Report written to {args.out}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Template Validation Benchmark: Incremental Template per Horizon Length
+
+Times template_roster._generate_validated_template (the incremental
+template generator: walk the horizon, validate every work day against
+C1-C17, build the assignment) for one template employee over horizons of
+--horizons days. Profiles cover the scheme/qualification branches: Scheme A
+CVSO with no qualification requirement, Scheme A APO (APGD-D10, 6th-day
+rest day pay) with an ALL qualification group and a constraint list, and
+Scheme P with an ANY qualification group. Records the median time, time per
+day and a digest of the template, so a "before" report from an older tree
+can be checked for identical output.
+
+Usage:
+    python benchmarks/bench_template_validation.py
+    python benchmarks/bench_template_validation.py --out benchmarks/results/template_validation_after.json
+"""
+
+import io
+import sys
+import json
+import time
+import hashlib
+import logging
+import argparse
+import pathlib
+import statistics
+import contextlib
+from datetime import date, datetime, timedelta
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from context.engine.template_roster import _generate_validated_template
+
+SHIFT = {'shiftCode': 'D', 'start': '08:00:00', 'end': '20:00:00', 'nextDay': False}
+PART_TIME_SHIFT = {'shiftCode': 'D', 'start': '08:00:00', 'end': '14:00:00', 'nextDay': False}
+ALL_DAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+CONSTRAINTS = [
+    {'id': 'momWeeklyHoursCap44h', 'enforcement': 'hard', 'defaultValue': 44},
+    {'id': 'maxConsecutiveWorkingDays', 'enforcement': 'hard', 'defaultValue': 12},
+    {'id': 'momMonthlyOTcap72h', 'enforcement': 'hard', 'defaultValue': 72},
+]
+
+
+def profiles():
+    """(name, employee, work_pattern, shift, ctx, requirement, coverage_days)"""
+    quals = [{'code': 'FRISKING', 'expiryDate': '2030-12-31'}, {'code': 'XRAY', 'expiryDate': '2030-12-31'}]
+    return [
+        ('schemeA_cvso',
+         {'employeeId': 'E1', 'scheme': 'Scheme A', 'productTypeId': 'CVSO', 'rankId': 'SER', 'rotationOffset': 0},
+         ['D', 'D', 'D', 'D', 'O', 'O'], SHIFT, {'constraintList': []},
+         {'productTypeId': 'CVSO', 'rankIds': ['SER']}, ALL_DAYS),
+        ('schemeA_apo_quals',
+         {'employeeId': 'E2', 'scheme': 'Scheme A', 'productTypeId': 'APO', 'rankId': 'APO', 'rotationOffset': 2,
+          'qualifications': quals},
+         ['D', 'D', 'D', 'D', 'D', 'D', 'O'], SHIFT, {'constraintList': CONSTRAINTS},
+         {'productTypeId': 'APO', 'rankIds': ['APO'],
+          'requiredQualifications': [{'groupId': 'g1', 'matchType': 'ALL', 'qualifications': ['FRISKING', 'XRAY']}]},
+         ALL_DAYS),
+        ('schemeP_any_qual',
+         {'employeeId': 'E3', 'scheme': 'Scheme P', 'productTypeId': 'CVSO', 'rankId': 'SER', 'rotationOffset': 1,
+          'qualifications': quals},
+         ['D', 'D', 'D', 'O', 'O'], PART_TIME_SHIFT, {'constraintList': CONSTRAINTS},
+         {'productTypeId': 'CVSO', 'rankIds': ['SER'],
+          'requiredQualifications': [{'groupId': 'g1', 'matchType': 'ANY', 'qualifications': ['NIGHT', 'XRAY']}]},
+         ['Mon', 'Tue', 'Wed', 'Thu', 'Fri']),
+    ]
+
+
+def digest(template):
+    canonical = json.dumps(template, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()[:16]
+
+
+def bench_profile(profile, days, repeat):
+    name, employee, pattern, shift, ctx, requirement, coverage_days = profile
+    start_date = date(2026, 1, 1)
+    end_date = start_date + timedelta(days=days - 1)
+    demand = {'id': 'D1'}
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            template = _generate_validated_template(
+                employee, pattern, start_date, end_date, shift, dict(ctx), demand, requirement, coverage_days
+            )
+        samples.append((time.perf_counter() - start) * 1000)
+    ms = statistics.median(samples)
+    return {
+        'profile': name,
+        'days': days,
+        'assigned': sum(1 for day in template.values() if day['assignment']),
+        'ms': round(ms, 3),
+        'us_per_day': round(ms * 1000 / days, 2),
+        'digest': digest(template),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark incremental template validation')
+    parser.add_argument('--horizons', default='31,365,1825', help='Comma-separated horizon lengths in days')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing repetitions per profile and horizon')
+    parser.add_argument('--out', help='Write JSON report to this path')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    results = []
+    print(f"{'profile':<20} {'days':>6} {'assigned':>9} {'ms':>10} {'us/day':>8} {'digest':>18}")
+    for profile in profiles():
+        for days in (int(d) for d in args.horizons.split(',')):
+            r = bench_profile(profile, days, args.repeat)
+            results.append(r)
+            print(f"{r['profile']:<20} {days:>6} {r['assigned']:>9} {r['ms']:>10.2f} {r['us_per_day']:>8.2f} "
+                  f"{r['digest']:>18}")
+
+    report = {
+        'benchmark': 'template_validation',
+        'timestamp': datetime.now().isoformat(),
+        'repeat': args.repeat,
+        'samples': results,
+    }
+    if args.out:
+        pathlib.Path(args.out).write_text(json.dumps(report, indent=2))
+        print(f"Report written to {args.out}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Synchronous-Solve Load Test: /health Latency During Solves
+
+Fires concurrent POST /v1/solve requests at a running API server while a
+/health probe runs every 50 ms, and reports probe latency next to an idle
+baseline. If solves run on the event loop, /health stalls for the length of
+each CP-SAT run; with the solve pool it should stay flat, and requests
+beyond the pool's capacity come back as 503 with Retry-After.
+
+Usage:
+    START_WORKERS=false uvicorn src.api_server:app --port 8080 &
+    python benchmarks/load_solve_health.py --base-url http://localhost:8080
+    python benchmarks/load_solve_health.py --solves 4 --max-seconds 10 \\
+        --out benchmarks/results/solve_health_after.json
+"""
+
+import sys
+import json
+import time
+import asyncio
+import argparse
+import pathlib
+import statistics
+from collections import Counter
+from datetime import datetime
+
+import httpx
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+DEFAULT_INPUT = ROOT / 'input' / 'RST-20260130-5B7971B2_Solver_Input.json'
+
+
+def percentile(samples, pct):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * pct))], 3)
+
+
+def summarise(samples):
+    return {
+        'samples': len(samples),
+        'p50': percentile(samples, 0.50),
+        'p95': percentile(samples, 0.95),
+        'max': round(max(samples), 3) if samples else None,
+        'mean': round(statistics.mean(samples), 3) if samples else None,
+    }
+
+
+async def probe_health(client, stop: asyncio.Event, latencies):
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            await client.get('/health')
+        except httpx.HTTPError:
+            pass
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.05)
+
+
+async def post_solve(client, endpoint, input_json, outcomes, durations):
+    start = time.perf_counter()
+    try:
+        response = await client.post(endpoint, json={'input_json': input_json})
+        code = response.status_code
+        if code == 503:
+            code = f"503 (Retry-After {response.headers.get('retry-after')})"
+    except httpx.HTTPError as e:
+        code = type(e).__name__
+    durations.append(round(time.perf_counter() - start, 2))
+    outcomes.append(str(code))
+
+
+async def main_async(args) -> dict:
+    input_json = json.loads(pathlib.Path(args.input).read_text())
+    input_json.setdefault('solverRunTime', {})['maxSeconds'] = args.max_seconds
+
+    limits = httpx.Limits(max_connections=args.solves + 2)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=600.0) as client:
+        # Idle baseline
+        idle, stop = [], asyncio.Event()
+        probe = asyncio.create_task(probe_health(client, stop, idle))
+        await asyncio.sleep(args.idle_seconds)
+        stop.set()
+        await probe
+
+        # Under solve load
+        loaded, stop = [], asyncio.Event()
+        outcomes, durations = [], []
+        probe = asyncio.create_task(probe_health(client, stop, loaded))
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            post_solve(client, args.endpoint, input_json, outcomes, durations)
+            for _ in range(args.solves)
+        ))
+        wall = time.perf_counter() - started
+        stop.set()
+        await probe
+
+    return {
+        'benchmark': 'solve_health',
+        'timestamp': datetime.now().isoformat(),
+        'base_url': args.base_url,
+        'endpoint': args.endpoint,
+        'input': pathlib.Path(args.input).name,
+        'concurrent_solves': args.solves,
+        'solver_max_seconds': args.max_seconds,
+        'wall_seconds': round(wall, 2),
+        'solve_outcomes': dict(Counter(outcomes)),
+        'solve_seconds': sorted(durations),
+        'health_idle_ms': summarise(idle),
+        'health_during_solves_ms': summarise(loaded),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure /health latency while synchronous solves run')
+    parser.add_argument('--base-url', default='http://localhost:8080', help='API server base URL')
+    parser.add_argument('--endpoint', default='/v1/solve', help='Synchronous solve endpoint to load')
+    parser.add_argument('--input', default=str(DEFAULT_INPUT), help='Solver input for each request')
+    parser.add_argument('--solves', type=int, default=4, help='Concurrent solve requests')
+    parser.add_argument('--max-seconds', type=int, default=10, help='solverRunTime.maxSeconds per solve')
+    parser.add_argument('--idle-seconds', type=float, default=3.0, help='Idle /health baseline duration')
+    parser.add_argument('--out', help='Write JSON report to this path')
+    args = parser.parse_args()
+
+    print(f"Solve/health load test against {args.base_url}{args.endpoint} ({args.solves} concurrent solves)")
+    report = asyncio.run(main_async(args))
+
+    idle, loaded = report['health_idle_ms'], report['health_during_solves_ms']
+    print(f"  solve outcomes: {report['solve_outcomes']}  (wall {report['wall_seconds']} s)")
+    print(f"  /health idle:          p50 {idle['p50']:>9.2f} ms   p95 {idle['p95']:>9.2f} ms   max {idle['max']:>9.2f} ms")
+    print(f"  /health during solves: p50 {loaded['p50']:>9.2f} ms   p95 {loaded['p95']:>9.2f} ms   max {loaded['max']:>9.2f} ms")
+
+    if args.out:
+        out_path = pathlib.Path(args.out)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(json.dumps(report, indent=2))
+        print(f"Report written to {out_path}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Status-Poll Load Test for the Async Job API
+
+Submits one job to a running API server, then hammers
+GET /solve/async/{job_id} from many concurrent clients for a fixed duration
+and reports throughput and latency percentiles. A /health probe runs
+alongside to show whether polling bursts stall the event loop.
+
+The server does not need workers (START_WORKERS=false): the job just stays
+queued while it is being polled.
+
+Usage:
+    START_WORKERS=false uvicorn src.api_server:app --port 8080 &
+    python benchmarks/load_status_poll.py --base-url http://localhost:8080
+    python benchmarks/load_status_poll.py --concurrency 10 50 200 --duration 15 \\
+        --out benchmarks/results/status_poll_after.json
+"""
+
+import sys
+import json
+import time
+import asyncio
+import argparse
+import pathlib
+import statistics
+from datetime import datetime
+
+import httpx
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+DEFAULT_INPUT = ROOT / 'input' / 'RST-20260112-4E8B07EE_Solver_Input.json'
+
+
+def percentile(samples, pct):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * pct))], 3)
+
+
+async def submit_job(client: httpx.AsyncClient, input_path: pathlib.Path) -> str:
+    input_json = json.loads(input_path.read_text())
+    response = await client.post('/solve/async', json={'input_json': input_json, 'dedup': False})
+    response.raise_for_status()
+    return response.json()['job_id']
+
+
+async def poll(client, job_id, deadline, latencies, errors):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            response = await client.get(f'/solve/async/{job_id}')
+            if response.status_code != 200:
+                errors.append(response.status_code)
+                continue
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+            continue
+        latencies.append((time.perf_counter() - start) * 1000)
+
+
+async def probe_health(client, deadline, latencies):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        await client.get('/health')
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.05)
+
+
+async def run_level(base_url: str, job_id: str, concurrency: int, duration: float) -> dict:
+    limits = httpx.Limits(max_connections=concurrency + 1, max_keepalive_connections=concurrency + 1)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        latencies, errors, health = [], [], []
+        deadline = time.perf_counter() + duration
+        started = time.perf_counter()
+        await asyncio.gather(
+            probe_health(client, deadline, health),
+            *(poll(client, job_id, deadline, latencies, errors) for _ in range(concurrency))
+        )
+        elapsed = time.perf_counter() - started
+
+    return {
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'errors': len(errors),
+        'requests_per_second': round(len(latencies) / elapsed, 1),
+        'latency_ms': {
+            'mean': round(statistics.mean(latencies), 3) if latencies else None,
+            'p50': percentile(latencies, 0.50),
+            'p95': percentile(latencies, 0.95),
+            'p99': percentile(latencies, 0.99),
+        },
+        'health_p95_ms': percentile(health, 0.95),
+    }
+
+
+async def main_async(args) -> dict:
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60.0) as client:
+        job_id = args.job_id or await submit_job(client, pathlib.Path(args.input))
+        # Warm up connections and caches
+        for _ in range(20):
+            await client.get(f'/solve/async/{job_id}')
+
+    levels = []
+    for concurrency in args.concurrency:
+        level = await run_level(args.base_url, job_id, concurrency, args.duration)
+        levels.append(level)
+        print(f"  concurrency {concurrency:>4}: {level['requests_per_second']:>8.1f} req/s   "
+              f"p50 {level['latency_ms']['p50']:>7.2f} ms   p95 {level['latency_ms']['p95']:>7.2f} ms   "
+              f"p99 {level['latency_ms']['p99']:>7.2f} ms   /health p95 {level['health_p95_ms']:>7.2f} ms   "
+              f"errors {level['errors']}")
+
+    return {
+        'benchmark': 'status_poll',
+        'timestamp': datetime.now().isoformat(),
+        'base_url': args.base_url,
+        'job_id': job_id,
+        'duration_seconds': args.duration,
+        'levels': levels,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test GET /solve/async/{job_id} status polling')
+    parser.add_argument('--base-url', default='http://localhost:8080', help='API server base URL')
+    parser.add_argument('--job-id', help='Poll this existing job instead of submitting one')
+    parser.add_argument('--input', default=str(DEFAULT_INPUT), help='Solver input used for the submitted job')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[10, 50, 200],
+                        help='Concurrent pollers (one run per value)')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds per concurrency level')
+    parser.add_argument('--out', help='Write JSON report to this path')
+    args = parser.parse_args()
+
+    print(f"Status-poll load test against {args.base_url} ({args.duration:.0f}s per level)")
+    report = asyncio.run(main_async(args))
+
+    if args.out:
+        out_path = pathlib.Path(args.out)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(json.dumps(report, indent=2))
+        print(f"Report written to {out_path}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -8,6 +8,8 @@ Input Schema (v0.43):
 - employees: [{ employeeId, ... }]
 - slots: List of Slot objects with start/end times
 """
+from context.engine.timeline import get_slot_timeline
+
 
 def add_constraints(model, ctx):
     """
@@ -45,33 +47,36 @@ def add_constraints(model, ctx):
     
     constraints_added = 0
     
-    # For each employee, check all pairs of slots for time conflicts
+    # Shift start/end minutes for the overlap checks
+    timeline = get_slot_timeline(ctx)
+    candidates = timeline.candidates(x)
+    start_min, end_min, slot_ids = timeline.start_min, timeline.end_min, timeline.slot_ids
+    
+    # For each employee, sweep their candidate slots in start order
     for emp in employees:
         emp_id = emp.get('employeeId')
         
-        # Get all slots this employee could be assigned to
-        emp_slots = [s for s in slots if (s.slot_id, emp_id) in x]
+        # Get all slots this employee could be assigned to, sorted by start minute
+        emp_slots = sorted(candidates.get(emp_id, ()), key=start_min.__getitem__)
         
         if len(emp_slots) < 2:
             continue
         
-        # Check all pairs of slots for overlaps
-        for i in range(len(emp_slots)):
-            for j in range(i + 1, len(emp_slots)):
-                slot1 = emp_slots[i]
-                slot2 = emp_slots[j]
+        for a in range(len(emp_slots)):
+            i = emp_slots[a]
+            
+            # Only slots starting before slot i ends can overlap it; later ones start even later
+            for b in range(a + 1, len(emp_slots)):
+                j = emp_slots[b]
+                if start_min[j] >= end_min[i]:
+                    break
                 
-                # Check if time ranges overlap
                 # Overlap occurs if: start1 < end2 AND start2 < end1
-                if slot1.start < slot2.end and slot2.start < slot1.end:
+                if start_min[i] < end_min[j]:
                     # Add disjunctive constraint: NOT (x[slot1, emp] AND x[slot2, emp])
                     # Implemented as: x[slot1, emp] + x[slot2, emp] <= 1
-                    var1 = x.get((slot1.slot_id, emp_id))
-                    var2 = x.get((slot2.slot_id, emp_id))
-                    
-                    if var1 is not None and var2 is not None:
-                        model.Add(var1 + var2 <= 1)
-                        constraints_added += 1
+                    model.Add(x[(slot_ids[i], emp_id)] + x[(slot_ids[j], emp_id)] <= 1)
+                    constraints_added += 1
     
     print(f"[C16] No Overlapping Shifts Constraint (HARD)")
     print(f"     ✓ Added {constraints_added} no-overlap disjunctive constraints\n")
@@ -12,8 +12,8 @@ Monthly OT caps (from monthlyHourLimits):
 This constraint enforces monthly OT doesn't exceed the scheme/product-specific limit (HARD).
 """
 from collections import defaultdict
-from calendar import monthrange
 from context.engine.constraint_config import get_monthly_hour_limits
+from context.engine.timeline import cap_minutes, get_slot_timeline
 
 
 # Weekly normal hours threshold (MOM standard)
@@ -25,7 +25,7 @@ def add_constraints(model, ctx):
     Enforce monthly OT hour cap per employee (HARD).
     
     Strategy: 
-    1. Group slots by (employee, ISO week) to calculate weekly gross hours
+    1. Group slots by (employee, ISO week) to calculate weekly gross minutes
     2. Weekly OT = max(0, weekly_gross - 44h)
     3. Sum weekly OT for each calendar month
     4. Constraint: monthly OT ≤ monthly_ot_cap
@@ -49,67 +49,59 @@ def add_constraints(model, ctx):
         print(f"[C17] Warning: Slots, employees, or decision variables not available")
         return
     
-    # Pre-calculate gross hours for each slot
-    slot_gross_hours = {}
-    for slot in slots:
-        gross = (slot.end - slot.start).total_seconds() / 3600.0
-        slot_gross_hours[slot.slot_id] = gross
-    
-    # Group slots by (employee, ISO week year, ISO week number)
-    # Each slot also knows which calendar month it belongs to
-    emp_week_slots = defaultdict(list)  # (emp_id, iso_year, iso_week) -> [slots]
-    emp_month_weeks = defaultdict(set)  # (emp_id, cal_year, cal_month) -> set of (iso_year, iso_week)
-    
-    for slot in slots:
-        slot_date = slot.date
-        iso_year, iso_week, _ = slot_date.isocalendar()
-        cal_month = (slot_date.year, slot_date.month)
-        
-        for emp in employees:
-            emp_id = emp.get('employeeId')
-            if (slot.slot_id, emp_id) in x:
-                week_key = (emp_id, iso_year, iso_week)
-                emp_week_slots[week_key].append(slot)
-                emp_month_weeks[(emp_id, cal_month[0], cal_month[1])].add((iso_year, iso_week))
-    
-    # Create weekly gross hours variables for each (employee, week)
-    # weekly_gross[emp_id, iso_year, iso_week] = sum of gross hours for that week
-    weekly_gross_vars = {}
-    weekly_ot_vars = {}
+    # Gross minutes and week/month indices for the OT sums
+    timeline = get_slot_timeline(ctx)
+    candidates = timeline.candidates(x)
+    employees_by_id = {e.get('employeeId'): e for e in employees}
     
-    # Scale factor for integer arithmetic (multiply by 100 for 2 decimal precision)
-    SCALE = 100
-    weekly_threshold_scaled = int(WEEKLY_HOURS_THRESHOLD * SCALE)
+    # All quantities below are exact integer minutes
+    weekly_threshold_minutes = int(WEEKLY_HOURS_THRESHOLD * 60)
+    max_weekly_gross = 24 * 7 * 60  # Max possible: 168h/week
+    max_weekly_ot = max_weekly_gross - weekly_threshold_minutes
+    
+    # Group candidate slots by (employee, ISO week index); each slot also knows
+    # which calendar month it belongs to
+    emp_week_slots = defaultdict(list)  # (emp_id, week_index) -> [slot positions]
+    emp_month_weeks = defaultdict(set)  # (emp_id, month_index) -> set of week indices
+    emp_month_slots = defaultdict(list)  # (emp_id, month_index) -> [slot positions]
+    
+    for emp_id, positions in candidates.items():
+        if emp_id not in employees_by_id:
+            continue
+        for i in positions:
+            week_index = timeline.iso_week_index[i]
+            month_index = timeline.month_index[i]
+            emp_week_slots[(emp_id, week_index)].append(i)
+            emp_month_weeks[(emp_id, month_index)].add(week_index)
+            emp_month_slots[(emp_id, month_index)].append(i)
+    
+    def gross_terms(emp_id, positions):
+        # sum(var * gross_minutes)
+        return [
+            x[(timeline.slot_ids[i], emp_id)] * timeline.gross_minutes(i)
+            for i in positions
+            if timeline.gross_minutes(i) > 0
+        ]
+    
+    # Create weekly OT variables for each (employee, week):
+    # weekly_ot = max(0, weekly_gross - 44h)
+    weekly_ot_vars = {}
     
     for week_key, week_slots in emp_week_slots.items():
-        emp_id, iso_year, iso_week = week_key
-        
-        # Build sum of gross hours for this week: sum(var * gross_hours)
-        gross_terms = []
-        for slot in week_slots:
-            if (slot.slot_id, emp_id) in x:
-                var = x[(slot.slot_id, emp_id)]
-                gross = slot_gross_hours.get(slot.slot_id, 0)
-                gross_scaled = int(round(gross * SCALE))
-                if gross_scaled > 0:
-                    gross_terms.append(var * gross_scaled)
+        emp_id, week_index = week_key
+        terms = gross_terms(emp_id, week_slots)
         
-        if gross_terms:
-            # Create variable for weekly gross hours
-            max_weekly_gross = int(24 * 7 * SCALE)  # Max possible: 168h/week
+        if terms:
+            iso_year, iso_week = timeline.week_label(week_index)
             weekly_gross_var = model.NewIntVar(0, max_weekly_gross, f"weekly_gross_{emp_id}_{iso_year}_{iso_week}")
-            model.Add(weekly_gross_var == sum(gross_terms))
-            weekly_gross_vars[week_key] = weekly_gross_var
-            
-            # Create variable for weekly OT: max(0, weekly_gross - 44)
-            max_weekly_ot = max_weekly_gross - weekly_threshold_scaled
-            weekly_ot_var = model.NewIntVar(0, max_weekly_ot, f"weekly_ot_{emp_id}_{iso_year}_{iso_week}")
+            model.Add(weekly_gross_var == sum(terms))
             
             # weekly_ot = max(0, weekly_gross - 44)
             # This is: weekly_ot >= weekly_gross - 44 AND weekly_ot >= 0
             # We use: weekly_ot = max(0, weekly_gross - threshold)
+            weekly_ot_var = model.NewIntVar(0, max_weekly_ot, f"weekly_ot_{emp_id}_{iso_year}_{iso_week}")
             diff_var = model.NewIntVar(-max_weekly_gross, max_weekly_gross, f"weekly_diff_{emp_id}_{iso_year}_{iso_week}")
-            model.Add(diff_var == weekly_gross_var - weekly_threshold_scaled)
+            model.Add(diff_var == weekly_gross_var - weekly_threshold_minutes)
             model.AddMaxEquality(weekly_ot_var, [diff_var, 0])
             
             weekly_ot_vars[week_key] = weekly_ot_var
@@ -119,63 +111,37 @@ def add_constraints(model, ctx):
     total_hours_constraints = 0
     unique_apgd = set()
     
-    # Get unique (employee, calendar month) combinations
-    emp_months = set()
-    for slot in slots:
-        slot_date = slot.date
-        for emp in employees:
-            emp_id = emp.get('employeeId')
-            if (slot.slot_id, emp_id) in x:
-                emp_months.add((emp_id, slot_date.year, slot_date.month))
-    
-    for emp_id, cal_year, cal_month in emp_months:
-        # Find employee dict
-        employee = next((e for e in employees if e.get('employeeId') == emp_id), None)
-        if not employee:
-            continue
-        
-        # Get all ISO weeks that have slots in this calendar month for this employee
-        weeks_in_month = emp_month_weeks.get((emp_id, cal_year, cal_month), set())
+    for (emp_id, month_index), month_slots in emp_month_slots.items():
+        employee = employees_by_id[emp_id]
+        cal_year, cal_month = timeline.month_label(month_index)
+        monthly_limits = get_monthly_hour_limits(ctx, employee, cal_year, cal_month)
         
-        # Collect weekly OT variables for this month
-        monthly_ot_terms = []
-        for iso_year, iso_week in weeks_in_month:
-            week_key = (emp_id, iso_year, iso_week)
-            if week_key in weekly_ot_vars:
-                monthly_ot_terms.append(weekly_ot_vars[week_key])
+        # Collect weekly OT variables of all ISO weeks that have slots in this calendar month
+        monthly_ot_terms = [
+            weekly_ot_vars[(emp_id, week_index)]
+            for week_index in emp_month_weeks[(emp_id, month_index)]
+            if (emp_id, week_index) in weekly_ot_vars
+        ]
         
         if monthly_ot_terms:
-            # Get scheme/product-specific monthly OT cap from monthlyHourLimits
-            monthly_limits = get_monthly_hour_limits(ctx, employee, cal_year, cal_month)
+            # Scheme/product-specific monthly OT cap from monthlyHourLimits
             monthly_ot_cap = monthly_limits.get('maxOvertimeHours', 72.0)
-            monthly_ot_cap_scaled = int(round(monthly_ot_cap * SCALE))
             
             # Track APGD-D10 (APO) employees
             if monthly_ot_cap > 72.0:
                 unique_apgd.add(emp_id)
             
             # Constraint 1: sum(weekly_ot) <= monthly_ot_cap
-            model.Add(sum(monthly_ot_terms) <= monthly_ot_cap_scaled)
+            model.Add(sum(monthly_ot_terms) <= cap_minutes(monthly_ot_cap))
             monthly_constraints += 1
         
         # Constraint 2: Total work hours <= totalMaxHours (if specified)
         # This prevents schedules like 27 days x 12h = 324h when cap is 267h
         total_max_hours = monthly_limits.get('totalMaxHours')
         if total_max_hours:
-            # Collect all assigned slots for this employee in this month
-            month_slot_terms = []
-            for slot in slots:
-                if slot.date.year == cal_year and slot.date.month == cal_month:
-                    if (slot.slot_id, emp_id) in x:
-                        var = x[(slot.slot_id, emp_id)]
-                        gross = slot_gross_hours.get(slot.slot_id, 0)
-                        gross_scaled = int(round(gross * SCALE))
-                        if gross_scaled > 0:
-                            month_slot_terms.append(var * gross_scaled)
-            
+            month_slot_terms = gross_terms(emp_id, month_slots)
             if month_slot_terms:
-                total_max_scaled = int(round(total_max_hours * SCALE))
-                model.Add(sum(month_slot_terms) <= total_max_scaled)
+                model.Add(sum(month_slot_terms) <= cap_minutes(total_max_hours))
                 total_hours_constraints += 1
     
     print(f"[C17] Monthly OT Cap Constraint (HARD) - 44h/week threshold")
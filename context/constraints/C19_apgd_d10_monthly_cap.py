@@ -34,10 +34,9 @@ def add_constraints(model, ctx):
     """
     from context.engine.time_utils import (
         is_apgd_d10_employee, 
-        get_apgd_d10_category,
-        span_hours,
-        lunch_hours
+        get_apgd_d10_category
     )
+    from context.engine.hour_cache import shift_breakdown
     
     slots = ctx.get('slots', [])
     employees = ctx.get('employees', [])
@@ -131,17 +130,8 @@ def add_constraints(model, ctx):
         slot_vars = []
         
         for slot in month_slots:
-            # Calculate gross hours
-            gross = span_hours(slot.start, slot.end)
-            
-            # Calculate lunch hours
-            lunch = lunch_hours(gross)
-            
-            # Net hours = gross - lunch
-            net_hours = gross - lunch
-            
-            # Convert to minutes (integer for CP-SAT)
-            net_minutes = int(round(net_hours * 60))
+            # Net minutes = gross - lunch (integer for CP-SAT, cached per shift shape)
+            net_minutes = shift_breakdown(slot.start, slot.end).net_minutes
             
             # Get decision variable
             var = x[(slot.slot_id, emp_id)]
@@ -17,7 +17,8 @@ Input Schema (v0.70):
 """
 from collections import defaultdict
 from datetime import datetime, timedelta
-from context.engine.time_utils import split_shift_hours, normalize_scheme
+from context.engine.time_utils import normalize_scheme
+from context.engine.hour_cache import shift_breakdown
 
 
 def add_constraints(model, ctx):
@@ -85,8 +86,7 @@ def add_constraints(model, ctx):
     for slot in slots:
         key = (slot.demandId, slot.shiftCode)
         if key not in shift_hours:
-            gross = (slot.end - slot.start).total_seconds() / 3600.0
-            shift_hours[key] = gross
+            shift_hours[key] = shift_breakdown(slot.start, slot.end).gross_minutes / 60.0
     
     # Add constraints: For each slot-employee pair, check if shift exceeds scheme limit
     constraints_added = 0
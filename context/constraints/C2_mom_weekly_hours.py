@@ -24,7 +24,8 @@ Input Schema (v0.70):
 - slots: [{ slot_id, requirementId, date, shiftCode, ... }]
 """
 from datetime import datetime, timedelta
-from context.engine.time_utils import split_shift_hours, normalize_scheme
+from context.engine.time_utils import normalize_scheme
+from context.engine.hour_cache import split_hours
 from context.engine.constraint_config import get_constraint_param
 from collections import defaultdict
 
@@ -245,7 +246,7 @@ def add_constraints(model, ctx):
                         if end_dt < start_dt:
                             end_dt = end_dt + timedelta(days=1)
                         
-                        hours_breakdown = split_shift_hours(start_dt, end_dt)
+                        hours_breakdown = split_hours(start_dt, end_dt)
                         key = f"{demand_id}-{shift_code}"
                         shift_info[key] = hours_breakdown
                 except Exception:
@@ -310,7 +311,7 @@ def add_constraints(model, ctx):
                 
                 if not hours_data:
                     try:
-                        hours_data = split_shift_hours(slot.start, slot.end)
+                        hours_data = split_hours(slot.start, slot.end)
                     except Exception:
                         continue
                 
@@ -400,7 +401,7 @@ def add_constraints(model, ctx):
                 
                 if not hours_data:
                     try:
-                        hours_data = split_shift_hours(slot.start, slot.end)
+                        hours_data = split_hours(slot.start, slot.end)
                     except Exception:
                         continue
                 
@@ -15,7 +15,9 @@ Monthly cap: sum(ot_hours) <= 72h per employee per calendar month
 All constraints added via model.Add() for hard enforcement.
 """
 from datetime import datetime, timedelta
-from context.engine.time_utils import split_shift_hours, normalize_scheme
+from context.engine.time_utils import normalize_scheme
+from context.engine.hour_cache import split_hours
+from context.engine.timeline import cap_minutes, get_slot_timeline, hours_to_minutes
 from context.engine.constraint_config import get_constraint_param
 from collections import defaultdict
 
@@ -129,6 +131,10 @@ def add_constraints(model, ctx):
         print(f"[C2] Warning: Slots or decision variables not available")
         return
     
+    # Day/week/month indices for grouping hours
+    timeline = get_slot_timeline(ctx)
+    candidates = timeline.candidates(x)
+    
     # Build requirement map for APGD-D10 detection
     req_map = {}
     for demand in demand_items:
@@ -180,16 +186,15 @@ def add_constraints(model, ctx):
         
         # Find pattern and scheme from slots this employee can be assigned to
         # This works for both demandBased (ICPMP) and outcomeBased modes
-        for slot in slots:
-            if (slot.slot_id, emp_id) in x:
-                # This employee can be assigned to this slot
-                req_id = getattr(slot, 'requirementId', None)
-                if req_id and req_id in req_patterns:
-                    pattern = req_patterns[req_id]
-                    # Also get scheme from requirement (for Scheme P detection)
-                    if req_id in req_schemes:
-                        scheme = req_schemes[req_id]
-                    break  # Found pattern, stop searching
+        for i in candidates.get(emp_id, ()):
+            # This employee can be assigned to this slot
+            req_id = getattr(timeline.slots[i], 'requirementId', None)
+            if req_id and req_id in req_patterns:
+                pattern = req_patterns[req_id]
+                # Also get scheme from requirement (for Scheme P detection)
+                if req_id in req_schemes:
+                    scheme = req_schemes[req_id]
+                break  # Found pattern, stop searching
         
         # Fallback 1: Try direct employee.workPattern and scheme (for outcomeBased with explicit patterns)
         if not pattern:
@@ -242,28 +247,32 @@ def add_constraints(model, ctx):
                         if end_dt < start_dt:
                             end_dt = end_dt + timedelta(days=1)
                         
-                        hours_breakdown = split_shift_hours(start_dt, end_dt)
+                        hours_breakdown = split_hours(start_dt, end_dt)
                         key = f"{demand_id}-{shift_code}"
                         shift_info[key] = hours_breakdown
                 except Exception:
                     pass
 
-    # Build employee-week and employee-month groupings of slots
+    def slot_hours(slot):
+        # Shift hours by demand/shift code, falling back to the slot's own times
+        hours_data = shift_info.get(f"{slot.demandId}-{slot.shiftCode}")
+        if not hours_data:
+            try:
+                hours_data = split_hours(slot.start, slot.end)
+            except Exception:
+                return None
+        return hours_data
+
+    # Build employee-week and employee-month groupings of slot positions
+    # (keys are timeline ISO week / calendar month indices)
     emp_week_slots = defaultdict(lambda: defaultdict(list))  
     emp_month_slots = defaultdict(lambda: defaultdict(list))  
     
-    for slot in slots:
-        slot_date = slot.date
-        iso_week = slot_date.isocalendar()[1]
-        iso_year = slot_date.isocalendar()[0]
-        week_key = f"{iso_year}-W{iso_week:02d}"
-        month_key = f"{slot_date.year}-{slot_date.month:02d}"
-        
-        for emp in employees:
-            emp_id = emp.get('employeeId')
-            if (slot.slot_id, emp_id) in x:
-                emp_week_slots[emp_id][week_key].append(slot)
-                emp_month_slots[emp_id][month_key].append(slot)
+    for emp in employees:
+        emp_id = emp.get('employeeId')
+        for i in candidates.get(emp_id, ()):
+            emp_week_slots[emp_id][timeline.iso_week_index[i]].append(i)
+            emp_month_slots[emp_id][timeline.month_index[i]].append(i)
 
     # ===== ADD CONSTRAINTS FOR WEEKLY NORMAL HOURS <= 44H =====
     weekly_constraints = 0
@@ -285,7 +294,7 @@ def add_constraints(model, ctx):
         
         work_pattern = emp_patterns.get(emp_id, [])
         
-        for week_key, week_slots in weeks.items():
+        for week_index, week_slots in weeks.items():
             weighted_assignments = []
             
             # FIX (28 Jan 2026): Calculate normal hours based on ACTUAL work days
@@ -295,46 +304,32 @@ def add_constraints(model, ctx):
             if actual_work_days_this_week <= 0:
                 actual_work_days_this_week = 5  # Fallback
             
-            # Calculate normal hours threshold for this specific week
-            normal_threshold_this_week = 44.0 / actual_work_days_this_week
+            # Exact integer form: both sides are in minutes scaled by the week's
+            # work days, so the per-shift threshold 44h / days is 44h in minutes
+            normal_threshold_scaled = int(44 * 60)
             
-            for slot in week_slots:
-                if (slot.slot_id, emp_id) not in x:
-                    continue
-                
-                # Get shift hours
-                slot_key = f"{slot.demandId}-{slot.shiftCode}"
-                hours_data = shift_info.get(slot_key)
-                
-                if not hours_data:
-                    try:
-                        hours_data = split_shift_hours(slot.start, slot.end)
-                    except Exception:
-                        continue
+            for i in week_slots:
+                hours_data = slot_hours(timeline.slots[i])
                 
                 if hours_data:
                     gross = hours_data.get('gross', 0)
                     lunch = hours_data.get('lunch', 0)
-                    net_hours = gross - lunch
+                    net_minutes = hours_to_minutes(gross - lunch)
                     
                     # WEEK-SPECIFIC NORMAL HOURS (MOM compliant)
                     # Use the actual work days in THIS week, not pattern average
-                    normal_hours = min(normal_threshold_this_week, net_hours)
+                    normal_scaled = min(normal_threshold_scaled, net_minutes * actual_work_days_this_week)
                     
-                    var = x[(slot.slot_id, emp_id)]
+                    var = x[(timeline.slot_ids[i], emp_id)]
                     
-                    if normal_hours > 0:
-                        int_hours = int(round(normal_hours * 10))
-                        weighted_assignments.append((var, int_hours))
+                    if normal_scaled > 0:
+                        weighted_assignments.append((var, normal_scaled))
             
             if weighted_assignments:
                 # Handle incremental mode locked hours
                 locked_hours = 0.0
                 if incremental_ctx and emp_id in locked_weekly_hours:
-                    iso_year_str, week_str = week_key.split('-W')
-                    iso_year = int(iso_year_str)
-                    iso_week = int(week_str)
-                    week_tuple = (iso_year, iso_week)
+                    week_tuple = timeline.week_label(week_index)
                     locked_hours = locked_weekly_hours[emp_id].get(week_tuple, 0.0)
                 
                 # SCHEME-AWARE WEEKLY NORMAL CAP (read from JSON with fallback)
@@ -361,7 +356,7 @@ def add_constraints(model, ctx):
                     )
                 
                 remaining_capacity = weekly_normal_cap - locked_hours
-                remaining_capacity_int = int(round(remaining_capacity * 10))
+                remaining_capacity_int = cap_minutes(remaining_capacity, scale=actual_work_days_this_week)
                 
                 # Add constraint: sum(normal_hours) <= weekly_normal_cap
                 constraint_expr = sum(var * hours for var, hours in weighted_assignments)
@@ -392,13 +387,12 @@ def add_constraints(model, ctx):
         # Determine if this is APGD-D10 employee
         is_apgd = is_apgd_d10_employee(employee_dict)
         
-        for month_key, month_slots in months.items():
+        for month_index, month_slots in months.items():
             # Determine month length (number of days in this month)
             if month_slots:
-                # Get first and last date of the month from slots
-                month_dates = set(slot.date for slot in month_slots)
-                # Parse month from month_key (format: "YYYY-MM")
-                year, month_num = map(int, month_key.split('-'))
+                # Distinct days of the month that have slots
+                month_dates = set(timeline.day_index[i] for i in month_slots)
+                year, month_num = timeline.month_label(month_index)
                 
                 # FIX (28 Jan 2026): Use get_monthly_hour_limits() for ALL employees
                 # This reads from monthlyHourLimits in the input JSON, which may define
@@ -406,7 +400,7 @@ def add_constraints(model, ctx):
                 monthly_limits = get_monthly_hour_limits(ctx, employee_dict, year, month_num)
                 monthly_ot_cap_hours = monthly_limits.get('maxOvertimeHours', 72.0)
                 
-                monthly_ot_cap_int = int(round(monthly_ot_cap_hours * 10))  # Convert to tenths
+                monthly_ot_cap_int = cap_minutes(monthly_ot_cap_hours)  # Whole minutes
                 
                 # Track for debug output
                 if emp_id not in applied_ot_caps:
@@ -416,26 +410,15 @@ def add_constraints(model, ctx):
             
             weighted_assignments = []
             
-            for slot in month_slots:
-                if (slot.slot_id, emp_id) not in x:
-                    continue
-                
-                slot_key = f"{slot.demandId}-{slot.shiftCode}"
-                hours_data = shift_info.get(slot_key)
-                
-                if not hours_data:
-                    try:
-                        hours_data = split_shift_hours(slot.start, slot.end)
-                    except Exception:
-                        continue
+            for i in month_slots:
+                hours_data = slot_hours(timeline.slots[i])
                 
                 if hours_data:
-                    ot_hours = hours_data.get('ot', 0)
-                    var = x[(slot.slot_id, emp_id)]
+                    ot_minutes = hours_to_minutes(hours_data.get('ot', 0))
+                    var = x[(timeline.slot_ids[i], emp_id)]
                     
-                    if ot_hours > 0:
-                        int_hours = int(round(ot_hours * 10))
-                        weighted_assignments.append((var, int_hours))
+                    if ot_minutes > 0:
+                        weighted_assignments.append((var, ot_minutes))
             
             if weighted_assignments:
                 constraint_expr = sum(var * hours for var, hours in weighted_assignments)
@@ -5,7 +5,11 @@ Default: 11 hours = 660 minutes minimum rest between shift end and next shift st
 APGD-D10: 8 hours = 480 minutes minimum rest.
 """
 from collections import defaultdict
-from datetime import timedelta
+
+from context.engine.timeline import get_slot_timeline
+
+# Rest gaps beyond this can never violate a minimum rest requirement
+MAX_REST_WINDOW_MINUTES = 24 * 60
 
 
 def add_constraints(model, ctx):
@@ -89,9 +93,15 @@ def add_constraints(model, ctx):
             # NEW format: convert hours to minutes
             min_rest_by_employee[emp_id] = int(min_rest_hours * 60)
     
+    # Shift start/end minutes and day indices for the rest-gap checks
+    timeline = get_slot_timeline(ctx)
+    candidates = timeline.candidates(x)
+    start_min, end_min = timeline.start_min, timeline.end_min
+    day_index, slot_ids = timeline.day_index, timeline.slot_ids
+    
     # Check for incremental mode
     incremental_ctx = ctx.get('_incremental')
-    last_locked_shift_end = {}
+    last_locked_shift_end = {}  # emp_id -> end minute on the timeline
     
     if incremental_ctx:
         # Calculate last shift end time before solve window for each employee
@@ -107,10 +117,11 @@ def add_constraints(model, ctx):
             if end_dt_str:
                 try:
                     end_dt = dt.fromisoformat(end_dt_str.replace('Z', '+00:00'))
+                    end_minute = timeline.minute(end_dt)
                     
                     # Track the latest end time for this employee
-                    if emp_id not in last_locked_shift_end or end_dt > last_locked_shift_end[emp_id]:
-                        last_locked_shift_end[emp_id] = end_dt
+                    if emp_id not in last_locked_shift_end or end_minute > last_locked_shift_end[emp_id]:
+                        last_locked_shift_end[emp_id] = end_minute
                 except Exception:
                     pass
         
@@ -125,10 +136,9 @@ def add_constraints(model, ctx):
         
         # Get employee-specific minimum rest from configuration
         emp_min_rest_minutes = min_rest_by_employee.get(emp_id, 480)
-        min_rest_delta = timedelta(minutes=emp_min_rest_minutes)
         
-        # Get all slots this employee could be assigned to
-        emp_slots = [s for s in slots if (s.slot_id, emp_id) in x]
+        # Get all slots this employee could be assigned to (timeline positions)
+        emp_slots = candidates.get(emp_id, [])
         
         if len(emp_slots) < 1:
             continue
@@ -137,52 +147,49 @@ def add_constraints(model, ctx):
         if incremental_ctx and emp_id in last_locked_shift_end:
             last_end = last_locked_shift_end[emp_id]
             
-            # Sort slots by start time
-            sorted_by_start = sorted(emp_slots, key=lambda s: (s.date, s.start))
+            # First slot by start time
+            first_slot = min(emp_slots, key=lambda i: (day_index[i], start_min[i]))
+            rest_from_locked = start_min[first_slot] - last_end
             
-            # Check first slot in solve window
-            if sorted_by_start:
-                first_slot = sorted_by_start[0]
-                rest_from_locked = first_slot.start - last_end
-                
-                if rest_from_locked < min_rest_delta:
-                    # Insufficient rest from last locked shift - cannot assign to first slot
-                    var = x[(first_slot.slot_id, emp_id)]
-                    model.Add(var == 0)
-                    constraints_added += 1
+            if rest_from_locked < emp_min_rest_minutes:
+                # Insufficient rest from last locked shift - cannot assign to first slot
+                var = x[(slot_ids[first_slot], emp_id)]
+                model.Add(var == 0)
+                constraints_added += 1
         
         if len(emp_slots) < 2:
             continue
         
-        # Sort by end time (date + end datetime)
-        sorted_slots = sorted(emp_slots, key=lambda s: (s.date, s.end))
+        # Sort by end time (date + end minute)
+        sorted_slots = sorted(emp_slots, key=lambda i: (day_index[i], end_min[i]))
         
         # Check pairs where slot1 ends before slot2 starts
         # and there's insufficient rest between them
         # Optimization: Only check slots within 24 hours (max relevant window for rest violations)
-        for i in range(len(sorted_slots)):
-            slot1 = sorted_slots[i]
+        for a in range(len(sorted_slots)):
+            slot1 = sorted_slots[a]
+            slot1_end = end_min[slot1]
             
             # Check subsequent slots within a reasonable time window
-            for j in range(i + 1, len(sorted_slots)):
-                slot2 = sorted_slots[j]
+            for b in range(a + 1, len(sorted_slots)):
+                slot2 = sorted_slots[b]
+                
+                # Rest minutes between slot1 end and slot2 start
+                rest_available = start_min[slot2] - slot1_end
                 
                 # Skip if slot2 starts before slot1 ends (impossible overlap)
-                if slot2.start < slot1.end:
+                if rest_available < 0:
                     continue
                 
-                # Calculate rest time between slot1 end and slot2 start
-                rest_available = slot2.start - slot1.end
-                
                 # Early termination: If rest exceeds 24 hours, all subsequent slots will have even more rest
                 # (slots are sorted by end time, so slot2.start increases monotonically)
-                if rest_available > timedelta(hours=24):
+                if rest_available > MAX_REST_WINDOW_MINUTES:
                     break
                 
                 # If rest is insufficient, add disjunctive constraint
-                if rest_available < min_rest_delta:
-                    var1 = x[(slot1.slot_id, emp_id)]
-                    var2 = x[(slot2.slot_id, emp_id)]
+                if rest_available < emp_min_rest_minutes:
+                    var1 = x[(slot_ids[slot1], emp_id)]
+                    var2 = x[(slot_ids[slot2], emp_id)]
                     
                     # Constraint: NOT (var1 AND var2)
                     # Implemented as: var1 + var2 <= 1
@@ -98,7 +98,7 @@ def add_constraints(model, ctx):
         normal_hour_terms = []
         pattern = emp_patterns.get(emp_id, [])
         
-        from context.engine.time_utils import lunch_hours
+        from context.engine.hour_cache import shift_breakdown
         from context.constraints.C2_mom_weekly_hours import calculate_pattern_aware_hours
         
         for slot in week_slots:
@@ -106,8 +106,9 @@ def add_constraints(model, ctx):
                 continue
             
             var = x[(slot.slot_id, emp_id)]
-            gross_hours = (slot.end - slot.start).total_seconds() / 3600.0
-            lunch = lunch_hours(gross_hours)
+            breakdown = shift_breakdown(slot.start, slot.end)
+            gross_hours = breakdown.gross_minutes / 60.0
+            lunch = breakdown.lunch
             
             # Calculate NORMAL hours using Scheme P pattern-aware logic
             # This is the KEY difference from old C6 (which capped NET hours)
@@ -0,0 +1,228 @@
+"""Employee Availability Calendar.
+
+One bitset per employee over day offsets from a base date (bit k set = the
+employee cannot work on base_date + k; the base moves back if an earlier day
+is blocked, so days before it are always available). Built once per solve from:
+  - employees[].unavailability: "YYYY-MM-DD" strings, {"date": ...} or
+    {"startDate": ..., "endDate": ...} ranges
+  - incremental solves: employeeChanges.longLeave [leaveFrom, leaveTo] and
+    newJoiners availableFrom (days before it are blocked)
+
+Shift blacklists (demandItems[].shifts[].blacklist) only apply to the slots
+of their shift, so they are kept apart: blacklist_masks() turns one blacklist
+into per-employee bitsets, memoized per blacklist object.
+
+Callers test employee-days while creating work (CP-SAT decision variables in
+build_model, template replication, slot-based assignment), so nothing is
+scheduled on a blocked day and the output post-pass only has to confirm it.
+
+Usage:
+    calendar = get_availability_calendar(ctx)
+    if not calendar.is_available(emp_id, slot.date, blacklist=slot.blacklist):
+        continue
+"""
+
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from context.engine.time_utils import DayLike, to_date
+
+# Bitset with every day blocked (legacy blacklist entries without dates)
+ALL_DAYS = -1
+
+
+def _range_mask(start: int, end: int) -> int:
+    """Bits start..end inclusive (offsets >= 0)"""
+    start = max(start, 0)
+    if end < start:
+        return 0
+    return ((1 << (end - start + 1)) - 1) << start
+
+
+class AvailabilityCalendar:
+    """Per-employee blocked-day bitsets relative to base_date"""
+
+    def __init__(self, base_date: DayLike):
+        self.base_date = to_date(base_date)
+        self._blocked: Dict[str, int] = {}
+        self._seen: Set[str] = set()
+        self._offsets: Dict[str, int] = {}
+        self._blacklists: Dict[int, Tuple[Dict[str, Any], Dict[str, int]]] = {}
+
+    def offset(self, day: DayLike) -> int:
+        """Day offset from base_date (string offsets are cached)"""
+        if isinstance(day, str):
+            cached = self._offsets.get(day)
+            if cached is None:
+                cached = self._offsets[day] = (to_date(day) - self.base_date).days
+            return cached
+        return (to_date(day) - self.base_date).days
+
+    def _rebase(self, days: int) -> None:
+        """Move base_date `days` earlier, shifting every stored bitset"""
+        self.base_date -= timedelta(days=days)
+        self._blocked = {emp_id: mask << days for emp_id, mask in self._blocked.items()}
+        self._offsets.clear()
+        self._blacklists.clear()  # Recomputed against the new base on next use
+
+    def _mask(self, start: DayLike, end: Optional[DayLike] = None) -> int:
+        first = self.offset(start)
+        if first < 0:
+            self._rebase(-first)
+            first = 0
+        last = self.offset(end) if end is not None else first
+        return _range_mask(first, last)
+
+    def block(self, emp_id: str, start: DayLike, end: Optional[DayLike] = None) -> None:
+        """Mark start..end (inclusive; a single day if end is None) unavailable"""
+        mask = self._mask(start, end)
+        if mask:
+            self._blocked[emp_id] = self._blocked.get(emp_id, 0) | mask
+
+    def add_employees(self, employees: Iterable[Dict[str, Any]]) -> None:
+        """Register employees[].unavailability (employees already added are skipped)"""
+        for emp in employees:
+            emp_id = emp.get('employeeId')
+            if emp_id is None or emp_id in self._seen:
+                continue
+            self._seen.add(emp_id)
+            for entry in emp.get('unavailability') or []:
+                try:
+                    if isinstance(entry, str):
+                        self.block(emp_id, entry)
+                    elif isinstance(entry, dict):
+                        start = entry.get('date') or entry.get('startDate')
+                        if start:
+                            self.block(emp_id, start, entry.get('endDate') or start)
+                except ValueError:
+                    continue  # Malformed date: ignore entry
+
+    def blocked_mask(self, emp_id: str) -> int:
+        return self._blocked.get(emp_id, 0)
+
+    def blacklist_masks(self, blacklist: Optional[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        emp_id → blocked-day bitset for one shift blacklist.
+
+        Entries need both blacklistStartDate and blacklistEndDate; a bare
+        employeeId string (legacy format) blocks every day.
+        """
+        if not blacklist:
+            return {}
+        cached = self._blacklists.get(id(blacklist))
+        if cached is not None and cached[0] is blacklist:
+            return cached[1]
+
+        masks: Dict[str, int] = {}
+        windows: List[Tuple[str, int, int]] = []
+        for entry in blacklist.get('employeeIds') or []:
+            if isinstance(entry, str):
+                masks[entry] = ALL_DAYS
+            elif isinstance(entry, dict) and entry.get('employeeId'):
+                start, end = entry.get('blacklistStartDate'), entry.get('blacklistEndDate')
+                if not (start and end):
+                    continue
+                try:
+                    windows.append((entry['employeeId'], self.offset(start), self.offset(end)))
+                except ValueError:
+                    continue  # If date parsing fails, allow assignment
+
+        # Rebase once for the earliest window before building any mask, so
+        # masks built from the old base cannot end up misaligned
+        shift = max(-min((first for _, first, _ in windows), default=0), 0)
+        if shift:
+            self._rebase(shift)
+        for emp_id, first, last in windows:
+            masks[emp_id] = masks.get(emp_id, 0) | _range_mask(first + shift, last + shift)
+
+        # Keep a reference so the id() key cannot be reused by another object
+        self._blacklists[id(blacklist)] = (blacklist, masks)
+        return masks
+
+    def is_available(self, emp_id: str, day: DayLike,
+                     blacklist: Optional[Dict[str, Any]] = None) -> bool:
+        """False if emp_id is unavailable (or blacklisted for this shift) on day"""
+        # Blacklist masks first: computing them may rebase the calendar
+        mask = self.blacklist_masks(blacklist).get(emp_id, 0) if blacklist else 0
+        mask |= self._blocked.get(emp_id, 0)
+        if not mask:
+            return True
+        k = self.offset(day)
+        return k < 0 or not (mask >> k) & 1
+
+    def is_blacklisted(self, emp_id: str, day: DayLike, blacklist: Optional[Dict[str, Any]]) -> bool:
+        """True if day falls in one of emp_id's windows in this shift blacklist"""
+        mask = self.blacklist_masks(blacklist).get(emp_id, 0)
+        if not mask:
+            return False
+        k = self.offset(day)
+        return k >= 0 and bool((mask >> k) & 1)
+
+    def blocked_dates(self, emp_id: str, blacklist: Optional[Dict[str, Any]] = None,
+                      until: Optional[DayLike] = None) -> Set[str]:
+        """Blocked days as ISO strings (ALL_DAYS masks need until)"""
+        # Blacklist masks first: computing them may rebase the calendar
+        mask = self.blacklist_masks(blacklist).get(emp_id, 0) if blacklist else 0
+        mask |= self._blocked.get(emp_id, 0)
+        if mask < 0:
+            if until is None:
+                raise ValueError("until is required for an unbounded block")
+            mask &= _range_mask(0, self.offset(until))
+        days = set()
+        k = 0
+        while mask:
+            if mask & 1:
+                days.add((self.base_date + timedelta(days=k)).isoformat())
+            mask >>= 1
+            k += 1
+        return days
+
+    @property
+    def blocked_employee_count(self) -> int:
+        return sum(1 for mask in self._blocked.values() if mask)
+
+
+def build_availability_calendar(ctx: Dict[str, Any],
+                                employees: Optional[List[Dict[str, Any]]] = None) -> AvailabilityCalendar:
+    """
+    Build the calendar for a solve context.
+
+    Args:
+        ctx: Context with planningHorizon, employees and optional _incremental
+        employees: Employees to register (default: ctx['employees'])
+
+    Returns:
+        AvailabilityCalendar anchored at the planning horizon start
+    """
+    horizon_start = (ctx.get('planningHorizon') or {}).get('startDate')
+    calendar = AvailabilityCalendar(horizon_start or date.today())
+    calendar.add_employees(ctx.get('employees', []) if employees is None else employees)
+
+    incremental_ctx = ctx.get('_incremental')
+    if incremental_ctx:
+        changes = incremental_ctx.get('employeeChanges', {})
+        for leave in changes.get('longLeave', []):
+            calendar.block(leave['employeeId'], leave['leaveFrom'], leave['leaveTo'])
+        for joiner in changes.get('newJoiners', []):
+            emp_id = joiner.get('employee', {}).get('employeeId')
+            available_from = to_date(joiner['availableFrom'])
+            if emp_id and available_from > calendar.base_date:
+                calendar.block(emp_id, calendar.base_date, available_from - timedelta(days=1))
+    return calendar
+
+
+def get_availability_calendar(ctx: Dict[str, Any],
+                              employees: Optional[List[Dict[str, Any]]] = None) -> AvailabilityCalendar:
+    """
+    Calendar cached on ctx['_availabilityCalendar'], built on first use.
+
+    Employees passed in that the calendar has not seen yet (e.g. a filtered
+    or substituted list) are registered on the way.
+    """
+    calendar = ctx.get('_availabilityCalendar')
+    if calendar is None:
+        calendar = build_availability_calendar(ctx)
+        ctx['_availabilityCalendar'] = calendar
+    if employees is not None:
+        calendar.add_employees(employees)
+    return calendar
@@ -19,10 +19,12 @@ First feasible solution found is PROVEN OPTIMAL (can't use fewer employees)
 import logging
 from datetime import datetime, timedelta
 from math import ceil
-from typing import List, Dict, Any, Tuple, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from collections import defaultdict
 import math
 
+from context.engine.coverage_kernel import CoverageKernel, kernel_for_calendar
+
 logger = logging.getLogger(__name__)
 
 # Scheme P (Part-time) Constraints - MOM Employment Act
@@ -155,13 +157,16 @@ def calculate_optimal_with_u_slots(
     max_attempts: int = 50,
     scheme: str = "A",
     enable_ot_aware_icpmp: bool = False,
-    monthly_ot_cap: float = 72.0
+    monthly_ot_cap: float = 72.0,
+    search: str = "bisect"
 ) -> Dict[str, Any]:
     """
     Calculate optimal employee count with U-slot injection.
     
-    Uses try-minimal-first approach starting from mathematical lower bound.
-    First feasible solution is guaranteed to be optimal.
+    Searches employee counts upward from the mathematical lower bound for the
+    smallest feasible one. Feasibility is monotone in N, so the default search
+    gallops (lower bound, +1, +3, +7, ...) and then bisects; the result is
+    proven minimal because N-1 was probed infeasible (or N is the lower bound).
     
     Args:
         pattern: Work pattern (e.g., ["D","D","D","D","O","O"])
@@ -173,6 +178,8 @@ def calculate_optimal_with_u_slots(
         scheme: Employment scheme ('A', 'B', 'P', or 'Global') for capacity constraints
         enable_ot_aware_icpmp: If True, consider OT capacity when calculating employee requirements
         monthly_ot_cap: Monthly OT hours cap for this scheme+product combination (default: 72h)
+        search: "bisect" (exponential then binary search) or "linear" (every N
+            from the lower bound); both return the same employee count
         
     Returns:
         Dictionary with:
@@ -181,7 +188,7 @@ def calculate_optimal_with_u_slots(
         - algorithm: "GREEDY_INCREMENTAL" or "INTEGER_PROGRAMMING"
         - employeePatterns: List of employee assignments with U-slots
         - coverage: Daily coverage statistics
-        - computation: Performance metrics
+        - computation: Search metrics (strategy, probes, probed employee counts)
     """
     cycle_length = len(pattern)
     work_days_per_cycle = sum(1 for s in pattern if s != 'O')
@@ -351,20 +358,35 @@ def calculate_optimal_with_u_slots(
     logger.info(f"  Strict pattern buffer: ×{strict_pattern_buffer} (no U-slot flexibility)")
     logger.info(f"  Lower bound: {lower_bound} employees (with strict pattern buffer)")
     
-    # Try increasing employee counts from lower bound
+    # Search employee counts upward from the lower bound
     upper_bound = lower_bound + max_attempts
     
-    for num_employees in range(lower_bound, upper_bound + 1):
-        
+    # Per-offset work rows are computed once; each candidate N is then a vector sum
+    kernel = kernel_for_calendar(pattern, calendar, anchor_date)
+    
+    def is_feasible(num_employees: int) -> bool:
+        offsets = distribute_offsets_evenly(num_employees, cycle_length)
+        return kernel.total_work_days(offsets) >= total_coverage_needed
+    
+    optimal_employees, probed = find_min_feasible_count(is_feasible, lower_bound, upper_bound, search)
+    computation = {
+        'search': search,
+        'probes': len(probed),
+        'probedEmployeeCounts': probed,
+    }
+    logger.info(f"  Search: {search}, {len(probed)} probe(s) over [{lower_bound}, {upper_bound}]: {probed}")
+    
+    if optimal_employees is not None:
+        num_employees = optimal_employees
         result = try_placement_with_n_employees(
             num_employees, pattern, headcount, calendar, anchor_date, cycle_length,
-            scheme=scheme, enable_ot_aware=enable_ot_aware_icpmp
+            scheme=scheme, enable_ot_aware=enable_ot_aware_icpmp, kernel=kernel
         )
         
         if result["is_feasible"]:
             print(f"  ✓ {num_employees} employees: FEASIBLE!")
             logger.info(f"[{requirement_id}] ✓ Found optimal: {num_employees} employees")
-            logger.info(f"  Attempts required: {num_employees - lower_bound + 1}")
+            logger.info(f"  Attempts required: {len(probed)}")
             logger.info(f"  Total U-slots: {result['total_u_slots']}")
             logger.info(f"  Coverage rate: {result['coverage_rate']:.1f}%")
             
@@ -375,7 +397,7 @@ def calculate_optimal_with_u_slots(
                     'optimality': 'PROVEN_MINIMAL',
                     'algorithm': 'GREEDY_INCREMENTAL',
                     'lowerBound': lower_bound,
-                    'attemptsRequired': num_employees - lower_bound + 1,
+                    'attemptsRequired': len(probed),  # feasibility probes, same as computation.probes
                     'offsetDistribution': result['offset_distribution']
                 },
                 'employeePatterns': result['employees'],
@@ -390,14 +412,15 @@ def calculate_optimal_with_u_slots(
                     'workDaysPerCycle': work_days_per_cycle,
                     'planningHorizonDays': len(calendar),
                     'totalCoverageNeeded': total_coverage_needed
-                }
+                },
+                'computation': computation
             }
     
     # Failed to find feasible solution - return best estimate with warning
     # Use the buffered lower bound as a reasonable starting point for CP-SAT
     estimated_employees = lower_bound
     logger.warning(
-        f"[{requirement_id}] ⚠️  ICPMP could not find exact feasible solution after {max_attempts} attempts."
+        f"[{requirement_id}] ⚠️  ICPMP could not find exact feasible solution in [{lower_bound}, {upper_bound}] ({len(probed)} probes)."
     )
     logger.warning(f"  Returning estimated {estimated_employees} employees (buffered lower bound)")
     logger.warning(f"  CP-SAT will determine actual feasibility with constraint enforcement")
@@ -431,10 +454,76 @@ def calculate_optimal_with_u_slots(
             'totalCoverageNeeded': total_coverage_needed,
             'icpmpStatus': 'estimated',
             'warning': 'ICPMP estimation only - exact employee count to be determined by CP-SAT'
-        }
+        },
+        'computation': computation
     }
 
 
+def find_min_feasible_count(
+    is_feasible: Callable[[int], bool],
+    lower_bound: int,
+    upper_bound: int,
+    search: str = "bisect"
+) -> Tuple[Optional[int], List[int]]:
+    """
+    Smallest N in [lower_bound, upper_bound] with is_feasible(N), assuming
+    feasibility is monotone in N.
+    
+    "bisect" probes lower_bound, then gallops with doubling steps until a
+    feasible N (capped at upper_bound), then bisects between the last
+    infeasible and first feasible probe. "linear" probes every N in order.
+    Either way, a returned N > lower_bound has had N-1 probed infeasible.
+    
+    Args:
+        is_feasible: Feasibility check for an employee count
+        lower_bound: Smallest employee count to consider
+        upper_bound: Largest employee count to consider
+        search: "bisect" or "linear"
+        
+    Returns:
+        (smallest feasible N or None if none in range, probed counts in order)
+    """
+    if search not in ('bisect', 'linear'):
+        raise ValueError(f"Unknown ICPMP search '{search}' (expected 'bisect' or 'linear')")
+    
+    probed = []
+    
+    def probe(num_employees: int) -> bool:
+        probed.append(num_employees)
+        return is_feasible(num_employees)
+    
+    if search == 'linear':
+        for num_employees in range(lower_bound, upper_bound + 1):
+            if probe(num_employees):
+                return num_employees, probed
+        return None, probed
+    
+    if lower_bound > upper_bound:
+        return None, probed
+    if probe(lower_bound):
+        return lower_bound, probed
+    
+    # Gallop: infeasible < N <= feasible
+    infeasible, step = lower_bound, 1
+    while True:
+        candidate = min(infeasible + step, upper_bound)
+        if probe(candidate):
+            feasible = candidate
+            break
+        if candidate == upper_bound:
+            return None, probed
+        infeasible, step = candidate, step * 2
+    
+    # Bisect down to adjacent counts
+    while feasible - infeasible > 1:
+        middle = (infeasible + feasible) // 2
+        if probe(middle):
+            feasible = middle
+        else:
+            infeasible = middle
+    return feasible, probed
+
+
 def try_placement_with_n_employees(
     num_employees: int,
     pattern: List[str],
@@ -443,7 +532,8 @@ def try_placement_with_n_employees(
     anchor_date: str,
     cycle_length: int,
     scheme: str = "A",
-    enable_ot_aware: bool = False
+    enable_ot_aware: bool = False,
+    kernel: Optional[CoverageKernel] = None
 ) -> Dict[str, Any]:
     """
     Attempt to cover all days with exactly N employees using U-slot injection.
@@ -464,6 +554,8 @@ def try_placement_with_n_employees(
         cycle_length: Length of pattern cycle
         scheme: Employment scheme ('A', 'B', 'P') for OT-aware logic
         enable_ot_aware: If True, consider OT capacity when injecting U-slots
+        kernel: Precomputed coverage kernel for (pattern, calendar, anchor_date)
+            (default: looked up from the kernel cache)
         
     Returns:
         Dictionary with:
@@ -475,43 +567,28 @@ def try_placement_with_n_employees(
         - total_work_days: Sum of actual work days (non-U, non-O)
         - total_u_slots: Sum of U slots across all employees
     """
-    daily_coverage = {date: 0 for date in calendar}
+    if kernel is None or kernel.cycle_length != cycle_length:
+        kernel = kernel_for_calendar(pattern[:cycle_length], calendar, anchor_date)
     employees = []
     
-    anchor_dt = datetime.fromisoformat(anchor_date)
-    
     # Simple even distribution across offsets (let CP-SAT figure out optimal assignment)
     offset_distribution_list = distribute_offsets_evenly(num_employees, cycle_length)
     offset_counts = defaultdict(int)
     for offset in offset_distribution_list:
         offset_counts[offset] += 1
     
-    # Simulate each employee with their assigned offset
+    # Each employee follows their offset's precomputed row (non-'O' days are
+    # potential work days; CP-SAT will decide actual assignment)
     for employee_num, offset in enumerate(offset_distribution_list):
-        employee_pattern = []
-        work_days = 0
-        
-        for calendar_date in calendar:
-            date_dt = datetime.fromisoformat(calendar_date)
-            pattern_day = calculate_pattern_day(date_dt, offset, anchor_dt, cycle_length)
-            shift_code = pattern[pattern_day]
-            
-            if shift_code == 'O':
-                employee_pattern.append('O')
-            else:
-                # Mark as potential work day (CP-SAT will decide actual assignment)
-                employee_pattern.append(shift_code)
-                work_days += 1
-        
+        work_days = int(kernel.work_days[offset % kernel.cycle_length])
         employees.append({
             'employeeNumber': employee_num + 1,
             'rotationOffset': offset,
-            'pattern': employee_pattern,
+            'pattern': kernel.employee_codes(offset),
             'workDays': work_days,
-            'restDays': employee_pattern.count('O'),
+            'restDays': kernel.num_days - work_days,
         })
     
-
     # Check feasibility - potential work days must cover required coverage
     total_potential_work_days = sum(emp["workDays"] for emp in employees)
     total_required = len(calendar) * headcount
@@ -596,7 +673,8 @@ def calculate_employees_for_requirement(
     requirement: Dict[str, Any],
     planning_horizon: Dict[str, Any],
     public_holidays: List[str] = None,
-    coverage_days: List[str] = None
+    coverage_days: List[str] = None,
+    calculate: Optional[Callable[..., Dict[str, Any]]] = None
 ) -> Dict[str, Any]:
     """
     Calculate optimal employees for a single requirement using solver schema format.
@@ -606,6 +684,8 @@ def calculate_employees_for_requirement(
         planning_horizon: Dict with startDate, endDate
         public_holidays: List of ISO dates to exclude (optional)
         coverage_days: List of weekday names to include (optional, defaults to all days)
+        calculate: Drop-in for calculate_optimal_with_u_slots (e.g. a cached
+            variant); defaults to calculate_optimal_with_u_slots
         
     Returns:
         Result from calculate_optimal_with_u_slots()
@@ -635,7 +715,8 @@ def calculate_employees_for_requirement(
     anchor_date = start_date
     
     # Calculate optimal employees
-    return calculate_optimal_with_u_slots(
+    calculate = calculate or calculate_optimal_with_u_slots
+    return calculate(
         pattern=pattern,
         headcount=headcount,
         calendar=calendar,
@@ -705,7 +786,8 @@ def optimize_multiple_requirements(
     requirements: List[Dict[str, Any]],
     planning_horizon: Dict[str, Any],
     public_holidays: List[str] = None,
-    coverage_days: List[str] = None
+    coverage_days: List[str] = None,
+    calculate: Optional[Callable[..., Dict[str, Any]]] = None
 ) -> List[Dict[str, Any]]:
     """
     Calculate optimal employees for multiple requirements.
@@ -717,6 +799,7 @@ def optimize_multiple_requirements(
         planning_horizon: Dict with startDate, endDate
         public_holidays: List of ISO dates to exclude (optional)
         coverage_days: List of weekday names (optional)
+        calculate: Drop-in for calculate_optimal_with_u_slots (optional)
         
     Returns:
         List of results (one per requirement)
@@ -726,7 +809,7 @@ def optimize_multiple_requirements(
     for req in requirements:
         try:
             result = calculate_employees_for_requirement(
-                req, planning_horizon, public_holidays, coverage_days
+                req, planning_horizon, public_holidays, coverage_days, calculate
             )
             results.append(result)
         except Exception as e:
@@ -0,0 +1,132 @@
+"""Vectorized Coverage Kernel.
+
+ICPMP sizing and the rotation pre-processor simulate a rotation pattern over
+a calendar for many (employee, offset) combinations. Done per cell, that
+parses every calendar date and recomputes its pattern day once per employee
+and again for every candidate employee count.
+
+The kernel precomputes, once per (pattern, calendar, anchor):
+
+  - pattern_index[o, d]: pattern day of calendar day d at rotation offset o
+    ((day_number[d] + o) % cycle_length)
+  - codes[o, d]:          shift code at that pattern day
+  - work[o, d]:           1 where the code is not 'O'
+  - work_days[o]:         work days per offset over the whole calendar
+
+Employees sharing an offset share a row, so an employee x day work matrix is
+a row gather and coverage for a whole offset assignment is one matrix-vector
+product of the per-offset employee counts with `work`.
+
+Usage:
+    from context.engine.coverage_kernel import kernel_for_calendar
+    kernel = kernel_for_calendar(pattern, calendar, '2026-01-01')
+    kernel.total_work_days(offsets)   # potential work days of N employees
+    kernel.coverage(offsets)          # employees working per calendar day
+"""
+
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+
+class CoverageKernel:
+    """Per-offset work rows of one rotation pattern over a fixed set of days"""
+
+    def __init__(self, pattern: Sequence[str], day_numbers: Sequence[int]):
+        """
+        Args:
+            pattern: Work pattern like ["D","D","N","N","O","O"]
+            day_numbers: Pattern position of each calendar day at offset 0
+                (days from the anchor, or the day's index in the calendar)
+        """
+        self.pattern = list(pattern)
+        self.cycle_length = len(self.pattern)
+        days = np.asarray(day_numbers, dtype=np.int64)
+        self.num_days = len(days)
+
+        offsets = np.arange(self.cycle_length, dtype=np.int64)
+        self.pattern_index = (offsets[:, None] + days[None, :]) % self.cycle_length
+        self.codes = np.array(self.pattern, dtype=object)[self.pattern_index]
+        is_work = np.array([code != 'O' for code in self.pattern], dtype=np.int64)
+        self.work = is_work[self.pattern_index]
+        self.work_days = self.work.sum(axis=1)
+
+    def offset_counts(self, offsets: Sequence[int]) -> np.ndarray:
+        """Employees per offset (offsets are taken modulo the cycle length)"""
+        offsets = np.asarray(offsets, dtype=np.int64) % self.cycle_length
+        return np.bincount(offsets, minlength=self.cycle_length)
+
+    def total_work_days(self, offsets: Sequence[int]) -> int:
+        """Potential work days of employees at these offsets, summed over the calendar"""
+        return int(self.offset_counts(offsets) @ self.work_days)
+
+    def coverage(self, offsets: Sequence[int]) -> np.ndarray:
+        """Employees working on each calendar day"""
+        return self.offset_counts(offsets) @ self.work
+
+    def shift_coverage(self, offsets: Sequence[int]) -> Dict[str, np.ndarray]:
+        """Employees per working shift code on each calendar day"""
+        counts = self.offset_counts(offsets)
+        shift_codes = [code for code in dict.fromkeys(self.pattern) if code != 'O']
+        return {code: counts @ (self.codes == code) for code in shift_codes}
+
+    def employee_work(self, offsets: Sequence[int]) -> np.ndarray:
+        """Employee x day 0/1 work matrix for employees at these offsets"""
+        return self.work[np.asarray(offsets, dtype=np.int64) % self.cycle_length]
+
+    def employee_codes(self, offset: int) -> List[str]:
+        """Shift code per calendar day for an employee at this offset"""
+        return self.codes[offset % self.cycle_length].tolist()
+
+
+def calendar_day_numbers(calendar: Sequence[str], anchor_date: str) -> np.ndarray:
+    """
+    Whole days from anchor_date to each calendar date.
+
+    Matches (datetime.fromisoformat(date) - datetime.fromisoformat(anchor)).days,
+    including the floor when the anchor carries a time of day.
+
+    Args:
+        calendar: ISO dates (YYYY-MM-DD)
+        anchor_date: ISO date or datetime
+
+    Returns:
+        int64 array, one entry per calendar date
+    """
+    anchor = datetime.fromisoformat(anchor_date)
+    dates = np.array(calendar, dtype='datetime64[D]')
+    days = (dates - np.datetime64(anchor.date(), 'D')).astype(np.int64)
+    if anchor.time() != datetime.min.time():
+        days -= 1
+    return days
+
+
+@lru_cache(maxsize=64)
+def _kernel_for_calendar(pattern: tuple, calendar: tuple, anchor_date: str) -> CoverageKernel:
+    return CoverageKernel(pattern, calendar_day_numbers(calendar, anchor_date))
+
+
+def kernel_for_calendar(pattern: Sequence[str], calendar: Sequence[str], anchor_date: str) -> CoverageKernel:
+    """
+    Kernel for a pattern anchored at anchor_date over calendar dates.
+
+    Kernels are memoized per (pattern, calendar, anchor), so every candidate
+    employee count of an ICPMP search reuses the same precomputed rows.
+    Treat the returned kernel as read-only.
+
+    Args:
+        pattern: Work pattern
+        calendar: ISO dates (YYYY-MM-DD)
+        anchor_date: Date on which offset 0 starts the pattern
+
+    Returns:
+        CoverageKernel
+    """
+    return _kernel_for_calendar(tuple(pattern), tuple(calendar), anchor_date)
+
+
+def clear_kernel_cache() -> None:
+    """Drop all memoized kernels (for tests and cold-start benchmarks)"""
+    _kernel_for_calendar.cache_clear()
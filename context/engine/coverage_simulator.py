@@ -9,6 +9,8 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Tuple
 from math import ceil
 
+from context.engine.coverage_kernel import CoverageKernel
+
 
 def simulate_coverage(
     pattern: List[str],
@@ -33,33 +35,27 @@ def simulate_coverage(
         Dict with coverage statistics
     """
     cycle_length = len(pattern)
+    
+    # Employees beyond the offsets list are staggered by index
+    employee_offsets = [
+        offsets[emp_idx] if emp_idx < len(offsets) else emp_idx % cycle_length
+        for emp_idx in range(employee_count)
+    ]
+    
+    # Cycle day for an employee is (day_offset - rotation_offset) % cycle_length,
+    # i.e. kernel offset -rotation_offset over day numbers 0..days_in_horizon-1
+    kernel = CoverageKernel(pattern, range(days_in_horizon))
+    kernel_offsets = [-offset for offset in employee_offsets]
+    available = kernel.coverage(kernel_offsets).tolist()
+    shift_rows = {shift: row.tolist() for shift, row in kernel.shift_coverage(kernel_offsets).items()}
+    
     coverage_map = {}  # date -> available employees
     shift_coverage_map = {}  # date -> {shift: count}
-    
-    # Simulate each day
     for day_offset in range(days_in_horizon):
-        current_date = anchor_date + timedelta(days=day_offset)
-        available_employees = []
-        shift_counts = {}
-        
-        # Check each employee
-        for emp_idx in range(employee_count):
-            if emp_idx < len(offsets):
-                rotation_offset = offsets[emp_idx]
-            else:
-                rotation_offset = emp_idx % cycle_length
-            
-            # Calculate cycle day for this employee
-            emp_cycle_day = (day_offset - rotation_offset) % cycle_length
-            expected_shift = pattern[emp_cycle_day]
-            
-            # If not 'O' (off), employee is available
-            if expected_shift != 'O':
-                available_employees.append(emp_idx)
-                shift_counts[expected_shift] = shift_counts.get(expected_shift, 0) + 1
-        
-        coverage_map[day_offset] = len(available_employees)
-        shift_coverage_map[day_offset] = shift_counts
+        coverage_map[day_offset] = available[day_offset]
+        shift_coverage_map[day_offset] = {
+            shift: row[day_offset] for shift, row in shift_rows.items() if row[day_offset]
+        }
     
     # Calculate statistics
     total_days = len(coverage_map)
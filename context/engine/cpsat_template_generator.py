@@ -6,10 +6,15 @@ then replicates to all employees with rotation offsets.
 """
 
 import logging
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional
 from datetime import datetime, timedelta
 from ortools.sat.python import cp_model
 
+from .availability import AvailabilityCalendar, get_availability_calendar
+from .template_cache import template_context, template_key
+from .template_pool import TemplateJob, build_templates, template_search_workers
+from .thread_budget import search_threads
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,13 +23,16 @@ def generate_template_with_cpsat(
     requirement: dict,
     all_employees: List[dict],
     date_range: Tuple[datetime, datetime],
-    optimization_mode: str = "minimizeEmployeeCount"
+    optimization_mode: str = "minimizeEmployeeCount",
+    template_stats: Optional[Dict[str, int]] = None
 ) -> List[dict]:
     """
     Generate optimal template roster using CP-SAT mini-solver.
     
     Creates one template employee, applies core MOM constraints (C1-C17),
-    solves for optimal pattern, then replicates to all employees.
+    solves for optimal pattern, then replicates to all employees. OU groups
+    whose template inputs match reuse one solved template (template_cache), and
+    the remaining templates may be built in parallel (template_pool).
     
     Args:
         ctx: Full context dictionary with constraints config
@@ -32,6 +40,7 @@ def generate_template_with_cpsat(
         all_employees: List of employee dicts for this requirement
         date_range: (start_date, end_date) tuple
         optimization_mode: "minimizeEmployeeCount" or "balanceWorkload"
+        template_stats: template_cache.new_template_stats() counters to update
     
     Returns:
         List of assignment dicts for all employees
@@ -56,6 +65,7 @@ def generate_template_with_cpsat(
     
     # Group employees by OU for template replication
     employees_by_ou = _group_employees_by_ou(all_employees)
+    calendar = get_availability_calendar(ctx, all_employees)
     logger.info(f"Grouped {len(all_employees)} employees into {len(employees_by_ou)} OUs")
     
     # Get shift details from demand
@@ -86,10 +96,26 @@ def generate_template_with_cpsat(
     include_public_holidays, include_eve_ph = _extract_public_holiday_settings(demand)
     logger.info(f"Public holidays: {public_holidays}, includePH: {include_public_holidays}, includeEvePH: {include_eve_ph}")
     
-    all_assignments = []
+    # Everything the template model reads besides the template employee
+    template_inputs = {
+        'workPattern': work_pattern,
+        'shiftDetails': shift_details,
+        'coverageDays': coverage_days,
+        'startDate': start_date,
+        'endDate': end_date,
+        'publicHolidays': sorted(public_holidays),
+        'includePublicHolidays': include_public_holidays,
+        'includeEveOfPublicHolidays': include_eve_ph,
+        'requirement': requirement,
+        'demand': demand,
+    }
     
-    # Generate template for each OU
-    for ou_id, ou_employees in employees_by_ou.items():
+    # Build one template per OU (identical OUs share one; the rest may be built in parallel)
+    ou_groups = list(employees_by_ou.items())
+    template_ctx = template_context(ctx)
+    search_workers = template_search_workers()
+    jobs = []
+    for ou_id, ou_employees in ou_groups:
         logger.info(f"\nProcessing OU: {ou_id} ({len(ou_employees)} employees)")
         print(f"[DEBUG] Processing OU: {ou_id}, Employees: {len(ou_employees)}")
         
@@ -97,22 +123,31 @@ def generate_template_with_cpsat(
         template_emp = ou_employees[0]
         print(f"[DEBUG] Template employee: {template_emp.get('employeeId')}, Offset: {template_emp.get('rotationOffset')}")
         
-        # Build CP-SAT model for template
-        template_assignments = _build_and_solve_template(
-            ctx=ctx,
-            template_emp=template_emp,
-            work_pattern=work_pattern,
-            shift_details_map=shift_details,
-            start_date=start_date,
-            end_date=end_date,
-            demand=demand,
-            requirement=requirement,
-            coverage_days=coverage_days,
-            public_holidays=public_holidays,
-            include_public_holidays=include_public_holidays,
-            include_eve_ph=include_eve_ph
-        )
-        
+        jobs.append(TemplateJob(
+            key=template_key('cpsat', template_emp, template_inputs, ctx),
+            build=_build_and_solve_template,
+            kwargs=dict(
+                ctx=template_ctx,
+                template_emp=template_emp,
+                work_pattern=work_pattern,
+                shift_details_map=shift_details,
+                start_date=start_date,
+                end_date=end_date,
+                demand=demand,
+                requirement=requirement,
+                coverage_days=coverage_days,
+                public_holidays=public_holidays,
+                include_public_holidays=include_public_holidays,
+                include_eve_ph=include_eve_ph,
+                search_workers=search_workers
+            )
+        ))
+    templates = build_templates(jobs, template_stats)
+    
+    all_assignments = []
+    
+    # Replicate templates in OU order
+    for (ou_id, ou_employees), template_assignments in zip(ou_groups, templates):
         if not template_assignments:
             logger.warning(f"  CP-SAT failed to generate template for OU {ou_id}")
             continue
@@ -137,7 +172,8 @@ def generate_template_with_cpsat(
                 template_assignments,
                 demand,
                 requirement,
-                shift_details
+                shift_details,
+                calendar
             )
             all_assignments.extend(emp_assignments)
     
@@ -157,7 +193,8 @@ def _build_and_solve_template(
     coverage_days: List[str],
     public_holidays: set = None,
     include_public_holidays: bool = True,
-    include_eve_ph: bool = True
+    include_eve_ph: bool = True,
+    search_workers: Optional[int] = None
 ) -> List[dict]:
     """
     Build CP-SAT model for single template employee and solve.
@@ -167,6 +204,8 @@ def _build_and_solve_template(
         public_holidays: Set of public holiday dates
         include_public_holidays: If False, skip creating work slots on PH dates
         include_eve_ph: If False, skip creating work slots on eve of PH dates
+        search_workers: CP-SAT search threads (None = CP-SAT default),
+            drawn from the host thread budget when one is installed
     
     Returns list of assignment dicts for the template employee.
     """
@@ -259,7 +298,10 @@ def _build_and_solve_template(
     solver.parameters.max_time_in_seconds = 10  # Quick solve for template
     solver.parameters.log_search_progress = False
     
-    status = solver.Solve(model)
+    with search_threads(search_workers) as granted_workers:
+        if granted_workers:
+            solver.parameters.num_search_workers = granted_workers
+        status = solver.Solve(model)
     
     if status not in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
         logger.warning(f"  CP-SAT solver status: {solver.StatusName(status)}")
@@ -1004,13 +1046,15 @@ def _replicate_template_to_employee(
     template_assignments: List[dict],
     demand: dict,
     requirement: dict,
-    shift_details: dict
+    shift_details: dict,
+    calendar: AvailabilityCalendar = None
 ) -> List[dict]:
     """
     Replicate template assignments to an employee.
     
     All employees in the same OU get the SAME dates (no date shifting).
     The rotation offset was already applied during template generation.
+    Days the employee is unavailable on (per calendar) become UNASSIGNED.
     """
     import copy
     
@@ -1031,6 +1075,10 @@ def _replicate_template_to_employee(
             date_str = assignment['date']
             shift_code = assignment['shiftCode']
             assignment['assignmentId'] = f"{demand_id}-{date_str}-{shift_code}-{emp_id}"
+            if calendar is not None and not calendar.is_available(emp_id, date_str):
+                assignment['status'] = 'UNASSIGNED'
+                assignment['employeeId'] = None
+                assignment['reason'] = 'Employee unavailable'
         else:
             # UNASSIGNED: keep employeeId=null, but update assignmentId for tracking
             date_str = assignment['date']
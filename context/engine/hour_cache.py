@@ -0,0 +1,203 @@
+"""Memoized Shift-Hour Breakdowns.
+
+A roster has only a handful of distinct shift shapes, but the hour breakdown
+(gross / lunch / normal / OT) is recomputed for every slot and assignment:
+while building the model (C1, C2, C6, C17, C19), in calculate_scores and per
+assignment in build_output. This module computes each breakdown once per
+process and shares it between all of them.
+
+Keys use integer minutes:
+  - shape: (start minute of day, duration in minutes)
+  - MOM split: shape + (scheme, work days in week, consecutive position,
+    public holiday flag)
+
+Values come from the canonical functions in time_utils (split_shift_hours,
+mom_hours_split), evaluated once per key, so cached and uncached results are
+identical. Gross and lunch are also kept as integer minutes for callers that
+need exact arithmetic (CP-SAT coefficients). Shifts that are not a whole
+number of minutes long bypass the cache.
+
+Usage:
+    from context.engine.hour_cache import shift_breakdown, mom_hours
+    gross_minutes = shift_breakdown(slot.start, slot.end).gross_minutes
+    hours = mom_hours(start_dt, end_dt, 'A', work_days_in_week=6)
+"""
+
+from datetime import datetime, timedelta
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, NamedTuple, Optional
+
+from context.engine.time_utils import lunch_hours, mom_hours_split, span_hours, split_shift_hours
+
+# Any date works: breakdowns only depend on time of day and duration
+_ANCHOR = datetime(2000, 1, 1)
+
+
+class ShiftShape(NamedTuple):
+    start_minute: int       # Minutes after midnight
+    duration_minutes: int
+
+
+class HourBreakdown(NamedTuple):
+    gross_minutes: int
+    lunch_minutes: int
+    hours: Mapping[str, float]  # Read-only split_shift_hours() result
+
+    @property
+    def net_minutes(self) -> int:
+        return self.gross_minutes - self.lunch_minutes
+
+    @property
+    def gross(self) -> float:
+        return self.hours['gross']
+
+    @property
+    def lunch(self) -> float:
+        return self.hours['lunch']
+
+
+def shift_shape(start_dt: datetime, end_dt: datetime) -> Optional[ShiftShape]:
+    """Integer-minute shape of a shift, or None if it is not whole minutes"""
+    seconds = (end_dt - start_dt).total_seconds()
+    if seconds < 0 or seconds % 60 or start_dt.second or start_dt.microsecond:
+        return None
+    return ShiftShape(start_dt.hour * 60 + start_dt.minute, int(seconds // 60))
+
+
+def _shape_bounds(shape: ShiftShape):
+    start = _ANCHOR + timedelta(minutes=shape.start_minute)
+    return start, start + timedelta(minutes=shape.duration_minutes)
+
+
+def _make_breakdown(start_dt: datetime, end_dt: datetime) -> HourBreakdown:
+    hours = split_shift_hours(start_dt, end_dt)
+    return HourBreakdown(
+        gross_minutes=int(round((end_dt - start_dt).total_seconds() / 60)),
+        lunch_minutes=int(round(hours['lunch'] * 60)),
+        hours=MappingProxyType(hours)
+    )
+
+
+@lru_cache(maxsize=None)
+def _breakdown_for_shape(shape: ShiftShape) -> HourBreakdown:
+    return _make_breakdown(*_shape_bounds(shape))
+
+
+def shift_breakdown(start_dt: datetime, end_dt: datetime) -> HourBreakdown:
+    """
+    Cached split_shift_hours() for one shift.
+
+    Args:
+        start_dt: Shift start datetime
+        end_dt: Shift end datetime
+
+    Returns:
+        HourBreakdown (integer-minute gross/lunch plus the read-only hours dict)
+
+    Raises:
+        ValueError: If end_dt is before start_dt (as span_hours)
+    """
+    shape = shift_shape(start_dt, end_dt)
+    if shape is None:
+        return _make_breakdown(start_dt, end_dt)
+    return _breakdown_for_shape(shape)
+
+
+def shape_breakdown(start_minute: int, duration_minutes: int) -> HourBreakdown:
+    """
+    Cached breakdown for a shift given in integer minutes.
+
+    Args:
+        start_minute: Start minute (of the day, or on a midnight-anchored timeline)
+        duration_minutes: Shift length in minutes
+
+    Returns:
+        HourBreakdown for the shape (same as shift_breakdown on the datetimes)
+    """
+    return _breakdown_for_shape(ShiftShape(start_minute % (24 * 60), duration_minutes))
+
+
+def split_hours(start_dt: datetime, end_dt: datetime) -> Mapping[str, float]:
+    """Read-only split_shift_hours() result from the cache"""
+    return shift_breakdown(start_dt, end_dt).hours
+
+
+def _mom_key_position(scheme: str, work_days_in_week: int, consecutive_position: int) -> int:
+    # Only Scheme P 5-day weeks distinguish positions (5th+ day is all OT)
+    if scheme == 'P' and work_days_in_week == 5:
+        return 5 if consecutive_position >= 5 else 0
+    return 0
+
+
+def _mom_record(gross: float, ln: float, scheme: str, work_days_in_week: int,
+                consecutive_position: int, is_public_holiday: bool) -> Dict[str, Any]:
+    split = mom_hours_split(gross, ln, scheme, work_days_in_week, consecutive_position)
+    return {
+        'gross': split['gross'],
+        'lunch': split['lunch'],
+        'normal': split['normal'],
+        'ot': split['ot'],
+        # All net worked hours on a public holiday are PH hours
+        'publicHolidayHours': max(0.0, split['gross'] - split['lunch']) if is_public_holiday else 0.0,
+        'restDayPay': split['restDayPay'],
+        'paid': split['paid'],
+    }
+
+
+@lru_cache(maxsize=None)
+def _mom_for_shape(shape: ShiftShape, scheme: str, work_days_in_week: int,
+                   consecutive_position: int, is_public_holiday: bool) -> Mapping[str, float]:
+    gross = span_hours(*_shape_bounds(shape))
+    record = _mom_record(gross, lunch_hours(gross), scheme, work_days_in_week,
+                         consecutive_position, is_public_holiday)
+    return MappingProxyType(record)
+
+
+def mom_hours(
+    start_dt: datetime,
+    end_dt: datetime,
+    scheme: str,
+    work_days_in_week: int,
+    consecutive_position: int = 0,
+    is_public_holiday: bool = False
+) -> Dict[str, float]:
+    """
+    Cached MOM-compliant hours record for one assignment.
+
+    Same numbers as calculate_mom_compliant_hours() given the week context
+    from time_utils.mom_week_position().
+
+    Args:
+        start_dt: Shift start datetime
+        end_dt: Shift end datetime
+        scheme: Normalized employee scheme ('A', 'B' or 'P')
+        work_days_in_week: Work days in the employee's week
+        consecutive_position: Consecutive work day position (Scheme P, 5-day weeks)
+        is_public_holiday: Whether the assignment date is a public holiday
+
+    Returns:
+        New dict with gross, lunch, normal, ot, publicHolidayHours, restDayPay, paid
+        (the assignment 'hours' record; safe to modify)
+    """
+    position = _mom_key_position(scheme, work_days_in_week, consecutive_position)
+    shape = shift_shape(start_dt, end_dt)
+    if shape is None:
+        gross = span_hours(start_dt, end_dt)
+        return _mom_record(gross, lunch_hours(gross), scheme, work_days_in_week,
+                           position, is_public_holiday)
+    return dict(_mom_for_shape(shape, scheme, work_days_in_week, position, bool(is_public_holiday)))
+
+
+def cache_stats() -> Dict[str, Dict[str, int]]:
+    """Hit/miss counters per cache (for logging and benchmarks)"""
+    stats = {}
+    for name, fn in (('shape', _breakdown_for_shape), ('mom', _mom_for_shape)):
+        info = fn.cache_info()
+        stats[name] = {'hits': info.hits, 'misses': info.misses, 'size': info.currsize}
+    return stats
+
+
+def clear_caches() -> None:
+    _breakdown_for_shape.cache_clear()
+    _mom_for_shape.cache_clear()
@@ -0,0 +1,81 @@
+"""Load-Keyed Employee Heap.
+
+Greedy slot assignment picks, for each slot, the best employee that can take
+it: the lowest workload in slot-based outcome rostering
+(outcome_based_with_slots), the most hours remaining in fill-slots
+(src.fill_slots_solver). Rescanning and sorting the employee list per slot
+is O(slots x employees). LoadHeap keeps the candidates in a binary heap
+keyed by (load, position), so the best one is found in O(log employees)
+and ties go to the earlier employee, as a stable sort by load would.
+
+Candidates that fail a slot's check (already assigned that day,
+unavailable, at a consecutive-day cap) are popped and set aside. They are
+pushed back unchanged, or handed to the caller to park until the check can
+change (e.g. the next date), so each employee is rejected at most once per
+date. Callers keep their own per-employee counters and push an employee back
+with its new load after assigning it.
+
+Usage:
+    heap = LoadHeap((workload[i], i, emp) for i, emp in enumerate(employees))
+    entry = heap.pop_first(lambda emp: emp_id(emp) not in assigned_today)
+    if entry is not None:
+        load, position, emp = entry
+        heap.push(load + 1, position, emp)
+"""
+
+import heapq
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+Entry = Tuple[Any, int, Any]
+
+
+class LoadHeap:
+    """Min-heap of (load, position, item); position breaks ties and must be unique"""
+
+    def __init__(self, entries: Iterable[Entry] = ()):
+        """
+        Args:
+            entries: (load, position, item) triples; load is any orderable key
+        """
+        self._heap: List[Entry] = list(entries)
+        heapq.heapify(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, load: Any, position: int, item: Any) -> None:
+        """Add or re-add an item with its current load"""
+        heapq.heappush(self._heap, (load, position, item))
+
+    def pop_first(self, accept: Callable[[Any], bool],
+                  stop: Optional[Callable[[Any], bool]] = None,
+                  parked: Optional[List[Entry]] = None) -> Optional[Entry]:
+        """
+        Remove and return the lowest-load entry whose item passes accept.
+
+        Args:
+            accept: Check for the current slot
+            stop: Called with the lowest remaining load before each pop; True
+                ends the search (no later entry can qualify either, e.g. the
+                most hours left are below the slot's hours)
+            parked: List that takes the rejected entries, for the caller to
+                push back later; by default they are pushed back before
+                returning
+
+        Returns:
+            (load, position, item), or None when no entry passes
+        """
+        rejected = parked if parked is not None else []
+        found = None
+        while self._heap:
+            if stop is not None and stop(self._heap[0][0]):
+                break
+            entry = heapq.heappop(self._heap)
+            if accept(entry[2]):
+                found = entry
+                break
+            rejected.append(entry)
+        if parked is None:
+            for entry in rejected:
+                heapq.heappush(self._heap, entry)
+        return found
@@ -15,8 +15,12 @@ Key differences from standard outcomeBased:
 import logging
 from datetime import datetime, timedelta, date
 from typing import Dict, List, Any, Optional, Set
+from bisect import bisect_left
 from collections import defaultdict
 
+from .availability import get_availability_calendar
+from .load_heap import LoadHeap
+
 logger = logging.getLogger(__name__)
 
 
@@ -267,11 +271,11 @@ def _remove_unavailable_assignments(assignments: List[Dict[str, Any]],
                                    employees: List[Dict[str, Any]],
                                    ctx: Dict[str, Any]) -> tuple[List[Dict[str, Any]], int]:
     """
-    Post-process assignments to remove violations of unavailability constraints.
+    Check that no assignment falls on a day its employee is unavailable.
     
-    This function filters out assignments where an employee is scheduled on a day
-    they marked as unavailable. The filtered assignments are converted to UNASSIGNED
-    slots so the roster shows gaps in coverage.
+    Employee templates already drop unavailable days from valid_work_days, so
+    this is a safety net: any hit is logged as an error and converted to an
+    UNASSIGNED slot so the roster shows the gap.
     
     Args:
         assignments: List of assignment dictionaries (both ASSIGNED and UNASSIGNED)
@@ -281,59 +285,26 @@ def _remove_unavailable_assignments(assignments: List[Dict[str, Any]],
     Returns:
         Tuple of (filtered_assignments, violations_removed_count)
     """
-    # Build unavailability map for quick lookup
-    unavail_map = {}
-    for emp in employees:
-        emp_id = emp['employeeId']
-        unavail_list = emp.get('unavailability', [])
-        unavailable_dates = set()
-        
-        # Handle both formats: array of strings or array of dicts
-        for u in unavail_list:
-            if isinstance(u, dict):
-                # Format: [{"date": "2026-01-05", ...}] or [{"startDate": "...", "endDate": "..."}]
-                date_val = u.get('date') or u.get('startDate')
-                if date_val:
-                    unavailable_dates.add(date_val)
-            elif isinstance(u, str):
-                # Format: ["2026-01-05", "2026-01-26"]
-                unavailable_dates.add(u)
-        
-        if unavailable_dates:
-            unavail_map[emp_id] = unavailable_dates
-    
-    # Filter assignments
+    calendar = get_availability_calendar(ctx, employees)
     filtered_assignments = []
     violations_removed = 0
     
     for assignment in assignments:
-        # Skip unassigned slots - they're already empty
-        if assignment['status'] == 'UNASSIGNED':
+        emp_id = assignment.get('employeeId')
+        if (assignment['status'] == 'UNASSIGNED' or not emp_id
+                or calendar.is_available(emp_id, assignment['date'])):
             filtered_assignments.append(assignment)
             continue
         
-        emp_id = assignment.get('employeeId')
-        assignment_date = assignment.get('date')
-        
-        # Check if this is a violation
-        if emp_id in unavail_map and assignment_date in unavail_map[emp_id]:
-            # Violation detected - convert to UNASSIGNED slot
-            violations_removed += 1
-            logger.warning(
-                f"  [UNAVAILABILITY FIX] Removing assignment: Employee {emp_id} on {assignment_date} "
-                f"(marked unavailable)"
-            )
-            
-            # Convert to unassigned slot
-            filtered_assignment = assignment.copy()
-            filtered_assignment['status'] = 'UNASSIGNED'
-            filtered_assignment['employeeId'] = None
-            # Keep slotId and other metadata for tracking
-            
-            filtered_assignments.append(filtered_assignment)
-        else:
-            # Valid assignment - keep it
-            filtered_assignments.append(assignment)
+        violations_removed += 1
+        logger.error(
+            f"  [UNAVAILABILITY CHECK] Employee {emp_id} assigned on unavailable day {assignment['date']}"
+        )
+        filtered_assignment = assignment.copy()
+        filtered_assignment['status'] = 'UNASSIGNED'
+        filtered_assignment['employeeId'] = None
+        # Keep slotId and other metadata for tracking
+        filtered_assignments.append(filtered_assignment)
     
     return filtered_assignments, violations_removed
 
@@ -651,83 +622,23 @@ def _generate_employee_template_with_constraints(ctx: Dict[str, Any], employee:
         coverage_days=coverage_days
     )
     
-    # Extract valid work days (exclude off days AND unavailable dates)
+    # Extract valid work days (exclude off days, unavailable and blacklisted dates)
     valid_work_days = set()
-    
-    # Get employee unavailability (handle both formats)
-    unavailability = employee.get('unavailability', [])
-    unavailable_dates_set = set()
-    for u in unavailability:
-        if isinstance(u, dict):
-            # Format: [{"date": "2026-01-05", ...}]
-            date_val = u.get('date') or u.get('startDate')
-            if date_val:
-                unavailable_dates_set.add(date_val)
-        elif isinstance(u, str):
-            # Format: ["2026-01-05", "2026-01-26"]
-            unavailable_dates_set.add(u)
-    
-    # Get blacklist dates with date ranges (v0.70+)
-    blacklisted_dates_set = set()
     emp_id = employee.get('employeeId')
-    
-    logger.info(f"[BLACKLIST CHECK] Checking blacklist for employee {emp_id}")
-    
-    # Check each shift for blacklist
-    shifts = demand.get('shifts', [])
-    logger.info(f"[BLACKLIST CHECK] Found {len(shifts)} shifts in demand")
-    
-    for shift in shifts:
-        blacklist = shift.get('blacklist', {})
-        blacklist_entries = blacklist.get('employeeIds', [])
-        logger.info(f"[BLACKLIST CHECK] Found {len(blacklist_entries)} blacklist entries in shift")
-        
-        for bl_entry in blacklist_entries:
-            if isinstance(bl_entry, dict):
-                bl_emp_id = bl_entry.get('employeeId')
-                logger.info(f"[BLACKLIST CHECK] Checking entry for employee {bl_emp_id}")
-                if bl_emp_id == emp_id:
-                    bl_start = bl_entry.get('blacklistStartDate', '')
-                    bl_end = bl_entry.get('blacklistEndDate', '')
-                    
-                    if bl_start and bl_end:
-                        try:
-                            from datetime import datetime, timedelta
-                            start_dt = datetime.strptime(bl_start, '%Y-%m-%d').date()
-                            end_dt = datetime.strptime(bl_end, '%Y-%m-%d').date()
-                            
-                            logger.info(f"[BLACKLIST] Employee {emp_id} blacklisted {bl_start} to {bl_end}")
-                            
-                            # Generate all dates in blacklist range
-                            current_date = start_dt
-                            while current_date <= end_dt:
-                                blacklisted_dates_set.add(current_date.strftime('%Y-%m-%d'))
-                                current_date += timedelta(days=1)
-                            
-                            logger.info(f"[BLACKLIST] Blocked {len(blacklisted_dates_set)} dates for employee {emp_id}")
-                        except Exception as e:
-                            logger.warning(f"[BLACKLIST] Failed to parse dates for {emp_id}: {e}")
-                            pass  # If date parsing fails, skip this entry
-                        except:
-                            pass  # If date parsing fails, skip this entry
-            elif isinstance(bl_entry, str) and bl_entry == emp_id:
-                # Legacy format: unconditional blacklist (block all dates)
-                # Add all dates in planning horizon
-                current_date = start_date
-                while current_date <= end_date:
-                    blacklisted_dates_set.add(current_date.strftime('%Y-%m-%d'))
-                    current_date += timedelta(days=1)
+    calendar = get_availability_calendar(ctx, [employee])
+    blacklists = [shift.get('blacklist') for shift in demand.get('shifts', []) if shift.get('blacklist')]
     
     for date_str, day_info in template_result.items():
         # Only include days where:
         # 1. assigned == True (passed validation)
         # 2. is_work_day == True (not an off day)
         # 3. OR has an actual assignment dict
-        # 4. NOT in unavailable dates
-        # 5. NOT in blacklisted dates
+        # 4. employee is available (unavailability, leave)
+        # 5. NOT blacklisted for one of the demand's shifts
         if (day_info.get('assigned', False) and (
             day_info.get('is_work_day', False) or day_info.get('assignment') is not None
-        ) and date_str not in unavailable_dates_set and date_str not in blacklisted_dates_set):
+        ) and calendar.is_available(emp_id, date_str)
+                and not any(calendar.is_blacklisted(emp_id, date_str, bl) for bl in blacklists)):
             valid_work_days.add(date_str)
     
     return {
@@ -736,6 +647,66 @@ def _generate_employee_template_with_constraints(ctx: Dict[str, Any], employee:
     }
 
 
+def _qualified_until(employee: Dict[str, Any],
+                     requirement: Dict[str, Any],
+                     employee_licenses_map: Dict[str, Dict[str, str]]) -> Optional[date]:
+    """Last date on which employee meets the requirement's qualifications.
+    
+    Same rules as _check_employee_qualifications: a qualification is valid up
+    to its expiry date, so an ALL group holds until its earliest expiry, an
+    ANY group until its latest, and the requirement until the earliest group.
+    
+    Args:
+        employee: Employee dictionary
+        requirement: Requirement dictionary with requiredQualifications
+        employee_licenses_map: Pre-built license map for all employees
+        
+    Returns:
+        date: Qualified on every date up to and including this one
+              (date.max when nothing expires), or None if never qualified
+    """
+    required_quals = requirement.get('requiredQualifications', [])
+    if not required_quals:
+        return date.max
+    
+    if isinstance(required_quals[0], dict) and 'qualifications' in required_quals[0]:
+        qual_groups = required_quals
+    elif isinstance(required_quals[0], (str, int)):
+        qual_groups = [{'matchType': 'ALL', 'qualifications': required_quals}]
+    else:
+        return date.max
+    
+    emp_licenses = employee_licenses_map.get(employee.get('employeeId'), {})
+    
+    def valid_until(qual_code: Any) -> Optional[date]:
+        qual_key = str(qual_code)
+        if qual_key not in emp_licenses:
+            return None
+        expiry_date_str = emp_licenses[qual_key]
+        if not expiry_date_str:
+            return date.max
+        try:
+            return datetime.strptime(expiry_date_str, '%Y-%m-%d').date()
+        except (ValueError, AttributeError):
+            return None
+    
+    until = date.max
+    for group in qual_groups:
+        quals = group.get('qualifications', [])
+        if not quals:
+            continue
+        cutoffs = [valid_until(qual) for qual in quals]
+        if group.get('matchType', 'ALL') == 'ANY':
+            valid = [cutoff for cutoff in cutoffs if cutoff is not None]
+            group_until = max(valid) if valid else None
+        else:
+            group_until = None if None in cutoffs else min(cutoffs)
+        if group_until is None:
+            return None
+        until = min(until, group_until)
+    return until
+
+
 def _assign_employees_to_slots_balanced(slots: List[Dict[str, Any]], 
                                        eligible_employees: List[Dict[str, Any]],
                                        employee_templates: Dict[str, Dict[str, Any]],
@@ -752,6 +723,12 @@ def _assign_employees_to_slots_balanced(slots: List[Dict[str, Any]],
     4. Exclude employees already assigned on that date (one position per day)
     5. Pick employee with lowest current workload
     6. Respect constraints via template validation
+    
+    Rank/product (C11) is checked once per employee and qualifications (C7)
+    reduce to a last qualified date. Each date's candidates (template work
+    day, qualified) go into a LoadHeap keyed by (workload, input order), so
+    each slot takes the least-loaded candidate in O(log employees) - the same
+    employee the per-slot sort picked.
     """
     assignments = []
     employee_workload = {emp['employeeId']: 0 for emp in eligible_employees}
@@ -760,6 +737,26 @@ def _assign_employees_to_slots_balanced(slots: List[Dict[str, Any]],
     # Track which employees are assigned on each date (prevent double-booking)
     employees_assigned_by_date = defaultdict(set)
     
+    # CHECK 1 (C11) is date-independent; CHECK 2 (C7) only depends on expiry dates
+    matching = [
+        (position, emp) for position, emp in enumerate(eligible_employees)
+        if _check_rank_product_match(emp, requirement)
+    ]
+    rank_product_misses = len(eligible_employees) - len(matching)
+    qualified_until = {
+        position: _qualified_until(emp, requirement, employee_licenses_map)
+        for position, emp in matching
+    }
+    never_qualified = sum(1 for until in qualified_until.values() if until is None)
+    expiries = sorted(until for until in qualified_until.values() if until is not None)
+    
+    # Template work days -> matching employees, in input order
+    candidates_by_date = defaultdict(list)
+    for position, emp in matching:
+        template = employee_templates.get(emp['employeeId'], {})
+        for date_str in template.get('valid_work_days', set()):
+            candidates_by_date[date_str].append(position)
+    
     # Track filtering statistics
     filtered_by_qualification = 0
     filtered_by_rank_product = 0
@@ -767,56 +764,33 @@ def _assign_employees_to_slots_balanced(slots: List[Dict[str, Any]],
     # Sort slots by date for chronological assignment
     sorted_slots = sorted(slots, key=lambda s: s['date'])
     
+    heap_date = None
+    heap = None
+    unqualified = 0
     for slot in sorted_slots:
         slot_date = slot['date']
-        slot_date_obj = datetime.strptime(slot_date, '%Y-%m-%d').date()
         slot_shift_code = slot['shiftCode']
         
-        # Find employees who can work this day (based on template validation)
-        eligible_for_slot = []
-        for emp in eligible_employees:
-            emp_id = emp['employeeId']
-            
-            # CRITICAL: Check if employee is already assigned on this date
-            if emp_id in employees_assigned_by_date[slot_date]:
-                continue  # Skip - already assigned to another position today
-            
-            # CHECK 1: Rank and Product Type Match (C11)
-            if not _check_rank_product_match(emp, requirement):
-                filtered_by_rank_product += 1
-                continue
-            
-            # CHECK 2: Qualifications/Licenses (C7)
-            if not _check_employee_qualifications(emp, requirement, slot_date_obj, employee_licenses_map):
-                filtered_by_qualification += 1
-                continue
-            
-            template = employee_templates.get(emp_id, {})
-            valid_days = template.get('valid_work_days', set())
-            
-            # Check if employee can work this date
-            if slot_date in valid_days:
-                # Check unavailability (handle both formats: array of strings or array of dicts)
-                unavailability = emp.get('unavailability', [])
-                unavailable_dates = []
-                for u in unavailability:
-                    if isinstance(u, dict):
-                        # Format: [{"date": "2026-01-05", ...}]
-                        date_val = u.get('date') or u.get('startDate')
-                        if date_val:
-                            unavailable_dates.append(date_val)
-                    elif isinstance(u, str):
-                        # Format: ["2026-01-05", "2026-01-26"]
-                        unavailable_dates.append(u)
-                
-                if slot_date not in unavailable_dates:
-                    eligible_for_slot.append(emp)
+        if slot_date != heap_date:
+            # Candidates for this date with their workload so far
+            slot_date_obj = datetime.strptime(slot_date, '%Y-%m-%d').date()
+            heap_date = slot_date
+            heap = LoadHeap(
+                (employee_workload[eligible_employees[position]['employeeId']], position,
+                 eligible_employees[position])
+                for position in candidates_by_date.get(slot_date, ())
+                if qualified_until[position] is not None and slot_date_obj <= qualified_until[position]
+            )
+            unqualified = never_qualified + bisect_left(expiries, slot_date_obj)
+        
+        filtered_by_rank_product += rank_product_misses
+        filtered_by_qualification += unqualified
         
         # Assign to employee with lowest workload
-        if eligible_for_slot:
-            # Sort by current workload (ascending)
-            eligible_for_slot.sort(key=lambda e: employee_workload[e['employeeId']])
-            selected_employee = eligible_for_slot[0]
+        assigned_today = employees_assigned_by_date[slot_date]
+        entry = heap.pop_first(lambda emp: emp['employeeId'] not in assigned_today)
+        if entry is not None:
+            selected_employee = entry[2]
             emp_id = selected_employee['employeeId']
             
             # Create assignment
@@ -841,7 +815,7 @@ def _assign_employees_to_slots_balanced(slots: List[Dict[str, Any]],
             employee_assignments[emp_id].append(slot_date)
             
             # Track that this employee is now assigned on this date
-            employees_assigned_by_date[slot_date].add(emp_id)
+            assigned_today.add(emp_id)
             
             slot['assigned'] = True
             slot['employeeId'] = emp_id
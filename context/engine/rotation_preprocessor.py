@@ -20,6 +20,10 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Set
 import logging
 
+import numpy as np
+
+from .coverage_kernel import CoverageKernel
+
 logger = logging.getLogger(__name__)
 
 
@@ -223,6 +227,10 @@ def simulate_pattern_filling(
     daily_coverage = {day: 0 for day in calendar}
     pattern_length = len(work_pattern)
     
+    # Employee at offset o works calendar day i when work_pattern[(i + o) % length] != 'O'
+    kernel = CoverageKernel(work_pattern, range(len(calendar)))
+    coverage = np.zeros(len(calendar), dtype=np.int64)
+    
     strict_employees = []
     current_offset = 0
     employee_index = 0
@@ -231,21 +239,15 @@ def simulate_pattern_filling(
     logger.info("\n--- PHASE 1: STRICT PATTERN ADHERENCE ---")
     
     while employee_index < available_employees:
-        temp_coverage = daily_coverage.copy()
-        
         # Simulate this employee's contribution
-        for day_index, calendar_day in enumerate(calendar):
-            pattern_position = (day_index + current_offset) % pattern_length
-            
-            if work_pattern[pattern_position] != 'O':  # Working day
-                temp_coverage[calendar_day] += 1
+        temp_coverage = coverage + kernel.work[current_offset]
         
         # Check: Would this cause any day to exceed headcount?
-        max_coverage = max(temp_coverage.values())
+        max_coverage = int(temp_coverage.max())
         
         if max_coverage <= combined_headcount:
             # ACCEPT: This employee fits within strict adherence
-            daily_coverage = temp_coverage
+            coverage = temp_coverage
             strict_employees.append({
                 'index': employee_index,
                 'rotationOffset': current_offset
@@ -258,6 +260,8 @@ def simulate_pattern_filling(
             logger.info(f"Adding next employee would cause max_coverage={max_coverage} > headcount={combined_headcount}")
             break
     
+    daily_coverage = dict(zip(calendar, coverage.tolist()))
+    
     min_coverage_strict = min(daily_coverage.values()) if daily_coverage else 0
     max_coverage_strict = max(daily_coverage.values()) if daily_coverage else 0
     
@@ -278,7 +282,8 @@ def simulate_pattern_filling(
             calendar=calendar,
             remaining_employees=available_employees - employee_index,
             start_offset=current_offset,
-            strict_count=len(strict_employees)
+            strict_count=len(strict_employees),
+            kernel=kernel
         )
         employee_index += len(flexible_candidates)
     
@@ -323,7 +328,8 @@ def fill_coverage_gaps(
     calendar: list,
     remaining_employees: int,
     start_offset: int,
-    strict_count: int
+    strict_count: int,
+    kernel: CoverageKernel = None
 ) -> List[dict]:
     """
     Flexible gap-filling phase: Try all possible offsets before giving up.
@@ -339,32 +345,26 @@ def fill_coverage_gaps(
     pattern_length = len(work_pattern)
     flexible_candidates = []
     
+    if kernel is None:
+        kernel = CoverageKernel(work_pattern, range(len(calendar)))
+    coverage = np.array([daily_coverage[day] for day in calendar], dtype=np.int64)
+    
     for emp_index in range(remaining_employees):
         # Try all possible offsets for this employee
         best_offset = None
         best_contribution = 0
         best_temp_coverage = None
+        underfilled = coverage < combined_headcount
         
         for trial_offset in range(pattern_length):
-            contribution = 0
-            violates = False
+            work = kernel.work[trial_offset]
+            temp_coverage = coverage + work
             
-            temp_coverage = daily_coverage.copy()
+            # Must not overfill any day
+            violates = bool((temp_coverage > combined_headcount).any())
             
-            for day_index, calendar_day in enumerate(calendar):
-                pattern_position = (day_index + trial_offset) % pattern_length
-                
-                if work_pattern[pattern_position] != 'O':
-                    temp_coverage[calendar_day] += 1
-                    
-                    # Check if this helps fill gap without overfilling
-                    if temp_coverage[calendar_day] > combined_headcount:
-                        violates = True
-                        break
-                    
-                    # Count contribution to underfilled days
-                    if daily_coverage[calendar_day] < combined_headcount:
-                        contribution += 1
+            # Count contribution to underfilled days
+            contribution = int(work[underfilled].sum())
             
             if not violates and contribution > best_contribution:
                 best_offset = trial_offset
@@ -373,7 +373,8 @@ def fill_coverage_gaps(
         
         if best_offset is not None and best_contribution > 0:
             # Accept this employee with best_offset
-            daily_coverage.update(best_temp_coverage)
+            coverage = best_temp_coverage
+            daily_coverage.update(zip(calendar, coverage.tolist()))
             
             flexible_candidates.append({
                 'index': strict_count + len(flexible_candidates),
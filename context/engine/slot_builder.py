@@ -9,30 +9,30 @@ Example:
 """
 
 from __future__ import annotations
+from array import array
 from dataclasses import dataclass
 from typing import List, Dict, Any, Optional
 from datetime import datetime, date, timedelta
 from collections import defaultdict
+import hashlib
 import math
-import uuid
 
 # Import helper functions at module level to avoid UnboundLocalError
 from context.engine.time_utils import normalize_scheme, is_apgd_d10_employee
 from context.engine.constraint_config import get_constraint_param
 
 
-@dataclass
-class Slot:
-    """Represents a single shift slot to be filled.
+@dataclass(slots=True, eq=False)
+class SlotRequirement:
+    """Fields shared by every slot expanded from one requirement.
+    
+    Built once per requirement (within a shift group) by the slot builders; each Slot
+    points to its descriptor instead of carrying its own references. Compared
+    by identity, so descriptors can key dicts and sets.
     
     Attributes:
-        slot_id: Unique identifier for this slot (demandId-requirementId-date-shiftCode-uuid)
-        demandId: Reference to the demand item this slot fulfills
+        demandId: Reference to the demand item the slots fulfill
         requirementId: Reference to the specific requirement within the demand
-        date: Date of the shift (calendar date)
-        shiftCode: Shift code (e.g., 'D', 'N', 'O')
-        start: Shift start time (datetime)
-        end: Shift end time (datetime)
         locationId: Location where the shift is located
         ouId: Organizational unit
         productTypeId: Product type (e.g., 'APO', 'AVSO')
@@ -42,18 +42,15 @@ class Slot:
         requiredQualifications: List of required qualification codes
         rotationSequence: Rotation pattern for this requirement
         patternStartDate: Anchor date for rotation pattern calculation (shiftStartDate from demand)
+        coverageAnchor: Anchor date for coverage-day rotation
+        coverageDays: Day names this requirement covers (e.g., ['Monday', 'Tuesday', ...])
         preferredTeams: List of preferred team IDs
         whitelist: Whitelist constraints {teamIds, employeeIds}
         blacklist: Blacklist with date ranges {employeeIds: [{employeeId, blacklistStartDate, blacklistEndDate}]}
-        targetEmployeeId: For employee-based slots, the specific employee this slot is for (None for position-based)
+        productTypeIds: v2 productTypeIds array (OR matching), None if not given
     """
-    slot_id: str
     demandId: str
     requirementId: str
-    date: date
-    shiftCode: str
-    start: datetime
-    end: datetime
     locationId: str
     ouId: str
     productTypeId: str
@@ -64,11 +61,127 @@ class Slot:
     rotationSequence: List[str]
     patternStartDate: date
     coverageAnchor: date
-    coverageDays: List[str]  # Day names this requirement covers (e.g., ['Monday', 'Tuesday', ...])
+    coverageDays: List[str]
     preferredTeams: List[str]
     whitelist: Dict[str, List[str]]
     blacklist: Dict[str, List[Dict[str, str]]]
+    productTypeIds: Optional[List[str]] = None
+
+
+@dataclass(slots=True)
+class Slot:
+    """Represents a single shift slot to be filled.
+    
+    Slotted: there is one instance per headcount position per day, so only
+    per-slot values are stored here. Requirement-level fields (demandId,
+    rankIds, whitelist, blacklist, rotationSequence, ...) are read-only
+    properties forwarding to the shared SlotRequirement.
+    
+    Attributes:
+        slot_id: Unique identifier for this slot (demandId-requirementId-shiftCode-position-date-hash, stable across solves)
+        date: Date of the shift (calendar date)
+        shiftCode: Shift code (e.g., 'D', 'N', 'O')
+        start: Shift start time (datetime)
+        end: Shift end time (datetime)
+        requirement: Shared descriptor with the requirement-level fields
+        targetEmployeeId: For employee-based slots, the specific employee this slot is for (None for position-based)
+        _dayType: v2 day type for output enrichment ('Normal', 'PublicHoliday', 'EveOfPH')
+        _hasTimeOverride: v2 flag: start/end come from a dailyHeadcount override
+    """
+    slot_id: str
+    date: date
+    shiftCode: str
+    start: datetime
+    end: datetime
+    requirement: SlotRequirement
     targetEmployeeId: Optional[str] = None  # For employee-based slots
+    _dayType: str = 'Normal'
+    _hasTimeOverride: bool = False
+
+
+def _requirement_field(name: str) -> property:
+    return property(lambda slot: getattr(slot.requirement, name),
+                    doc=f"{name} of the shared SlotRequirement")
+
+
+# Requirement-level fields, readable on every slot as before
+for _name in SlotRequirement.__dataclass_fields__:
+    setattr(Slot, _name, _requirement_field(_name))
+Slot._productTypeIds = _requirement_field('productTypeIds')  # Name used by the solver engine
+del _name
+
+
+@dataclass
+class SlotColumns:
+    """Struct-of-arrays view of a slot list (index k = slot k).
+    
+    Integer columns are array.array buffers, so vectorized consumers can wrap
+    them without copying (e.g. numpy.frombuffer(columns.start_minute, dtype=numpy.int64)).
+    
+    Attributes:
+        slot_ids: Slot IDs
+        requirements: Distinct SlotRequirement descriptors (first-seen order)
+        requirement_index: 'i' index into requirements
+        shift_codes: Distinct shift codes (first-seen order)
+        shift_code_index: 'i' index into shift_codes
+        day_ordinal: 'i' date.toordinal() of the slot date
+        start_minute: 'q' shift start in minutes since 0001-01-01 00:00
+        end_minute: 'q' shift end in minutes since 0001-01-01 00:00
+        target_employee_ids: targetEmployeeId per slot (None for position-based)
+    """
+    slot_ids: List[str]
+    requirements: List[SlotRequirement]
+    requirement_index: array
+    shift_codes: List[str]
+    shift_code_index: array
+    day_ordinal: array
+    start_minute: array
+    end_minute: array
+    target_employee_ids: List[Optional[str]]
+    
+    def __len__(self) -> int:
+        return len(self.slot_ids)
+
+
+def _epoch_minute(dt: datetime) -> int:
+    return dt.toordinal() * 1440 + dt.hour * 60 + dt.minute
+
+
+def slot_columns(slots: List[Slot]) -> SlotColumns:
+    """Build the struct-of-arrays view of slots.
+    
+    Args:
+        slots: List of Slot objects
+    
+    Returns:
+        SlotColumns with one entry per slot, in list order
+    """
+    requirement_pos: Dict[int, int] = {}
+    requirements: List[SlotRequirement] = []
+    code_pos: Dict[str, int] = {}
+    columns = SlotColumns(
+        slot_ids=[], requirements=requirements, requirement_index=array('i'),
+        shift_codes=[], shift_code_index=array('i'), day_ordinal=array('i'),
+        start_minute=array('q'), end_minute=array('q'), target_employee_ids=[]
+    )
+    for slot in slots:
+        req = slot.requirement
+        k = requirement_pos.get(id(req))
+        if k is None:
+            k = requirement_pos[id(req)] = len(requirements)
+            requirements.append(req)
+        c = code_pos.get(slot.shiftCode)
+        if c is None:
+            c = code_pos[slot.shiftCode] = len(columns.shift_codes)
+            columns.shift_codes.append(slot.shiftCode)
+        columns.slot_ids.append(slot.slot_id)
+        columns.requirement_index.append(k)
+        columns.shift_code_index.append(c)
+        columns.day_ordinal.append(slot.date.toordinal())
+        columns.start_minute.append(_epoch_minute(slot.start))
+        columns.end_minute.append(_epoch_minute(slot.end))
+        columns.target_employee_ids.append(slot.targetEmployeeId)
+    return columns
 
 
 def combine(d: date, time_str: str) -> datetime:
@@ -170,6 +283,26 @@ def normalize_scheme(scheme_value: str, scheme_map: Optional[Dict[str, str]] = N
     return scheme_value
 
 
+def stable_slot_id(base: str, seen: Dict[str, int]) -> str:
+    """Slot id with a deterministic 6-hex suffix.
+    
+    The suffix hashes the base id and how often that base already occurred in the
+    current expansion, so the same demand expands to the same slot ids on every
+    solve while repeated bases (e.g. a shift code listed twice) stay unique.
+    
+    Args:
+        base: demandId-requirementId-shiftCode-<employee or position>-date
+        seen: Occurrence counts per base for the current expansion (updated)
+    
+    Returns:
+        base + "-" + 6 hex characters
+    """
+    occurrence = seen.get(base, 0)
+    seen[base] = occurrence + 1
+    suffix = hashlib.blake2b(f"{base}#{occurrence}".encode(), digest_size=3).hexdigest()
+    return f"{base}-{suffix}"
+
+
 def daterange(start: date, end: date) -> List[date]:
     """Generate a list of dates from start (inclusive) to end (inclusive).
     
@@ -213,6 +346,7 @@ def _build_employee_based_slots(inputs: Dict[str, Any], start_date: date, end_da
         List of employee-based Slot objects
     """
     slots: List[Slot] = []
+    slot_id_counts: Dict[str, int] = {}
     employees = inputs.get('_eligibleEmployees', inputs.get('employees', []))
     
     print(f"[slot_builder] EMPLOYEE-BASED SLOT GENERATION MODE")
@@ -285,6 +419,26 @@ def _build_employee_based_slots(inputs: Dict[str, Any], start_date: date, end_da
                 
                 print(f"    Requirement {requirement_id}: pattern={work_pattern}, length={pattern_length}")
                 
+                # Requirement-level fields shared by all of this requirement's slots
+                requirement = SlotRequirement(
+                    demandId=demand_id,
+                    requirementId=requirement_id,
+                    locationId=location_id,
+                    ouId=ou_id,
+                    productTypeId=product_type,
+                    rankIds=rank_ids,
+                    genderRequirement=gender_req,
+                    schemeRequirement=scheme_req,
+                    requiredQualifications=required_quals,
+                    rotationSequence=work_pattern,
+                    patternStartDate=base,
+                    coverageAnchor=coverage_anchor_date,
+                    coverageDays=coverage_days_names,
+                    preferredTeams=preferred_teams,
+                    whitelist=whitelist,
+                    blacklist=blacklist
+                )
+                
                 # Create slots for each employee based on their rotated pattern
                 employee_slots_created = 0
                 ph_skipped = 0
@@ -346,30 +500,17 @@ def _build_employee_based_slots(inputs: Dict[str, Any], start_date: date, end_da
                         
                         # Create employee-specific slot
                         # Use employee ID in slot_id to make it unique per employee
-                        slot_id = f"{demand_id}-{requirement_id}-{shift_code}-{emp_id}-{cur_day.isoformat()}-{uuid.uuid4().hex[:6]}"
+                        slot_id = stable_slot_id(
+                            f"{demand_id}-{requirement_id}-{shift_code}-{emp_id}-{cur_day.isoformat()}", slot_id_counts
+                        )
                         
                         slot = Slot(
                             slot_id=slot_id,
-                            demandId=demand_id,
-                            requirementId=requirement_id,
                             date=cur_day,
                             shiftCode=shift_code,
                             start=slot_start,
                             end=slot_end,
-                            locationId=location_id,
-                            ouId=ou_id,
-                            productTypeId=product_type,
-                            rankIds=rank_ids,
-                            genderRequirement=gender_req,
-                            schemeRequirement=scheme_req,
-                            requiredQualifications=required_quals,
-                            rotationSequence=work_pattern,
-                            patternStartDate=base,
-                            coverageAnchor=coverage_anchor_date,
-                            coverageDays=coverage_days_names,
-                            preferredTeams=preferred_teams,
-                            whitelist=whitelist,
-                            blacklist=blacklist,
+                            requirement=requirement,
                             targetEmployeeId=emp_id  # Employee-based slot: only this employee can fill it
                         )
                         slots.append(slot)
@@ -432,6 +573,7 @@ def build_slots(inputs: Dict[str, Any]) -> List[Slot]:
     scheme_map = inputs.get("schemeMap", {})
     
     slots: List[Slot] = []
+    slot_id_counts: Dict[str, int] = {}
     
     print(f"\n[slot_builder] Expanding demands into slots...")
     print(f"  Planning horizon: {start_date} to {end_date}")
@@ -811,6 +953,26 @@ def build_slots(inputs: Dict[str, Any]) -> List[Slot]:
                 
                 print(f"        Creating slots for shift codes from workPattern: {sorted(shift_codes_to_create)}")
                 
+                # Requirement-level fields shared by all of this requirement's slots
+                requirement = SlotRequirement(
+                    demandId=demand_id,
+                    requirementId=requirement_id,
+                    locationId=location_id,
+                    ouId=ou_id,
+                    productTypeId=product_type,
+                    rankIds=rank_ids,  # Changed from rankId to rankIds
+                    genderRequirement=gender_req,
+                    schemeRequirement=scheme_req,
+                    requiredQualifications=required_quals,
+                    rotationSequence=work_pattern,
+                    patternStartDate=base,
+                    coverageAnchor=coverage_anchor_date,
+                    coverageDays=coverage_days_names,
+                    preferredTeams=preferred_teams,
+                    whitelist=whitelist,
+                    blacklist=blacklist
+                )
+                
                 # Generate slots for each shift code found in workPattern
                 for shift_code in sorted(shift_codes_to_create):
                     shift_detail = details.get(shift_code)
@@ -864,29 +1026,16 @@ def build_slots(inputs: Dict[str, Any]) -> List[Slot]:
                                 end = end + timedelta(days=1)
                             
                             # Create individual slot (headcount=1 per slot)
-                            slot_id = f"{demand_id}-{requirement_id}-{shift_code}-P{position_idx}-{cur_day.isoformat()}-{uuid.uuid4().hex[:6]}"
+                            slot_id = stable_slot_id(
+                                f"{demand_id}-{requirement_id}-{shift_code}-P{position_idx}-{cur_day.isoformat()}", slot_id_counts
+                            )
                             slot = Slot(
                                 slot_id=slot_id,
-                                demandId=demand_id,
-                                requirementId=requirement_id,
                                 date=cur_day,
                                 shiftCode=shift_code,
                                 start=start,
                                 end=end,
-                                locationId=location_id,
-                                ouId=ou_id,
-                                productTypeId=product_type,
-                                rankIds=rank_ids,  # Changed from rankId to rankIds
-                                genderRequirement=gender_req,
-                                schemeRequirement=scheme_req,
-                                requiredQualifications=required_quals,
-                                rotationSequence=work_pattern,
-                                patternStartDate=base,
-                                coverageAnchor=coverage_anchor_date,
-                                coverageDays=coverage_days_names,
-                                preferredTeams=preferred_teams,
-                                whitelist=whitelist,
-                                blacklist=blacklist
+                                requirement=requirement
                             )
                             slots.append(slot)
                             position_slot_count += 1
@@ -29,12 +29,11 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import List, Dict, Any, Optional
 from datetime import datetime, date, timedelta
-import uuid
 import logging
 
 # Import base Slot class and utilities from v1 slot builder
 from context.engine.slot_builder import (
-    Slot, combine, daterange, normalize_qualifications, normalize_scheme,
+    Slot, SlotRequirement, combine, stable_slot_id, daterange, normalize_qualifications, normalize_scheme,
     _build_employee_based_slots
 )
 
@@ -143,6 +142,7 @@ def build_slots_v2(inputs: Dict[str, Any]) -> List[Slot]:
     
     scheme_map = inputs.get("schemeMap", {})
     slots: List[Slot] = []
+    slot_id_counts: Dict[str, int] = {}
     
     logger.info(f"[slot_builder_v2] Building slots with dailyHeadcount support...")
     logger.info(f"  Planning horizon: {start_date} to {end_date}")
@@ -275,6 +275,29 @@ def build_slots_v2(inputs: Dict[str, Any]) -> List[Slot]:
                 
                 logger.info(f"      Shift codes: {sorted(shift_codes_to_create)}")
                 
+                # Requirement-level fields shared by all of this requirement's slots
+                requirement = SlotRequirement(
+                    demandId=demand_id,
+                    requirementId=requirement_id,
+                    locationId=location_id,
+                    ouId=ou_id,
+                    productTypeId=product_type,
+                    rankIds=rank_ids,
+                    genderRequirement=gender_req,
+                    schemeRequirement=scheme_req,
+                    requiredQualifications=required_quals,
+                    rotationSequence=work_pattern,
+                    patternStartDate=base,
+                    coverageAnchor=coverage_anchor_date,
+                    coverageDays=coverage_days_names,
+                    preferredTeams=preferred_teams,
+                    whitelist=whitelist,
+                    blacklist=blacklist,
+                    # === v2 CHANGE: productTypeIds array for OR matching ===
+                    # This allows solver_engine to match employee against multiple product types
+                    productTypeIds=product_type_ids if product_type_ids else None
+                )
+                
                 # Generate slots
                 for shift_code in sorted(shift_codes_to_create):
                     shift_detail = details.get(shift_code)
@@ -345,42 +368,23 @@ def build_slots_v2(inputs: Dict[str, Any]) -> List[Slot]:
                                 slot_end = slot_end + timedelta(days=1)
                             
                             # Create slot with dayType metadata
-                            slot_id = f"{demand_id}-{requirement_id}-{shift_code}-P{position_idx}-{cur_day.isoformat()}-{uuid.uuid4().hex[:6]}"
+                            slot_id = stable_slot_id(
+                                f"{demand_id}-{requirement_id}-{shift_code}-P{position_idx}-{cur_day.isoformat()}", slot_id_counts
+                            )
                             
                             slot = Slot(
                                 slot_id=slot_id,
-                                demandId=demand_id,
-                                requirementId=requirement_id,
                                 date=cur_day,
                                 shiftCode=shift_code,
                                 start=slot_start,
                                 end=slot_end,
-                                locationId=location_id,
-                                ouId=ou_id,
-                                productTypeId=product_type,
-                                rankIds=rank_ids,
-                                genderRequirement=gender_req,
-                                schemeRequirement=scheme_req,
-                                requiredQualifications=required_quals,
-                                rotationSequence=work_pattern,
-                                patternStartDate=base,
-                                coverageAnchor=coverage_anchor_date,
-                                coverageDays=coverage_days_names,
-                                preferredTeams=preferred_teams,
-                                whitelist=whitelist,
-                                blacklist=blacklist
+                                requirement=requirement,
+                                # Store dayType as metadata on slot for output enrichment
+                                _dayType=day_type,
+                                # Store time override flag for output enrichment
+                                _hasTimeOverride=(day_start_override is not None or day_end_override is not None)
                             )
                             
-                            # Store dayType as metadata on slot for output enrichment
-                            slot._dayType = day_type
-                            
-                            # === v2 CHANGE: Store productTypeIds array for OR matching ===
-                            # This allows solver_engine to match employee against multiple product types
-                            slot._productTypeIds = product_type_ids if product_type_ids else None
-                            
-                            # Store time override flag for output enrichment
-                            slot._hasTimeOverride = (day_start_override is not None or day_end_override is not None)
-                            
                             slots.append(slot)
                             slots_created_for_shift += 1
                     
@@ -0,0 +1,257 @@
+"""Cached Slot Expansion.
+
+build_slots / build_slots_v2 re-expand the demand on every solve, although
+resubmissions, incremental re-solves and what-if runs mostly send the same
+demand definition and horizon again. This module keys each expansion by a
+content hash of everything the builders read and reuses it:
+
+  - key: sha256 of the canonical JSON of the builder version, demandItems,
+    planningHorizon, publicHolidays, schemeMap, _rosteringBasis and
+    _useEmployeeBasedSlots. Employee-dependent expansions (employee-based
+    slots, outcomeBased) also hash the employee list and constraintList.
+  - in-process LRU of SLOT_CACHE_SIZE expansions (0 disables caching)
+  - optional on-disk pickles under SLOT_CACHE_DIR, shared by all worker
+    processes on a host and surviving restarts
+
+Slot ids are deterministic (slot_builder.stable_slot_id), so a cached
+expansion is indistinguishable from a fresh one. Context keys the builders
+set as a side effect (_selectedEmployeeIds, _targetEmployeeCount) are stored
+with the expansion and replayed on a hit. Slots are shared between solves and
+must be treated as read-only.
+
+A date window (start/end) returns the slots of those days from the full
+horizon expansion without rebuilding it; incremental solves use this for
+their solvable window.
+
+Usage:
+    from context.engine.slot_cache import cached_build_slots
+    slots = cached_build_slots(ctx, 'v2')
+    window = cached_build_slots(ctx, 'v1', start=date(2026, 3, 10), end=date(2026, 3, 16))
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from context.engine.slot_builder import Slot, build_slots
+from context.engine.slot_builder_v2 import build_slots_v2
+
+logger = logging.getLogger(__name__)
+
+SLOT_CACHE_SIZE = int(os.getenv('SLOT_CACHE_SIZE', '16'))
+SLOT_CACHE_DIR = os.getenv('SLOT_CACHE_DIR', '')
+
+BUILDERS = {'v1': build_slots, 'v2': build_slots_v2}
+
+# Keys every expansion depends on
+_KEY_FIELDS = ('demandItems', 'planningHorizon', 'publicHolidays', 'schemeMap',
+               '_rosteringBasis', '_useEmployeeBasedSlots')
+# Additional keys read by employee-based and outcomeBased expansions
+_EMPLOYEE_KEY_FIELDS = ('employees', '_eligibleEmployees', 'constraintList')
+# Context keys the builders write as a side effect
+_CONTEXT_UPDATE_KEYS = ('_selectedEmployeeIds', '_targetEmployeeCount')
+
+
+@dataclass
+class SlotExpansion:
+    """Slots expanded for one demand definition and horizon"""
+    key: str
+    builder: str
+    slots: Tuple[Slot, ...]
+    context_updates: Dict[str, Any]
+
+    def window(self, start: Optional[date] = None, end: Optional[date] = None) -> List[Slot]:
+        """Slots dated within [start, end] (either bound optional), in expansion order"""
+        if start is None and end is None:
+            return list(self.slots)
+        return [
+            slot for slot in self.slots
+            if (start is None or slot.date >= start) and (end is None or slot.date <= end)
+        ]
+
+    def apply_context_updates(self, inputs: Dict[str, Any]) -> None:
+        """Replay the builder's side effects on a solve context"""
+        for name, value in self.context_updates.items():
+            inputs[name] = set(value) if isinstance(value, (set, frozenset)) else value
+
+
+def _employee_dependent(inputs: Dict[str, Any]) -> bool:
+    return bool(inputs.get('_useEmployeeBasedSlots')) or inputs.get('_rosteringBasis') == 'outcomeBased'
+
+
+def expansion_key(inputs: Dict[str, Any], builder: str = 'v1') -> str:
+    """
+    Content hash of everything the slot builder reads from inputs.
+
+    Args:
+        inputs: Solve context
+        builder: 'v1' (build_slots) or 'v2' (build_slots_v2)
+
+    Returns:
+        Hex sha256 digest
+    """
+    fields = _KEY_FIELDS + (_EMPLOYEE_KEY_FIELDS if _employee_dependent(inputs) else ())
+    payload = {'builder': builder, **{name: inputs.get(name) for name in fields}}
+    canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class SlotCache:
+    """LRU of slot expansions with an optional on-disk pickle store"""
+
+    def __init__(self, max_entries: int = SLOT_CACHE_SIZE, directory: Optional[str] = None):
+        """
+        Args:
+            max_entries: Expansions kept in memory (0 disables the cache)
+            directory: Directory for <key>.pkl files shared across processes
+                (None = memory only)
+        """
+        self.max_entries = max(0, int(max_entries))
+        self.directory = directory or None
+        self._entries: 'OrderedDict[str, SlotExpansion]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if self.directory and self.max_entries:
+            os.makedirs(self.directory, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, key: str) -> Optional[SlotExpansion]:
+        """Cached expansion for key (memory first, then disk) or None"""
+        with self._lock:
+            expansion = self._entries.get(key)
+            if expansion is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return expansion
+        expansion = self._load(key)
+        with self._lock:
+            if expansion is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, expansion)
+        return expansion
+
+    def put(self, expansion: SlotExpansion) -> None:
+        """Store an expansion in memory and, if configured, on disk"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._remember(expansion.key, expansion)
+        self._store(expansion)
+
+    def clear(self) -> None:
+        """Drop the in-memory entries and counters (disk files are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.disk_hits = self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters (for logging and benchmarks)"""
+        with self._lock:
+            return {'hits': self.hits, 'disk_hits': self.disk_hits,
+                    'misses': self.misses, 'size': len(self._entries)}
+
+    def _remember(self, key: str, expansion: SlotExpansion) -> None:
+        self._entries[key] = expansion
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def _load(self, key: str) -> Optional[SlotExpansion]:
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(key), 'rb') as f:
+                expansion = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:  # Truncated or stale file: rebuild and overwrite it
+            logger.warning(f"[slot_cache] Ignoring unreadable cache file for {key[:12]}: {e}")
+            return None
+        return expansion if isinstance(expansion, SlotExpansion) and expansion.key == key else None
+
+    def _store(self, expansion: SlotExpansion) -> None:
+        if not self.directory:
+            return
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(expansion, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(expansion.key))
+        except OSError as e:
+            logger.warning(f"[slot_cache] Could not write cache file for {expansion.key[:12]}: {e}")
+
+
+_default_cache = SlotCache(SLOT_CACHE_SIZE, SLOT_CACHE_DIR)
+
+
+def get_slot_cache() -> SlotCache:
+    """Process-wide cache configured from SLOT_CACHE_SIZE / SLOT_CACHE_DIR"""
+    return _default_cache
+
+
+def get_expansion(inputs: Dict[str, Any], builder: str = 'v1',
+                  cache: Optional[SlotCache] = None) -> SlotExpansion:
+    """
+    Full-horizon expansion for inputs, built on a cache miss.
+
+    Side-effect context keys are replayed on inputs either way.
+
+    Args:
+        inputs: Solve context
+        builder: 'v1' (build_slots) or 'v2' (build_slots_v2)
+        cache: Cache to use (default: the process-wide cache)
+
+    Returns:
+        SlotExpansion
+    """
+    cache = cache or _default_cache
+    key = expansion_key(inputs, builder) if cache.enabled else ''
+    expansion = cache.get(key) if cache.enabled else None
+    if expansion is not None:
+        print(f"[slot_cache] ✓ Reusing {len(expansion.slots)} cached slots ({builder}, key {key[:12]})")
+        expansion.apply_context_updates(inputs)
+        return expansion
+
+    slots = BUILDERS[builder](inputs)
+    context_updates = {name: inputs[name] for name in _CONTEXT_UPDATE_KEYS if name in inputs}
+    expansion = SlotExpansion(key=key, builder=builder, slots=tuple(slots),
+                              context_updates=context_updates)
+    cache.put(expansion)
+    return expansion
+
+
+def cached_build_slots(inputs: Dict[str, Any], builder: str = 'v1',
+                       start: Optional[date] = None, end: Optional[date] = None,
+                       cache: Optional[SlotCache] = None) -> List[Slot]:
+    """
+    Drop-in for build_slots / build_slots_v2 backed by the slot cache.
+
+    Args:
+        inputs: Solve context
+        builder: 'v1' (build_slots) or 'v2' (build_slots_v2)
+        start: First date of the window to return (default: horizon start)
+        end: Last date of the window to return (default: horizon end)
+        cache: Cache to use (default: the process-wide cache)
+
+    Returns:
+        New list of (shared, read-only) Slot objects
+    """
+    return get_expansion(inputs, builder, cache).window(start, end)
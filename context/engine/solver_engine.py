@@ -12,9 +12,11 @@ import os
 from collections import defaultdict
 from .data_loader import load_input
 from .score_helpers import ScoreBook
-from .slot_builder import build_slots, normalize_scheme
-from .slot_builder_v2 import build_slots_v2
+from .slot_builder import normalize_scheme
+from .slot_cache import cached_build_slots
 from .time_utils import is_apgd_d10_employee
+from .thread_budget import search_threads
+from .availability import get_availability_calendar
 
 # Optimization mode constants
 OPTIMIZATION_MODE_BALANCE = "balanceWorkload"
@@ -101,9 +103,12 @@ def build_model(ctx):
     - Headcount: Each slot gets exactly as many assignments as headcount requires
     - One assignment per day per employee: No employee assigned to multiple slots on same day
     
+    Employee-slot pairs on an employee's unavailable days or inside a shift
+    blacklist window get no variable (see context/engine/availability.py).
+    
     INCREMENTAL MODE SUPPORT (v0.80):
     - If ctx['_incremental'] exists, builds model only for solvable slots
-    - Filters employee-slot pairs based on availability windows
+    - Filters employee-slot pairs based on availability windows (long leave, new joiners)
     - Passes incremental context to constraints via ctx
     
     Args:
@@ -127,9 +132,6 @@ def build_model(ctx):
         # But to avoid Slot() constructor issues, let's use the regular flow
         # and filter slots based on solvable slot IDs
         
-        # Build all slots first
-        slots = build_slots(ctx)
-        
         # Filter to only solvable slots by matching (date, demandId, shiftCode)
         # Cannot match by slotId since previous output slotIds differ from newly generated ones
         # Note: solvable slots have date as string, built slots have date as date object
@@ -137,6 +139,14 @@ def build_model(ctx):
             (s.get('date'), s.get('demandId'), s.get('shiftCode'))
             for s in incremental_ctx['solvableSlots']
         }
+        
+        # Slots of the solvable date window, sliced from the cached full-horizon expansion
+        solvable_dates = sorted(key[0] for key in solvable_keys if key[0])
+        slots = cached_build_slots(
+            ctx, 'v1',
+            start=date.fromisoformat(solvable_dates[0]) if solvable_dates else None,
+            end=date.fromisoformat(solvable_dates[-1]) if solvable_dates else None
+        )
         print(f"[DEBUG] Solvable keys sample (first 3): {list(solvable_keys)[:3]}")
         original_count = len(slots)
         if slots:
@@ -156,10 +166,10 @@ def build_model(ctx):
         
         if use_v2:
             print(f"[build_model] Using v2 slot builder (dailyHeadcount support)")
-            slots = build_slots_v2(ctx)
+            slots = cached_build_slots(ctx, 'v2')
             ctx['_usedV2SlotBuilder'] = True
         else:
-            slots = build_slots(ctx)
+            slots = cached_build_slots(ctx, 'v1')
             ctx['_usedV2SlotBuilder'] = False
     
     ctx['slots'] = slots  # Store in context for constraint use
@@ -229,7 +239,9 @@ def build_model(ctx):
     product_filtered = 0
     rank_filtered = 0
     blacklist_filtered = 0
+    unavailable_filtered = 0
     ou_selection_filtered = 0  # v0.98: Track OU-based filtering
+    calendar = get_availability_calendar(ctx)
     
     for slot in slots:
         for emp in employees:
@@ -302,60 +314,15 @@ def build_model(ctx):
             if not scheme_allowed:
                 continue
             
-            # v0.70: Check blacklist date ranges
-            blacklist = slot.blacklist
-            blacklist_allowed = True
-            
-            if blacklist and 'employeeIds' in blacklist:
-                for bl_entry in blacklist['employeeIds']:
-                    if bl_entry.get('employeeId') == emp_id:
-                        # Check if slot date falls within blacklist range
-                        bl_start = bl_entry.get('blacklistStartDate', '')
-                        bl_end = bl_entry.get('blacklistEndDate', '')
-                        
-                        if bl_start and bl_end:
-                            try:
-                                from datetime import datetime as dt
-                                start_date = dt.fromisoformat(bl_start).date()
-                                end_date = dt.fromisoformat(bl_end).date()
-                                
-                                if start_date <= slot.date <= end_date:
-                                    blacklist_allowed = False
-                                    blacklist_filtered += 1
-                                    break
-                            except:
-                                pass  # If date parsing fails, allow assignment
-            
-            if not blacklist_allowed:
+            # Availability calendar: unavailability / leave days, then this
+            # shift's blacklist (v0.70 date ranges) - no variable is created
+            # for an employee-day that could never be kept
+            if not calendar.is_available(emp_id, slot.date):
+                unavailable_filtered += 1
+                continue
+            if slot.blacklist and calendar.is_blacklisted(emp_id, slot.date, slot.blacklist):
+                blacklist_filtered += 1
                 continue
-            
-            # INCREMENTAL MODE: Check employee availability windows
-            if incremental_ctx:
-                availability_allowed = True
-                
-                # Check if employee is new joiner with availableFrom constraint
-                new_joiners = incremental_ctx.get('employeeChanges', {}).get('newJoiners', [])
-                for joiner in new_joiners:
-                    if joiner.get('employee', {}).get('employeeId') == emp_id:
-                        from datetime import datetime as dt
-                        available_from = dt.fromisoformat(joiner['availableFrom']).date()
-                        if slot.date < available_from:
-                            availability_allowed = False
-                            break
-                
-                # Check if employee is on long leave during this slot
-                long_leave_list = incremental_ctx.get('employeeChanges', {}).get('longLeave', [])
-                for leave in long_leave_list:
-                    if leave.get('employeeId') == emp_id:
-                        from datetime import datetime as dt
-                        leave_from = dt.fromisoformat(leave['leaveFrom']).date()
-                        leave_to = dt.fromisoformat(leave['leaveTo']).date()
-                        if leave_from <= slot.date <= leave_to:
-                            availability_allowed = False
-                            break
-                
-                if not availability_allowed:
-                    continue
             
             # Check whitelist constraints
             whitelist = slot.whitelist
@@ -393,6 +360,8 @@ def build_model(ctx):
         print(f"  ℹ️  Filtered {scheme_filtered} employee-slot pairs based on scheme requirement")
     if blacklist_filtered > 0:
         print(f"  ℹ️  Filtered {blacklist_filtered} employee-slot pairs based on blacklist date ranges")
+    if unavailable_filtered > 0:
+        print(f"  ℹ️  Filtered {unavailable_filtered} employee-slot pairs on unavailable/leave days")
     print(f"  ℹ️  Work pattern enforcement will be handled as hard constraints")
     
     # ========== NEW: UNASSIGNED SLOT VARIABLES ==========
@@ -1415,14 +1384,20 @@ def calculate_scores(ctx, assignments) -> tuple:
     assigned_slots = [a for a in assignments if a.get('status') == 'ASSIGNED']
     
     # ========== POST-SOLUTION CONSTRAINT VALIDATION ==========
-    from context.engine.time_utils import split_shift_hours
+    from context.engine.hour_cache import shape_breakdown
+    from context.engine.timeline import get_slot_timeline
     from collections import defaultdict
     from datetime import datetime
     
+    # Integer-minute positions of the solved slots; assignments without a
+    # known slot (e.g. carried over from elsewhere) are placed from their times
+    timeline = get_slot_timeline(ctx)
+    assignment_span = {}  # id(assignment) -> (start_min, end_min)
+    
     # Aggregate assignments by employee and date (only assigned slots)
     emp_assignments_by_date = defaultdict(list)  # (emp_id, date) -> [assignments]
-    emp_assignments_by_week = defaultdict(list)  # (emp_id, week) -> [assignments]
-    emp_assignments_by_month = defaultdict(list)  # (emp_id, month) -> [assignments]
+    emp_assignments_by_week = defaultdict(list)  # (emp_id, week index) -> [assignments]
+    emp_assignments_by_month = defaultdict(list)  # (emp_id, month index) -> [assignments]
     
     employees = {emp.get('employeeId'): emp for emp in ctx.get('employees', [])}
     
@@ -1431,19 +1406,30 @@ def calculate_scores(ctx, assignments) -> tuple:
         date_str = a.get('date')
         
         try:
-            date_obj = datetime.fromisoformat(date_str).date()
-            iso_year, iso_week, _ = date_obj.isocalendar()
-            
-            week_key = (emp_id, f"{iso_year}-W{iso_week:02d}")
-            month_key = (emp_id, f"{iso_year}-{date_obj.month:02d}")
-            date_key = (emp_id, date_str)
+            i = timeline.position.get(a.get('slotId'))
+            if i is not None:
+                span = (timeline.start_min[i], timeline.end_min[i])
+                week_index, month_index = timeline.iso_week_index[i], timeline.month_index[i]
+            else:
+                span = (timeline.minute(datetime.fromisoformat(a.get('startDateTime'))),
+                        timeline.minute(datetime.fromisoformat(a.get('endDateTime'))))
+                week_index, month_index = timeline.week(date_str), timeline.month(date_str)
+            assignment_span[id(a)] = span
             
-            emp_assignments_by_date[date_key].append(a)
-            emp_assignments_by_week[week_key].append(a)
-            emp_assignments_by_month[month_key].append(a)
+            emp_assignments_by_date[(emp_id, date_str)].append(a)
+            emp_assignments_by_week[(emp_id, week_index)].append(a)
+            emp_assignments_by_month[(emp_id, month_index)].append(a)
         except:
             pass
     
+    def hours_of(a):
+        start_min, end_min = assignment_span[id(a)]
+        return shape_breakdown(start_min, end_min - start_min)
+    
+    def week_label(week_index):
+        iso_year, iso_week = timeline.week_label(week_index)
+        return f"{iso_year}-W{iso_week:02d}"
+    
     # ========== C1 CHECK: Daily Gross Hours by Scheme ==========
     max_gross_by_scheme = {'A': 14, 'B': 13, 'P': 9}
     for (emp_id, date_str), day_assignments in emp_assignments_by_date.items():
@@ -1451,17 +1437,12 @@ def calculate_scores(ctx, assignments) -> tuple:
         scheme = emp.get('scheme', 'A')
         max_gross = max_gross_by_scheme.get(scheme, 14)
         
-        daily_gross = 0
-        for a in day_assignments:
-            start = datetime.fromisoformat(a.get('startDateTime'))
-            end = datetime.fromisoformat(a.get('endDateTime'))
-            hours_dict = split_shift_hours(start, end)
-            daily_gross += hours_dict['gross']
+        daily_gross_minutes = sum(hours_of(a).gross_minutes for a in day_assignments)
         
-        if daily_gross > max_gross:
+        if daily_gross_minutes > max_gross * 60:
             score_book.hard(
                 "C1",
-                f"{emp_id} on {date_str}: {daily_gross}h exceeds scheme {scheme} limit ({max_gross}h)"
+                f"{emp_id} on {date_str}: {daily_gross_minutes / 60}h exceeds scheme {scheme} limit ({max_gross}h)"
             )
     
     # ========== C2a CHECK: Weekly Normal Hours (44h cap) ==========
@@ -1473,48 +1454,41 @@ def calculate_scores(ctx, assignments) -> tuple:
         if is_apgd_d10_employee(emp):
             apgd_employees.add(emp.get('employeeId'))
     
-    for (emp_id, week_key), week_assignments in emp_assignments_by_week.items():
+    for (emp_id, week_index), week_assignments in emp_assignments_by_week.items():
         # Skip APGD-D10 employees (exempt from weekly cap)
         if emp_id in apgd_employees:
             continue
         
         # FIX (28 Jan 2026): Calculate normal hours using WEEK-SPECIFIC thresholds
         # This matches the CP-SAT constraint logic where normal = 44h / work_days_this_week
+        # (minutes scaled by the week's work days, so the threshold is exactly 44h)
         work_days_this_week = len(week_assignments)
-        if work_days_this_week > 0:
-            normal_per_shift = 44.0 / work_days_this_week
-        else:
-            normal_per_shift = 8.8  # Default
         
-        weekly_normal = 0
+        weekly_normal_scaled = 0
         for a in week_assignments:
-            start = datetime.fromisoformat(a.get('startDateTime'))
-            end = datetime.fromisoformat(a.get('endDateTime'))
-            gross = (end - start).total_seconds() / 3600.0
+            start_min, end_min = assignment_span[id(a)]
+            gross_minutes = end_min - start_min
             # Normal hours = min(threshold, gross - lunch)
             # For simplicity, assume 1h lunch for 12h shifts
-            lunch = 1.0 if gross >= 6 else 0.0
-            weekly_normal += min(normal_per_shift, gross - lunch)
+            lunch_minutes = 60 if gross_minutes >= 6 * 60 else 0
+            weekly_normal_scaled += min(44 * 60, (gross_minutes - lunch_minutes) * work_days_this_week)
         
-        if weekly_normal > 44.0:
+        if weekly_normal_scaled > 44 * 60 * work_days_this_week:
+            weekly_normal = weekly_normal_scaled / (60 * work_days_this_week)
             score_book.hard(
                 "C2",
-                f"{emp_id} in {week_key}: {weekly_normal:.1f}h exceeds 44h weekly normal cap"
+                f"{emp_id} in {week_label(week_index)}: {weekly_normal:.1f}h exceeds 44h weekly normal cap"
             )
     
     # ========== C17 CHECK: Monthly OT Hours (month-dependent cap from monthlyHourLimits) ==========
     from context.engine.constraint_config import get_monthly_hour_limits
     
-    for (emp_id, month_key), month_assignments in emp_assignments_by_month.items():
-        monthly_ot = 0
-        for a in month_assignments:
-            start = datetime.fromisoformat(a.get('startDateTime'))
-            end = datetime.fromisoformat(a.get('endDateTime'))
-            hours_dict = split_shift_hours(start, end)
-            monthly_ot += hours_dict['ot']
+    for (emp_id, month_index), month_assignments in emp_assignments_by_month.items():
+        monthly_ot = sum(hours_of(a).hours['ot'] for a in month_assignments)
         
         # FIX (28 Jan 2026): Get month-specific OT cap from monthlyHourLimits
-        year, month = map(int, month_key.split('-'))
+        year, month = timeline.month_label(month_index)
+        month_key = f"{year}-{month:02d}"
         employee = employees.get(emp_id, {})
         monthly_limits = get_monthly_hour_limits(ctx, employee, year, month)
         monthly_ot_cap = monthly_limits.get('maxOvertimeHours', 72.0)
@@ -1606,7 +1580,7 @@ def calculate_scores(ctx, assignments) -> tuple:
     
     # ========== C6 CHECK: Part-Timer Weekly Limits ==========
     part_timer_limits = {'≤4_days': 34.98, '>4_days': 29.98}
-    for (emp_id, week_key), week_assignments in emp_assignments_by_week.items():
+    for (emp_id, week_index), week_assignments in emp_assignments_by_week.items():
         emp = employees.get(emp_id, {})
         scheme = emp.get('scheme', 'A')
         
@@ -1618,18 +1592,13 @@ def calculate_scores(ctx, assignments) -> tuple:
         working_days = len(set((a.get('date') for a in week_assignments)))
         
         # Calculate normal hours
-        weekly_normal = 0
-        for a in week_assignments:
-            start = datetime.fromisoformat(a.get('startDateTime'))
-            end = datetime.fromisoformat(a.get('endDateTime'))
-            hours_dict = split_shift_hours(start, end)
-            weekly_normal += hours_dict['normal']
+        weekly_normal = sum(hours_of(a).hours['normal'] for a in week_assignments)
         
         limit = 34.98 if working_days <= 4 else 29.98
         if weekly_normal > limit:
             score_book.hard(
                 "C6",
-                f"{emp_id} (scheme P) in {week_key}: {weekly_normal:.1f}h exceeds limit {limit}h for {working_days} days"
+                f"{emp_id} (scheme P) in {week_label(week_index)}: {weekly_normal:.1f}h exceeds limit {limit}h for {working_days} days"
             )
     
     # ========== C7 CHECK: License Validity on Shift Date ==========
@@ -1967,8 +1936,22 @@ def solve(ctx):
     
     solver = cp_model.CpSolver()
     solver.parameters.max_time_in_seconds = time_limit
-    solver.parameters.num_search_workers = num_search_workers
-    status = solver.Solve(model)
+    
+    # Fixed seed for reproducible runs (benchmarks, regression comparisons)
+    cpsat_seed = os.getenv("CPSAT_RANDOM_SEED")
+    if cpsat_seed:
+        try:
+            solver.parameters.random_seed = int(cpsat_seed)
+            print(f"  Random seed: {solver.parameters.random_seed} (env)")
+        except ValueError:
+            pass
+    
+    # Draw threads from the host-wide budget when running inside the worker pool
+    with search_threads(num_search_workers) as granted_workers:
+        if granted_workers != num_search_workers:
+            print(f"  Parallel search workers granted by host budget: {granted_workers}")
+        solver.parameters.num_search_workers = granted_workers
+        status = solver.Solve(model)
     
     print(f"[solve] Raw status code: {status} (OPTIMAL={cp_model.OPTIMAL}, FEASIBLE={cp_model.FEASIBLE}, INFEASIBLE={cp_model.INFEASIBLE}, MODEL_INVALID={cp_model.MODEL_INVALID})")
     
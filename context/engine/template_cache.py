@@ -0,0 +1,221 @@
+"""Memoized Outcome-Based Templates.
+
+Template rostering (cpsat_template_generator, and template_roster in
+incremental mode) builds one template per OU group and replicates it to the
+group's employees. OUs whose template employees share a rotation offset,
+scheme, product, rank and qualifications produce the same template. Their
+inputs differ only in the template employee's ID, and replication overwrites
+that. This module keys each template by a content hash of everything the
+generator reads, and reuses it:
+
+  - key: sha256 of the canonical JSON of the generator name and version, the
+    template employee without identity and replication-only fields (ID, OU,
+    team, unavailability, preferences), the generator inputs (work pattern,
+    shift details, coverage days, horizon, public holidays and PH settings,
+    requirement, demand), and the context's constraintList,
+    monthlyHourLimits and schemeMap
+  - in-process LRU of TEMPLATE_CACHE_SIZE templates (0 disables caching),
+    shared by OUs, requirements and requests handled by the process
+  - optional on-disk pickles under TEMPLATE_CACHE_DIR, shared by all worker
+    processes on a host and surviving restarts
+
+Empty templates (solver failure or timeout) are not cached. Cached templates
+are shared and must be treated as read-only: replication deep-copies each
+assignment before writing the employee's ID into it.
+
+Lookups, per-request merging of identical OU groups and building the misses
+(in parallel when worthwhile) are done by template_pool.build_templates.
+
+Usage:
+    key = template_key('cpsat', template_emp, inputs, ctx)
+    template = get_template_cache().get_or_build(key, build, stats)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_CACHE_SIZE = int(os.getenv('TEMPLATE_CACHE_SIZE', '256'))
+TEMPLATE_CACHE_DIR = os.getenv('TEMPLATE_CACHE_DIR', '')
+
+# Bump when a generator changes what it produces for the same inputs
+TEMPLATE_CACHE_VERSION = 1
+
+# Employee fields the generators do not read (identity, or used only when replicating)
+_REPLICATION_ONLY_FIELDS = frozenset({
+    'employeeId', 'ouId', 'organizationalUnitId', 'teamId', 'unavailability', 'preferences'
+})
+# Context keys the generators read (constraint parameters, hour limits, scheme names)
+_CONTEXT_KEY_FIELDS = ('constraintList', 'monthlyHourLimits', 'schemeMap')
+
+
+def template_context(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    """The part of the solve context template generators read (and template_key covers)"""
+    return {name: ctx[name] for name in _CONTEXT_KEY_FIELDS if name in ctx}
+
+
+def template_key(generator: str, template_emp: Dict[str, Any], inputs: Dict[str, Any],
+                 ctx: Dict[str, Any]) -> str:
+    """
+    Content hash of everything a template generator reads.
+
+    Args:
+        generator: 'cpsat' or 'incremental'
+        template_emp: Employee the template is built for
+        inputs: Generator inputs (pattern, shift details, dates, requirement, demand, ...)
+        ctx: Solve context
+
+    Returns:
+        Hex sha256 digest
+    """
+    payload = {
+        'generator': generator,
+        'version': TEMPLATE_CACHE_VERSION,
+        'employee': {k: v for k, v in template_emp.items() if k not in _REPLICATION_ONLY_FIELDS},
+        'inputs': inputs,
+        'context': template_context(ctx),
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def new_template_stats() -> Dict[str, int]:
+    """
+    Per-roster counters reported in the solve output (solverRun.templateCache).
+
+    workers is the most processes templates were built on (1 = sequential).
+    """
+    return {'templates': 0, 'solved': 0, 'hits': 0, 'persistentHits': 0, 'workers': 1}
+
+
+class TemplateCache:
+    """LRU of built templates with an optional on-disk pickle store"""
+
+    def __init__(self, max_entries: int = TEMPLATE_CACHE_SIZE, directory: Optional[str] = None):
+        """
+        Args:
+            max_entries: Templates kept in memory (0 disables the cache)
+            directory: Directory for <key>.pkl files shared across processes
+                (None = memory only)
+        """
+        self.max_entries = max(0, int(max_entries))
+        self.directory = directory or None
+        self._entries: 'OrderedDict[str, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+        if self.directory and self.max_entries:
+            os.makedirs(self.directory, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Template from memory, or None"""
+        with self._lock:
+            template = self._entries.get(key)
+            if template is not None:
+                self._entries.move_to_end(key)
+            return template
+
+    def load(self, key: str) -> Optional[Any]:
+        """Template from disk (remembered in memory on success), or None"""
+        template = self._load(key)
+        if template is not None:
+            with self._lock:
+                self._remember(key, template)
+        return template
+
+    def put(self, key: str, template: Any) -> None:
+        """Store a template in memory and, if configured, on disk"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._remember(key, template)
+        self._store(key, template)
+
+    def clear(self) -> None:
+        """Drop the in-memory entries (disk files are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_or_build(self, key: str, build: Callable[[], Any],
+                     stats: Optional[Dict[str, int]] = None) -> Any:
+        """
+        Cached template for key, built (and cached unless empty) on a miss.
+
+        Args:
+            key: template_key(...)
+            build: Builds the template
+            stats: new_template_stats() counters to update
+
+        Returns:
+            Template (shared when cached; do not mutate)
+        """
+        stats = stats if stats is not None else new_template_stats()
+        stats['templates'] += 1
+        if self.enabled:
+            template = self.get(key)
+            if template is not None:
+                stats['hits'] += 1
+                return template
+            template = self.load(key)
+            if template is not None:
+                stats['hits'] += 1
+                stats['persistentHits'] += 1
+                return template
+
+        template = build()
+        stats['solved'] += 1
+        if template:
+            self.put(key, template)
+        return template
+
+    def _remember(self, key: str, template: Any) -> None:
+        self._entries[key] = template
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def _load(self, key: str) -> Optional[Any]:
+        if not self.directory or not self.enabled:
+            return None
+        try:
+            with open(self._path(key), 'rb') as f:
+                stored_key, template = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:  # Truncated or stale file: rebuild and overwrite it
+            logger.warning(f"[template_cache] Ignoring unreadable cache file for {key[:12]}: {e}")
+            return None
+        return template if stored_key == key else None
+
+    def _store(self, key: str, template: Any) -> None:
+        if not self.directory:
+            return
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((key, template), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            logger.warning(f"[template_cache] Could not write cache file for {key[:12]}: {e}")
+
+
+_default_cache = TemplateCache(TEMPLATE_CACHE_SIZE, TEMPLATE_CACHE_DIR)
+
+
+def get_template_cache() -> TemplateCache:
+    """Process-wide cache configured from TEMPLATE_CACHE_SIZE / TEMPLATE_CACHE_DIR"""
+    return _default_cache
+
@@ -0,0 +1,164 @@
+"""Parallel Per-OU Template Generation.
+
+Template rostering builds one template per OU group: a small CP-SAT model
+(cpsat_template_generator._build_and_solve_template) or an incremental
+validation run (template_roster._generate_validated_template). Templates do
+not depend on each other. build_templates first merges identical groups via
+template_cache, builds the first remaining template in-process and, if the
+rest are estimated to be worth it, builds them in a process pool. The total
+time then approaches the slowest template per worker instead of the sum.
+
+  - TEMPLATE_POOL_WORKERS: processes (0 = auto, up to 4 by CPU count divided
+    by the threads per model; 1 = sequential)
+  - TEMPLATE_PARALLEL_MIN_MS: only go parallel when the remaining templates
+    are estimated, from the first one, to take at least this long (default
+    200 ms; starting a pool costs tens of milliseconds)
+  - TEMPLATE_SEARCH_WORKERS: CP-SAT search threads per template model
+    (default 1). The same count is used on the sequential and the parallel
+    path, so a template does not depend on which path built it. With a host
+    SearchThreadBudget installed, threads are drawn from it (pool processes
+    fork with it), and the pool never has more processes than the budget's
+    capacity allows at this thread count.
+
+Templates come back in job (OU) order, so the merged roster is the same as a
+sequential run. Falls back to sequential when a pool cannot be started
+(e.g. inside a daemon process).
+
+Usage:
+    jobs = [TemplateJob(key, _build_and_solve_template, kwargs) for each OU group]
+    templates = build_templates(jobs, template_stats)
+"""
+
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from context.engine.template_cache import TemplateCache, get_template_cache, new_template_stats
+from context.engine.thread_budget import get_search_thread_budget
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TemplateJob:
+    """One OU group's template: cache key and a picklable (module-level) builder call"""
+    key: str
+    build: Callable[..., Any]
+    kwargs: Dict[str, Any]
+
+
+def template_search_workers() -> int:
+    """CP-SAT search threads per template model (TEMPLATE_SEARCH_WORKERS)"""
+    return max(1, int(os.getenv('TEMPLATE_SEARCH_WORKERS', '1')))
+
+
+def template_pool_workers(threads_per_model: int = 1) -> int:
+    """
+    Process count for template generation.
+
+    Args:
+        threads_per_model: Search threads each template model uses
+
+    Returns:
+        TEMPLATE_POOL_WORKERS (0 = auto: up to 4, and at most CPU count /
+        threads_per_model), capped by an installed search thread budget
+    """
+    threads_per_model = max(1, threads_per_model)
+    configured = int(os.getenv('TEMPLATE_POOL_WORKERS', '0'))
+    if configured > 0:
+        workers = configured
+    else:
+        workers = min(4, (os.cpu_count() or 1) // threads_per_model)
+    budget = get_search_thread_budget()
+    if budget is not None:
+        workers = min(workers, budget.capacity // threads_per_model)
+    return max(1, workers)
+
+
+def _run_job(job: TemplateJob) -> Any:
+    """Pool task: build one template"""
+    return job.build(**job.kwargs)
+
+
+def _run_jobs(jobs: List[TemplateJob], stats: Dict[str, int]) -> List[Any]:
+    """Build templates in job order: the first in-process, the rest in a pool when worthwhile"""
+    if not jobs:
+        return []
+    start = time.perf_counter()
+    results = [_run_job(jobs[0])]
+    first_ms = (time.perf_counter() - start) * 1000
+    rest = jobs[1:]
+
+    workers = min(len(rest), template_pool_workers(template_search_workers()))
+    estimated_ms = first_ms * len(rest)
+    if workers > 1 and estimated_ms >= float(os.getenv('TEMPLATE_PARALLEL_MIN_MS', '200')):
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results.extend(pool.map(_run_job, rest))
+            stats['workers'] = max(stats.get('workers', 1), workers)
+            logger.info(f"  Templates: {len(rest)} built on {workers} processes")
+            return results
+        except (OSError, AssertionError, BrokenProcessPool) as e:
+            logger.warning(f"  Template pool unavailable ({e}); building templates sequentially")
+            del results[1:]
+
+    results.extend(_run_job(job) for job in rest)
+    return results
+
+
+def build_templates(jobs: List[TemplateJob], stats: Optional[Dict[str, int]] = None,
+                    cache: Optional[TemplateCache] = None) -> List[Any]:
+    """
+    Templates for jobs, in job order.
+
+    Jobs whose key is cached, or repeats an earlier job's key, reuse that
+    template. The remaining distinct templates are built (in parallel when
+    worthwhile) and cached unless empty. With the cache disabled every job
+    is built.
+
+    Args:
+        jobs: One TemplateJob per OU group, in OU order
+        stats: template_cache.new_template_stats() counters to update
+        cache: Cache to use (default: the process-wide cache)
+
+    Returns:
+        One template per job (shared when cached; do not mutate)
+    """
+    cache = cache or get_template_cache()
+    stats = stats if stats is not None else new_template_stats()
+    stats['templates'] += len(jobs)
+
+    if not cache.enabled:
+        stats['solved'] += len(jobs)
+        return _run_jobs(jobs, stats)
+
+    templates: Dict[str, Any] = {}
+    pending: List[TemplateJob] = []
+    pending_keys = set()
+    for job in jobs:
+        if job.key in templates or job.key in pending_keys:
+            stats['hits'] += 1
+            continue
+        template = cache.get(job.key)
+        if template is None:
+            template = cache.load(job.key)
+            if template is not None:
+                stats['persistentHits'] += 1
+        if template is not None:
+            stats['hits'] += 1
+            templates[job.key] = template
+        else:
+            pending.append(job)
+            pending_keys.add(job.key)
+
+    stats['solved'] += len(pending)
+    for job, template in zip(pending, _run_jobs(pending, stats)):
+        templates[job.key] = template
+        if template:
+            cache.put(job.key, template)
+
+    return [templates[job.key] for job in jobs]
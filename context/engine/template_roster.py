@@ -24,84 +24,65 @@ try:
 except ImportError:
     _has_constraint_config = False
 
+from context.engine.availability import AvailabilityCalendar, get_availability_calendar
+from context.engine.template_cache import new_template_stats, template_context, template_key
+from context.engine.template_pool import TemplateJob, build_templates
+
 logger = logging.getLogger(__name__)
 
 
 def _remove_unavailable_assignments_from_roster(
     assignments: List[Dict[str, Any]], 
-    employees: List[Dict[str, Any]]
+    employees: List[Dict[str, Any]],
+    calendar: AvailabilityCalendar
 ) -> tuple[List[Dict[str, Any]], int]:
     """
-    Post-process roster to remove assignments on unavailable days.
+    Check that no assignment falls on an employee's unavailable day.
     
-    This function filters out assignments where an employee is scheduled on a day
-    they marked as unavailable. The filtered assignments are converted to UNASSIGNED
-    status so the roster shows gaps in coverage.
+    Template generation already skips unavailable days (see
+    _replicate_template_to_employee), so this should find nothing. Any
+    assignment that does slip through is logged as an error and converted to
+    UNASSIGNED so the roster shows the gap instead of an invalid shift.
     
     Args:
         assignments: List of assignment dictionaries
-        employees: List of employee dictionaries with unavailability data
+        employees: Employees whose unavailability must be registered in calendar
+        calendar: Availability calendar for the solve
         
     Returns:
         Tuple of (filtered_assignments, violations_removed_count)
     """
-    # Build unavailability map for quick lookup
-    unavail_map = {}
-    for emp in employees:
-        emp_id = emp['employeeId']
-        unavail_list = emp.get('unavailability', [])
-        unavailable_dates = set()
-        
-        # Handle both formats: array of strings or array of dicts
-        for u in unavail_list:
-            if isinstance(u, dict):
-                # Format: [{"date": "2026-01-05", ...}] or [{"startDate": "...", "endDate": "..."}]
-                date_val = u.get('date') or u.get('startDate')
-                if date_val:
-                    unavailable_dates.add(date_val)
-            elif isinstance(u, str):
-                # Format: ["2026-01-05", "2026-01-26"]
-                unavailable_dates.add(u)
-        
-        if unavailable_dates:
-            unavail_map[emp_id] = unavailable_dates
+    calendar.add_employees(employees)
     
-    # Filter assignments
     filtered_assignments = []
     violations_removed = 0
     
     for assignment in assignments:
-        # Skip unassigned slots - they're already empty
-        if assignment.get('status') == 'UNASSIGNED':
-            filtered_assignments.append(assignment)
-            continue
-        
         emp_id = assignment.get('employeeId')
         assignment_date = assignment.get('date')
         
-        # Check if this is a violation
-        if emp_id and emp_id in unavail_map and assignment_date in unavail_map[emp_id]:
-            # Violation detected - convert to UNASSIGNED
+        if (assignment.get('status') != 'UNASSIGNED' and emp_id and assignment_date
+                and not calendar.is_available(emp_id, assignment_date)):
             violations_removed += 1
-            logger.warning(
-                f"[UNAVAILABILITY FIX] Removing assignment: Employee {emp_id} on {assignment_date} "
-                f"(marked unavailable)"
+            logger.error(
+                f"[UNAVAILABILITY CHECK] Assignment on unavailable day: Employee {emp_id} on {assignment_date}"
             )
-            
-            # Convert to unassigned
-            filtered_assignment = assignment.copy()
-            filtered_assignment['status'] = 'UNASSIGNED'
-            filtered_assignment['employeeId'] = None
-            filtered_assignment['reason'] = 'Employee unavailable'
-            
-            filtered_assignments.append(filtered_assignment)
+            filtered_assignments.append(_as_unavailable(assignment))
         else:
-            # Valid assignment - keep it
             filtered_assignments.append(assignment)
     
     return filtered_assignments, violations_removed
 
 
+def _as_unavailable(assignment: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of assignment turned into an UNASSIGNED gap (employee unavailable)"""
+    unassigned = assignment.copy()
+    unassigned['status'] = 'UNASSIGNED'
+    unassigned['employeeId'] = None
+    unassigned['reason'] = 'Employee unavailable'
+    return unassigned
+
+
 def generate_template_validated_roster(
     ctx: Dict[str, Any],
     selected_employees: List[Dict[str, Any]],
@@ -117,7 +98,8 @@ def generate_template_validated_roster(
     
     Mode selection: demandItems[].templateGenerationMode (default: "cpsat")
     
-    Phase 1: Generate template pattern per OU
+    Phase 1: Generate template pattern per OU (OUs with identical template
+             inputs share one template, see template_cache)
     Phase 2: Replicate validated pattern to all employees in OU
     
     Args:
@@ -127,7 +109,8 @@ def generate_template_validated_roster(
         demand: Demand item configuration
     
     Returns:
-        Tuple of (assignments list, statistics dict)
+        Tuple of (assignments list, statistics dict); statistics include
+        templateCache counters (templates, solved, hits, persistentHits)
     """
     # Determine template generation mode
     template_mode = demand.get('templateGenerationMode', 'cpsat')
@@ -152,6 +135,9 @@ def generate_template_validated_roster(
     start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
     end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
     
+    # Unavailable days and blacklist windows per employee (bitsets, built once per solve)
+    calendar = get_availability_calendar(ctx, selected_employees)
+    
     # Get shift details and coverage days
     shift_details = _extract_shift_details(demand)
     if not shift_details:
@@ -196,6 +182,8 @@ def generate_template_validated_roster(
             'pattern': work_pattern
         }
     
+    template_stats = new_template_stats()
+    
     # ========== TEMPLATE GENERATION MODE SELECTION ==========
     if template_mode == 'cpsat':
         # Use CP-SAT mini-solver for optimal template generation
@@ -220,7 +208,8 @@ def generate_template_validated_roster(
             requirement=requirement,
             all_employees=selected_employees,
             date_range=date_range,
-            optimization_mode=optimization_mode
+            optimization_mode=optimization_mode,
+            template_stats=template_stats
         )
         
         # Check if CP-SAT succeeded
@@ -241,15 +230,14 @@ def generate_template_validated_roster(
         # Generate statistics
         stats = _generate_statistics(all_assignments, selected_employees)
         
-        # POST-PROCESSING: Remove assignments on unavailable days (FIX: Unavailability constraint violation)
-        print(f"\n[UNAVAILABILITY FIX] Post-processing {len(all_assignments)} CP-SAT assignments for {len(selected_employees)} employees...")
+        # Unavailable days were skipped during replication; confirm none slipped through
         all_assignments, violations_removed = _remove_unavailable_assignments_from_roster(
-            all_assignments, selected_employees
+            all_assignments, selected_employees, calendar
         )
-        print(f"[UNAVAILABILITY FIX] ✓ Removed {violations_removed} unavailability violations from CP-SAT roster\n")
         
         # Regenerate stats after filtering
         stats = _generate_statistics(all_assignments, selected_employees)
+        stats['templateCache'] = template_stats
         
         logger.info("\n" + "=" * 80)
         logger.info("CP-SAT TEMPLATE ROSTER COMPLETE")
@@ -260,6 +248,7 @@ def generate_template_validated_roster(
         if violations_removed > 0:
             logger.warning(f"  ⚠️  Removed {violations_removed} assignments on unavailable days")
         logger.info(f"Employees Used: {stats['employees_used']}")
+        logger.info(f"Templates: {template_stats['solved']} built, {template_stats['hits']} reused")
         logger.info(f"Generation Time: {stats['generation_time']:.3f}s")
         logger.info("=" * 80)
         
@@ -280,7 +269,21 @@ def generate_template_validated_roster(
     logger.info("PHASE 1: Template Generation & Validation")
     logger.info("=" * 80)
     
-    ou_templates = {}
+    # Everything the template validation reads besides the template employee
+    template_inputs = {
+        'workPattern': work_pattern,
+        'startDate': start_date,
+        'endDate': end_date,
+        'shiftDetails': shift_details,
+        'coverageDays': coverage_days,
+        'requirement': requirement,
+        'demand': demand,
+    }
+    
+    # Generate and validate one template per OU (identical OUs share one; the rest
+    # may be built in parallel)
+    template_ctx = template_context(ctx)
+    jobs = []
     for ou_id, ou_employees in employees_by_ou.items():
         logger.info(f"\nProcessing OU: {ou_id} ({len(ou_employees)} employees)")
         
@@ -288,19 +291,24 @@ def generate_template_validated_roster(
         template_emp = ou_employees[0]
         logger.info(f"  Template: {template_emp['employeeId']}")
         
-        # Generate and validate template pattern
-        template_pattern = _generate_validated_template(
-            template_emp,
-            work_pattern,
-            start_date,
-            end_date,
-            shift_details,
-            ctx,
-            demand,
-            requirement,
-            coverage_days
-        )
-        
+        jobs.append(TemplateJob(
+            key=template_key('incremental', template_emp, template_inputs, ctx),
+            build=_generate_validated_template,
+            kwargs=dict(
+                template_emp=template_emp,
+                work_pattern=work_pattern,
+                start_date=start_date,
+                end_date=end_date,
+                shift_details=shift_details,
+                ctx=template_ctx,
+                demand=demand,
+                requirement=requirement,
+                coverage_days=coverage_days
+            )
+        ))
+    
+    ou_templates = {}
+    for ou_id, template_pattern in zip(employees_by_ou, build_templates(jobs, template_stats)):
         ou_templates[ou_id] = template_pattern
         
         assigned_days = sum(1 for day_status in template_pattern.values() if day_status['assigned'])
@@ -323,22 +331,22 @@ def generate_template_validated_roster(
                 template_pattern,
                 demand,
                 requirement,
-                shift_details
+                shift_details,
+                calendar
             )
             all_assignments.extend(emp_assignments)
     
     # Generate statistics
     stats = _generate_statistics(all_assignments, selected_employees)
     
-    # POST-PROCESSING: Remove assignments on unavailable days (FIX: Unavailability constraint violation)
-    print(f"\n[UNAVAILABILITY FIX] Post-processing {len(all_assignments)} assignments for {len(selected_employees)} employees...")
+    # Unavailable days were skipped during replication; confirm none slipped through
     all_assignments, violations_removed = _remove_unavailable_assignments_from_roster(
-        all_assignments, selected_employees
+        all_assignments, selected_employees, calendar
     )
-    print(f"[UNAVAILABILITY FIX] ✓ Removed {violations_removed} unavailability violations\n")
     
     # Regenerate stats after filtering
     stats = _generate_statistics(all_assignments, selected_employees)
+    stats['templateCache'] = template_stats
     
     logger.info("\n" + "=" * 80)
     logger.info("TEMPLATE ROSTER COMPLETE")
@@ -349,6 +357,7 @@ def generate_template_validated_roster(
     if violations_removed > 0:
         logger.warning(f"  ⚠️  Removed {violations_removed} assignments on unavailable days")
     logger.info(f"Employees Used: {stats['employees_used']}")
+    logger.info(f"Templates: {template_stats['solved']} built, {template_stats['hits']} reused")
     logger.info(f"Generation Time: {stats['generation_time']:.3f}s")
     logger.info("=" * 80)
     
@@ -397,6 +406,306 @@ def _group_employees_by_ou(employees: List[Dict[str, Any]]) -> Dict[str, List[Di
     return ou_groups
 
 
+# Parsed expiry dates that could not be parsed (the checks skip them)
+_UNPARSEABLE = object()
+
+
+class EmployeeTemplateState:
+    """
+    Constraint state of one template employee while walking the horizon.
+
+    Employee-level invariants (rank/product match, license map, APGD-D10
+    status, caps read from the constraint config, shift hours) are computed
+    once. The rolling state (consecutive days, the Monday-Sunday week's
+    normal hours and work days, OT minutes, last shift end) is updated in
+    O(1) per day, so validating a template is linear in the number of days.
+    """
+
+    def __init__(
+        self,
+        employee: Dict[str, Any],
+        work_pattern: List[str],
+        shift_details: Dict[str, Any],
+        ctx: Dict[str, Any],
+        coverage_days: List[str],
+        requirement: Dict[str, Any] = None
+    ):
+        """
+        Args:
+            employee: Template employee
+            work_pattern: Requirement work pattern (sets the Scheme P weekly cap)
+            shift_details: Shift timing (start, end, nextDay)
+            ctx: Context with constraintList
+            coverage_days: Day names when shifts are assigned (e.g. ['Mon', 'Tue'])
+            requirement: Requirement with product, rank and qualification
+                requirements (optional)
+        """
+        from context.engine.time_utils import is_apgd_d10_employee
+
+        self.employee = employee
+        self.shift_details = shift_details
+        self.requirement = requirement
+
+        # Rolling state
+        self.consecutive_days = 0
+        self.week_start = None  # Monday of the week being tracked
+        self.week_normal_hours = 0.0
+        self.week_work_days = 0  # Work days assigned in the current week
+        self.week_paid_days = 0  # ... of which count normal hours (C5)
+        self.monthly_ot_minutes = 0
+        self.last_shift_end = None
+
+        # C11: Rank/product type match (if requirement specified)
+        self.eligibility_reason = None
+        self.qual_groups = []
+        self.licenses = {}
+        self._expiry_dates = {}
+        if requirement:
+            emp_rank = employee.get('rankId')
+            emp_product = employee.get('productTypeId')
+            req_product = requirement.get('productTypeId')
+            req_ranks = requirement.get('rankIds', [])
+            if not req_ranks:
+                req_ranks = [requirement.get('rankId')] if requirement.get('rankId') else []
+
+            if req_product and emp_product != req_product:
+                self.eligibility_reason = f'C11: Product type {emp_product} does not match required {req_product}'
+            elif req_ranks and emp_rank not in req_ranks:
+                self.eligibility_reason = f'C11: Rank {emp_rank} not in required ranks {req_ranks}'
+
+            # C7: Employee licenses map and qualification groups
+            required_quals = requirement.get('requiredQualifications', [])
+            if required_quals:
+                for lic in employee.get('licenses', []):
+                    if isinstance(lic, dict):
+                        code = lic.get('code')
+                        if code:
+                            self.licenses[str(code)] = lic.get('expiryDate')
+
+                for qual in employee.get('qualifications', []):
+                    if isinstance(qual, dict):
+                        code = qual.get('code')
+                        if code:
+                            self.licenses[str(code)] = qual.get('expiryDate')
+                    elif isinstance(qual, (str, int)):
+                        # Simple format: just a code without expiry
+                        self.licenses[str(qual)] = None
+
+                # Normalize to group format if needed
+                if isinstance(required_quals[0], dict) and 'qualifications' in required_quals[0]:
+                    self.qual_groups = required_quals
+                elif isinstance(required_quals[0], (str, int)):
+                    self.qual_groups = [{
+                        'groupId': 'default',
+                        'matchType': 'ALL',
+                        'qualifications': required_quals
+                    }]
+
+        # C1: Daily hours cap
+        self.scheme = scheme = employee.get('scheme', 'Scheme A')
+        self.shift_duration_hours = _calculate_shift_duration(shift_details)
+        if 'Scheme A' in scheme:
+            default_daily_cap = 14.0
+        elif 'Scheme B' in scheme:
+            default_daily_cap = 13.0
+        elif 'Scheme P' in scheme:
+            default_daily_cap = 9.0
+        else:
+            default_daily_cap = 12.0
+
+        employee_dict = {'employeeId': employee.get('employeeId'), 'scheme': scheme}
+
+        def param(constraint_id, default, **kwargs):
+            # Read from JSON config if available
+            if _has_constraint_config:
+                return get_constraint_param(ctx, constraint_id, employee_dict, default=default, **kwargs)
+            return default
+
+        self.max_daily_hours = param('momDailyHoursCap', default_daily_cap)
+
+        # C2: Normal hours this shift adds to the week; Scheme A APO employees
+        # work a 6th day on rest day pay (0h normal)
+        lunch_hours = 1.0 if self.shift_duration_hours >= 8 else 0.0
+        self.shift_normal_hours = min(self.shift_duration_hours - lunch_hours, 8.8)
+        self.is_scheme_a_apo = (scheme == 'Scheme A' and employee.get('productTypeId', '') == 'APO'
+                                and (requirement or {}).get('productTypeId', '') == 'APO')
+
+        # Weekly cap: Scheme A/B 44h; Scheme P 34.98h (≤4 work days) or 29.98h (5+ work days)
+        if 'Scheme P' in scheme:
+            work_days_count = sum(1 for d in work_pattern if d != 'O') if work_pattern else 4  # Default to 4 if unknown
+            if work_days_count <= 4:
+                self.weekly_cap = param('partTimerWeeklyHours', 34.98, param_name='maxHours4Days')
+            else:  # 5, 6, or 7 days
+                self.weekly_cap = param('partTimerWeeklyHours', 29.98, param_name='maxHoursMoreDays')
+        else:
+            self.weekly_cap = param('momWeeklyHoursCap44h', 44.0)
+
+        # C3/C4/C5: APGD-D10 employees get 8 consecutive days, 8h rest and no weekly rest day
+        self.is_apgd_d10 = is_apgd_d10_employee(employee, ctx)
+        self.max_consecutive = param('maxConsecutiveWorkingDays', 8 if self.is_apgd_d10 else 12)
+        self.min_rest_hours = param('apgdMinRestBetweenShifts', 8.0 if self.is_apgd_d10 else 11.0)
+        self.shift_start_time = datetime.strptime(shift_details.get('start', '08:00:00'), '%H:%M:%S').time()
+        self.shift_end_time = datetime.strptime(shift_details.get('end', '20:00:00'), '%H:%M:%S').time()
+        if not self.is_apgd_d10:
+            self.min_off_days = param('minimumOffDaysPerWeek', 1)
+            # The 7 days before any date cover each weekday once, so the days
+            # outside coverage (always off) are the same for every date
+            some_week = datetime(2024, 1, 1)
+            self.coverage_skipped_count = sum(
+                1 for i in range(7) if (some_week + timedelta(days=i)).strftime('%a') not in coverage_days
+            )
+
+        # C17: Monthly OT cap (72 hours)
+        self.max_monthly_ot_hours = param('momMonthlyOTcap72h', 72.0)
+
+        self._assignment_hours = {}
+
+    def start_day(self, date) -> None:
+        """Move to date (a coverage day), starting a new week's totals on a new Monday"""
+        monday_of_week = date - timedelta(days=date.weekday())
+        if monday_of_week != self.week_start:
+            self.week_start = monday_of_week
+            self.week_normal_hours = 0.0
+            self.week_work_days = 0
+            self.week_paid_days = 0
+
+    @property
+    def work_day_position_in_week(self) -> int:
+        """Position a work day today would have in the Monday-Sunday week (1-based)"""
+        return self.week_work_days + 1
+
+    @property
+    def is_6th_day_apo(self) -> bool:
+        return self.is_scheme_a_apo and self.work_day_position_in_week == 6
+
+    def validate(self, date) -> Dict[str, Any]:
+        """
+        Check whether working the shift on date satisfies all hard constraints.
+
+        Returns: {'valid': bool, 'reason': str}
+        """
+        # C11: Rank/product type match
+        if self.eligibility_reason:
+            return {'valid': False, 'reason': self.eligibility_reason}
+
+        # C7: Qualifications/Licenses
+        for group in self.qual_groups:
+            reason = self._check_qualification_group(group, date)
+            if reason:
+                return {'valid': False, 'reason': reason}
+
+        # C1: Daily hours cap
+        if self.shift_duration_hours > self.max_daily_hours:
+            return {'valid': False, 'reason': f'C1: Shift {self.shift_duration_hours}h exceeds {self.max_daily_hours}h daily cap'}
+
+        # C2: Weekly normal hours cap (SCHEME-AWARE)
+        shift_normal_hours = 0.0 if self.is_6th_day_apo else self.shift_normal_hours
+        if self.week_normal_hours + shift_normal_hours > self.weekly_cap:
+            return {'valid': False, 'reason': f'C2: Weekly normal hours {self.week_normal_hours + shift_normal_hours:.1f}h would exceed {self.weekly_cap}h cap (Scheme: {self.scheme})'}
+
+        # C3: Maximum consecutive days
+        if self.consecutive_days >= self.max_consecutive:
+            return {'valid': False, 'reason': f'C3: Consecutive days {self.consecutive_days} exceeds {self.max_consecutive} limit'}
+
+        # C4: Minimum rest period
+        if self.last_shift_end:
+            shift_start_dt = datetime.combine(date, self.shift_start_time)
+            rest_hours = (shift_start_dt - self.last_shift_end).total_seconds() / 3600
+            if rest_hours < self.min_rest_hours:
+                return {'valid': False, 'reason': f'C4: Rest period {rest_hours:.1f}h less than {self.min_rest_hours}h minimum'}
+
+        # C5: Weekly rest day (skipped for APGD-D10 employees). Days outside
+        # coverage are off; of the rest, those not worked this week are off.
+        if not self.is_apgd_d10:
+            off_days_in_remaining = max(0, (7 - self.coverage_skipped_count) - self.week_paid_days)
+            total_off_days = self.coverage_skipped_count + off_days_in_remaining
+            if total_off_days < self.min_off_days:
+                return {'valid': False, 'reason': f'C5: Only {total_off_days} off day(s) in last 7 days (minimum {self.min_off_days} required)'}
+
+        # C17: Monthly OT cap
+        if self.monthly_ot_minutes >= self.max_monthly_ot_hours * 60:
+            return {'valid': False, 'reason': f'C17: Monthly OT {self.monthly_ot_minutes/60:.1f}h exceeds {self.max_monthly_ot_hours}h cap'}
+
+        return {'valid': True, 'reason': 'All constraints satisfied'}
+
+    def _check_qualification_group(self, group: Dict[str, Any], date) -> str:
+        """C7 failure reason for one qualification group on date, or None"""
+        match_type = group.get('matchType', 'ALL')
+        group_quals = group.get('qualifications', [])
+
+        if match_type == 'ALL':
+            for qual_code in group_quals:
+                qual_key = str(qual_code)
+                if qual_key not in self.licenses:
+                    return f'C7: Missing required qualification {qual_code}'
+                expiry_str = self.licenses[qual_key]
+                if expiry_str:
+                    try:
+                        if date > self._expiry_date(expiry_str):
+                            return f'C7: Qualification {qual_code} expired on {expiry_str}'
+                    except Exception:
+                        pass
+        elif match_type == 'ANY':
+            for qual_code in group_quals:
+                qual_key = str(qual_code)
+                if qual_key in self.licenses:
+                    expiry_str = self.licenses[qual_key]
+                    if not expiry_str:  # No expiry
+                        return None
+                    try:
+                        if date <= self._expiry_date(expiry_str):
+                            return None
+                    except Exception:
+                        pass
+            return f'C7: No valid qualification from group {group.get("groupId", "unknown")}'
+        return None
+
+    def _expiry_date(self, expiry_str):
+        """Parsed expiry date (raises ValueError when unparseable)"""
+        expiry = self._expiry_dates.get(expiry_str)
+        if expiry is None:
+            try:
+                expiry = datetime.strptime(expiry_str, '%Y-%m-%d').date()
+            except Exception:
+                expiry = _UNPARSEABLE
+            self._expiry_dates[expiry_str] = expiry
+        if expiry is _UNPARSEABLE:
+            raise ValueError(f'Unparseable expiry date {expiry_str!r}')
+        return expiry
+
+    def assignment_hours(self, pattern_day: int, is_6th_day_apo: bool) -> Tuple[float, float, float, float, float]:
+        """_assignment_hours for this employee's shift, computed once per pattern day"""
+        key = (pattern_day, is_6th_day_apo)
+        hours = self._assignment_hours.get(key)
+        if hours is None:
+            hours = self._assignment_hours[key] = _assignment_hours(
+                self.employee, self.shift_details, pattern_day, is_6th_day_apo
+            )
+        return hours
+
+    def record_work_day(self, date, assignment: Dict[str, Any]) -> None:
+        """Update the rolling state after assigning the shift on date"""
+        self.consecutive_days += 1
+        self.week_work_days += 1
+
+        # Track only normal hours for C2 weekly cap validation
+        normal_hours = assignment['hours']['normal']
+        self.week_normal_hours += normal_hours
+        if normal_hours > 0:
+            self.week_paid_days += 1
+        self.monthly_ot_minutes += assignment['hours']['ot'] * 60
+
+        # Last shift end time for rest period
+        shift_end_dt = datetime.combine(date, self.shift_end_time)
+        if self.shift_details.get('nextDay', False):
+            shift_end_dt += timedelta(days=1)
+        self.last_shift_end = shift_end_dt
+
+    def record_rest_day(self) -> None:
+        """Update the rolling state after an off day or a day that could not be assigned"""
+        self.consecutive_days = 0
+
+
 def _generate_validated_template(
     template_emp: Dict[str, Any],
     work_pattern: List[str],
@@ -416,29 +725,14 @@ def _generate_validated_template(
     
     Returns a dict mapping date -> {assigned: bool, reason: str, assignment: dict}
     """
-    from context.engine.time_utils import calculate_mom_compliant_hours
-    
     template_pattern = {}
     
     # Get employee offset
     emp_offset = template_emp.get('rotationOffset', 0)
     pattern_length = len(work_pattern)
     
-    # Detect if this is Scheme A + APO (eligible for 6-day week with rest day pay)
-    emp_scheme = template_emp.get('scheme', '')
-    emp_product = template_emp.get('productTypeId', '')
-    req_product = requirement.get('productTypeId', '')
-    is_scheme_a_apo = (emp_scheme == 'Scheme A' and emp_product == 'APO' and req_product == 'APO')
-    
-    # Store work pattern in ctx for constraint validation (needed for Scheme P weekly cap)
-    ctx['_temp_work_pattern'] = work_pattern
-    
     # Track state for constraint validation
-    consecutive_days = 0
-    weekly_hours = []  # List of (date, hours) tuples
-    work_days_this_week = []  # Track work days in current Monday-Sunday week
-    monthly_ot_minutes = 0
-    last_shift_end = None
+    state = EmployeeTemplateState(template_emp, work_pattern, shift_details, ctx, coverage_days, requirement)
     
     current_date = start_date
     day_index = 0
@@ -460,16 +754,8 @@ def _generate_validated_template(
             day_index += 1
             continue
         
-        # Calculate Monday-Sunday work week for MOM compliance
         # MOM law defines work week as Monday-Sunday, NOT rolling 7-day window
-        monday_of_week = current_date - timedelta(days=current_date.weekday())  # weekday() returns 0 for Monday
-        sunday_of_week = monday_of_week + timedelta(days=6)
-        
-        # Clean up old weekly hours: keep only hours from current Monday-Sunday week
-        weekly_hours = [(d, h) for d, h in weekly_hours if monday_of_week <= d < current_date]
-        
-        # Clean up work days tracking for current week
-        work_days_this_week = [d for d in work_days_this_week if monday_of_week <= d < current_date]
+        state.start_day(current_date)
         
         # Calculate pattern position with offset
         pattern_index = (emp_offset + day_index) % pattern_length
@@ -483,28 +769,11 @@ def _generate_validated_template(
                 'assignment': None,
                 'is_work_day': False
             }
-            consecutive_days = 0  # Reset consecutive days
+            state.record_rest_day()
         else:
             # Work day - check if this would be 6th day in week for Scheme A APO
-            work_day_position_in_week = len(work_days_this_week) + 1  # Current day would be Nth work day
-            is_6th_day_apo = is_scheme_a_apo and work_day_position_in_week == 6
-            
-            # Validate constraints
-            validation_result = _validate_assignment(
-                template_emp,
-                current_date,
-                shift_details,
-                consecutive_days,
-                weekly_hours,
-                monthly_ot_minutes,
-                last_shift_end,
-                ctx,
-                coverage_days,
-                requirement,
-                demand,
-                is_scheme_a_apo,
-                work_day_position_in_week
-            )
+            is_6th_day_apo = state.is_6th_day_apo
+            validation_result = state.validate(current_date)
             
             if validation_result['valid']:
                 # Create assignment
@@ -516,7 +785,8 @@ def _generate_validated_template(
                     requirement,
                     pattern_index,
                     emp_offset,
-                    is_6th_day_apo
+                    is_6th_day_apo,
+                    hours=state.assignment_hours(pattern_index, is_6th_day_apo)
                 )
                 
                 template_pattern[date_str] = {
@@ -525,22 +795,7 @@ def _generate_validated_template(
                     'assignment': assignment,
                     'is_work_day': True
                 }
-                
-                # Update tracking state
-                consecutive_days += 1
-                work_days_this_week.append(current_date)  # Track this work day
-                
-                # Track only normal hours for C2 weekly cap validation
-                normal_hours = assignment['hours']['normal']
-                weekly_hours.append((current_date, normal_hours))
-                monthly_ot_minutes += assignment['hours']['ot'] * 60
-                
-                # Calculate last shift end time for rest period
-                shift_end_time = shift_details.get('end', '20:00:00')
-                shift_end_dt = datetime.combine(current_date, datetime.strptime(shift_end_time, '%H:%M:%S').time())
-                if shift_details.get('nextDay', False):
-                    shift_end_dt += timedelta(days=1)
-                last_shift_end = shift_end_dt
+                state.record_work_day(current_date, assignment)
             else:
                 # Constraint violated - mark as unassigned
                 template_pattern[date_str] = {
@@ -549,7 +804,7 @@ def _generate_validated_template(
                     'assignment': None,
                     'is_work_day': True
                 }
-                consecutive_days = 0  # Reset if can't work
+                state.record_rest_day()  # Reset if can't work
         
         current_date += timedelta(days=1)
         day_index += 1
@@ -557,271 +812,6 @@ def _generate_validated_template(
     return template_pattern
 
 
-def _validate_assignment(
-    employee: Dict[str, Any],
-    date,
-    shift_details: Dict[str, Any],
-    consecutive_days: int,
-    weekly_hours: List[Tuple[Any, float]],
-    monthly_ot_minutes: float,
-    last_shift_end,
-    ctx: Dict[str, Any],
-    coverage_days: List[str],
-    requirement: Dict[str, Any] = None,
-    demand: Dict[str, Any] = None,
-    is_scheme_a_apo: bool = False,
-    work_day_position_in_week: int = 1
-) -> Dict[str, Any]:
-    """
-    Validate if assignment satisfies all hard constraints.
-    
-    Args:
-        coverage_days: List of day names when shifts can be assigned (e.g., ['Mon', 'Tue', 'Wed', 'Thu', 'Fri'])
-        requirement: Requirement dict with qualification and rank requirements (optional)
-        is_scheme_a_apo: True if Scheme A + APO (eligible for 6-day week with rest day pay)
-        work_day_position_in_week: Position of this work day in current Monday-Sunday week (1-6)
-        demand: Demand dict (optional)
-    
-    Returns: {'valid': bool, 'reason': str}
-    """
-    from context.engine.time_utils import is_apgd_d10_employee
-    
-    # C7: Qualifications/Licenses (if requirement specified)
-    if requirement:
-        # Check rank/product type match (C11)
-        emp_rank = employee.get('rankId')
-        emp_product = employee.get('productTypeId')
-        
-        req_product = requirement.get('productTypeId')
-        if req_product and emp_product != req_product:
-            return {'valid': False, 'reason': f'C11: Product type {emp_product} does not match required {req_product}'}
-        
-        req_ranks = requirement.get('rankIds', [])
-        if not req_ranks:
-            req_ranks = [requirement.get('rankId')] if requirement.get('rankId') else []
-        
-        if req_ranks and emp_rank not in req_ranks:
-            return {'valid': False, 'reason': f'C11: Rank {emp_rank} not in required ranks {req_ranks}'}
-        
-        # Check qualifications (C7)
-        required_quals = requirement.get('requiredQualifications', [])
-        if required_quals:
-            # Build employee licenses map
-            emp_licenses = {}
-            for lic in employee.get('licenses', []):
-                if isinstance(lic, dict):
-                    code = lic.get('code')
-                    expiry = lic.get('expiryDate')
-                    if code:
-                        emp_licenses[str(code)] = expiry
-            
-            for qual in employee.get('qualifications', []):
-                if isinstance(qual, dict):
-                    code = qual.get('code')
-                    expiry = qual.get('expiryDate')
-                    if code:
-                        emp_licenses[str(code)] = expiry
-                elif isinstance(qual, (str, int)):
-                    # Simple format: just a code without expiry
-                    emp_licenses[str(qual)] = None
-            
-            # Normalize to group format if needed
-            if required_quals and isinstance(required_quals[0], dict) and 'qualifications' in required_quals[0]:
-                qual_groups = required_quals
-            elif required_quals and isinstance(required_quals[0], (str, int)):
-                qual_groups = [{
-                    'groupId': 'default',
-                    'matchType': 'ALL',
-                    'qualifications': required_quals
-                }]
-            else:
-                qual_groups = []
-            
-            # Check each qualification group
-            for group in qual_groups:
-                match_type = group.get('matchType', 'ALL')
-                group_quals = group.get('qualifications', [])
-                
-                if match_type == 'ALL':
-                    for qual_code in group_quals:
-                        qual_key = str(qual_code)
-                        if qual_key not in emp_licenses:
-                            return {'valid': False, 'reason': f'C7: Missing required qualification {qual_code}'}
-                        
-                        # Check expiry
-                        expiry_str = emp_licenses[qual_key]
-                        if expiry_str:
-                            try:
-                                expiry_date = datetime.strptime(expiry_str, '%Y-%m-%d').date()
-                                if date > expiry_date:
-                                    return {'valid': False, 'reason': f'C7: Qualification {qual_code} expired on {expiry_str}'}
-                            except:
-                                pass
-                
-                elif match_type == 'ANY':
-                    has_any = False
-                    for qual_code in group_quals:
-                        qual_key = str(qual_code)
-                        if qual_key in emp_licenses:
-                            expiry_str = emp_licenses[qual_key]
-                            if not expiry_str:  # No expiry
-                                has_any = True
-                                break
-                            try:
-                                expiry_date = datetime.strptime(expiry_str, '%Y-%m-%d').date()
-                                if date <= expiry_date:
-                                    has_any = True
-                                    break
-                            except:
-                                pass
-                    
-                    if not has_any:
-                        return {'valid': False, 'reason': f'C7: No valid qualification from group {group.get("groupId", "unknown")}'}
-    
-    # C1: Daily hours cap
-    scheme = employee.get('scheme', 'Scheme A')
-    shift_duration_hours = _calculate_shift_duration(shift_details)
-    
-    # Determine default based on scheme
-    if 'Scheme A' in scheme:
-        default_daily_cap = 14.0
-    elif 'Scheme B' in scheme:
-        default_daily_cap = 13.0
-    elif 'Scheme P' in scheme:
-        default_daily_cap = 9.0
-    else:
-        default_daily_cap = 12.0
-    
-    # Read from JSON config if available
-    employee_dict = {'employeeId': employee.get('employeeId'), 'scheme': scheme}
-    if _has_constraint_config:
-        max_daily_hours = get_constraint_param(ctx, 'momDailyHoursCap', employee_dict, default=default_daily_cap)
-    else:
-        max_daily_hours = default_daily_cap
-    
-    if shift_duration_hours > max_daily_hours:
-        return {'valid': False, 'reason': f'C1: Shift {shift_duration_hours}h exceeds {max_daily_hours}h daily cap'}
-    
-    # C2: Weekly normal hours cap (SCHEME-AWARE)
-    # SPECIAL CASE: Scheme A APO employees can work 6th day with rest day pay (0h normal)
-    # Calculate what normal hours would be for THIS shift
-    gross_hours = _calculate_shift_duration(shift_details)
-    lunch_hours = 1.0 if gross_hours >= 8 else 0.0
-    net_hours = gross_hours - lunch_hours
-    
-    # For Scheme A APO 6th work day in week: Use 0h normal (rest day pay applies)
-    if is_scheme_a_apo and work_day_position_in_week == 6:
-        shift_normal_hours = 0.0  # Rest day pay - doesn't count toward 44h cap
-    else:
-        shift_normal_hours = min(net_hours, 8.8)  # Standard: Cap at 8.8h normal
-    
-    # Determine weekly cap based on scheme (FIX: Add Scheme P support)
-    # Scheme A/B: 44h/week
-    # Scheme P: 34.98h (≤4 work days) or 29.98h (5+ work days)
-    if 'Scheme P' in scheme:
-        # Part-timer: Need to count work days in pattern to determine cap
-        # For template validation, we need to know the work pattern
-        work_pattern = ctx.get('_temp_work_pattern', [])  # Should be set by caller
-        work_days_count = sum(1 for d in work_pattern if d != 'O') if work_pattern else 4  # Default to 4 if unknown
-        
-        if work_days_count <= 4:
-            if _has_constraint_config:
-                weekly_cap = get_constraint_param(ctx, 'partTimerWeeklyHours', employee_dict, param_name='maxHours4Days', default=34.98)
-            else:
-                weekly_cap = 34.98
-        else:  # 5, 6, or 7 days
-            if _has_constraint_config:
-                weekly_cap = get_constraint_param(ctx, 'partTimerWeeklyHours', employee_dict, param_name='maxHoursMoreDays', default=29.98)
-            else:
-                weekly_cap = 29.98
-    else:
-        # Full-timer (Scheme A/B): 44h/week
-        if _has_constraint_config:
-            weekly_cap = get_constraint_param(ctx, 'momWeeklyHoursCap44h', employee_dict, default=44.0)
-        else:
-            weekly_cap = 44.0
-    
-    current_week_normal_hours = sum(h for d, h in weekly_hours)
-    if current_week_normal_hours + shift_normal_hours > weekly_cap:
-        return {'valid': False, 'reason': f'C2: Weekly normal hours {current_week_normal_hours + shift_normal_hours:.1f}h would exceed {weekly_cap}h cap (Scheme: {scheme})'}
-    
-    # C3: Maximum consecutive days
-    is_apgd_d10 = is_apgd_d10_employee(employee, ctx)
-    default_consecutive = 8 if is_apgd_d10 else 12
-    
-    # Read from JSON config if available
-    if _has_constraint_config:
-        max_consecutive = get_constraint_param(ctx, 'maxConsecutiveWorkingDays', employee_dict, default=default_consecutive)
-    else:
-        max_consecutive = default_consecutive
-    
-    if consecutive_days >= max_consecutive:
-        return {'valid': False, 'reason': f'C3: Consecutive days {consecutive_days} exceeds {max_consecutive} limit'}
-    
-    # C4: Minimum rest period
-    if last_shift_end:
-        default_rest = 8.0 if is_apgd_d10 else 11.0
-        
-        # Read from JSON config if available
-        if _has_constraint_config:
-            min_rest_hours = get_constraint_param(ctx, 'apgdMinRestBetweenShifts', employee_dict, default=default_rest)
-        else:
-            min_rest_hours = default_rest
-        
-        shift_start_time = shift_details.get('start', '08:00:00')
-        shift_start_dt = datetime.combine(date, datetime.strptime(shift_start_time, '%H:%M:%S').time())
-        
-        rest_hours = (shift_start_dt - last_shift_end).total_seconds() / 3600
-        if rest_hours < min_rest_hours:
-            return {'valid': False, 'reason': f'C4: Rest period {rest_hours:.1f}h less than {min_rest_hours}h minimum'}
-    
-    # C5: Weekly rest day (check if had at least one off day in last 7 days)
-    # Skip for APGD-D10 employees (exempted)
-    if not is_apgd_d10:
-        # Read from JSON config if available (minimum off days per week)
-        if _has_constraint_config:
-            min_off_days = get_constraint_param(ctx, 'minimumOffDaysPerWeek', employee_dict, default=1)
-        else:
-            min_off_days = 1
-        
-        # Count work days in rolling 7-day window
-        work_days_in_window = len([d for d, h in weekly_hours if h > 0])
-        
-        # Count coverage-skipped days (e.g., weekends) in rolling 7-day window
-        # These automatically count as off days
-        coverage_skipped_count = 0
-        for i in range(1, 8):  # Check previous 7 days
-            check_date = date - timedelta(days=i)
-            day_name = check_date.strftime('%a')
-            if day_name not in coverage_days:
-                coverage_skipped_count += 1
-        
-        # Calculate off days:
-        # - Coverage-skipped days are always OFF (e.g., weekends when coverage is Mon-Fri)
-        # - Remaining days in window = 7 - coverage_skipped_count
-        # - Work days in remaining days = work_days_in_window
-        # - Off days in remaining days = (7 - coverage_skipped_count) - work_days_in_window
-        # - Total off days = coverage_skipped_count + off_days_in_remaining
-        off_days_in_remaining = max(0, (7 - coverage_skipped_count) - work_days_in_window)
-        total_off_days = coverage_skipped_count + off_days_in_remaining
-        
-        if total_off_days < min_off_days:
-            return {'valid': False, 'reason': f'C5: Only {total_off_days} off day(s) in last 7 days (minimum {min_off_days} required)'}
-    
-    # C17: Monthly OT cap (72 hours)
-    # Read from JSON config if available
-    if _has_constraint_config:
-        max_monthly_ot_hours = get_constraint_param(ctx, 'momMonthlyOTcap72h', employee_dict, default=72.0)
-    else:
-        max_monthly_ot_hours = 72.0
-    
-    max_monthly_ot_minutes = max_monthly_ot_hours * 60
-    if monthly_ot_minutes >= max_monthly_ot_minutes:
-        return {'valid': False, 'reason': f'C17: Monthly OT {monthly_ot_minutes/60:.1f}h exceeds {max_monthly_ot_hours}h cap'}
-    
-    return {'valid': True, 'reason': 'All constraints satisfied'}
-
-
 def _calculate_shift_duration(shift_details: Dict[str, Any]) -> float:
     """Calculate shift duration in hours including lunch."""
     start_str = shift_details.get('start', '08:00:00')
@@ -838,6 +828,39 @@ def _calculate_shift_duration(shift_details: Dict[str, Any]) -> float:
     return duration
 
 
+def _assignment_hours(
+    employee: Dict[str, Any],
+    shift_details: Dict[str, Any],
+    pattern_day: int,
+    is_6th_day_apo: bool = False
+) -> Tuple[float, float, float, float, float]:
+    """
+    Hours of the template employee's shift on a pattern day.
+    
+    Returns: (gross, lunch, normal, ot, restDayPay) hours
+    """
+    gross_hours = _calculate_shift_duration(shift_details)
+    lunch_hours = 1.0 if gross_hours >= 8 else 0.0
+    net_hours = gross_hours - lunch_hours
+    
+    # SCHEME A APO 6TH DAY: Apply rest day pay
+    if is_6th_day_apo:
+        normal_hours = 0.0
+        rest_day_pay = 8.0
+        ot_hours = max(0.0, net_hours - 8.0)  # OT is anything beyond 8h rest day pay
+    else:
+        # Standard pattern-aware calculation
+        from context.constraints.C2_mom_weekly_hours import calculate_pattern_aware_hours
+        work_pattern = employee.get('workPattern', [])
+        emp_scheme = employee.get('scheme', 'A')
+        normal_hours, ot_hours = calculate_pattern_aware_hours(
+            work_pattern, pattern_day, gross_hours, lunch_hours, emp_scheme
+        )
+        rest_day_pay = 0.0
+    
+    return gross_hours, lunch_hours, normal_hours, ot_hours, rest_day_pay
+
+
 def _create_validated_assignment(
     employee: Dict[str, Any],
     date,
@@ -846,15 +869,15 @@ def _create_validated_assignment(
     requirement: Dict[str, Any],
     pattern_day: int,
     rotation_offset: int,
-    is_6th_day_apo: bool = False
+    is_6th_day_apo: bool = False,
+    hours: Tuple[float, float, float, float, float] = None
 ) -> Dict[str, Any]:
     """Create assignment dictionary for validated work day.
     
     Args:
         is_6th_day_apo: True if this is 6th work day in week for Scheme A APO (rest day pay applies)
+        hours: Precomputed _assignment_hours(...) for this pattern day (optional)
     """
-    from context.engine.time_utils import calculate_mom_compliant_hours
-    
     emp_id = employee['employeeId']
     date_str = date.strftime('%Y-%m-%d')
     
@@ -876,24 +899,9 @@ def _create_validated_assignment(
         end_datetime = f"{date_str}T{shift_end}"
     
     # Calculate hours
-    gross_hours = _calculate_shift_duration(shift_details)
-    lunch_hours = 1.0 if gross_hours >= 8 else 0.0
-    net_hours = gross_hours - lunch_hours
-    
-    # SCHEME A APO 6TH DAY: Apply rest day pay
-    if is_6th_day_apo:
-        normal_hours = 0.0
-        rest_day_pay = 8.0
-        ot_hours = max(0.0, net_hours - 8.0)  # OT is anything beyond 8h rest day pay
-    else:
-        # Standard pattern-aware calculation
-        from context.constraints.C2_mom_weekly_hours import calculate_pattern_aware_hours
-        work_pattern = employee.get('workPattern', [])
-        emp_scheme = employee.get('scheme', 'A')
-        normal_hours, ot_hours = calculate_pattern_aware_hours(
-            work_pattern, pattern_day, gross_hours, lunch_hours, emp_scheme
-        )
-        rest_day_pay = 0.0
+    if hours is None:
+        hours = _assignment_hours(employee, shift_details, pattern_day, is_6th_day_apo)
+    gross_hours, lunch_hours, normal_hours, ot_hours, rest_day_pay = hours
     
     assignment = {
         'assignmentId': f"{demand_id}-{date_str}-D-{emp_id}",
@@ -926,51 +934,26 @@ def _replicate_template_to_employee(
     template_pattern: Dict[str, Dict[str, Any]],
     demand: Dict[str, Any],
     requirement: Dict[str, Any],
-    shift_details: Dict[str, Any]
+    shift_details: Dict[str, Any],
+    calendar: AvailabilityCalendar
 ) -> List[Dict[str, Any]]:
-    """Replicate validated template pattern to an employee."""
+    """
+    Replicate validated template pattern to an employee.
+    
+    Days inside one of the demand's shift blacklist windows (v0.70+) are
+    skipped; work days the employee is unavailable become UNASSIGNED gaps.
+    """
     import copy
     from datetime import datetime
     
     assignments = []
-    
-    # Build blacklist date set for this employee (v0.70+)
-    blacklisted_dates = set()
     emp_id = employee.get('employeeId')
-    
-    for shift in demand.get('shifts', []):
-        blacklist = shift.get('blacklist', {})
-        blacklist_entries = blacklist.get('employeeIds', [])
-        
-        for bl_entry in blacklist_entries:
-            if isinstance(bl_entry, dict):
-                bl_emp_id = bl_entry.get('employeeId')
-                if bl_emp_id == emp_id:
-                    bl_start = bl_entry.get('blacklistStartDate', '')
-                    bl_end = bl_entry.get('blacklistEndDate', '')
-                    
-                    if bl_start and bl_end:
-                        try:
-                            from datetime import timedelta
-                            start_dt = datetime.strptime(bl_start, '%Y-%m-%d').date()
-                            end_dt = datetime.strptime(bl_end, '%Y-%m-%d').date()
-                            
-                            # Generate all blacklisted dates
-                            current_date = start_dt
-                            while current_date <= end_dt:
-                                blacklisted_dates.add(current_date.strftime('%Y-%m-%d'))
-                                current_date += timedelta(days=1)
-                        except:
-                            pass
-            elif isinstance(bl_entry, str) and bl_entry == emp_id:
-                # Legacy format: unconditionally blacklist all dates
-                for date_str in template_pattern.keys():
-                    blacklisted_dates.add(date_str)
+    blacklists = [shift.get('blacklist') for shift in demand.get('shifts', []) if shift.get('blacklist')]
     
     for date_str, day_info in sorted(template_pattern.items()):
         if day_info['is_work_day'] and day_info['assigned']:
             # Check if employee is blacklisted for this date
-            if date_str in blacklisted_dates:
+            if any(calendar.is_blacklisted(emp_id, date_str, bl) for bl in blacklists):
                 # Skip this assignment - employee is blacklisted
                 continue
             
@@ -985,6 +968,10 @@ def _replicate_template_to_employee(
             )
             assignment['employeeId'] = employee['employeeId']
             
+            if not calendar.is_available(emp_id, date_str):
+                # Employee unavailable - leave the slot open
+                assignment = _as_unavailable(assignment)
+            
             assignments.append(assignment)
         elif day_info['is_work_day'] and not day_info['assigned']:
             # Create unassigned slot (employeeId must be None for UNASSIGNED status)
@@ -0,0 +1,170 @@
+"""
+Host-wide CP-SAT search thread budget.
+
+Every CP-SAT solve picks its own num_search_workers (see
+solver_engine.calculate_num_search_workers). When several worker processes
+solve concurrently on one host, those independent choices can add up to more
+threads than there are cores. A SearchThreadBudget is shared by all worker
+processes on a host; each solve draws its threads from it and returns them
+when done, so the total never exceeds the budget capacity.
+
+Grants are recorded per owner (the worker id) in shared memory, so when a
+worker is killed mid-solve (OOM, SIGKILL) the pool controller can return its
+threads with release_owner() instead of losing them for good.
+
+The budget is optional: when none is installed (CLI runs, tests, synchronous
+API solves) solves keep their independently chosen thread counts.
+"""
+
+import logging
+import multiprocessing
+from contextlib import contextmanager
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SearchThreadBudget:
+    """
+    Pool of CP-SAT search threads shared across processes.
+
+    Grants are sized so that every live worker that is not currently solving
+    can still get one thread immediately: a lone job on an idle host gets
+    (almost) all cores, concurrent jobs share them, and no job ever waits
+    unless more workers than cores are running.
+    """
+
+    def __init__(self, capacity: int, live_workers: int = 1):
+        """
+        Args:
+            capacity: Total search threads available (usually the core count)
+            live_workers: Number of worker processes drawing from the budget
+        """
+        self.capacity = max(1, int(capacity))
+        self._free = multiprocessing.Value('i', self.capacity, lock=False)
+        self._holders = multiprocessing.Value('i', 0, lock=False)
+        self._live_workers = multiprocessing.Value('i', max(1, live_workers), lock=False)
+        # Outstanding grants as (owner, threads) pairs; every holder has at
+        # least one thread, so there are never more holders than capacity
+        self._grants = multiprocessing.Array('i', 2 * self.capacity, lock=False)
+        self._cond = multiprocessing.Condition()
+
+    def set_live_workers(self, count: int) -> None:
+        """Update the number of worker processes sharing the budget"""
+        with self._cond:
+            self._live_workers.value = max(1, count)
+            self._cond.notify_all()
+
+    def acquire(self, requested: int, owner: int = 0) -> int:
+        """
+        Take up to `requested` threads, blocking until at least one is free.
+
+        Args:
+            requested: Threads wanted
+            owner: Worker id the grant is recorded under
+
+        Returns:
+            Number of threads granted (>= 1)
+        """
+        requested = max(1, int(requested))
+        with self._cond:
+            while self._free.value < 1:
+                self._cond.wait()
+            # Keep one thread back for each idle worker so it can start immediately
+            idle_workers = max(0, self._live_workers.value - self._holders.value - 1)
+            available = max(1, self._free.value - idle_workers)
+            granted = min(requested, available)
+            self._free.value -= granted
+            self._holders.value += 1
+            grants = self._grants
+            for i in range(0, len(grants), 2):
+                if grants[i + 1] == 0:
+                    grants[i], grants[i + 1] = owner, granted
+                    break
+            return granted
+
+    def release(self, granted: int, owner: int = 0) -> None:
+        """Return threads obtained from acquire()"""
+        with self._cond:
+            grants = self._grants
+            for i in range(0, len(grants), 2):
+                if grants[i] == owner and grants[i + 1] == granted:
+                    grants[i], grants[i + 1] = 0, 0
+                    break
+            self._return_locked(granted, 1)
+
+    def release_owner(self, owner: int) -> int:
+        """
+        Return every grant still held by `owner` (a worker that died mid-solve).
+
+        Returns:
+            Number of threads recovered
+        """
+        with self._cond:
+            grants = self._grants
+            threads = holders = 0
+            for i in range(0, len(grants), 2):
+                if grants[i] == owner and grants[i + 1] > 0:
+                    threads += grants[i + 1]
+                    holders += 1
+                    grants[i], grants[i + 1] = 0, 0
+            if holders:
+                self._return_locked(threads, holders)
+            return threads
+
+    def _return_locked(self, threads: int, holders: int) -> None:
+        """Put threads back and wake waiters (caller holds self._cond)"""
+        self._free.value = min(self.capacity, self._free.value + threads)
+        self._holders.value = max(0, self._holders.value - holders)
+        self._cond.notify_all()
+
+    def snapshot(self) -> dict:
+        """Current budget usage (for stats endpoints)"""
+        with self._cond:
+            return {
+                'capacity': self.capacity,
+                'in_use': self.capacity - self._free.value,
+                'active_solves': self._holders.value,
+                'live_workers': self._live_workers.value
+            }
+
+
+# Budget installed in this process and the worker id grants are recorded under
+_budget: Optional[SearchThreadBudget] = None
+_owner = 0
+
+
+def set_search_thread_budget(budget: Optional[SearchThreadBudget], owner: int = 0) -> None:
+    """Install the budget that CP-SAT solves in this process draw from"""
+    global _budget, _owner
+    _budget = budget
+    _owner = owner
+
+
+def get_search_thread_budget() -> Optional[SearchThreadBudget]:
+    """Budget installed in this process, if any"""
+    return _budget
+
+
+@contextmanager
+def search_threads(requested: Optional[int]):
+    """
+    Reserve CP-SAT search threads for the duration of a solve.
+
+    Yields the thread count to put in num_search_workers. Without an
+    installed budget this is simply `requested` (None keeps the CP-SAT
+    default); with a budget it is the granted share.
+    """
+    budget = _budget
+    if budget is None:
+        yield requested
+        return
+
+    owner = _owner
+    granted = budget.acquire(requested or 1, owner)
+    if requested and granted < requested:
+        logger.info(f"Search threads limited by host budget: {requested} -> {granted}")
+    try:
+        yield granted
+    finally:
+        budget.release(granted, owner)
@@ -18,8 +18,8 @@ Examples:
   10:00-14:00 → gross=4,  lunch=0, normal=4,  ot=0  (4h short shift, no lunch)
 """
 
-from datetime import datetime, time
-from typing import Optional, Dict, List, Tuple
+from datetime import date, datetime, time
+from typing import Optional, Dict, List, Tuple, Union
 
 try:
     from context.engine.constraint_config import get_constraint_param
@@ -893,6 +893,20 @@ def calculate_daily_gross_hours(shifts_same_day: list) -> float:
     return round(total, 2)
 
 
+# ============ DATE HELPERS ============
+
+DayLike = Union[date, datetime, str]
+
+
+def to_date(value: DayLike) -> date:
+    """Date of a date, datetime or ISO string ("2026-01-07" or "2026-01-07T08:00:00")"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(value[:10])
+
+
 # ============ MOM COMPLIANCE HELPERS ============
 
 def get_calendar_week_bounds(date_obj) -> tuple:
@@ -1195,26 +1209,74 @@ def calculate_mom_compliant_hours(
     # Calculate lunch based on shift duration (same for ALL schemes)
     ln = lunch_hours(gross)
     
+    work_days_in_week, consecutive_position = mom_week_position(
+        employee_id, assignment_date_obj, all_assignments, employee_scheme, pattern_work_days
+    )
+    return mom_hours_split(gross, ln, employee_scheme, work_days_in_week, consecutive_position)
+
+
+def mom_week_position(
+    employee_id: str,
+    assignment_date_obj,
+    all_assignments: list,
+    employee_scheme: str = 'A',
+    pattern_work_days: int = None
+) -> Tuple[int, int]:
+    """Week context used by the MOM normal/OT split.
+    
+    Args:
+        employee_id: Employee ID
+        assignment_date_obj: Assignment date (date object)
+        all_assignments: Assignments to count from (the employee's own suffice)
+        employee_scheme: Employment scheme ('A', 'B', or 'P')
+        pattern_work_days: Work days per week from the pattern; if None the
+                           actual days in the calendar week are counted
+    
+    Returns:
+        Tuple of (work_days_in_week, consecutive_position). The consecutive
+        position only affects Scheme P 5-day weeks and is 0 otherwise.
+    """
     # Use pattern work days if provided (for all schemes)
     # Otherwise fall back to counting actual days in calendar week
     if pattern_work_days is not None:
         # Use pattern-based count (e.g., 6-on-1-off pattern = 6 work days)
         work_days_in_week = pattern_work_days
-        print(f"[DEBUG time_utils] Using pattern_work_days={pattern_work_days} for work_days_in_week")
     else:
         # No pattern provided: count actual days in calendar week
         work_days_in_week = count_work_days_in_calendar_week(
             employee_id, assignment_date_obj, all_assignments
         )
-        print(f"[DEBUG time_utils] Counted work_days_in_week={work_days_in_week} from calendar")
     
-    work_day_position_in_week = count_work_day_position_in_week(
-        employee_id, assignment_date_obj, all_assignments
-    )
-    consecutive_position = find_consecutive_position(
-        employee_id, assignment_date_obj, all_assignments
-    )
+    consecutive_position = 0
+    if employee_scheme == 'P' and work_days_in_week == 5:
+        consecutive_position = find_consecutive_position(
+            employee_id, assignment_date_obj, all_assignments
+        )
+    return work_days_in_week, consecutive_position
+
+
+def mom_hours_split(
+    gross: float,
+    ln: float,
+    employee_scheme: str,
+    work_days_in_week: int,
+    consecutive_position: int = 0
+) -> dict:
+    """Scheme-aware normal/OT split of one shift (see calculate_mom_compliant_hours).
+    
+    Pure function of its arguments, so results can be memoized per shift
+    shape (see context.engine.hour_cache).
     
+    Args:
+        gross: Gross shift hours
+        ln: Lunch hours
+        employee_scheme: Employment scheme ('A', 'B', or 'P')
+        work_days_in_week: Work days in the employee's week
+        consecutive_position: Consecutive work day position (Scheme P, 5-day weeks)
+    
+    Returns:
+        Dictionary with keys gross, lunch, normal, ot, restDayPay, paid
+    """
     # Initialize rest day pay
     rest_day_pay = 0.0
     
@@ -1293,12 +1355,10 @@ def calculate_mom_compliant_hours(
         
         # Calculate normal hours threshold: 44h weekly cap / work days in week
         normal_threshold = 44.0 / work_days_in_week
-        print(f"[DEBUG calc] work_days={work_days_in_week}, threshold={normal_threshold:.2f}, gross={gross}, ln={ln}")
         
         # Apply threshold: normal = min(threshold, net hours), OT = rest
         normal = min(normal_threshold, gross - ln)
         ot = max(0.0, gross - ln - normal_threshold)
-        print(f"[DEBUG calc] → normal={normal:.2f}, ot={ot:.2f}")
         
         # restDayPay remains 0 for initial solve
         # It will only be set during incremental solving when employee works on their OFF_DAY
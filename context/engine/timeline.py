@@ -0,0 +1,199 @@
+"""Integer-Minute Slot Timeline.
+
+Slots carry datetime start/end objects; constraint modules used to compare
+them pairwise (C4, C16), call date.isocalendar() per slot and employee to
+group weeks and months (C2, C17) and scale float hours before handing them to
+CP-SAT. The timeline does that work once per solve: every slot gets integer
+positions relative to the planning-horizon start (minute 0 = startDate 00:00):
+
+  - start_min / end_min: minutes since the anchor (end_min > start_min for
+    overnight shifts)
+  - day_index:           days since the anchor date
+  - iso_week_index:      ISO weeks since the anchor's week (Monday-based, so
+                         equal indices = same ISO week)
+  - month_index:         calendar months since the anchor's month
+  - lunch_min:           meal break minutes (hour_cache), so net minutes are
+                         end_min - start_min - lunch_min
+
+Arrays are parallel lists indexed by slot position (order of ctx['slots'];
+timeline.slots[i] is the Slot itself).
+candidates(x) groups the decision variable keys by employee once, replacing
+the per-employee scans over all slots.
+
+Usage:
+    timeline = get_slot_timeline(ctx)
+    for emp_id, positions in timeline.candidates(x).items():
+        for i in positions:
+            gross_minutes = timeline.end_min[i] - timeline.start_min[i]
+"""
+
+import math
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from context.engine.hour_cache import HourBreakdown, shape_breakdown
+from context.engine.time_utils import DayLike, to_date
+
+
+def hours_to_minutes(hours: float) -> int:
+    """Hours as minutes, rounded to the nearest whole minute"""
+    return int(round(hours * 60))
+
+
+def cap_minutes(hours: float, scale: int = 1) -> int:
+    """
+    Largest integer ≤ hours * 60 * scale.
+
+    Sums of integer minutes stay within a fractional cap (e.g. 34.98h =
+    2098.8 min) exactly when they stay within its floor.
+    """
+    return math.floor(hours * 60 * scale + 1e-9)
+
+
+class SlotTimeline:
+    """
+    Per-slot integer positions relative to anchor (planning horizon start).
+
+    Constraint modules get it from get_slot_timeline(ctx), which builds it
+    once per solve and caches it on the context, and group their decision
+    variables with candidates(x) instead of scanning every slot per employee.
+    Comparisons then use integer minutes, days, ISO weeks and months rather
+    than datetimes and isocalendar() calls.
+    """
+
+    def __init__(self, anchor: DayLike, slots: Iterable[Any] = ()):
+        self.anchor = to_date(anchor)
+        self._anchor_dt = datetime.combine(self.anchor, datetime.min.time())
+        self._anchor_monday = self.anchor - timedelta(days=self.anchor.weekday())
+        self.slots: List[Any] = []
+        self.slot_ids: List[str] = []
+        self.position: Dict[str, int] = {}
+        self.start_min: List[int] = []
+        self.end_min: List[int] = []
+        self.lunch_min: List[int] = []
+        self.day_index: List[int] = []
+        self.iso_week_index: List[int] = []
+        self.month_index: List[int] = []
+        self._candidates: Optional[Tuple[Any, int, Dict[str, List[int]]]] = None
+        for slot in slots:
+            self.add_slot(slot)
+
+    def __len__(self) -> int:
+        return len(self.slot_ids)
+
+    # ---- Conversions for values that are not slots (locked shifts, assignments) ----
+
+    def minute(self, dt: datetime) -> int:
+        """Minutes since anchor (wall clock; tz-aware values drop their tzinfo)"""
+        if dt.tzinfo is not None:
+            dt = dt.replace(tzinfo=None)
+        return (dt - self._anchor_dt) // timedelta(minutes=1)
+
+    def day(self, day: DayLike) -> int:
+        return (to_date(day) - self.anchor).days
+
+    def week(self, day: DayLike) -> int:
+        d = to_date(day)
+        return (d - timedelta(days=d.weekday()) - self._anchor_monday).days // 7
+
+    def month(self, day: DayLike) -> int:
+        d = to_date(day)
+        return (d.year - self.anchor.year) * 12 + d.month - self.anchor.month
+
+    def week_label(self, week_index: int) -> Tuple[int, int]:
+        """(ISO year, ISO week) of a week index"""
+        iso_year, iso_week, _ = (self._anchor_monday + timedelta(weeks=week_index)).isocalendar()
+        return iso_year, iso_week
+
+    def month_label(self, month_index: int) -> Tuple[int, int]:
+        """(year, month) of a month index"""
+        year, month0 = divmod(self.anchor.year * 12 + self.anchor.month - 1 + month_index, 12)
+        return year, month0 + 1
+
+    # ---- Slots ----
+
+    def add_slot(self, slot: Any) -> int:
+        """Append one slot (start/end datetimes, date) and return its position"""
+        existing = self.position.get(slot.slot_id)
+        if existing is not None:
+            return existing
+        i = len(self.slot_ids)
+        self.slots.append(slot)
+        self.slot_ids.append(slot.slot_id)
+        self.position[slot.slot_id] = i
+        start_min, end_min = self.minute(slot.start), self.minute(slot.end)
+        self.start_min.append(start_min)
+        self.end_min.append(end_min)
+        self.lunch_min.append(shape_breakdown(start_min, end_min - start_min).lunch_minutes)
+        self.day_index.append(self.day(slot.date))
+        self.iso_week_index.append(self.week(slot.date))
+        self.month_index.append(self.month(slot.date))
+        self._candidates = None
+        return i
+
+    def gross_minutes(self, i: int) -> int:
+        return self.end_min[i] - self.start_min[i]
+
+    def net_minutes(self, i: int) -> int:
+        return self.end_min[i] - self.start_min[i] - self.lunch_min[i]
+
+    def breakdown(self, i: int) -> HourBreakdown:
+        """Cached hour breakdown (gross/lunch/normal/OT) of slot i"""
+        return shape_breakdown(self.start_min[i], self.end_min[i] - self.start_min[i])
+
+    def candidates(self, x: Dict[Tuple[str, str], Any]) -> Dict[str, List[int]]:
+        """
+        emp_id → slot positions the employee has a decision variable for.
+
+        Positions are in slot order. Memoized per x dict (rebuilt if it grows).
+        """
+        cached = self._candidates
+        if cached is not None and cached[0] is x and cached[1] == len(x):
+            return cached[2]
+        by_employee: Dict[str, List[int]] = {}
+        position = self.position
+        for slot_id, emp_id in x:
+            i = position.get(slot_id)
+            if i is not None:
+                by_employee.setdefault(emp_id, []).append(i)
+        for positions in by_employee.values():
+            positions.sort()
+        self._candidates = (x, len(x), by_employee)
+        return by_employee
+
+
+def build_slot_timeline(ctx: Dict[str, Any], slots: Optional[List[Any]] = None) -> SlotTimeline:
+    """
+    Build the timeline for a solve context.
+
+    Args:
+        ctx: Context with planningHorizon
+        slots: Slots to place (default: ctx['slots'])
+
+    Returns:
+        SlotTimeline anchored at planningHorizon.startDate (or the earliest
+        slot date when the context has no horizon)
+    """
+    slots = ctx.get('slots', []) if slots is None else slots
+    horizon_start = (ctx.get('planningHorizon') or {}).get('startDate')
+    if horizon_start:
+        anchor = to_date(horizon_start)
+    elif slots:
+        anchor = min(slot.date for slot in slots)
+    else:
+        anchor = date.today()
+    return SlotTimeline(anchor, slots)
+
+
+def get_slot_timeline(ctx: Dict[str, Any]) -> SlotTimeline:
+    """
+    Timeline for ctx['slots'], cached on ctx['_slotTimeline'].
+
+    Rebuilt when ctx['slots'] is replaced or changes length.
+    """
+    slots = ctx.get('slots', [])
+    cached = ctx.get('_slotTimeline')
+    if cached is None or cached[0] is not slots or cached[1] != len(slots):
+        cached = (slots, len(slots), build_slot_timeline(ctx, slots))
+        ctx['_slotTimeline'] = cached
+    return cached[2]
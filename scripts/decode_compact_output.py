@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Decoder for the Compact Columnar Solver Output
+
+Rebuilds the standard solver output (assignments, employeeRoster, ...) from
+a result produced with "outputFormat": "compact". Standalone: needs only the
+standard library, so it can be copied into consumer projects. The format is
+described in src/compact_output.py, whose decode_compact_output() this mirrors.
+
+Usage:
+    python scripts/decode_compact_output.py --file output/roster_compact.json
+    python scripts/decode_compact_output.py --file output/roster_compact.json --out output/roster.json
+
+As a module:
+    from decode_compact_output import decode_compact_output
+    output = decode_compact_output(json.load(f))
+"""
+
+import sys
+import json
+import argparse
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+HEADER_KEYS = ('outputFormat', 'compactVersion', 'baseDate', 'strings')
+SUPPORTED_VERSIONS = (1,)
+
+
+class _Decoder:
+    def __init__(self, strings: List[str], base_date: str):
+        self.strings = strings
+        self.base_date = date.fromisoformat(base_date) if base_date else None
+
+    def day(self, offset):
+        if offset is None:
+            return None
+        return (self.base_date + timedelta(days=offset)).isoformat()
+
+    def string(self, idx):
+        return None if idx is None else self.strings[idx]
+
+    def value(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            if len(value) == 1 and '$t' in value:
+                return self.table(value['$t'])
+            return {key: self.value(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.value(item) for item in value]
+        return value
+
+    def table(self, table: Dict[str, Any]) -> List[Dict[str, Any]]:
+        records = [{} for _ in range(table['rows'])]
+        for field, column in table['columns'].items():
+            rows = column.get('rows', range(table['rows']))
+            for row, cell in zip(rows, self.column(column, len(rows))):
+                records[row][field] = cell
+        return records
+
+    def column(self, column: Dict[str, Any], count: int) -> List[Any]:
+        kind = column['kind']
+        if kind == 'str':
+            if 'const' in column:
+                return [self.strings[column['const']]] * count
+            return [self.string(idx) for idx in column['values']]
+        if kind == 'day':
+            if 'start' in column:
+                return [self.day(column['start'] + i) for i in range(count)]
+            return [self.day(offset) for offset in column['values']]
+        if kind == 'dt':
+            return [
+                None if day is None else f"{self.day(day)}T{self.strings[time]}"
+                for day, time in zip(column['day'], column['time'])
+            ]
+        if kind == 'obj':
+            return self.table(column['table'])
+        if kind == 'raw':
+            if 'const' in column:
+                return [self.value(column['const']) for _ in range(count)]
+            return [self.value(v) for v in column['values']]
+        raise ValueError(f"Unknown column kind: {kind}")
+
+
+def decode_compact_output(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a compact solver output back to the standard format.
+
+    Documents that are not compact are returned unchanged.
+    """
+    if data.get('outputFormat') != 'compact':
+        return data
+    version = data.get('compactVersion')
+    if version not in SUPPORTED_VERSIONS:
+        raise ValueError(f"Unsupported compactVersion: {version}")
+
+    decoder = _Decoder(data['strings'], data.get('baseDate'))
+    return {
+        key: decoder.value(value)
+        for key, value in data.items()
+        if key not in HEADER_KEYS
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Decode a compact NGRS solver output')
+    parser.add_argument('--file', required=True, help='Compact output JSON file')
+    parser.add_argument('--out', help='Write decoded JSON here (default: stdout)')
+    args = parser.parse_args()
+
+    with open(args.file) as f:
+        decoded = decode_compact_output(json.load(f))
+
+    text = json.dumps(decoded, indent=2)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(text)
+        print(f"Decoded output written to {args.out}", file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -23,14 +23,14 @@ import uuid
 import time
 import logging
 import pathlib
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 # Setup path
 sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
 
-from fastapi import FastAPI, File, UploadFile, Query, HTTPException, Request, Header
-from fastapi.responses import ORJSONResponse
+from fastapi import FastAPI, File, UploadFile, Query, HTTPException, Request, Header, BackgroundTasks
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
 
@@ -46,11 +46,16 @@ from src.models import (
     ValidateAssignmentRequest, ValidateAssignmentResponse
 )
 from src.output_builder import build_output
-from src.redis_job_manager import RedisJobManager
-from src.redis_worker import start_worker_pool
+from src.redis_job_manager import RedisJobManager, AsyncRedisJobManager
+from src.redis_manager import close_async_redis_client
+from src.redis_worker import WorkerPoolController
+from src.solve_pool import (
+    get_solve_pool, SolvePoolBusyError,
+    solve_incremental_task, fill_slots_task, empty_slots_task, icpmp_whatif_task
+)
 from src.feasibility_checker import quick_feasibility_check
-from src.incremental_solver import solve_incremental, IncrementalSolverError
-from src.fill_slots_solver import solve_fill_slots, FillSlotsSolverError
+from src.incremental_solver import IncrementalSolverError
+from src.fill_slots_solver import FillSlotsSolverError
 from src.offset_manager import ensure_staggered_offsets
 from src.resource_monitor import (
     pre_solve_safety_check,
@@ -58,6 +63,8 @@ from src.resource_monitor import (
     estimate_problem_complexity
 )
 from src.input_validator import validate_input, ValidationResult
+from src.result_index import ResultFilter
+from src.ratio_cache import cached_optimal_with_u_slots
 
 # ============================================================================
 # LOGGING SETUP
@@ -165,66 +172,87 @@ app.include_router(v2_router, prefix="/v2", tags=["v2 - Enhanced API (dailyHeadc
 # ASYNC MODE: REDIS JOB MANAGER & WORKERS
 # ============================================================================
 
-# Initialize Redis-based job manager
+# Initialize Redis-based job managers: the sync one backs the worker pool and
+# background tasks, request handlers use the asyncio one
 NUM_WORKERS = int(os.getenv("SOLVER_WORKERS", "2"))
-job_manager = RedisJobManager(
+JOB_MANAGER_SETTINGS = dict(
     result_ttl_seconds=int(os.getenv("RESULT_TTL_SECONDS", "3600")),
-    key_prefix=os.getenv("REDIS_KEY_PREFIX", "ngrs")
+    key_prefix=os.getenv("REDIS_KEY_PREFIX", "ngrs"),
+    dedup_window_seconds=int(os.getenv("DEDUP_WINDOW_SECONDS", "3600"))
 )
+job_manager = RedisJobManager(**JOB_MANAGER_SETTINGS)
+async_job_manager = AsyncRedisJobManager(**JOB_MANAGER_SETTINGS)
+
+# Autoscaling bounds (default: fixed pool of SOLVER_WORKERS processes)
+MIN_WORKERS = int(os.getenv("SOLVER_WORKERS_MIN", str(NUM_WORKERS)))
+MAX_WORKERS = int(os.getenv("SOLVER_WORKERS_MAX", str(max(NUM_WORKERS, MIN_WORKERS))))
 
 # Start worker pool on startup (can be disabled via env var)
-worker_processes = []
-worker_stop_event = None
+worker_pool: Optional[WorkerPoolController] = None
 START_WORKERS = os.getenv("START_WORKERS", "true").lower() in ("true", "1", "yes")
 
+
+def create_worker_pool() -> WorkerPoolController:
+    """Build the autoscaling worker pool from environment settings"""
+    thread_budget = os.getenv("CPSAT_THREAD_BUDGET")
+    return WorkerPoolController(
+        min_workers=MIN_WORKERS,
+        max_workers=MAX_WORKERS,
+        queue_length_fn=job_manager.get_queue_length,
+        ttl_seconds=int(os.getenv("RESULT_TTL_SECONDS", "3600")),
+        thread_capacity=int(thread_budget) if thread_budget else None,
+        min_free_memory_gb=float(os.getenv("WORKER_MIN_FREE_MEMORY_GB", "1.0")),
+        max_cpu_percent=float(os.getenv("WORKER_MAX_CPU_PERCENT", "85")),
+        idle_seconds=int(os.getenv("WORKER_IDLE_SECONDS", "300")),
+        check_interval=float(os.getenv("WORKER_SCALE_INTERVAL_SECONDS", "10"))
+    )
+
+
+def current_worker_count() -> int:
+    """Live worker processes managed by this API process"""
+    return worker_pool.size if worker_pool else NUM_WORKERS
+
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize worker pool on API startup"""
-    global worker_processes, worker_stop_event
+    global worker_pool
     
     if START_WORKERS:
-        logger.info(f"Starting {NUM_WORKERS} solver workers with Redis...")
-        worker_processes, worker_stop_event = start_worker_pool(
-            num_workers=NUM_WORKERS,
-            ttl_seconds=int(os.getenv("RESULT_TTL_SECONDS", "3600"))
-        )
-        logger.info(f"Async mode enabled with {NUM_WORKERS} workers (Redis-backed)")
+        logger.info(f"Starting solver worker pool ({MIN_WORKERS}-{MAX_WORKERS} workers) with Redis...")
+        worker_pool = create_worker_pool()
+        worker_pool.start()
+        logger.info(f"Async mode enabled with {worker_pool.size} workers (Redis-backed)")
     else:
         logger.info("Worker startup disabled (START_WORKERS=false). Run workers separately.")
+    
+    # Pre-start solver processes for the synchronous solve endpoints
+    get_solve_pool().start()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup workers on shutdown"""
-    global worker_processes, worker_stop_event
-    
-    if START_WORKERS and worker_processes:
+    if START_WORKERS and worker_pool:
         logger.info("Shutting down solver workers...")
-        from src.redis_worker import cleanup_worker_pool
-        cleanup_worker_pool(worker_processes, worker_stop_event)
+        worker_pool.stop()
     else:
         logger.info("No workers to shutdown (workers run separately)")
+    
+    get_solve_pool().shutdown()
+    await close_async_redis_client()
 
 
 def restart_workers():
     """Restart worker pool"""
-    global worker_processes, worker_stop_event
+    global worker_pool
     
-    # Stop existing workers
-    if worker_stop_event and worker_processes:
+    if worker_pool is None:
+        worker_pool = create_worker_pool()
+        worker_pool.start()
+    else:
         logger.info("Stopping existing workers...")
-        from src.redis_worker import cleanup_worker_pool
-        cleanup_worker_pool(worker_processes, worker_stop_event)
-        worker_processes.clear()
-    
-    # Start new workers
-    logger.info(f"Starting {NUM_WORKERS} new workers...")
-    new_processes, new_stop_event = start_worker_pool(
-        num_workers=NUM_WORKERS,
-        ttl_seconds=int(os.getenv("RESULT_TTL_SECONDS", "3600"))
-    )
-    worker_processes = new_processes
-    worker_stop_event = new_stop_event
-    logger.info(f"Worker pool restarted with {len(worker_processes)} workers")
+        worker_pool.restart()
+    logger.info(f"Worker pool restarted with {worker_pool.size} workers")
 
 
 # ============================================================================
@@ -571,7 +599,9 @@ async def get_metrics():
             "max_memory_percent": float(os.getenv("MAX_SOLVER_MEMORY_PERCENT", "70")),
             "max_memory_gb": float(os.getenv("MAX_SOLVER_MEMORY_GB", "2.5")),
             "max_cpsat_workers": int(os.getenv("MAX_CPSAT_WORKERS", "2"))
-        }
+        },
+        "worker_pool": worker_pool.status() if worker_pool else None,
+        "solve_pool": get_solve_pool().status()
     }
 
 
@@ -942,7 +972,7 @@ async def icpmp_v3_calculate(request: Request):
     strict patterns with U-slots injected when coverage would exceed headcount.
     
     Key Features:
-    - Proven optimal employee count (try-minimal-first algorithm)
+    - Proven optimal employee count (galloping/binary search from the lower bound)
     - All employees on strict patterns (no flexible category)
     - U-slots for predictable scheduling
     - Handles public holidays and coverage day filtering
@@ -997,6 +1027,11 @@ async def icpmp_v3_calculate(request: Request):
             "totalWorkDays": 155,
             "totalUSlots": 35,
             "dailyCoverageDetails": {...}
+        },
+        "computation": {
+            "search": "bisect",
+            "probes": 2,
+            "probedEmployeeCounts": [5, 6]
         }
     }
     """
@@ -1067,7 +1102,8 @@ async def icpmp_v3_calculate(request: Request):
             requirements=all_requirements,
             planning_horizon=planning_horizon,
             public_holidays=public_holidays,
-            coverage_days=coverage_days
+            coverage_days=coverage_days,
+            calculate=cached_optimal_with_u_slots
         )
         
         # Build response
@@ -1121,6 +1157,134 @@ async def icpmp_v3_calculate(request: Request):
         raise HTTPException(status_code=500, detail=error_msg)
 
 
+@app.post("/icpmp/v3/batch", response_class=ORJSONResponse)
+async def icpmp_v3_batch(request: Request):
+    """
+    ICPMP v3.0 What-If: size N scenarios of one requirement in a single call
+    
+    Each scenario is the base configuration with its overrides applied
+    (workPattern, headcount, scheme, planningHorizon, publicHolidays,
+    coverageDays, enableOtAwareIcpmp, monthlyOtCap, shiftHours). Calendars are
+    built once per distinct horizon/coverage days/holidays, identical scenarios
+    are sized once, and distinct scenarios are sized in parallel processes
+    (ICPMP_WHATIF_WORKERS). The batch runs in the solve pool, so it is
+    subject to the same admission control as the solve endpoints (503 +
+    Retry-After when full). See src/icpmp_whatif.py.
+    
+    Input Schema:
+    {
+        "base": {
+            "planningHorizon": {"startDate": "2026-01-01", "endDate": "2026-01-31"},
+            "publicHolidays": ["2026-01-01"],
+            "coverageDays": ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"],
+            "workPattern": ["D","D","D","D","O","O"],
+            "headcount": 5,
+            "scheme": "A",
+            "shiftHours": 12
+        },
+        "scenarios": [
+            {"scenarioId": "5on-2off", "workPattern": ["D","D","D","D","D","O","O"]},
+            {"scenarioId": "hc6", "headcount": 6},
+            {"scenarioId": "schemeB", "scheme": "B", "enableOtAwareIcpmp": true}
+        ],
+        "rankBy": "employeesRequired"   // or uSlots, otHours, coverageRate
+    }
+    
+    Returns:
+    {
+        "rankBy": "employeesRequired",
+        "scenarios": [
+            {
+                "rank": 1,
+                "scenarioId": "5on-2off",
+                "status": "OK",
+                "workPattern": [...],
+                "headcount": 5,
+                "scheme": "A",
+                "employeesRequired": 11,
+                "lowerBound": 11,
+                "optimality": "PROVEN_MINIMAL",
+                "uSlots": 0,
+                "coverageRate": 160.95,
+                "coverageDays": 21,
+                "potentialWorkDays": 169,
+                "otHours": 371.8,
+                "otHoursPerEmployeeMonth": 33.25,
+                "computeMs": 0.62,
+                "sharedEvaluation": false
+            },
+            {"rank": null, "scenarioId": "bad", "status": "FAILED", "error": "...", ...}
+        ],
+        "summary": {
+            "totalScenarios": 3,
+            "successfulScenarios": 3,
+            "failedScenarios": 0,
+            "distinctEvaluations": 3,
+            "distinctCalendars": 1,
+            "mode": "sequential",
+            "workers": 1,
+            "calendarMs": 0.4,
+            "evaluationMs": 5.2,
+            "computationTimeMs": 5.9
+        }
+    }
+    """
+    request_id = request.state.request_id
+    start_time = time.perf_counter()
+    
+    try:
+        raw_body = await request.body()
+        if not raw_body:
+            raise HTTPException(status_code=400, detail="Empty request body")
+        
+        data = json.loads(raw_body)
+        if not isinstance(data, dict):
+            raise HTTPException(status_code=400, detail="Request body must be a JSON object")
+        
+        try:
+            # In a solver process, so large batches don't block the event loop
+            response = await get_solve_pool().run(
+                icpmp_whatif_task,
+                data.get('base', {}),
+                data.get('scenarios'),
+                data.get('rankBy', 'employeesRequired')
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except SolvePoolBusyError as e:
+            logger.warning("icpmp_batch requestId=%s rejected: %s", request_id, str(e))
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+        
+        elapsed_ms = int((time.perf_counter() - start_time) * 1000)
+        summary = response['summary']
+        logger.info(
+            "icpmp_batch requestId=%s scenarios=%d distinct=%d failed=%d mode=%s durMs=%d",
+            request_id,
+            summary['totalScenarios'],
+            summary['distinctEvaluations'],
+            summary['failedScenarios'],
+            summary['mode'],
+            elapsed_ms
+        )
+        
+        return response
+        
+    except HTTPException:
+        raise
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid JSON: {str(e)}")
+    except Exception as e:
+        elapsed_ms = int((time.perf_counter() - start_time) * 1000)
+        logger.error(
+            "icpmp_batch requestId=%s error=%s durMs=%s",
+            request_id,
+            str(e),
+            elapsed_ms,
+            exc_info=True
+        )
+        raise HTTPException(status_code=500, detail=f"ICPMP what-if error: {str(e)}")
+
+
 # ============================================================================
 # ASYNC ENDPOINTS (Root - Aliases to v1 for backward compatibility)
 # ============================================================================
@@ -1128,6 +1292,7 @@ async def icpmp_v3_calculate(request: Request):
 @app.post("/solve/async", response_model=AsyncJobResponse, tags=["Root (Auto-Detecting)"])
 async def solve_async(
     request: Request,
+    background_tasks: BackgroundTasks,
     payload: Optional[AsyncJobRequest] = None
 ):
     """
@@ -1184,6 +1349,14 @@ async def solve_async(
     - Webhook timeout: 10 seconds
     - Job will complete successfully even if webhook fails
     
+    Duplicate Submissions (dedup, default true):
+    - Keyed on the canonical input hash; webhook_url, priority and ttl_seconds are ignored
+    - Identical job still queued/running: its job_id is returned (deduplicated="in_flight");
+      only the original submission's webhook is notified
+    - Identical job completed within DEDUP_WINDOW_SECONDS: a new job_id is returned that is
+      already completed and serves the cached result (deduplicated="cached_result")
+    - Send "dedup": false to force a fresh solve
+    
     Returns:
     - 201: Job created and queued
     - 400: Invalid input or missing required fields
@@ -1216,16 +1389,19 @@ async def solve_async(
         priority = 0
         ttl_seconds = None
         webhook_url = None
+        dedup = True
         
         if payload:
             priority = payload.priority or 0
             ttl_seconds = payload.ttl_seconds
             webhook_url = payload.webhook_url
+            dedup = payload.dedup is not False
         elif raw_body_json:
             # Check if raw body has these fields (for backward compatibility)
             priority = raw_body_json.get("priority", 0)
             ttl_seconds = raw_body_json.get("ttl_seconds")
             webhook_url = raw_body_json.get("webhook_url")
+            dedup = raw_body_json.get("dedup", True) is not False
         
         # ====== INPUT VALIDATION ======
         # Validate input structure and business logic before submission
@@ -1288,7 +1464,7 @@ async def solve_async(
         # Perform quick feasibility check (< 100ms)
         feasibility_result = None
         try:
-            feasibility_result = quick_feasibility_check(input_json)
+            feasibility_result = quick_feasibility_check(input_json, validation_result.employee_pool)
             logger.info(
                 f"async_job_feasibility requestId={request_id} likely_feasible={feasibility_result['likely_feasible']} "
                 f"confidence={feasibility_result['confidence']} "
@@ -1304,10 +1480,36 @@ async def solve_async(
             logger.warning(f"Feasibility check failed for requestId={request_id}: {check_error}")
             feasibility_result = None
         
-        # Create job with webhook URL
-        job_id = job_manager.create_job(input_json, webhook_url=webhook_url)
+        # Create job with webhook URL (identical submissions are deduplicated)
+        job_id, dedup_outcome = await async_job_manager.submit_job(
+            input_json, webhook_url=webhook_url, dedup=dedup
+        )
         
-        queue_length = job_manager.get_queue_length()
+        if dedup_outcome:
+            job_summary = await async_job_manager.get_job_summary(job_id) or {}
+            if dedup_outcome == 'in_flight':
+                job_message = "Identical job already in progress - returning existing job"
+            else:
+                job_message = "Identical job completed recently - result available immediately"
+                background_tasks.add_task(
+                    job_manager.send_webhook_notification, job_id, os.getenv('API_BASE_URL')
+                )
+            
+            logger.info(
+                "async_job_deduplicated requestId=%s jobId=%s outcome=%s",
+                request_id, job_id, dedup_outcome
+            )
+            
+            return AsyncJobResponse(
+                job_id=job_id,
+                status=job_summary.get('status', 'queued'),
+                created_at=job_summary.get('created_at') or datetime.now().isoformat(),
+                message=job_message,
+                feasibility_check=feasibility_result,
+                deduplicated=dedup_outcome
+            )
+        
+        queue_length = await async_job_manager.get_queue_length()
         
         # Build message based on detected API version
         api_version = input_json.get('_apiVersion', 'v1')
@@ -1346,24 +1548,36 @@ async def solve_async(
 
 
 @app.get("/solve/async/stats", response_model=AsyncStatsResponse)
-async def get_async_stats(details: bool = Query(False, description="Include detailed job list with UUIDs and timestamps")):
+async def get_async_stats(
+    details: bool = Query(False, description="Include detailed job list with UUIDs and timestamps"),
+    offset: int = Query(0, ge=0, description="Number of newest jobs to skip in the detailed list"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of jobs in the detailed list")
+):
     """
     Get statistics about async job queue and workers.
     
     Query parameters:
-    - details: If true, includes list of all jobs with UUIDs and timestamps (default: false)
+    - details: If true, includes list of jobs with UUIDs and timestamps (default: false)
+    - offset: Jobs to skip, newest first (default: 0)
+    - limit: Page size for the job list (default: 100, max: 1000)
     
     Returns:
     - 200: Current statistics
     
+    Counts come from counters maintained by the job manager, so this endpoint
+    stays cheap regardless of how many jobs are retained in Redis.
     Useful for monitoring queue capacity and worker utilization.
     """
-    stats = job_manager.get_stats()
-    stats["workers"] = NUM_WORKERS
+    stats = await async_job_manager.get_stats()
+    stats["workers"] = current_worker_count()
+    if worker_pool:
+        stats["worker_pool"] = worker_pool.status()
     
     # Add detailed job list if requested
     if details:
-        stats["jobs"] = job_manager.get_all_jobs_details()
+        stats["jobs"] = await async_job_manager.get_all_jobs_details(offset=offset, limit=limit)
+        stats["jobs_offset"] = offset
+        stats["jobs_limit"] = limit
     
     return AsyncStatsResponse(**stats)
 
@@ -1410,11 +1624,11 @@ async def admin_reset(
         
         # 1. Flush Redis
         logger.info("Flushing Redis database...")
-        job_manager.redis.flushdb()
+        await async_job_manager.redis.flushdb()
         logger.info("Redis flushed")
         
         # 2. Restart workers (only if workers are managed by this process)
-        if START_WORKERS and worker_processes:
+        if START_WORKERS and worker_pool:
             logger.info("Restarting worker pool...")
             restart_workers()
             logger.info("Workers restarted")
@@ -1424,8 +1638,8 @@ async def admin_reset(
             workers_restarted = False
         
         # 3. Verify system state
-        stats = job_manager.get_stats()
-        stats["workers"] = NUM_WORKERS
+        stats = await async_job_manager.get_stats()
+        stats["workers"] = current_worker_count()
         
         actions = [
             "Redis database flushed (all jobs and results deleted)",
@@ -1433,7 +1647,7 @@ async def admin_reset(
         ]
         
         if workers_restarted:
-            actions.insert(1, f"Worker pool restarted ({NUM_WORKERS} workers)")
+            actions.insert(1, f"Worker pool restarted ({current_worker_count()} workers)")
         else:
             actions.insert(1, "Workers run separately (not restarted)")
         
@@ -1476,7 +1690,7 @@ async def get_job_status(job_id: str):
     - failed: Error occurred (see error_message)
     - expired: Result expired (TTL exceeded)
     """
-    job_info = job_manager.get_job(job_id)
+    job_info = await async_job_manager.get_job(job_id)
     
     if not job_info:
         raise HTTPException(
@@ -1510,7 +1724,7 @@ async def get_job_result(job_id: str):
     - 425: Job not completed yet (check status first)
     - 410: Result expired or job failed
     """
-    job_info = job_manager.get_job(job_id)
+    job_info = await async_job_manager.get_job(job_id)
     
     if not job_info:
         raise HTTPException(
@@ -1536,15 +1750,94 @@ async def get_job_result(job_id: str):
             detail=f"Job not completed yet (current status: {job_info.status.value})"
         )
     
-    result = job_manager.get_result(job_id)
+    # Stored JSON is returned verbatim (no decode/re-encode on the event loop)
+    result_json = await async_job_manager.get_result_json(job_id)
     
-    if not result:
+    if not result_json:
         raise HTTPException(
             status_code=410,
             detail="Result no longer available"
         )
     
-    return ORJSONResponse(content=result)
+    return Response(content=result_json, media_type="application/json")
+
+
+@app.get("/solve/async/{job_id}/result/stream")
+async def stream_job_result(
+    job_id: str,
+    employeeId: Optional[List[str]] = Query(None, description="Only these employees (repeatable)"),
+    dateFrom: Optional[str] = Query(None, description="First date to include (YYYY-MM-DD)"),
+    dateTo: Optional[str] = Query(None, description="Last date to include (YYYY-MM-DD)"),
+    status: Optional[List[str]] = Query(None, description="Assignment / day status, e.g. ASSIGNED (repeatable)"),
+    ouId: Optional[List[str]] = Query(None, description="Only employees of these OUs (repeatable)"),
+    includeHeader: bool = Query(True, description="Send the header record (scoreBreakdown can be large)")
+):
+    """
+    Stream result of completed solver job as NDJSON, optionally filtered.
+    
+    One JSON object per line:
+    - {"type": "header", "data": {...}}: everything except assignments/employeeRoster
+      (omitted with includeHeader=false)
+    - {"type": "assignment", "data": {...}}: one per matching assignment
+    - {"type": "roster", "data": {...}}: one per matching employeeRoster row
+      (dailyStatus trimmed to the date/status filters)
+    - {"type": "end", "counts": {...}}: number of records sent
+    
+    Filters combine with AND; repeated values of one filter combine with OR.
+    Records are read from a per-result index, so a filtered request never
+    loads the whole result. Compact results are streamed as standard records.
+    
+    Returns:
+    - 200: application/x-ndjson stream
+    - 400: Malformed date filter
+    - 404 / 410 / 425: As for GET /solve/async/{job_id}/result
+    """
+    try:
+        result_filter = ResultFilter(
+            employee_ids=employeeId or [], statuses=status or [], ou_ids=ouId or [],
+            date_from=dateFrom, date_to=dateTo
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid date filter: {e}")
+    
+    job_info = await async_job_manager.get_job(job_id)
+    
+    if not job_info:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Job {job_id} not found"
+        )
+    
+    if job_info.status.value == "failed":
+        raise HTTPException(
+            status_code=410,
+            detail=f"Job failed: {job_info.error_message}"
+        )
+    
+    if job_info.status.value == "expired":
+        raise HTTPException(
+            status_code=410,
+            detail="Job result expired (TTL exceeded)"
+        )
+    
+    if job_info.status.value != "completed":
+        raise HTTPException(
+            status_code=425,
+            detail=f"Job not completed yet (current status: {job_info.status.value})"
+        )
+    
+    stream = await async_job_manager.open_result_stream(job_id)
+    
+    if not stream:
+        raise HTTPException(
+            status_code=410,
+            detail="Result no longer available"
+        )
+    
+    return StreamingResponse(
+        async_job_manager.iter_result_stream(*stream, result_filter, include_header=includeHeader),
+        media_type="application/x-ndjson"
+    )
 
 
 @app.delete("/solve/async/{job_id}")
@@ -1574,7 +1867,7 @@ async def cancel_job(job_id: str):
     Note: Jobs IN_PROGRESS cannot be stopped instantly due to CP-SAT solver limitations.
     Worker checks cancellation flag before and after solving, typically stopping within 60 seconds.
     """
-    result = job_manager.cancel_job(job_id)
+    result = await async_job_manager.cancel_job(job_id)
     
     if not result.get("success"):
         raise HTTPException(
@@ -1604,7 +1897,7 @@ async def cancel_job_post(job_id: str):
     - 200: Job cancelled/being cancelled with details
     - 404: Job not found
     """
-    result = job_manager.cancel_job(job_id)
+    result = await async_job_manager.cancel_job(job_id)
     
     if not result.get("success"):
         raise HTTPException(
@@ -1686,12 +1979,8 @@ async def solve_incremental_endpoint(
         # Generate unique run ID
         run_id = f"incr-{int(time.time())}-{request_id[:8]}"
         
-        # Call incremental solver
-        result = solve_incremental(
-            request_data=request_data,
-            solver_engine=solve,  # Pass solver function
-            run_id=run_id
-        )
+        # Call incremental solver (in a solver process)
+        result = await get_solve_pool().run(solve_incremental_task, request_data, run_id)
         
         logger.info(f"[{request_id}] Incremental solve completed: {result.get('status')}")
         
@@ -1708,6 +1997,10 @@ async def solve_incremental_endpoint(
     except IncrementalSolverError as e:
         logger.error(f"[{request_id}] Incremental solver error: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
+    
+    except SolvePoolBusyError as e:
+        logger.warning(f"[{request_id}] Incremental solve rejected: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
         
     except Exception as e:
         logger.error(
@@ -1786,8 +2079,8 @@ async def solve_fill_slots_endpoint(
         # Convert Pydantic model to dict
         request_data = payload.model_dump()
         
-        # Call fill slots solver
-        result = solve_fill_slots(request_data)
+        # Call fill slots solver (in a solver process)
+        result = await get_solve_pool().run(fill_slots_task, request_data)
         
         logger.info(f"[{request_id}] Fill slots completed: {result['solverRun']['status']}, "
                    f"{result['solverRun']['numAssignments']} assignments")
@@ -1800,6 +2093,10 @@ async def solve_fill_slots_endpoint(
     except FillSlotsSolverError as e:
         logger.error(f"[{request_id}] Fill slots solver error: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
+    
+    except SolvePoolBusyError as e:
+        logger.warning(f"[{request_id}] Fill slots rejected: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
         
     except Exception as e:
         logger.error(
@@ -1932,14 +2229,8 @@ async def solve_empty_slots_endpoint(
         logger.info(f"[{request_id}] Employees: {len(employees)}")
         logger.info(f"[{request_id}] Cutoff date: {locked_ctx.get('cutoffDate')}")
         
-        # Call empty slots solver
-        from src.empty_slots_solver import solve_empty_slots
-        
-        result = solve_empty_slots(
-            request_data=request_data,
-            solver_engine=solve,  # Pass solver function
-            run_id=run_id
-        )
+        # Call empty slots solver (in a solver process)
+        result = await get_solve_pool().run(empty_slots_task, request_data, run_id)
         
         logger.info(f"[{request_id}] Empty slots solve completed")
         logger.info(f"[{request_id}] Filled: {result.get('emptySlotsMetadata', {}).get('filledSlotCount', 0)}/{len(empty_slots)}")
@@ -1954,6 +2245,10 @@ async def solve_empty_slots_endpoint(
         
         return result
         
+    except SolvePoolBusyError as e:
+        logger.warning(f"[{request_id}] Empty slots solve rejected: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+        
     except Exception as e:
         logger.error(
             f"[{request_id}] Empty slots solve error: {str(e)}",
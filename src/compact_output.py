@@ -0,0 +1,249 @@
+"""
+Compact Columnar Output Format
+
+Opt-in with `"outputFormat": "compact"` in the solver input. The standard
+output repeats every field name, every demandId/requirementId and every ISO
+datetime once per assignment and again per employeeRoster day, which is why a
+single OU-month reaches ~700 KB. The compact format keeps the same top-level
+keys but stores every list of records as a column table:
+
+- strings go into one shared table ("strings") and cells hold indices
+- dates become day offsets from "baseDate"; datetimes become a day offset
+  plus an index into the string table for the time part
+- nested objects (e.g. assignment hours) become per-key vectors
+- a column that is the same in every row is stored once; a column whose
+  day offsets run 0,1,2,... (dailyStatus dates) is stored as its start only
+
+So employeeRoster[].dailyStatus turns into per-employee arrays indexed by day
+offset, and assignments into shift-code / hours vectors.
+
+The encoding is lossless. decode_compact_output() rebuilds the standard
+document server-side; scripts/decode_compact_output.py is a stdlib-only copy
+of the decoder for API consumers and must be kept in step with it.
+
+Table layout (a list of records is replaced by {"$t": table}):
+    {"rows": n, "columns": {field: column}}
+Column kinds:
+    {"kind": "str", "values": [idx|null]}      or {"kind": "str", "const": idx}
+    {"kind": "day", "values": [offset|null]}   or {"kind": "day", "start": k}
+    {"kind": "dt", "day": [offset|null], "time": [idx|null]}
+    {"kind": "obj", "table": table}
+    {"kind": "raw", "values": [json]}          or {"kind": "raw", "const": json}
+A column missing from some records carries "rows": [indices that have it].
+"""
+
+import re
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+OUTPUT_FORMATS = ('standard', 'compact')
+COMPACT_VERSION = 1
+
+_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+_DATETIME_RE = re.compile(r'^(\d{4}-\d{2}-\d{2})T(.+)$')
+
+
+class _Encoder:
+    """Holds the shared string table and base date while encoding one document"""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._string_index: Dict[str, int] = {}
+        self.base_date: Optional[date] = None
+
+    def string(self, value: str) -> int:
+        idx = self._string_index.get(value)
+        if idx is None:
+            idx = len(self.strings)
+            self._string_index[value] = idx
+            self.strings.append(value)
+        return idx
+
+    def day(self, value: str) -> int:
+        day = date.fromisoformat(value)
+        if self.base_date is None:
+            self.base_date = day
+        return (day - self.base_date).days
+
+    def value(self, value: Any) -> Any:
+        """Encode any JSON value, turning lists of records into tables"""
+        if isinstance(value, list):
+            if len(value) >= 2 and all(isinstance(item, dict) for item in value):
+                return {'$t': self.table(value)}
+            return [self.value(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self.value(item) for key, item in value.items()}
+        return value
+
+    def table(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        fields = {}
+        for record in records:
+            for field in record:
+                fields.setdefault(field, None)
+
+        columns = {}
+        for field in fields:
+            rows = [i for i, record in enumerate(records) if field in record]
+            column = self.column([records[i][field] for i in rows])
+            if len(rows) < len(records):
+                column['rows'] = rows
+            columns[field] = column
+        return {'rows': len(records), 'columns': columns}
+
+    def column(self, values: List[Any]) -> Dict[str, Any]:
+        present = [v for v in values if v is not None]
+
+        if present and all(isinstance(v, str) for v in present):
+            if all(_is_iso_date(v) for v in present):
+                offsets = [None if v is None else self.day(v) for v in values]
+                start = offsets[0]
+                if start is not None and offsets == list(range(start, start + len(offsets))):
+                    return {'kind': 'day', 'start': start}
+                return {'kind': 'day', 'values': offsets}
+
+            if all(_split_datetime(v) for v in present):
+                days, times = [], []
+                for v in values:
+                    if v is None:
+                        days.append(None)
+                        times.append(None)
+                    else:
+                        day_part, time_part = _split_datetime(v)
+                        days.append(self.day(day_part))
+                        times.append(self.string(time_part))
+                return {'kind': 'dt', 'day': days, 'time': times}
+
+            indices = [None if v is None else self.string(v) for v in values]
+            if len(indices) > 1 and None not in indices and len(set(indices)) == 1:
+                return {'kind': 'str', 'const': indices[0]}
+            return {'kind': 'str', 'values': indices}
+
+        if present and len(present) == len(values) and all(isinstance(v, dict) for v in values):
+            return {'kind': 'obj', 'table': self.table(values)}
+
+        encoded = [self.value(v) for v in values]
+        if len(encoded) > 1 and all(v == encoded[0] and type(v) is type(encoded[0]) for v in encoded):
+            return {'kind': 'raw', 'const': encoded[0]}
+        return {'kind': 'raw', 'values': encoded}
+
+
+def _is_iso_date(value: str) -> bool:
+    if not _DATE_RE.match(value):
+        return False
+    try:
+        return date.fromisoformat(value).isoformat() == value
+    except ValueError:
+        return False
+
+
+def _split_datetime(value: str):
+    """'YYYY-MM-DDT<time>' → (date part, time part), or None"""
+    match = _DATETIME_RE.match(value)
+    if not match or not _is_iso_date(match.group(1)):
+        return None
+    return match.group(1), match.group(2)
+
+
+class _Decoder:
+    """Inverse of _Encoder for one compact document"""
+
+    def __init__(self, strings: List[str], base_date: Optional[str]):
+        self.strings = strings
+        self.base_date = date.fromisoformat(base_date) if base_date else None
+
+    def day(self, offset: Optional[int]) -> Optional[str]:
+        if offset is None:
+            return None
+        return (self.base_date + timedelta(days=offset)).isoformat()
+
+    def value(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            if len(value) == 1 and '$t' in value:
+                return self.table(value['$t'])
+            return {key: self.value(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.value(item) for item in value]
+        return value
+
+    def table(self, table: Dict[str, Any]) -> List[Dict[str, Any]]:
+        records = [{} for _ in range(table['rows'])]
+        for field, column in table['columns'].items():
+            rows = column.get('rows', range(table['rows']))
+            for row, cell in zip(rows, self.column(column, len(rows))):
+                records[row][field] = cell
+        return records
+
+    def column(self, column: Dict[str, Any], count: int) -> List[Any]:
+        kind = column['kind']
+        if kind == 'str':
+            if 'const' in column:
+                return [self.strings[column['const']]] * count
+            return [None if idx is None else self.strings[idx] for idx in column['values']]
+        if kind == 'day':
+            if 'start' in column:
+                return [self.day(column['start'] + i) for i in range(count)]
+            return [self.day(offset) for offset in column['values']]
+        if kind == 'dt':
+            return [
+                None if day is None else f"{self.day(day)}T{self.strings[time]}"
+                for day, time in zip(column['day'], column['time'])
+            ]
+        if kind == 'obj':
+            return self.table(column['table'])
+        if kind == 'raw':
+            if 'const' in column:
+                return [self.value(column['const']) for _ in range(count)]
+            return [self.value(v) for v in column['values']]
+        raise ValueError(f"Unknown column kind: {kind}")
+
+
+def encode_compact_output(output: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a standard solver output document to the compact format.
+
+    Args:
+        output: Output dict as produced by build_output
+
+    Returns:
+        Compact document (same top-level keys plus outputFormat, compactVersion,
+        baseDate and strings)
+    """
+    encoder = _Encoder()
+    body = {key: encoder.value(value) for key, value in output.items()}
+    return {
+        'outputFormat': 'compact',
+        'compactVersion': COMPACT_VERSION,
+        'baseDate': encoder.base_date.isoformat() if encoder.base_date else None,
+        'strings': encoder.strings,
+        **body
+    }
+
+
+def apply_output_format(output: Dict[str, Any], input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Return output in the format requested by input_data['outputFormat']"""
+    if (input_data or {}).get('outputFormat') == 'compact':
+        return encode_compact_output(output)
+    return output
+
+
+def decode_compact_output(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a compact document back to the standard output format.
+
+    Args:
+        data: Compact document from encode_compact_output (after a JSON round trip)
+
+    Returns:
+        Standard output dict; documents that are not compact are returned unchanged
+    """
+    if data.get('outputFormat') != 'compact':
+        return data
+    if data.get('compactVersion') != COMPACT_VERSION:
+        raise ValueError(f"Unsupported compactVersion: {data.get('compactVersion')}")
+
+    decoder = _Decoder(data['strings'], data.get('baseDate'))
+    return {
+        key: decoder.value(value)
+        for key, value in data.items()
+        if key not in ('outputFormat', 'compactVersion', 'baseDate', 'strings')
+    }
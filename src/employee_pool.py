@@ -0,0 +1,184 @@
+"""
+Attribute-Indexed Employee Pool
+
+ICPMP employee selection, the quick feasibility check and input validation
+all match employees against requirement criteria (product type, rank, OU,
+scheme, gender, qualifications). Scanning the employee list per requirement
+is O(employees x requirements), and ICPMP also deep-copied every eligible
+employee. EmployeePool is built once per request and keeps inverted indexes
+from attribute value to employee positions, each built on first use:
+
+    productTypeId, rankId, ouId, teamId, gender, scheme (raw value),
+    schemeCode (normalize_scheme of the raw value), employeeId,
+    qualification code -> (position, validFrom, expiryDate)
+
+Buckets are position lists (far smaller than sets for high-cardinality
+fields such as employeeId). A filter evaluates its predicate once per
+distinct value of a field and unions the matching buckets into a set, so
+each requirement's criteria become a few set intersections. Results are
+the pool's own employee dicts, returned in input order. They are read-only views: callers that write to an employee
+(e.g. ICPMP applying rotation offsets) copy it at that point.
+
+Usage:
+    pool = EmployeePool(input_json['employees'])
+    ids = pool.where_in('productTypeId', ['APO']) & pool.where('rankId', lambda r: r in ranks)
+    employees = pool.view(ids)
+"""
+
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from context.engine.time_utils import normalize_scheme
+
+INDEXED_FIELDS = ('productTypeId', 'rankId', 'ouId', 'teamId', 'gender', 'scheme', 'employeeId')
+
+# Key for employees that do not have the field at all (distinct from an explicit None)
+MISSING = object()
+
+
+class EmployeePool:
+    """Inverted indexes over one request's employees"""
+
+    def __init__(self, employees: Sequence[Dict[str, Any]]):
+        """
+        Args:
+            employees: Employee dicts of the request (not copied or modified)
+        """
+        self.employees = list(employees)
+        self._all = frozenset(range(len(self.employees)))
+        self._index: Dict[str, Dict[Any, List[int]]] = {}
+        self._qualifications: Optional[Dict[str, List[Tuple[int, Optional[str], Optional[str]]]]] = None
+
+    def _field(self, field: str) -> Dict[Any, List[int]]:
+        """Index of one field, built on first use"""
+        index = self._index.get(field)
+        if index is not None:
+            return index
+
+        index = defaultdict(list)
+        if field == 'schemeCode':
+            # Normalize once per distinct raw scheme rather than once per employee
+            for scheme, positions in self._field('scheme').items():
+                index[normalize_scheme(None if scheme is MISSING else scheme)].extend(positions)
+        elif field in INDEXED_FIELDS:
+            for position, emp in enumerate(self.employees):
+                index[emp.get(field, MISSING)].append(position)
+        else:
+            raise KeyError(f"Field '{field}' is not indexed")
+        self._index[field] = index
+        return index
+
+    def _qualification_index(self) -> Dict[str, List[Tuple[int, Optional[str], Optional[str]]]]:
+        """Qualification code -> (position, validFrom, expiryDate), built on first use"""
+        if self._qualifications is None:
+            self._qualifications = defaultdict(list)
+            for position, emp in enumerate(self.employees):
+                for qual in emp.get('qualifications', []) or []:
+                    if isinstance(qual, dict) and 'code' in qual:
+                        self._qualifications[qual['code']].append(
+                            (position, qual.get('validFrom'), qual.get('expiryDate'))
+                        )
+                    elif isinstance(qual, str):  # Legacy format: flat list of codes
+                        self._qualifications[qual].append((position, None, None))
+        return self._qualifications
+
+    def __len__(self) -> int:
+        return len(self.employees)
+
+    def all(self) -> Set[int]:
+        """Every position, as a new set the caller can narrow in place"""
+        return set(self._all)
+
+    def values(self, field: str) -> List[Any]:
+        """Distinct values of an indexed field (MISSING for employees without it)"""
+        return list(self._field(field))
+
+    def where(self, field: str, predicate: Callable[[Any], bool], default: Any = None) -> Set[int]:
+        """
+        Positions of employees whose field value satisfies predicate.
+
+        Args:
+            field: Indexed field name
+            predicate: Called once per distinct value
+            default: Value passed to predicate for employees without the field
+                (mirrors emp.get(field, default))
+
+        Returns:
+            Set of positions
+        """
+        matched = set()
+        for value, positions in self._field(field).items():
+            if predicate(default if value is MISSING else value):
+                matched.update(positions)
+        return matched
+
+    def narrow(self, candidates: Set[int], field: str, predicate: Callable[[Any], bool],
+               default: Any = None) -> Set[int]:
+        """
+        Keep only candidates whose field value satisfies predicate (in place).
+
+        Same result as candidates &= where(field, predicate, default), but
+        removes the failing buckets instead when they hold fewer employees,
+        so broad filters (scheme compatibility) stay cheap on large pools.
+
+        Args:
+            candidates: Positions to narrow (modified)
+            field: Indexed field name
+            predicate: Called once per distinct value
+            default: Value passed to predicate for employees without the field
+
+        Returns:
+            candidates
+        """
+        passing, failing = [], []
+        for value, positions in self._field(field).items():
+            if predicate(default if value is MISSING else value):
+                passing.append(positions)
+            else:
+                failing.append(positions)
+
+        if sum(map(len, failing)) <= sum(map(len, passing)):
+            for positions in failing:
+                candidates.difference_update(positions)
+        else:
+            matched = set()
+            for positions in passing:
+                matched.update(positions)
+            candidates &= matched
+        return candidates
+
+    def where_in(self, field: str, values: Iterable[Any]) -> Set[int]:
+        """Positions of employees whose field value is one of values"""
+        index = self._field(field)
+        matched = set()
+        for value in values:
+            matched.update(index.get(value, ()))
+        return matched
+
+    def with_qualification(self, codes: Iterable[str], start: Optional[str] = None,
+                           end: Optional[str] = None) -> Set[int]:
+        """
+        Positions of employees holding any of the qualification codes.
+
+        Args:
+            codes: Acceptable qualification codes
+            start: If given with end, only count qualifications whose
+                validFrom/expiryDate range (ISO dates, open when missing)
+                overlaps [start, end]
+            end: See start
+
+        Returns:
+            Set of positions
+        """
+        matched = set()
+        for code in codes:
+            for position, valid_from, expiry in self._qualification_index().get(code, ()):
+                if start is not None and end is not None:
+                    if (expiry and expiry[:10] < start[:10]) or (valid_from and valid_from[:10] > end[:10]):
+                        continue
+                matched.add(position)
+        return matched
+
+    def view(self, positions: Iterable[int]) -> List[Dict[str, Any]]:
+        """Employee dicts at positions, in input order (shared; do not mutate)"""
+        return [self.employees[position] for position in sorted(positions)]
@@ -15,13 +15,15 @@ from datetime import datetime
 from collections import defaultdict
 
 from context.engine.time_utils import normalize_scheme, normalize_schemes, is_scheme_compatible
+from src.employee_pool import EmployeePool
 from math import ceil
 
 # ICPMP v2.0: Use sophisticated coverage simulation
 from context.engine.config_optimizer_v3 import simulate_coverage_with_preprocessing
 
 
-def quick_feasibility_check(input_data: Dict[str, Any]) -> Dict[str, Any]:
+def quick_feasibility_check(input_data: Dict[str, Any],
+                            pool: Optional[EmployeePool] = None) -> Dict[str, Any]:
     """
     Fast pre-flight feasibility check without running solver.
     
@@ -33,6 +35,8 @@ def quick_feasibility_check(input_data: Dict[str, Any]) -> Dict[str, Any]:
     
     Args:
         input_data: Full NGRS input JSON
+        pool: Employee index of input_data['employees'] (e.g. the one built
+            by validate_input); built here when not given
         
     Returns:
         {
@@ -66,6 +70,10 @@ def quick_feasibility_check(input_data: Dict[str, Any]) -> Dict[str, Any]:
     # Extract constraints
     constraints = _extract_constraints(constraint_list)
     
+    # One employee index for all requirements
+    if pool is None:
+        pool = EmployeePool(employees)
+    
     # Analyze each requirement
     requirement_analysis = []
     total_required_min = 0
@@ -81,7 +89,8 @@ def quick_feasibility_check(input_data: Dict[str, Any]) -> Dict[str, Any]:
                 demand, 
                 employees, 
                 days_in_horizon,
-                constraints
+                constraints,
+                pool
             )
             requirement_analysis.append(analysis)
             total_required_min += analysis['employees_required_min']
@@ -181,7 +190,8 @@ def _analyze_requirement(
     demand: Dict,
     employees: List[Dict],
     days_in_horizon: int,
-    constraints: Dict
+    constraints: Dict,
+    pool: Optional[EmployeePool] = None
 ) -> Dict[str, Any]:
     """
     Analyze single requirement for feasibility using ICPMP v2.0 logic.
@@ -211,7 +221,8 @@ def _analyze_requirement(
         product_type_ids,  # Pass array for v2 OR logic
         rank_id, 
         gender_req, 
-        scheme_list  # Pass list instead of single value
+        scheme_list,  # Pass list instead of single value
+        pool
     )
     
     matching_count = len(matching_employees)
@@ -339,40 +350,30 @@ def _filter_matching_employees(
     product_type_ids: List[str],
     rank_id: str,
     gender_req: str,
-    scheme_req: str
+    scheme_req: str,
+    pool: Optional[EmployeePool] = None
 ) -> List[Dict]:
-    """Filter employees matching requirement criteria."""
-    matching = []
-    
-    # Determine if using v2 productTypeIds array
-    use_product_types_array = bool(product_type_ids and len(product_type_ids) > 0)
-    
-    for emp in employees:
-        # Check product type (v2: supports OR logic for productTypeIds array)
-        emp_product = emp.get('productTypeId', '')
-        if use_product_types_array:
-            if emp_product not in product_type_ids:
-                continue
-        elif product_type and emp_product != product_type:
-            continue
-        
-        # Check rank
-        emp_rank = emp.get('rankId', '')
-        if rank_id and emp_rank != rank_id:
-            continue
-        
-        # Check gender (if specific gender required)
-        if gender_req in ['M', 'F', 'Male', 'Female']:
-            emp_gender = emp.get('gender', '').upper()
-            req_gender = gender_req[0].upper()
-            if emp_gender != req_gender:
-                continue
-        
-        # v0.96: Check scheme compatibility (supports multiple schemes)
-        emp_scheme = normalize_scheme(emp.get('scheme', 'A'))
-        if not is_scheme_compatible(emp_scheme, scheme_req):
-            continue
-        
-        matching.append(emp)
+    """Filter employees matching requirement criteria (via the pool's indexes)."""
+    if pool is None:
+        pool = EmployeePool(employees)
+    matching = pool.all()
+    
+    # Check product type (v2: supports OR logic for productTypeIds array)
+    if product_type_ids:
+        pool.narrow(matching, 'productTypeId', lambda p: p in product_type_ids, default='')
+    elif product_type:
+        matching &= pool.where_in('productTypeId', [product_type])
+    
+    # Check rank
+    if rank_id:
+        matching &= pool.where_in('rankId', [rank_id])
+    
+    # Check gender (if specific gender required)
+    if gender_req in ['M', 'F', 'Male', 'Female']:
+        req_gender = gender_req[0].upper()
+        pool.narrow(matching, 'gender', lambda g: g.upper() == req_gender, default='')
+    
+    # v0.96: Check scheme compatibility (supports multiple schemes)
+    pool.narrow(matching, 'schemeCode', lambda code: is_scheme_compatible(code, scheme_req))
     
-    return matching
+    return pool.view(matching)
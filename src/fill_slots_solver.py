@@ -12,6 +12,9 @@ import uuid
 from datetime import datetime, date, timedelta
 from typing import Dict, List, Any, Set, Optional, Tuple
 from collections import defaultdict
+from functools import lru_cache
+
+from context.engine.load_heap import LoadHeap
 
 logger = logging.getLogger(__name__)
 
@@ -21,8 +24,9 @@ class FillSlotsSolverError(Exception):
     pass
 
 
+@lru_cache(maxsize=4096)
 def parse_date(date_str: str) -> date:
-    """Parse YYYY-MM-DD string to date object."""
+    """Parse YYYY-MM-DD string to date object (memoized; dates repeat across slots)."""
     return datetime.strptime(date_str, "%Y-%m-%d").date()
 
 
@@ -268,7 +272,17 @@ def simple_greedy_assignment(
     employee_pool: Dict[str, Dict[str, Any]]
 ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
     """
-    Simple greedy algorithm to assign slots to employees.
+    Greedy algorithm to assign slots to employees.
+    
+    Slots are taken by date. Each goes to the employee with the most monthly
+    hours remaining who passes the can_assign_employee_to_slot checks, ties
+    in pool order, so load spreads across the pool instead of draining the
+    first employees. Employees wait in a LoadHeap keyed by hours remaining
+    (new joiners enter on their availableFrom date), with hours, consecutive
+    days and last work date kept as per-employee counters. Employees
+    unavailable or at the consecutive-day limit on a date stay so for the
+    whole date, so they are parked until the date changes. A slot costs
+    O(log employees), plus one pop per parked employee per date.
     
     Returns:
         Tuple of (assignments, unmet_slots)
@@ -276,25 +290,64 @@ def simple_greedy_assignment(
     assignments = []
     unmet_slots = []
     
+    employees = list(employee_pool.values())
+    hours_left = [emp["availableHours"]["monthly"] for emp in employees]
+    consecutive = [emp["currentState"].get("consecutiveDaysWorked", 0) for emp in employees]
+    last_work = [
+        parse_date(last) if isinstance(last, str) else last
+        for last in (emp["currentState"].get("lastWorkDate") for emp in employees)
+    ]
+    
+    # New joiners join the heap once slots reach their availableFrom date
+    joiners = sorted(
+        (emp["availableFrom"], i) for i, emp in enumerate(employees) if emp["type"] == "new_joiner"
+    )
+    next_joiner = 0
+    heap = LoadHeap((-hours_left[i], i, i) for i, emp in enumerate(employees) if emp["type"] != "new_joiner")
+    parked = []
+    parked_date = None
+    
     # Sort slots by date
     sorted_slots = sorted(empty_slots, key=lambda s: s["date"])
     
     for slot in sorted_slots:
         slot_date = parse_date(slot["date"])
-        assigned = False
+        slot_hours = slot["hours"].get("normal", 8.0)
+        
+        if slot_date != parked_date:
+            for entry in parked:
+                heap.push(*entry)
+            parked.clear()
+            parked_date = slot_date
         
-        # Try to assign to first available employee
-        for emp_id, employee in employee_pool.items():
-            can_assign, reason = can_assign_employee_to_slot(employee, slot, slot_date)
-            
-            if can_assign:
-                assignment = assign_slot_to_employee(employee, slot, slot_date)
-                assignments.append(assignment)
-                assigned = True
-                logger.debug(f"✓ Assigned slot {slot.get('slotId')} on {slot['date']} to {emp_id}")
-                break
+        while next_joiner < len(joiners) and joiners[next_joiner][0] <= slot_date:
+            i = joiners[next_joiner][1]
+            heap.push(-hours_left[i], i, i)
+            next_joiner += 1
         
-        if not assigned:
+        def can_take(i: int) -> bool:
+            # Same checks as can_assign_employee_to_slot, on the counters
+            availability_map = employees[i]["availabilityMap"]
+            if slot_date in availability_map and not availability_map[slot_date]:
+                return False
+            if last_work[i] and (slot_date - last_work[i]).days == 1 and consecutive[i] >= 12:
+                return False
+            return True
+        
+        # Most hours remaining first; stop once even that is below the slot's hours
+        entry = heap.pop_first(can_take, stop=lambda load: -load < slot_hours, parked=parked)
+        
+        if entry is not None:
+            i = entry[2]
+            employee = employees[i]
+            assignment = assign_slot_to_employee(employee, slot, slot_date)
+            assignments.append(assignment)
+            hours_left[i] = employee["availableHours"]["monthly"]
+            consecutive[i] = employee["currentState"]["consecutiveDaysWorked"]
+            last_work[i] = slot_date
+            heap.push(-hours_left[i], i, i)
+            logger.debug(f"✓ Assigned slot {slot.get('slotId')} on {slot['date']} to {employee['employeeId']}")
+        else:
             unmet_slots.append(slot)
             logger.warning(f"✗ Could not assign slot {slot.get('slotId')} on {slot['date']}")
     
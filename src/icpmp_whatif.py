@@ -0,0 +1,340 @@
+"""
+ICPMP What-If Scenarios
+
+Planners compare patterns, headcounts and schemes by sizing the same
+requirement many ways. /icpmp/v3/batch takes a base configuration plus N
+scenario overrides and returns one ranked comparison table instead of N
+/icpmp/v3 calls:
+
+- Each scenario is the base with its overrides applied (top-level keys
+  replace the base's).
+- Coverage calendars are built once per distinct (horizon, coverage days,
+  public holidays) and shared by the scenarios that use them.
+- Scenarios with identical sizing inputs are evaluated once.
+- Evaluations are ordered by calendar and pattern, so scenarios sharing a
+  pattern reuse its coverage kernel (coverage_kernel.kernel_for_calendar)
+  in the same process.
+- The first evaluation runs in-process. The rest go to a pool of up to
+  ICPMP_WHATIF_WORKERS processes (0 = auto, up to 4 by CPU count; 1 =
+  sequential) when they are estimated to take at least ICPMP_PARALLEL_MIN_MS.
+- Results go through the persistent ratio cache like /icpmp/v3.
+
+Scenario fields (base or override):
+    workPattern, headcount, scheme, planningHorizon, publicHolidays,
+    coverageDays, enableOtAwareIcpmp, monthlyOtCap, shiftHours (gross hours
+    per shift, for the OT estimate; default 12)
+
+Ranking (rankBy): employeesRequired (default), uSlots, otHours or
+coverageRate first, then the other columns in that order (fewer employees,
+U-slots and OT hours, higher coverage), then input order. Failed scenarios
+are listed after the ranked ones with rank None.
+
+OT load is estimated at full pattern capacity: potential work days times the
+pattern's mean OT hours per shift (C2 pattern-aware normal/OT split).
+
+Usage:
+    from src.icpmp_whatif import evaluate_scenarios
+    report = evaluate_scenarios(base, scenarios, rank_by='employeesRequired')
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
+from math import ceil
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+import os
+import time
+
+from context.constraints.C2_mom_weekly_hours import calculate_pattern_aware_hours
+from context.engine.config_optimizer_v3 import generate_coverage_calendar
+from context.engine.time_utils import normalize_scheme
+from src.ratio_cache import cached_optimal_with_u_slots
+
+logger = logging.getLogger(__name__)
+
+MAX_SCENARIOS = int(os.getenv('ICPMP_WHATIF_MAX_SCENARIOS', '1000'))
+
+SCENARIO_FIELDS = (
+    'workPattern', 'headcount', 'scheme', 'planningHorizon', 'publicHolidays', 'coverageDays',
+    'enableOtAwareIcpmp', 'monthlyOtCap', 'shiftHours',
+)
+
+# Ranking columns: (row key, sign so that smaller sorts first)
+RANK_COLUMNS = {
+    'employeesRequired': ('employeesRequired', 1),
+    'uSlots': ('uSlots', 1),
+    'otHours': ('otHours', 1),
+    'coverageRate': ('coverageRate', -1),
+}
+
+
+def _whatif_workers() -> int:
+    """Process count for scenario evaluation (ICPMP_WHATIF_WORKERS, 0 = auto)"""
+    configured = int(os.getenv('ICPMP_WHATIF_WORKERS', '0'))
+    if configured > 0:
+        return configured
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+def _evaluate(task: Tuple) -> Tuple[Optional[Dict[str, Any]], Optional[str], float]:
+    """
+    Pool task: ICPMP sizing for one distinct scenario.
+
+    Args:
+        task: (pattern, headcount, calendar, anchor_date, scheme,
+            enable_ot_aware_icpmp, monthly_ot_cap)
+
+    Returns:
+        (icpmp_result or None, error message or None, compute_ms)
+    """
+    pattern, headcount, calendar, anchor_date, scheme, enable_ot_aware, monthly_ot_cap = task
+    start = time.perf_counter()
+    try:
+        result = cached_optimal_with_u_slots(
+            pattern=list(pattern),
+            headcount=headcount,
+            calendar=calendar,
+            anchor_date=anchor_date,
+            requirement_id='whatif',
+            scheme=scheme,
+            enable_ot_aware_icpmp=enable_ot_aware,
+            monthly_ot_cap=monthly_ot_cap
+        )
+        return result, None, (time.perf_counter() - start) * 1000
+    except Exception as e:
+        return None, str(e), (time.perf_counter() - start) * 1000
+
+
+def _run_tasks(tasks: List[Tuple]) -> Tuple[List[Tuple], str, int]:
+    """Evaluate tasks in order: the first in-process, the rest in a pool when worthwhile"""
+    if not tasks:
+        return [], 'sequential', 1
+    results = [_evaluate(tasks[0])]
+    rest = tasks[1:]
+
+    workers = min(len(rest), _whatif_workers())
+    estimated_ms = results[0][2] * len(rest)
+    if workers > 1 and estimated_ms >= float(os.getenv('ICPMP_PARALLEL_MIN_MS', '100')):
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                # Contiguous chunks keep scenarios sharing a pattern in one process
+                results.extend(pool.map(_evaluate, rest, chunksize=ceil(len(rest) / workers)))
+            logger.info(f"  ICPMP what-if: {len(rest)} evaluations on {workers} processes")
+            return results, 'parallel', workers
+        except (OSError, AssertionError, BrokenProcessPool) as e:
+            logger.warning(f"  ICPMP what-if pool unavailable ({e}); evaluating sequentially")
+            del results[1:]
+
+    results.extend(_evaluate(task) for task in rest)
+    return results, 'sequential', 1
+
+
+def resolve_scenario(base: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """Base configuration with a scenario's overrides applied"""
+    scenario = {field: base[field] for field in SCENARIO_FIELDS if field in base}
+    scenario.update({field: overrides[field] for field in SCENARIO_FIELDS if field in overrides})
+    return scenario
+
+
+def _check_scenario(scenario: Dict[str, Any]) -> Optional[str]:
+    """Error message for a scenario that cannot be sized, or None"""
+    pattern = scenario.get('workPattern')
+    headcount = scenario.get('headcount')
+    horizon = scenario.get('planningHorizon')
+    if not isinstance(pattern, list) or not pattern or not all(isinstance(shift, str) for shift in pattern):
+        return "workPattern must be a non-empty array of shift codes"
+    if all(shift == 'O' for shift in pattern):
+        return "workPattern must contain at least one work day (non-'O' shift)"
+    if not isinstance(headcount, int) or isinstance(headcount, bool) or headcount < 1:
+        return "headcount must be a positive integer"
+    if not isinstance(horizon, dict) or not horizon.get('startDate') or not horizon.get('endDate'):
+        return "planningHorizon must contain 'startDate' and 'endDate'"
+    if not isinstance(scenario.get('scheme', 'A'), str):
+        return "scheme must be a string"
+    for field in ('shiftHours', 'monthlyOtCap'):
+        value = scenario.get(field, 1)
+        if not isinstance(value, (int, float)) or isinstance(value, bool) or value <= 0:
+            return f"{field} must be a positive number"
+    return None
+
+
+def ot_hours_per_shift(pattern: List[str], shift_hours: float, scheme: str) -> float:
+    """
+    Mean OT hours per worked shift of a pattern.
+
+    Args:
+        pattern: Work pattern
+        shift_hours: Gross shift hours (1h lunch deducted from 8h up)
+        scheme: Employee scheme ('A', 'Scheme P', ...)
+
+    Returns:
+        OT hours averaged over the pattern's work days
+    """
+    lunch_hours = 1.0 if shift_hours >= 8 else 0.0
+    scheme_code = normalize_scheme(scheme) or 'A'
+    ot = [
+        calculate_pattern_aware_hours(pattern, day, shift_hours, lunch_hours, scheme_code)[1]
+        for day, shift in enumerate(pattern) if shift != 'O'
+    ]
+    return sum(ot) / len(ot) if ot else 0.0
+
+
+def _row(scenario_id: str, scenario: Dict[str, Any], result: Dict[str, Any],
+         calendar_days: int) -> Dict[str, Any]:
+    """Comparison table row for a sized scenario"""
+    config = result['configuration']
+    coverage = result.get('coverage', {})
+    employees = config['employeesRequired']
+    work_days = coverage.get('totalWorkDays', 0)
+    horizon = scenario['planningHorizon']
+    horizon_days = (date.fromisoformat(horizon['endDate'][:10])
+                    - date.fromisoformat(horizon['startDate'][:10])).days + 1
+    ot_hours = work_days * ot_hours_per_shift(
+        scenario['workPattern'], float(scenario.get('shiftHours', 12)), scenario.get('scheme', 'A')
+    )
+    return {
+        'scenarioId': scenario_id,
+        'workPattern': scenario['workPattern'],
+        'headcount': scenario['headcount'],
+        'scheme': scenario.get('scheme', 'A'),
+        'employeesRequired': employees,
+        'lowerBound': config.get('lowerBound'),
+        'optimality': config.get('optimality'),
+        'uSlots': coverage.get('totalUSlots', 0),
+        'coverageRate': round(coverage.get('achievedRate', 0.0), 2),
+        'coverageDays': calendar_days,
+        'potentialWorkDays': work_days,
+        'otHours': round(ot_hours, 1),
+        'otHoursPerEmployeeMonth': round(ot_hours / employees / (horizon_days / 30.5), 2) if employees else 0.0,
+    }
+
+
+def evaluate_scenarios(base: Dict[str, Any], scenarios: List[Dict[str, Any]],
+                       rank_by: str = 'employeesRequired') -> Dict[str, Any]:
+    """
+    Size every scenario and rank them.
+
+    Args:
+        base: Base configuration (SCENARIO_FIELDS)
+        scenarios: Overrides per scenario; scenarioId names the row
+            (default: scenario-<n>)
+        rank_by: Primary ranking column (RANK_COLUMNS)
+
+    Returns:
+        {'rankBy', 'scenarios': [rows, ranked], 'summary': {...timings}}
+
+    Raises:
+        ValueError: Invalid batch (not a list, too many scenarios, unknown rankBy)
+    """
+    if not isinstance(base, dict):
+        raise ValueError("'base' must be an object")
+    if not isinstance(scenarios, list) or not scenarios:
+        raise ValueError("'scenarios' must be a non-empty array")
+    if len(scenarios) > MAX_SCENARIOS:
+        raise ValueError(f"At most {MAX_SCENARIOS} scenarios per request ({len(scenarios)} given)")
+    if rank_by not in RANK_COLUMNS:
+        raise ValueError(f"rankBy must be one of {sorted(RANK_COLUMNS)}")
+
+    start = time.perf_counter()
+
+    # Resolve scenarios and build each distinct calendar once
+    calendars: Dict[Tuple, List[str]] = {}
+    tasks: Dict[Tuple, int] = {}  # Distinct sizing inputs -> task index
+    task_list: List[Tuple] = []
+    resolved = []
+    for index, overrides in enumerate(scenarios):
+        if isinstance(overrides, dict):
+            scenario_id = str(overrides.get('scenarioId', f'scenario-{index + 1}'))
+            scenario = resolve_scenario(base, overrides)
+            error = _check_scenario(scenario)
+        else:
+            scenario_id, scenario, error = f'scenario-{index + 1}', {}, "scenario must be an object"
+        task_index = None
+        if error is None:
+            horizon = scenario['planningHorizon']
+            try:
+                calendar_key = (
+                    horizon['startDate'], horizon['endDate'],
+                    tuple(scenario.get('coverageDays') or ()), tuple(sorted(scenario.get('publicHolidays') or ())),
+                )
+                if calendar_key not in calendars:
+                    calendars[calendar_key] = generate_coverage_calendar(
+                        horizon['startDate'], horizon['endDate'],
+                        coverage_days=scenario.get('coverageDays'),
+                        public_holidays=scenario.get('publicHolidays') or []
+                    )
+            except (ValueError, TypeError) as e:
+                error = f"Invalid planningHorizon, coverageDays or publicHolidays: {e}"
+            else:
+                if not calendars[calendar_key]:
+                    error = "No coverage days in planning horizon"
+        if error is None:
+            task = (
+                tuple(scenario['workPattern']), scenario['headcount'], calendar_key,
+                horizon['startDate'], scenario.get('scheme', 'A'),
+                bool(scenario.get('enableOtAwareIcpmp', False)), float(scenario.get('monthlyOtCap', 72.0)),
+            )
+            if task not in tasks:
+                tasks[task] = len(task_list)
+                task_list.append(task)
+            task_index = tasks[task]
+        resolved.append((scenario_id, scenario, error, task_index, calendar_key if error is None else None))
+    calendar_ms = (time.perf_counter() - start) * 1000
+
+    # Evaluate distinct tasks grouped by calendar and pattern (kernel reuse); repr()
+    # keeps the order total when scenarios mix value types (e.g. coverageDays)
+    order = sorted(range(len(task_list)), key=lambda i: (repr(task_list[i][2]), repr(task_list[i][0]), i))
+    evaluate_start = time.perf_counter()
+    evaluated, mode, workers = _run_tasks([
+        task_list[i][:2] + (calendars[task_list[i][2]],) + task_list[i][3:] for i in order
+    ])
+    outcomes = [None] * len(task_list)
+    for i, outcome in zip(order, evaluated):
+        outcomes[i] = outcome
+    evaluate_ms = (time.perf_counter() - evaluate_start) * 1000
+
+    rows = []
+    first_use = set()
+    for scenario_id, scenario, error, task_index, calendar_key in resolved:
+        compute_ms, shared = 0.0, False
+        if error is None:
+            result, error, compute_ms = outcomes[task_index]
+            shared = task_index in first_use
+            first_use.add(task_index)
+        if error is not None:
+            row = {'scenarioId': scenario_id, 'status': 'FAILED', 'error': error}
+        else:
+            row = {**_row(scenario_id, scenario, result, len(calendars[calendar_key])), 'status': 'OK'}
+        row['computeMs'] = 0.0 if shared else round(compute_ms, 2)
+        row['sharedEvaluation'] = shared
+        rows.append(row)
+
+    # Rank successful rows; failures follow in input order
+    columns = [RANK_COLUMNS[rank_by]] + [column for name, column in RANK_COLUMNS.items() if name != rank_by]
+    ok = sorted(
+        (i for i, row in enumerate(rows) if row['status'] == 'OK'),
+        key=lambda i: tuple(s * rows[i][key] for key, s in columns) + (i,)
+    )
+    ranked = []
+    for rank, i in enumerate(ok, start=1):
+        ranked.append({'rank': rank, **rows[i]})
+    ranked.extend({'rank': None, **row} for row in rows if row['status'] != 'OK')
+
+    total_ms = (time.perf_counter() - start) * 1000
+    return {
+        'rankBy': rank_by,
+        'scenarios': ranked,
+        'summary': {
+            'totalScenarios': len(rows),
+            'successfulScenarios': len(ok),
+            'failedScenarios': len(rows) - len(ok),
+            'distinctEvaluations': len(task_list),
+            'distinctCalendars': len(calendars),
+            'mode': mode,
+            'workers': workers,
+            'calendarMs': round(calendar_ms, 2),
+            'evaluationMs': round(evaluate_ms, 2),
+            'computationTimeMs': round(total_ms, 2),
+        },
+    }
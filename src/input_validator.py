@@ -7,6 +7,9 @@ from typing import Dict, List, Tuple, Any, Optional
 from datetime import datetime
 import re
 
+from src.compact_output import OUTPUT_FORMATS
+from src.employee_pool import EmployeePool
+
 
 class ValidationError:
     """Represents a validation error or warning"""
@@ -30,6 +33,9 @@ class ValidationResult:
     def __init__(self):
         self.errors: List[ValidationError] = []
         self.warnings: List[ValidationError] = []
+        # Employee index built by the feasibility pre-check, reusable by
+        # quick_feasibility_check for the same request
+        self.employee_pool: Optional[EmployeePool] = None
     
     @property
     def is_valid(self) -> bool:
@@ -112,6 +118,10 @@ def _validate_schema_structure(data: dict, result: ValidationResult):
         result.add_error('employees', 'INVALID_TYPE', 
                         "employees must be an array")
     
+    if data.get('outputFormat', 'standard') not in OUTPUT_FORMATS:
+        result.add_error('outputFormat', 'INVALID_VALUE',
+                        f"outputFormat must be one of {list(OUTPUT_FORMATS)}")
+    
     # Check non-empty arrays
     if 'demandItems' in data and isinstance(data['demandItems'], list):
         if len(data['demandItems']) == 0:
@@ -551,27 +561,20 @@ def _validate_feasibility(data: dict, result: ValidationResult):
     employees = data['employees']
     scheme_map = data.get('schemeMap', {})
     
-    # Normalize employee schemes
-    normalized_employees = []
-    for emp in employees:
-        emp_copy = emp.copy()
-        emp_scheme = emp.get('scheme', '')
-        
-        # Normalize scheme
+    # Index employees once; each requirement is then a few set intersections
+    pool = EmployeePool(employees)
+    result.employee_pool = pool
+    
+    # Normalize employee schemes: short code as-is, else reverse lookup of the
+    # full name, else as-is
+    full_names = {}
+    for short_code, full_name in scheme_map.items():
+        full_names.setdefault(full_name, short_code)
+    
+    def normalized_scheme(emp_scheme):
         if emp_scheme in scheme_map:
-            # Already short code
-            emp_copy['normalized_scheme'] = emp_scheme
-        else:
-            # Try reverse lookup
-            for short_code, full_name in scheme_map.items():
-                if full_name == emp_scheme:
-                    emp_copy['normalized_scheme'] = short_code
-                    break
-            else:
-                # Use as-is
-                emp_copy['normalized_scheme'] = emp_scheme
-        
-        normalized_employees.append(emp_copy)
+            return emp_scheme
+        return full_names.get(emp_scheme, emp_scheme)
     
     # Check each requirement
     for di_idx, demand_item in enumerate(data['demandItems']):
@@ -622,23 +625,16 @@ def _validate_feasibility(data: dict, result: ValidationResult):
                     req_scheme = req_scheme_raw
             
             # Count matching employees
-            matching_count = 0
-            for emp in normalized_employees:
-                emp_product = emp.get('productTypeId', '')
-                emp_rank = emp.get('rankId', '')
-                emp_scheme = emp.get('normalized_scheme', '')
-                
-                # v2: Check product match with OR logic for productTypeIds array
-                if use_product_types_array:
-                    product_match = (emp_product in req_product_types)
-                else:
-                    product_match = (emp_product == req_product)
-                    
-                rank_match = (emp_rank in req_ranks) if req_ranks else True
-                scheme_match = (req_scheme == 'Global' or emp_scheme == req_scheme)
-                
-                if product_match and rank_match and scheme_match:
-                    matching_count += 1
+            # v2: Check product match with OR logic for productTypeIds array
+            if use_product_types_array:
+                matching = pool.where('productTypeId', lambda p: p in req_product_types, default='')
+            else:
+                matching = pool.where('productTypeId', lambda p: p == req_product, default='')
+            if req_ranks:
+                pool.narrow(matching, 'rankId', lambda r: r in req_ranks, default='')
+            if req_scheme != 'Global':
+                pool.narrow(matching, 'scheme', lambda sc: normalized_scheme(sc) == req_scheme, default='')
+            matching_count = len(matching)
             
             # Check if sufficient employees
             if matching_count == 0:
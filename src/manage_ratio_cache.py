@@ -2,14 +2,17 @@
 """
 Ratio Cache Management CLI Tool
 
-Manage the optimal ratio cache for production deployment.
+Manage the persistent ICPMP configuration cache (src/ratio_cache.py) for
+production deployment. Set RATIO_CACHE_PATH to manage a file other than
+config/ratio_cache.db.
 
 Usage:
     python src/manage_ratio_cache.py stats          # Show cache statistics
-    python src/manage_ratio_cache.py list           # List all cached ratios
+    python src/manage_ratio_cache.py list           # List all cached configurations
     python src/manage_ratio_cache.py clear          # Clear entire cache
     python src/manage_ratio_cache.py invalidate <hash>  # Remove specific pattern
     python src/manage_ratio_cache.py export         # Export cache to JSON
+    python src/manage_ratio_cache.py import <file>  # Merge an exported cache
 
 Examples:
     # View cache stats
@@ -46,13 +49,16 @@ def cmd_list(cache: RatioCache):
         return
     
     print(f"\n{'='*80}")
-    print("CACHED OPTIMAL RATIOS")
+    print("CACHED ICPMP CONFIGURATIONS")
     print(f"{'='*80}\n")
     
     for i, pattern in enumerate(stats['patterns'], 1):
+        headcount = pattern['headcountByShift'] or pattern['headcount']
         print(f"{i}. Pattern: {pattern['pattern']} (hash: {pattern['hash']})")
-        print(f"   Optimal Ratio: {pattern['ratio']:.0%} strict / {(1-pattern['ratio']):.0%} flexible")
-        print(f"   Employees Used: {pattern['employees']}")
+        print(f"   Headcount: {headcount}, Scheme: {pattern['scheme']}, "
+              f"OT-aware: {pattern['otAware']}, Monthly OT cap: {pattern['monthlyOtCap']:g}h")
+        print(f"   Coverage Days: {pattern['coverageDays']}")
+        print(f"   Employees Required: {pattern['employees']}")
         print(f"   Usage Count: {pattern['usageCount']}")
         print(f"   Last Used: {pattern['lastUsed']}")
         print()
@@ -71,46 +77,39 @@ def cmd_clear(cache: RatioCache, force: bool = False):
         return
     
     if not force:
-        print(f"⚠️  This will delete {entry_count} cached ratio(s)")
+        print(f"⚠️  This will delete {entry_count} cached configuration(s)")
         response = input("Are you sure? (yes/no): ").strip().lower()
         if response not in ['yes', 'y']:
             print("❌ Cancelled")
             return
     
     cache.clear_cache()
-    print(f"✅ Cleared {entry_count} cached ratio(s)")
+    print(f"✅ Cleared {entry_count} cached configuration(s)")
 
 
 def cmd_invalidate(cache: RatioCache, pattern_hash: str):
-    """Invalidate specific pattern by hash."""
+    """Invalidate specific pattern by hash (or unique hash prefix)."""
     stats = cache.get_stats()
+    matches = [p for p in stats.get('patterns', []) if p['hash'].startswith(pattern_hash)]
     
-    # Find the pattern
-    pattern_entry = None
-    for p in stats.get('patterns', []):
-        if p['hash'] == pattern_hash or p['hash'].startswith(pattern_hash):
-            pattern_entry = p
-            break
-    
-    if not pattern_entry:
+    if not matches:
         print(f"❌ Pattern hash '{pattern_hash}' not found in cache")
         print("\nAvailable hashes:")
         for p in stats.get('patterns', []):
             print(f"  • {p['hash']}: {p['pattern']}")
         return
     
-    # Remove from cache
-    if "entries" in cache.cache and pattern_entry['hash'] in cache.cache["entries"]:
-        del cache.cache["entries"][pattern_entry['hash']]
-        cache._save_cache()
-        print(f"✅ Invalidated pattern: {pattern_entry['pattern']} (hash: {pattern_entry['hash']})")
-    else:
-        print(f"❌ Could not invalidate pattern")
+    if len(matches) > 1:
+        print(f"❌ Hash prefix '{pattern_hash}' is ambiguous ({len(matches)} entries)")
+        return
+    
+    cache.invalidate(matches[0]['hash'])
+    print(f"✅ Invalidated pattern: {matches[0]['pattern']} (hash: {matches[0]['hash']})")
 
 
 def cmd_export(cache: RatioCache):
     """Export cache as JSON to stdout."""
-    print(json.dumps(cache.cache, indent=2, default=str))
+    print(json.dumps(cache.export_entries(), indent=2))
 
 
 def cmd_import(cache: RatioCache, json_file: str):
@@ -124,26 +123,13 @@ def cmd_import(cache: RatioCache, json_file: str):
             print("❌ Invalid cache format")
             return
         
-        # Merge with existing cache
-        existing_entries = cache.cache.get("entries", {})
-        imported_entries = imported_cache.get("entries", {})
-        
-        new_count = 0
-        updated_count = 0
-        
-        for hash_key, entry in imported_entries.items():
-            if hash_key in existing_entries:
-                updated_count += 1
-            else:
-                new_count += 1
-            existing_entries[hash_key] = entry
-        
-        cache.cache["entries"] = existing_entries
-        cache._save_cache()
+        counts = cache.import_entries(imported_cache)
         
         print(f"✅ Import complete:")
-        print(f"   New patterns: {new_count}")
-        print(f"   Updated patterns: {updated_count}")
+        print(f"   New patterns: {counts['new']}")
+        print(f"   Updated patterns: {counts['updated']}")
+        if counts['skipped']:
+            print(f"   Skipped (no stored result): {counts['skipped']}")
     
     except FileNotFoundError:
         print(f"❌ File not found: {json_file}")
@@ -155,7 +141,7 @@ def cmd_import(cache: RatioCache, json_file: str):
 
 def main():
     parser = argparse.ArgumentParser(
-        description="Manage the optimal ratio cache",
+        description="Manage the ICPMP configuration cache",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
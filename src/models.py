@@ -394,6 +394,11 @@ class AsyncJobRequest(BaseModel):
         description="Optional webhook URL to POST job completion status. Will receive JobStatusResponse payload."
     )
     
+    dedup: Optional[bool] = Field(
+        True,
+        description="Reuse an identical in-flight job or recently cached result. Set false to force a fresh solve."
+    )
+    
     model_config = ConfigDict(extra='allow')
 
 
@@ -408,6 +413,10 @@ class AsyncJobResponse(BaseModel):
         None,
         description="Optional pre-flight feasibility analysis with warnings and recommendations"
     )
+    deduplicated: Optional[str] = Field(
+        None,
+        description="Set when an identical submission was reused: 'in_flight' (existing job_id returned) or 'cached_result' (new job_id already completed)"
+    )
     
     model_config = ConfigDict(extra='allow')
 
@@ -7,17 +7,18 @@ Refactored from run_solver.py to ensure CLI and API produce identical output.
 import json
 import hashlib
 import math
+import time
 import uuid
 import logging
-from typing import List, Dict, Any
-from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional
+from datetime import date, datetime, timedelta
 from collections import defaultdict
 
 logger = logging.getLogger(__name__)
 from context.engine.time_utils import (
     split_shift_hours, 
-    calculate_mom_compliant_hours,
     calculate_apgd_d10_hours,
+    mom_week_position,
     calculate_daily_contractual_hours,
     count_work_days_for_employee_in_month,
     is_apgd_d10_employee,
@@ -26,6 +27,8 @@ from context.engine.time_utils import (
     span_hours,
     lunch_hours
 )
+from context.engine.availability import AvailabilityCalendar, get_availability_calendar
+from context.engine.hour_cache import mom_hours
 
 
 def _safe_score(value):
@@ -35,77 +38,127 @@ def _safe_score(value):
     return int(value) if isinstance(value, (int, float)) else 0
 
 
+class AssignmentGrid:
+    """
+    Per-employee / per-date index over the output assignments.
+
+    build_output creates one grid and every assembly stage (OFF-day insertion,
+    unavailability check, hour annotation, OT cap, employee roster) reads and
+    updates it in place, instead of each stage re-scanning the full list,
+    re-parsing dates and rebuilding its own emp → date map.
+
+    - by_employee: emp_id → assignments of that employee (None = unassigned)
+    - cells: emp_id → 'YYYY-MM-DD' → assignment (last one wins, as in the roster)
+    - date keys are parsed once and cached as date objects
+    """
+
+    def __init__(self, assignments: List[Dict[str, Any]] = ()):
+        self.by_employee: Dict[Any, List[Dict[str, Any]]] = defaultdict(list)
+        self.cells: Dict[str, Dict[str, Dict[str, Any]]] = defaultdict(dict)
+        self.date_keys = set()
+        self._parsed_dates: Dict[str, date] = {}
+        for assignment in assignments:
+            self.add(assignment)
+
+    def add(self, assignment: Dict[str, Any]) -> None:
+        """Index one assignment"""
+        emp_id = assignment.get('employeeId')
+        assign_date = assignment.get('date')
+        self.by_employee[emp_id].append(assignment)
+        if assign_date is not None:
+            self.date_keys.add(assign_date)
+        if emp_id and assign_date:
+            self.cells[emp_id][assign_date[:10]] = assignment
+
+    def replace(self, old: Dict[str, Any], new: Dict[str, Any]) -> None:
+        """Swap an indexed assignment for a modified copy (e.g. converted to UNASSIGNED)"""
+        emp_id = old.get('employeeId')
+        bucket = self.by_employee.get(emp_id, [])
+        for i, candidate in enumerate(bucket):
+            if candidate is old:
+                del bucket[i]
+                break
+        assign_date = old.get('date')
+        if emp_id and assign_date:
+            emp_cells = self.cells.get(emp_id, {})
+            if emp_cells.get(assign_date[:10]) is old:
+                del emp_cells[assign_date[:10]]
+                # Fall back to an earlier assignment on the same date, if any
+                for candidate in bucket:
+                    if candidate.get('date') and candidate['date'][:10] == assign_date[:10]:
+                        emp_cells[assign_date[:10]] = candidate
+        self.add(new)
+
+    def for_employee(self, emp_id) -> List[Dict[str, Any]]:
+        """All assignments of one employee (the context the MOM hour helpers scan)"""
+        return self.by_employee.get(emp_id, [])
+
+    def has_employee(self, emp_id) -> bool:
+        return bool(self.cells.get(emp_id))
+
+    def date_of(self, date_str: str) -> date:
+        """Parse an ISO date or datetime string once"""
+        parsed = self._parsed_dates.get(date_str)
+        if parsed is None:
+            parsed = datetime.fromisoformat(date_str).date()
+            self._parsed_dates[date_str] = parsed
+        return parsed
+
+    def date_range(self):
+        """(first, last) date over all indexed assignments, or None"""
+        if not self.date_keys:
+            return None
+        ordered = sorted(self.date_keys)
+        return self.date_of(ordered[0].split('T')[0]), self.date_of(ordered[-1].split('T')[0])
+
+
 def _remove_unavailable_assignments_from_roster(
-    assignments: List[Dict[str, Any]], 
-    employees: List[Dict[str, Any]]
+    assignments: List[Dict[str, Any]],
+    calendar: AvailabilityCalendar,
+    grid: Optional[AssignmentGrid] = None
 ) -> tuple:
     """
-    Post-process roster to remove assignments on unavailable days.
+    Convert records that fall on an employee's unavailable day to UNASSIGNED.
     
-    This function filters out assignments where an employee is scheduled on a day
-    they marked as unavailable. The filtered assignments are converted to UNASSIGNED
-    status so the roster shows gaps in coverage.
+    The solvers never create work on unavailable days (the availability
+    calendar prunes those employee-days up front), so for ASSIGNED records
+    this is only a check: a hit is logged as an error. OFF_DAY and
+    PUBLIC_HOLIDAY records generated by insert_off_day_assignments are
+    converted as before so the roster shows the gap.
     
     Args:
         assignments: List of assignment dictionaries
-        employees: List of employee dictionaries with unavailability data
+        calendar: AvailabilityCalendar for the solve
+        grid: Optional AssignmentGrid to keep in sync with the converted records
         
     Returns:
         Tuple of (filtered_assignments, violations_removed_count)
     """
-    # Build unavailability map for quick lookup
-    unavail_map = {}
-    for emp in employees:
-        emp_id = emp['employeeId']
-        unavail_list = emp.get('unavailability', [])
-        unavailable_dates = set()
-        
-        # Handle both formats: array of strings or array of dicts
-        for u in unavail_list:
-            if isinstance(u, dict):
-                # Format: [{"date": "2026-01-05", ...}] or [{"startDate": "...", "endDate": "..."}]
-                date_val = u.get('date') or u.get('startDate')
-                if date_val:
-                    unavailable_dates.add(date_val)
-            elif isinstance(u, str):
-                # Format: ["2026-01-05", "2026-01-26"]
-                unavailable_dates.add(u)
-        
-        if unavailable_dates:
-            unavail_map[emp_id] = unavailable_dates
-    
-    # Filter assignments
     filtered_assignments = []
     violations_removed = 0
     
     for assignment in assignments:
-        # Skip unassigned slots - they're already empty
-        if assignment.get('status') == 'UNASSIGNED':
-            filtered_assignments.append(assignment)
-            continue
-        
         emp_id = assignment.get('employeeId')
         assignment_date = assignment.get('date')
+        if (assignment.get('status') == 'UNASSIGNED' or not emp_id or not assignment_date
+                or calendar.is_available(emp_id, assignment_date)):
+            filtered_assignments.append(assignment)
+            continue
         
-        # Check if this is a violation
-        if emp_id and emp_id in unavail_map and assignment_date in unavail_map[emp_id]:
-            # Violation detected - convert to UNASSIGNED
-            violations_removed += 1
-            logger.warning(
-                f"[UNAVAILABILITY FIX] Removing assignment: Employee {emp_id} on {assignment_date} "
-                f"(marked unavailable)"
+        violations_removed += 1
+        if assignment.get('status') == 'ASSIGNED':
+            logger.error(
+                f"[UNAVAILABILITY CHECK] Employee {emp_id} assigned on unavailable day "
+                f"{assignment_date} - converting to UNASSIGNED"
             )
-            
-            # Convert to unassigned
-            filtered_assignment = assignment.copy()
-            filtered_assignment['status'] = 'UNASSIGNED'
-            filtered_assignment['employeeId'] = None
-            filtered_assignment['reason'] = 'Employee unavailable'
-            
-            filtered_assignments.append(filtered_assignment)
-        else:
-            # Valid assignment - keep it
-            filtered_assignments.append(assignment)
+        
+        filtered_assignment = assignment.copy()
+        filtered_assignment['status'] = 'UNASSIGNED'
+        filtered_assignment['employeeId'] = None
+        filtered_assignment['reason'] = 'Employee unavailable'
+        if grid is not None:
+            grid.replace(assignment, filtered_assignment)
+        filtered_assignments.append(filtered_assignment)
     
     return filtered_assignments, violations_removed
 
@@ -113,7 +166,8 @@ def _remove_unavailable_assignments_from_roster(
 def _enforce_monthly_ot_cap(
     assignments: List[Dict[str, Any]],
     employees: List[Dict[str, Any]],
-    ctx: Dict[str, Any]
+    ctx: Dict[str, Any],
+    grid: Optional[AssignmentGrid] = None
 ) -> tuple:
     """
     Enforce monthly overtime cap per employee (72h standard, or scheme-specific).
@@ -129,6 +183,7 @@ def _enforce_monthly_ot_cap(
         assignments: List of assignment dictionaries with hours calculated
         employees: List of employee dictionaries
         ctx: Context dictionary with constraints and hour limits
+        grid: Optional AssignmentGrid whose parsed dates are reused
         
     Returns:
         Tuple of (adjusted_assignments, employees_capped_count)
@@ -155,8 +210,7 @@ def _enforce_monthly_ot_cap(
             continue
         
         try:
-            from datetime import datetime
-            date_obj = datetime.fromisoformat(date_str).date()
+            date_obj = grid.date_of(date_str) if grid is not None else datetime.fromisoformat(date_str).date()
             year = date_obj.year
             month = date_obj.month
             
@@ -237,7 +291,7 @@ def _enforce_monthly_ot_cap(
     return assignments, employees_capped
 
 
-def build_employee_roster(input_data, ctx, assignments, off_day_assignments=None):
+def build_employee_roster(input_data, ctx, assignments, off_day_assignments=None, grid=None):
     """
     Build a comprehensive employee roster showing daily status for ALL employees.
     
@@ -246,6 +300,8 @@ def build_employee_roster(input_data, ctx, assignments, off_day_assignments=None
         ctx: Context dict with employees and patterns
         assignments: Work assignments ONLY (D, N shifts)
         off_day_assignments: Optional list of OFF day records (shiftCode='O', status='OFF_DAY')
+        grid: Optional AssignmentGrid already indexing assignments (+ OFF days);
+            its emp → date cells are used instead of rebuilding the lookup
     
     Returns list with:
     - employeeRoster: List of all employees with their daily schedules
@@ -267,37 +323,19 @@ def build_employee_roster(input_data, ctx, assignments, off_day_assignments=None
     
     # Merge work assignments and OFF days for complete roster view
     # But remember: only work assignments go in output's assignments array
-    all_assignments_for_roster = assignments.copy()
-    if off_day_assignments:
-        all_assignments_for_roster.extend(off_day_assignments)
-    
-    # Get date range from assignments (filter out None values explicitly)
-    date_values = set(a.get('date') for a in all_assignments_for_roster if a.get('date') is not None)
-    dates = sorted(date_values)
-    if not dates:
+    # The grid normalizes date keys to YYYY-MM-DD (strips any time component)
+    if grid is None:
+        grid = AssignmentGrid(assignments)
+        for assignment in off_day_assignments or []:
+            grid.add(assignment)
+    
+    date_range = grid.date_range()
+    if not date_range:
         return []
+    start_date, end_date = date_range
     
-    from datetime import date as date_cls, datetime
-    # Handle both ISO date strings and datetime strings
-    def parse_date_string(date_str):
-        if 'T' in date_str:
-            return datetime.fromisoformat(date_str).date()
-        return date_cls.fromisoformat(date_str)
-    
-    start_date = parse_date_string(dates[0])
-    end_date = parse_date_string(dates[-1])
-    
-    # Build assignment lookup: emp_id -> date -> assignment
-    # CRITICAL: Normalize date keys to YYYY-MM-DD format for consistent lookup
-    assignment_by_emp_date = defaultdict(dict)
-    for assignment in all_assignments_for_roster:
-        emp_id = assignment.get('employeeId')
-        assign_date = assignment.get('date')
-        if emp_id and assign_date:
-            # Normalize date to YYYY-MM-DD (strip time component if present)
-            date_key = assign_date[:10] if assign_date else None
-            if date_key:
-                assignment_by_emp_date[emp_id][date_key] = assignment
+    # Assignment lookup: emp_id -> date -> assignment
+    assignment_by_emp_date = grid.cells
     
     # Get base rotation pattern from first demand (assuming single pattern for now)
     base_pattern = None
@@ -315,8 +353,27 @@ def build_employee_roster(input_data, ctx, assignments, off_day_assignments=None
     # Convert pattern_start_date to date object if it exists
     pattern_start_date_obj = None
     if pattern_start_date:
-        from datetime import date as date_cls
-        pattern_start_date_obj = date_cls.fromisoformat(pattern_start_date)
+        pattern_start_date_obj = date.fromisoformat(pattern_start_date)
+    
+    # Roster days and their patternDay (the same for every employee, since
+    # patterns are pre-rotated by offset)
+    roster_days = []
+    current_date = start_date
+    while current_date <= end_date:
+        pattern_day = None
+        if base_pattern and pattern_start_date_obj:
+            from context.engine.solver_engine import calculate_pattern_day
+            # NOTE: We pass employee_offset=0 because emp_pattern is already rotated
+            # calculate_pattern_day returns the index into the pattern
+            pattern_day = calculate_pattern_day(
+                assignment_date=current_date,
+                pattern_start_date=pattern_start_date_obj,
+                employee_offset=0,  # Pattern is already rotated by emp_offset
+                pattern_length=len(base_pattern),
+                coverage_days=coverage_days
+            )
+        roster_days.append((current_date.isoformat(), pattern_day))
+        current_date += timedelta(days=1)
     
     roster = []
     
@@ -331,32 +388,15 @@ def build_employee_roster(input_data, ctx, assignments, off_day_assignments=None
             emp_pattern = calculate_employee_work_pattern(base_pattern, emp_offset)
         
         # Check if employee has any assignments
-        has_assignments = emp_id in assignment_by_emp_date
+        has_assignments = grid.has_employee(emp_id)
+        emp_cells = assignment_by_emp_date.get(emp_id, {})
         
         # Build daily status for each date
         daily_status = []
-        current_date = start_date
-        day_index = 0
         
-        while current_date <= end_date:
-            date_str = current_date.isoformat()
-            
-            # Calculate patternDay if we have pattern info
-            pattern_day = None
-            if base_pattern and pattern_start_date_obj:
-                from context.engine.solver_engine import calculate_pattern_day
-                # NOTE: We pass employee_offset=0 because emp_pattern is already rotated
-                # calculate_pattern_day returns the index into the pattern
-                pattern_day = calculate_pattern_day(
-                    assignment_date=current_date,
-                    pattern_start_date=pattern_start_date_obj,
-                    employee_offset=0,  # Pattern is already rotated by emp_offset
-                    pattern_length=len(base_pattern),
-                    coverage_days=coverage_days
-                )
-            
+        for date_str, pattern_day in roster_days:
             # Check if employee has assignment on this date
-            assignment = assignment_by_emp_date.get(emp_id, {}).get(date_str)
+            assignment = emp_cells.get(date_str)
             
             # PRIORITY 1: Check pattern first to determine if this is an OFF day
             # This ensures OFF days are marked correctly even if solver assigned work due to flexibility
@@ -446,9 +486,6 @@ def build_employee_roster(input_data, ctx, assignments, off_day_assignments=None
                         "shiftCode": None,
                         "reason": "No work pattern defined"
                     })
-            
-            current_date += timedelta(days=1)
-            day_index += 1
         
         # Calculate totals for this employee
         total_assignments = len([d for d in daily_status if d['status'] == 'ASSIGNED'])
@@ -460,7 +497,7 @@ def build_employee_roster(input_data, ctx, assignments, off_day_assignments=None
         total_ot_hours = 0.0
         total_hours = 0.0
         
-        for date_str, assignment in assignment_by_emp_date.get(emp_id, {}).items():
+        for assignment in emp_cells.values():
             if assignment.get('status') == 'ASSIGNED':
                 hours = assignment.get('hours', {})
                 total_normal_hours += hours.get('normal', 0.0)
@@ -728,7 +765,7 @@ def check_continuous_adherence(employee_counts, avg_shifts):
     return avg_shifts >= 18  # Allow some tolerance
 
 
-def insert_off_day_assignments(assignments, input_data, ctx):
+def insert_off_day_assignments(assignments, input_data, ctx, grid=None):
     """
     Insert explicit OFF day assignments for employees based on their work patterns.
     
@@ -745,12 +782,12 @@ def insert_off_day_assignments(assignments, input_data, ctx):
         assignments: List of actual shift assignments (D, N shifts)
         input_data: Original input JSON
         ctx: Context dict with employees and their patterns
+        grid: Optional AssignmentGrid indexing `assignments`; generated OFF/PH
+            records are added to it
     
     Returns:
         Expanded assignments list including both work shifts and OFF days
     """
-    from datetime import datetime, timedelta
-    
     # Extract public holidays for special handling
     public_holidays_raw = input_data.get('publicHolidays', [])
     public_holidays = set()
@@ -772,24 +809,16 @@ def insert_off_day_assignments(assignments, input_data, ctx):
         if shifts:
             include_public_holidays = shifts[0].get('includePublicHolidays', True)
     
-    # Get date range from existing assignments (filter out None values explicitly)
-    date_values = set(a.get('date') for a in assignments if a.get('date') is not None)
-    dates = sorted(date_values)
-    if not dates:
-        return assignments
-    
-    start_date_str = dates[0]
-    end_date_str = dates[-1]
-    start_date = datetime.fromisoformat(start_date_str.split('T')[0]).date()
-    end_date = datetime.fromisoformat(end_date_str.split('T')[0]).date()
-    
     # Build lookup: emp_id -> date -> assignment
-    assignments_by_emp_date = defaultdict(dict)
-    for assignment in assignments:
-        emp_id = assignment.get('employeeId')
-        assign_date = assignment.get('date')
-        if emp_id and assign_date:
-            assignments_by_emp_date[emp_id][assign_date] = assignment
+    if grid is None:
+        grid = AssignmentGrid(assignments)
+    assignments_by_emp_date = grid.cells
+    
+    # Get date range from existing assignments
+    date_range = grid.date_range()
+    if not date_range:
+        return assignments
+    start_date, end_date = date_range
     
     # Get employees with work patterns
     employees = ctx.get('employees', [])
@@ -816,10 +845,25 @@ def insert_off_day_assignments(assignments, input_data, ctx):
     
     # Build set of employees who have at least one work assignment (D or N shift)
     employees_with_work = set()
-    for assignment in assignments:
-        shift_code = assignment.get('shiftCode')
-        if shift_code in ['D', 'N']:  # Only count actual work shifts
-            employees_with_work.add(assignment.get('employeeId'))
+    for emp_id, emp_assignments in grid.by_employee.items():
+        if any(a.get('shiftCode') in ['D', 'N'] for a in emp_assignments):  # Only count actual work shifts
+            employees_with_work.add(emp_id)
+    
+    # patternDay per date (patterns are pre-rotated, so it is the same for every employee)
+    from context.engine.solver_engine import calculate_employee_work_pattern, calculate_pattern_day
+    horizon_days = []
+    current_date = start_date
+    while current_date <= end_date:
+        # NOTE: We pass employee_offset=0 because emp_pattern is already rotated
+        pattern_day = calculate_pattern_day(
+            assignment_date=current_date,
+            pattern_start_date=pattern_start_date_obj,
+            employee_offset=0,  # Pattern is already rotated by emp_offset
+            pattern_length=pattern_length,
+            coverage_days=coverage_days
+        )
+        horizon_days.append((current_date, current_date.isoformat(), pattern_day))
+        current_date += timedelta(days=1)
     
     # Generate OFF day assignments for each employee
     off_day_assignments = []
@@ -834,30 +878,16 @@ def insert_off_day_assignments(assignments, input_data, ctx):
             continue
         
         # Calculate employee's rotated pattern
-        from context.engine.solver_engine import calculate_employee_work_pattern
         emp_pattern = calculate_employee_work_pattern(base_pattern, emp_offset)
+        emp_assignments_dict = assignments_by_emp_date.get(emp_id, {})
         
         # Iterate through date range and add OFF days
-        current_date = start_date
-        while current_date <= end_date:
-            date_str = current_date.isoformat()
-            
+        for current_date, date_str, pattern_day in horizon_days:
             # Skip if employee already has assignment on this date
-            if date_str in assignments_by_emp_date[emp_id]:
-                current_date += timedelta(days=1)
+            if date_str in emp_assignments_dict:
                 continue
             
             # Calculate what shift code employee should have based on pattern
-            from context.engine.solver_engine import calculate_pattern_day
-            # NOTE: We pass employee_offset=0 because emp_pattern is already rotated
-            pattern_day = calculate_pattern_day(
-                assignment_date=current_date,
-                pattern_start_date=pattern_start_date_obj,
-                employee_offset=0,  # Pattern is already rotated by emp_offset
-                pattern_length=pattern_length,
-                coverage_days=coverage_days
-            )
-            
             expected_shift = emp_pattern[pattern_day]
             
             # Check if this is a public holiday (missing assignment = PH was excluded)
@@ -868,7 +898,6 @@ def insert_off_day_assignments(assignments, input_data, ctx):
             # 2. OR it's a public holiday that was excluded (shiftCode="PH")
             if expected_shift == 'O' or is_public_holiday:
                 # Get demand/requirement info from one of employee's actual assignments (if any)
-                emp_assignments_dict = assignments_by_emp_date.get(emp_id, {})
                 sample_assignment = next(iter(emp_assignments_dict.values()), None) if emp_assignments_dict else None
                 
                 # Determine shift code and status based on PH and includePublicHolidays settings
@@ -901,7 +930,7 @@ def insert_off_day_assignments(assignments, input_data, ctx):
                 if sample_assignment:
                     # Determine typical shift times for this employee
                     # Use the employee's most common shift time pattern
-                    emp_assignments = list(assignments_by_emp_date[emp_id].values())
+                    emp_assignments = list(emp_assignments_dict.values())
                     
                     # Find most common shift type (D or N) for this employee
                     shift_types = [a.get('shiftCode') for a in emp_assignments if a.get('shiftCode') in ['D', 'N']]
@@ -964,8 +993,9 @@ def insert_off_day_assignments(assignments, input_data, ctx):
                     }
                 }
                 off_day_assignments.append(off_assignment)
-            
-            current_date += timedelta(days=1)
+    
+    for off_assignment in off_day_assignments:
+        grid.add(off_assignment)
     
     # Merge and sort by date, then employee (handle None values safely)
     all_assignments = assignments + off_day_assignments
@@ -1049,7 +1079,12 @@ def build_output(input_data, ctx, status, solver_result, assignments, violations
     
     Returns:
         Dict in output schema format with all fields populated
+    
+    Assembly runs as a pipeline over one AssignmentGrid (emp → date index with
+    cached parsed dates): OFF days, the unavailability check, hour annotation,
+    the OT cap and the employee roster all read and update it in place.
     """
+    build_start = time.perf_counter()
     
     # Compute input hash for reproducibility tracking (use input_data, not ctx which has IntVars)
     input_hash = compute_input_hash(input_data)
@@ -1061,17 +1096,21 @@ def build_output(input_data, ctx, status, solver_result, assignments, violations
     
     # Generate and merge OFF day assignments for both assignments array and employeeRoster
     # This applies to BOTH demandBased and outcomeBased rosters
-    all_with_off = insert_off_day_assignments(assignments, input_data, ctx)
+    grid = AssignmentGrid(assignments)
+    all_with_off = insert_off_day_assignments(assignments, input_data, ctx, grid=grid)
     # Include ALL assignments (work + OFF days) in assignments array
     assignments = all_with_off
     
-    # ========== UNAVAILABILITY FIX ==========
-    # Remove assignments that violate employee unavailability constraints
-    # This catches violations from PUBLIC_HOLIDAY assignments added by insert_off_day_assignments
+    # ========== UNAVAILABILITY CHECK ==========
+    # Work on unavailable days is pruned before solving; this only clears the
+    # OFF_DAY / PUBLIC_HOLIDAY records added by insert_off_day_assignments
     employees = ctx.get('employees', [])
-    assignments, violations_removed = _remove_unavailable_assignments_from_roster(assignments, employees)
+    availability = get_availability_calendar(ctx, employees)
+    assignments, violations_removed = _remove_unavailable_assignments_from_roster(
+        assignments, availability, grid=grid
+    )
     if violations_removed > 0:
-        print(f"[UNAVAILABILITY FIX] ✓ Removed {violations_removed} unavailability violations from final output")
+        print(f"[UNAVAILABILITY CHECK] Cleared {violations_removed} records on unavailable days")
     
     # NOTE: UNASSIGNED assignments are added AFTER employee_roster is built
     # (see extract_unassigned_from_roster() call below)
@@ -1127,13 +1166,12 @@ def build_output(input_data, ctx, status, solver_result, assignments, violations
     scheme_a_thresholds = {}  # emp_id -> contractual threshold
     employee_assignments = defaultdict(list)  # emp_id -> list of (date, assignment)
     
-    for assignment in assignments:
-        emp_id = assignment.get('employeeId')
-        if not emp_id:
+    from context.engine.time_utils import normalize_scheme
+    for emp_id, emp_assignments in grid.by_employee.items():
+        if not emp_id or not emp_assignments:
             continue
         
         employee = employee_dict.get(emp_id, {})
-        from context.engine.time_utils import normalize_scheme, is_apgd_d10_employee
         emp_scheme = normalize_scheme(employee.get('scheme', 'A'))
         
         # SCHEME A + APO (APGD-D10 ONLY): Monthly contractual threshold-based calculation
@@ -1149,9 +1187,10 @@ def build_output(input_data, ctx, status, solver_result, assignments, violations
         
         # Track assignments for Scheme A + APO employees only
         if emp_id in scheme_a_apo_employees:
-            assignment_date = assignment.get('date', '')
-            if assignment_date:
-                employee_assignments[emp_id].append((assignment_date, assignment))
+            for assignment in emp_assignments:
+                assignment_date = assignment.get('date', '')
+                if assignment_date:
+                    employee_assignments[emp_id].append((assignment_date, assignment))
     
     # Sort Scheme A + APO assignments by date for cumulative calculation
     for emp_id in employee_assignments:
@@ -1172,6 +1211,9 @@ def build_output(input_data, ctx, status, solver_result, assignments, violations
             pass
     
     # ========== PASS 2: Calculate hours for all assignments ==========
+    # The MOM helpers only look at the employee's own assignments, so they get
+    # the grid bucket instead of the full list (O(days) per call, not O(roster))
+    hour_limits_cache = {}  # (emp_id, month_length) -> monthly hour limits
     for assignment in assignments:
         try:
             # Check for OFF days (no work, no time calculation needed)
@@ -1192,23 +1234,25 @@ def build_output(input_data, ctx, status, solver_result, assignments, violations
             assignment_date = assignment.get('date')
             
             # Get date object for MOM calculations
-            date_obj = datetime.fromisoformat(assignment_date).date()
+            date_obj = grid.date_of(assignment_date)
+            emp_context = grid.for_employee(emp_id)
             
             # ALWAYS recalculate hours - template pre-calculation may be inaccurate
             # due to incomplete week data during template generation
             if True:  # Force recalculation
-                print(f"[DEBUG] Recalculating hours for {emp_id} on {assignment_date}")  # DEBUG
                 # Calculate hours using MOM compliance logic
                 employee = employee_dict.get(emp_id, {})
                 emp_scheme_raw = employee.get('scheme', 'A')
-                from context.engine.time_utils import normalize_scheme
                 emp_scheme = normalize_scheme(emp_scheme_raw)
                 product_type = employee.get('productTypeId', '').upper()
                 
                 # Get monthly hour limits to determine calculation method
                 import calendar
                 month_length = calendar.monthrange(date_obj.year, date_obj.month)[1]
-                hour_limits = get_monthly_hour_limits(month_length, employee, input_data)
+                limits_key = (emp_id, month_length)
+                if limits_key not in hour_limits_cache:
+                    hour_limits_cache[limits_key] = get_monthly_hour_limits(month_length, employee, input_data)
+                hour_limits = hour_limits_cache[limits_key]
                 hour_calc_method = hour_limits.get('hourCalculationMethod', 'weekly44h')
                 
                 # Map new method names to canonical names (backward compatibility)
@@ -1220,7 +1264,6 @@ def build_output(input_data, ctx, status, solver_result, assignments, violations
                 hour_calc_method = method_aliases.get(hour_calc_method, hour_calc_method)
                 
                 # Route based on hourCalculationMethod from monthlyHourLimits
-                print(f"[DEBUG method] {emp_id} on {assignment_date}: hour_calc_method={hour_calc_method}")  # DEBUG
                 if hour_calc_method == 'dailyContractual':
                     # Daily proration of minimumContractualHours (e.g., Scheme B + SO)
                     # Initialize cumulative tracking for this employee if needed
@@ -1229,7 +1272,7 @@ def build_output(input_data, ctx, status, solver_result, assignments, violations
                     
                     # Count work days for this employee in the month
                     work_days_in_month = count_work_days_for_employee_in_month(
-                        emp_id, date_obj.year, date_obj.month, assignments
+                        emp_id, date_obj.year, date_obj.month, emp_context
                     )
                     
                     cumulative = scheme_a_cumulative.get(emp_id, 0.0)
@@ -1240,7 +1283,7 @@ def build_output(input_data, ctx, status, solver_result, assignments, violations
                         end_dt=end_dt,
                         employee_id=emp_id,
                         assignment_date_obj=date_obj,
-                        all_assignments=assignments,
+                        all_assignments=emp_context,
                         cumulative_normal_hours=cumulative,
                         minimum_contractual_hours=minimum_contractual,
                         work_days_in_month=work_days_in_month
@@ -1261,7 +1304,7 @@ def build_output(input_data, ctx, status, solver_result, assignments, violations
                         end_dt=end_dt,
                         employee_id=emp_id,
                         assignment_date_obj=date_obj,
-                        all_assignments=assignments,
+                        all_assignments=emp_context,
                         employee_dict=employee,
                         cumulative_normal_hours=cumulative,
                         contractual_hours_threshold=threshold
@@ -1284,14 +1327,12 @@ def build_output(input_data, ctx, status, solver_result, assignments, violations
                         # Clamp to valid range [1, 7]
                         pattern_work_days = max(1, min(7, work_days_per_week))
                     
-                    hours_dict = calculate_mom_compliant_hours(
-                        start_dt=start_dt,
-                        end_dt=end_dt,
-                        employee_id=emp_id,
-                        assignment_date_obj=date_obj,
-                        all_assignments=assignments,
-                        employee_scheme=emp_scheme,
-                        pattern_work_days=pattern_work_days
+                    work_days_in_week, consecutive_position = mom_week_position(
+                        emp_id, date_obj, emp_context, emp_scheme, pattern_work_days
+                    )
+                    hours_dict = mom_hours(
+                        start_dt, end_dt, emp_scheme, work_days_in_week,
+                        consecutive_position, is_public_holiday=date_obj in public_holidays
                     )
                 
                 else:
@@ -1326,14 +1367,12 @@ def build_output(input_data, ctx, status, solver_result, assignments, violations
                         # Fallback: assume 6-on-1-off if no pattern found
                         pattern_work_days = 6
                     
-                    hours_dict = calculate_mom_compliant_hours(
-                        start_dt=start_dt,
-                        end_dt=end_dt,
-                        employee_id=emp_id,
-                        assignment_date_obj=date_obj,
-                        all_assignments=assignments,
-                        employee_scheme=emp_scheme,
-                        pattern_work_days=pattern_work_days
+                    work_days_in_week, consecutive_position = mom_week_position(
+                        emp_id, date_obj, emp_context, emp_scheme, pattern_work_days
+                    )
+                    hours_dict = mom_hours(
+                        start_dt, end_dt, emp_scheme, work_days_in_week,
+                        consecutive_position, is_public_holiday=date_obj in public_holidays
                     )
             
             # Add hour breakdown to assignment (including restDayPay)
@@ -1341,8 +1380,8 @@ def build_output(input_data, ctx, status, solver_result, assignments, violations
             is_public_holiday = date_obj in public_holidays
             
             # For PH assignments, mark all worked hours as publicHolidayHours
-            public_holiday_hours = 0.0
-            if is_public_holiday:
+            public_holiday_hours = hours_dict.get('publicHolidayHours', 0.0)
+            if is_public_holiday and 'publicHolidayHours' not in hours_dict:
                 # All net worked hours on PH are public holiday hours
                 net_hours = hours_dict.get('gross', 0.0) - hours_dict.get('lunch', 0.0)
                 public_holiday_hours = max(0.0, net_hours)
@@ -1356,8 +1395,6 @@ def build_output(input_data, ctx, status, solver_result, assignments, violations
                 'restDayPay': hours_dict.get('restDayPay', 0.0),
                 'paid': hours_dict['paid']
             }
-            if emp_id == '00100012' and assignment.get('date') == '2026-07-01':
-                print(f"[DEBUG assign] After update: assignment['hours']['normal'] = {assignment['hours']['normal']}")
             
             # Week calculation: ISO week (Mon-Sun)
             try:
@@ -1389,7 +1426,8 @@ def build_output(input_data, ctx, status, solver_result, assignments, violations
     annotated_assignments, employees_capped = _enforce_monthly_ot_cap(
         annotated_assignments, 
         employees, 
-        ctx
+        ctx,
+        grid=grid
     )
     
     # ========== BUILD EMPLOYEE HOURS SUMMARY ==========
@@ -1416,7 +1454,7 @@ def build_output(input_data, ctx, status, solver_result, assignments, violations
     # ========== BUILD OUTPUT ==========
     # Build employee roster with daily status for ALL employees
     # All assignments (including OFF days) are now in the main assignments list
-    employee_roster = build_employee_roster(input_data, ctx, annotated_assignments, off_day_assignments=None)
+    employee_roster = build_employee_roster(input_data, ctx, annotated_assignments, off_day_assignments=None, grid=grid)
     
     # ========== EXTRACT AND ADD UNASSIGNED ASSIGNMENTS ==========
     # The employee_roster logic has comprehensive rules for UNASSIGNED status
@@ -1430,12 +1468,14 @@ def build_output(input_data, ctx, status, solver_result, assignments, violations
             key=lambda a: (a.get('date') or '', a.get('employeeId') or '')
         )
     
-    # ========== SECOND UNAVAILABILITY FIX (for UNASSIGNED records) ==========
-    # Remove unavailability violations from UNASSIGNED records created by extract_unassigned_from_roster
-    # These have employeeId set even though they're UNASSIGNED, but shouldn't be for unavailable employees
-    annotated_assignments_fixed, violations_removed_2 = _remove_unavailable_assignments_from_roster(annotated_assignments, employees)
+    # ========== SECOND UNAVAILABILITY CHECK (for UNASSIGNED records) ==========
+    # Records created by extract_unassigned_from_roster carry the employeeId;
+    # on unavailable days they are turned into employee-less UNASSIGNED gaps
+    annotated_assignments_fixed, violations_removed_2 = _remove_unavailable_assignments_from_roster(
+        annotated_assignments, availability
+    )
     if violations_removed_2 > 0:
-        print(f"[UNAVAILABILITY FIX] ✓ Removed {violations_removed_2} unavailability violations from UNASSIGNED records")
+        print(f"[UNAVAILABILITY CHECK] Cleared {violations_removed_2} UNASSIGNED records on unavailable days")
         annotated_assignments = annotated_assignments_fixed
     
     # ========== CALCULATE ROSTER SUMMARY ==========
@@ -1502,7 +1542,12 @@ def build_output(input_data, ctx, status, solver_result, assignments, violations
     # Add ICPMP preprocessing data if available (for transparency and debugging)
     if icpmp_preprocessing:
         output["icpmpPreprocessing"] = icpmp_preprocessing
-    
+
+    # Template reuse counters from template-based outcome rostering
+    template_cache = solver_result.get('metadata', {}).get('stats', {}).get('templateCache')
+    if template_cache:
+        output["solverRun"]["templateCache"] = template_cache
+
     # ========== V2 OUTPUT ENRICHMENT (dailyHeadcount support) ==========
     # Add dayType to assignments and dailyCoverage summary when v2 slot builder was used
     api_version = ctx.get('_apiVersion', 'v1')
@@ -1528,7 +1573,7 @@ def build_output(input_data, ctx, status, solver_result, assignments, violations
                 asgn_date = asgn.get('date', '')
                 if asgn_date:
                     try:
-                        asgn_date_obj = datetime.fromisoformat(asgn_date + "T00:00:00").date() if 'T' not in asgn_date else datetime.fromisoformat(asgn_date).date()
+                        asgn_date_obj = grid.date_of(asgn_date)
                         if asgn_date_obj in public_holidays:
                             asgn['dayType'] = 'PublicHoliday'
                         else:
@@ -1582,6 +1627,8 @@ def build_output(input_data, ctx, status, solver_result, assignments, violations
         output['meta']['usedDailyHeadcount'] = has_daily_headcount
         output['meta']['usedV2SlotBuilder'] = used_v2_slot_builder
     
+    output['meta']['outputBuildSeconds'] = round(time.perf_counter() - build_start, 3)
+    
     return output
 
 
@@ -1645,8 +1692,8 @@ def build_incremental_output(
     # Build employee lookup dictionary for scheme information
     employee_dict = {emp['employeeId']: emp for emp in ctx.get('employees', [])}
     
-    # Combine locked and new for MOM context analysis
-    all_assignments_for_context = locked_assignments + new_assignments
+    # Combine locked and new for MOM context analysis (indexed per employee)
+    context_grid = AssignmentGrid(locked_assignments + new_assignments)
     
     for assignment in new_assignments:
         try:
@@ -1715,7 +1762,7 @@ def build_incremental_output(
                     end_dt=end_dt,
                     employee_id=emp_id,
                     assignment_date_obj=date_obj,
-                    all_assignments=all_assignments_for_context,
+                    all_assignments=context_grid.for_employee(emp_id),
                     employee_dict=employee,
                     cumulative_normal_hours=cumulative,
                     contractual_hours_threshold=threshold
@@ -1736,15 +1783,10 @@ def build_incremental_output(
                         # Clamp to valid range [1, 7]
                         pattern_work_days = max(1, min(7, work_days_per_week))
                 
-                hours_dict = calculate_mom_compliant_hours(
-                    start_dt=start_dt,
-                    end_dt=end_dt,
-                    employee_id=emp_id,
-                    assignment_date_obj=date_obj,
-                    all_assignments=all_assignments_for_context,
-                    employee_scheme=emp_scheme,
-                    pattern_work_days=pattern_work_days
+                work_days_in_week, consecutive_position = mom_week_position(
+                    emp_id, date_obj, context_grid.for_employee(emp_id), emp_scheme, pattern_work_days
                 )
+                hours_dict = mom_hours(start_dt, end_dt, emp_scheme, work_days_in_week, consecutive_position)
             
             # Add audit trail
             audit_info = {
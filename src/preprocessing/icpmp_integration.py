@@ -22,15 +22,48 @@ Date: December 2025
 from typing import Dict, List, Any, Set, Tuple
 from datetime import datetime, timedelta
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from math import ceil
 import logging
+import os
+import time
 
-from context.engine.config_optimizer_v3 import calculate_optimal_with_u_slots
 from context.engine.time_utils import normalize_scheme, normalize_schemes, is_scheme_compatible
+from src.employee_pool import EmployeePool
+from src.ratio_cache import cached_optimal_with_u_slots
 
 logger = logging.getLogger(__name__)
 
 
+def _sizing_workers() -> int:
+    """Process count for ICPMP sizing (ICPMP_SIZING_WORKERS, 0 = auto)"""
+    configured = int(os.getenv('ICPMP_SIZING_WORKERS', '0'))
+    if configured > 0:
+        return configured
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+def _size_requirement(settings: Dict[str, Any], demand_item: Dict, req: Dict) -> Tuple:
+    """
+    Pool task: ICPMP sizing for one requirement.
+    
+    Args:
+        settings: planningHorizon, publicHolidays and monthlyHourLimits of the input
+        demand_item: Demand item containing the requirement
+        req: Requirement to size
+    
+    Returns:
+        (icpmp_result or None, exception or None, sizing_ms)
+    """
+    start = time.perf_counter()
+    try:
+        result = ICPMPPreprocessor(settings)._run_icpmp_for_requirement(demand_item, req)
+        return result, None, (time.perf_counter() - start) * 1000
+    except Exception as e:
+        return None, e, (time.perf_counter() - start) * 1000
+
+
 class ICPMPPreprocessor:
     """
     ICPMP v3.0 Preprocessor for optimal employee selection and rotation offset assignment.
@@ -63,6 +96,7 @@ class ICPMPPreprocessor:
         
         # Extract common data
         self.all_employees = input_json.get('employees', [])
+        self.employee_pool = EmployeePool(self.all_employees)
         self.public_holidays = input_json.get('publicHolidays', [])
         self.planning_horizon = input_json.get('planningHorizon', {})
         self.monthly_hour_limits = input_json.get('monthlyHourLimits', [])
@@ -89,54 +123,77 @@ class ICPMPPreprocessor:
         requirement_count = 0
         total_selected = 0
         
-        for demand_item in self.input.get('demandItems', []):
+        tasks = [
+            (demand_item, req)
+            for demand_item in self.input.get('demandItems', [])
+            for req in demand_item.get('requirements', [])
+        ]
+        
+        # Stage 1: size every requirement (independent, parallel when worthwhile)
+        sizing_start = time.perf_counter()
+        sizing_results, sizing_mode, sizing_workers = self._size_requirements(tasks)
+        sizing_wall_ms = (time.perf_counter() - sizing_start) * 1000
+        
+        # Stage 2: select employees in input order (shares the claimed-employee pool)
+        current_demand_id = None
+        for (demand_item, req), (icpmp_result, sizing_error, sizing_ms) in zip(tasks, sizing_results):
             demand_id = demand_item.get('demandId', 'UNKNOWN')
-            logger.info(f"\nProcessing Demand Item: {demand_id}")
+            if demand_id != current_demand_id:
+                current_demand_id = demand_id
+                logger.info(f"\nProcessing Demand Item: {demand_id}")
+            
+            requirement_count += 1
+            req_id = req.get('requirementId', 'UNKNOWN')
+            logger.info(f"  Requirement: {req_id}")
             
-            for req in demand_item.get('requirements', []):
-                requirement_count += 1
-                req_id = req.get('requirementId', 'UNKNOWN')
-                logger.info(f"  Requirement: {req_id}")
+            try:
+                if sizing_error is not None:
+                    raise sizing_error
                 
-                try:
-                    # Step 1: Run ICPMP v3.0 to get optimal configuration
-                    icpmp_result = self._run_icpmp_for_requirement(demand_item, req)
-                    
-                    # Step 2: Select and assign employees
-                    selected_employees = self._select_and_assign_employees(
-                        requirement=req,
-                        demand_item=demand_item,
-                        icpmp_result=icpmp_result
-                    )
-                    
-                    # Step 3: Track results
-                    filtered_employees.extend(selected_employees)
-                    total_selected += len(selected_employees)
-                    self.icpmp_metadata[req_id] = {
-                        'demandId': demand_id,
-                        'optimal_employees': icpmp_result['configuration']['employeesRequired'],
-                        'selected_count': len(selected_employees),
-                        'u_slots_total': icpmp_result['coverage']['totalUSlots'],
-                        'offset_distribution': icpmp_result['configuration']['offsetDistribution'],
-                        'is_optimal': icpmp_result['configuration']['optimality'] == 'PROVEN_MINIMAL',
-                        'coverage_rate': icpmp_result['coverage']['achievedRate']
-                    }
-                    
-                    logger.info(f"    ✓ Selected {len(selected_employees)} employees "
-                              f"(optimal: {icpmp_result['configuration']['employeesRequired']}, "
-                              f"U-slots: {icpmp_result['coverage']['totalUSlots']})")
-                    
-                except Exception as e:
-                    error_msg = f"Failed to process requirement {req_id}: {str(e)}"
-                    logger.error(f"    ✗ {error_msg}")
-                    logger.error(f"    Traceback:", exc_info=True)
-                    self.warnings.append(error_msg)
+                # Step 2: Select and assign employees
+                selection_start = time.perf_counter()
+                selected_employees = self._select_and_assign_employees(
+                    requirement=req,
+                    demand_item=demand_item,
+                    icpmp_result=icpmp_result
+                )
+                selection_ms = (time.perf_counter() - selection_start) * 1000
+                
+                # Step 3: Track results
+                filtered_employees.extend(selected_employees)
+                total_selected += len(selected_employees)
+                self.icpmp_metadata[req_id] = {
+                    'demandId': demand_id,
+                    'optimal_employees': icpmp_result['configuration']['employeesRequired'],
+                    'selected_count': len(selected_employees),
+                    'u_slots_total': icpmp_result['coverage']['totalUSlots'],
+                    'offset_distribution': icpmp_result['configuration']['offsetDistribution'],
+                    'is_optimal': icpmp_result['configuration']['optimality'] == 'PROVEN_MINIMAL',
+                    'coverage_rate': icpmp_result['coverage']['achievedRate'],
+                    'sizing_ms': round(sizing_ms, 1),
+                    'selection_ms': round(selection_ms, 1)
+                }
+                
+                logger.info(f"    ✓ Selected {len(selected_employees)} employees "
+                          f"(optimal: {icpmp_result['configuration']['employeesRequired']}, "
+                          f"U-slots: {icpmp_result['coverage']['totalUSlots']})")
+                
+            except Exception as e:
+                error_msg = f"Failed to process requirement {req_id}: {str(e)}"
+                logger.error(f"    ✗ {error_msg}")
+                logger.error(f"    Traceback:", exc_info=True)
+                self.warnings.append(error_msg)
         
         summary = {
             'total_requirements_processed': requirement_count,
             'total_employees_selected': total_selected,
             'total_employees_available': len(self.all_employees),
-            'utilization_rate': total_selected / len(self.all_employees) if self.all_employees else 0
+            'utilization_rate': total_selected / len(self.all_employees) if self.all_employees else 0,
+            'sizing': {
+                'mode': sizing_mode,
+                'workers': sizing_workers,
+                'wall_ms': round(sizing_wall_ms, 1)
+            }
         }
         
         logger.info("\n" + "=" * 80)
@@ -154,6 +211,64 @@ class ICPMPPreprocessor:
             'summary': summary
         }
     
+    def _size_requirements(self, tasks: List[Tuple[Dict, Dict]]) -> Tuple[List[Tuple], str, int]:
+        """
+        Run ICPMP sizing for every (demand_item, requirement) pair.
+        
+        Sizing only reads the requirement, its demand item and the horizon /
+        holiday / OT-limit settings, so requirements can be sized in a process
+        pool. The first requirement is sized in-process; the rest go to a pool
+        of up to ICPMP_SIZING_WORKERS processes (default: up to 4 by CPU count)
+        only if, judging by the first one, they would take at least
+        ICPMP_PARALLEL_MIN_MS (default 100 ms), as starting a pool costs tens of
+        milliseconds. Falls back to sequential sizing when a pool cannot be
+        started (e.g. inside a daemon process).
+        
+        Args:
+            tasks: (demand_item, requirement) pairs in input order
+        
+        Returns:
+            ([(icpmp_result or None, exception or None, sizing_ms), ...] in task
+            order, mode ('parallel' or 'sequential'), worker count)
+        """
+        def size_in_process(demand_item, req):
+            start = time.perf_counter()
+            try:
+                result, error = self._run_icpmp_for_requirement(demand_item, req), None
+            except Exception as e:
+                result, error = None, e
+            return result, error, (time.perf_counter() - start) * 1000
+        
+        if not tasks:
+            return [], 'sequential', 1
+        results = [size_in_process(*tasks[0])]
+        rest = tasks[1:]
+        
+        workers = min(len(rest), _sizing_workers())
+        estimated_ms = results[0][2] * len(rest)
+        if workers > 1 and estimated_ms >= float(os.getenv('ICPMP_PARALLEL_MIN_MS', '100')):
+            settings = {
+                'planningHorizon': self.planning_horizon,
+                'publicHolidays': self.public_holidays,
+                'monthlyHourLimits': self.monthly_hour_limits
+            }
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    results.extend(pool.map(
+                        _size_requirement,
+                        [settings] * len(rest),
+                        [demand_item for demand_item, _ in rest],
+                        [req for _, req in rest]
+                    ))
+                logger.info(f"  ICPMP sizing: {len(rest)} requirements on {workers} processes")
+                return results, 'parallel', workers
+            except (OSError, AssertionError, BrokenProcessPool) as e:
+                logger.warning(f"  ICPMP sizing pool unavailable ({e}); sizing sequentially")
+                del results[1:]
+        
+        results.extend(size_in_process(demand_item, req) for demand_item, req in rest)
+        return results, 'sequential', 1
+    
     def _run_icpmp_for_requirement(self, demand_item: Dict, req: Dict) -> Dict:
         """
         Run ICPMP v3.0 for a single requirement to get optimal configuration.
@@ -249,14 +364,16 @@ class ICPMPPreprocessor:
         logger.info(f"    Monthly OT cap for {scheme} + {product_type}: {monthly_ot_cap}h\")")
         
         # Call ICPMP v3.0 with scheme parameter, OT-aware flag, and scheme-specific OT cap
-        icpmp_result = calculate_optimal_with_u_slots(
+        # (reused from the persistent ratio cache when the same shape was sized before)
+        icpmp_result = cached_optimal_with_u_slots(
             pattern=work_pattern,
             headcount=headcount,
             calendar=calendar,
             anchor_date=coverage_anchor,
             scheme=scheme,  # Pass scheme for capacity calculation
             enable_ot_aware_icpmp=enable_ot_aware_icpmp,  # Pass OT-aware flag
-            monthly_ot_cap=monthly_ot_cap  # Pass scheme-specific monthly OT cap
+            monthly_ot_cap=monthly_ot_cap,  # Pass scheme-specific monthly OT cap
+            headcount_by_shift=headcount_by_shift
         )
         
         # POST-ICPMP VALIDATION: Check if all required offsets are covered
@@ -296,7 +413,8 @@ class ICPMPPreprocessor:
                         'optimality': 'FORCED_FULL_OFFSET_COVERAGE',
                         'algorithm': 'GREEDY_INCREMENTAL_WITH_VALIDATION',
                         'lowerBound': icpmp_result['configuration']['lowerBound'],
-                        'attemptsRequired': pattern_length - icpmp_result['configuration']['lowerBound'] + 1,
+                        # Probes of the search, same as computation.probes
+                        'attemptsRequired': icpmp_result.get('computation', {}).get('probes'),
                         'offsetDistribution': recalc_result['offset_distribution']
                     },
                     'employeePatterns': recalc_result['employees'],
@@ -313,7 +431,8 @@ class ICPMPPreprocessor:
                         'totalCoverageNeeded': len(calendar) * headcount,
                         'validationApplied': True,
                         'originalEmployeesRequired': icpmp_result['configuration']['employeesRequired']
-                    }
+                    },
+                    'computation': icpmp_result.get('computation', {})
                 }
                 logger.info(f"    ✓ Validation fix applied: Using {pattern_length} employees with all offsets [0-{pattern_length-1}]")
             else:
@@ -514,6 +633,8 @@ class ICPMPPreprocessor:
         )
         
         # Step 5: Apply rotation offsets AND ROTATED work patterns
+        # (on copies: eligible employees are shared with the input)
+        selected = [dict(emp) for emp in selected]
         base_pattern = requirement.get('workPattern', [])
         for i, emp in enumerate(selected):
             offset = offset_list[i] if i < len(offset_list) else 0
@@ -554,13 +675,8 @@ class ICPMPPreprocessor:
             demand_item: Demand item with whitelist/blacklist
         
         Returns:
-            List of eligible employee dicts (deep copies to avoid mutation)
+            List of eligible employee dicts (shared with the input; read-only)
         """
-        import copy
-        
-        eligible = []
-        filtered_count = 0
-        
         # Extract criteria (v0.95: use rankIds plural for multiple rank support)
         # v2: Support productTypeIds array (OR logic)
         product_type = requirement.get('productTypeId')
@@ -649,82 +765,47 @@ class ICPMPPreprocessor:
                 blacklist_emp_ids.add(bl_entry)
                 logger.info(f"✗ Employee {bl_entry} blacklisted (legacy format)")
         
-        for emp in self.all_employees:
-            emp_id = emp['employeeId']
-            logger.info(f"Evaluating employee {emp_id}...")
-            
-            # Check blacklist first
-            if emp_id in blacklist_emp_ids:
-                logger.info(f"  ✗ {emp_id} filtered: in blacklist")
-                continue
-            
-            # Check whitelist (if specified)
-            if whitelist_emp_ids and emp_id not in whitelist_emp_ids:
-                if not whitelist_team_ids or emp.get('teamId') not in whitelist_team_ids:
-                    logger.info(f"  ✗ {emp_id} filtered: not in whitelist")
-                    continue
-            
-            # Check basic criteria
-            # v2: Support productTypeIds array (OR logic)
-            emp_product = emp.get('productTypeId', '')
-            if use_product_types_array:
-                if emp_product not in product_type_ids:
-                    logger.info(f"  ✗ {emp_id} filtered: product type {emp_product} not in {product_type_ids}")
-                    continue
-            elif product_type and emp_product != product_type:
-                logger.info(f"  ✗ {emp_id} filtered: product type {emp_product} != {product_type}")
-                continue
-            
-            # v0.95: Support multiple ranks - employee must match ANY rank in the list
-            if ranks and emp.get('rankId') not in ranks:
-                logger.info(f"  ✗ {emp_id} filtered: rank {emp.get('rankId')} not in {ranks}")
-                continue
-            if ou_id and emp.get('ouId') != ou_id:
-                continue
-            
-            # Check gender
-            if gender_req != 'Any' and emp.get('gender') != gender_req:
-                continue
-            
-            # Check shift duration compatibility (MOM hour limits)
-            # Filter out employees whose scheme limit is less than shift duration
-            emp_scheme_raw = emp.get('scheme', 'Unknown')
-            emp_scheme = normalize_scheme(emp_scheme_raw)
-            scheme_limit = SCHEME_HOUR_LIMITS.get(emp_scheme, 14)  # Default to Scheme A limit
-            
-            if max_shift_hours > scheme_limit:
-                logger.debug(f"      Employee {emp['employeeId']} (Scheme {emp_scheme_raw}, {scheme_limit}h limit) "
-                           f"filtered: shift {max_shift_hours:.1f}h exceeds limit")
-                filtered_count += 1
-                continue
-            
-            # v0.96: Check scheme compatibility (supports multiple schemes)
-            if not is_scheme_compatible(emp_scheme, scheme_list):
-                logger.debug(f"      Employee {emp['employeeId']} (Scheme {emp_scheme}) "
-                           f"filtered: not compatible with requirement schemes {scheme_list}")
-                continue
-            
-            # Check qualifications (v0.98: handle object format)
-            # Employee qualifications: [{"code":"523_BASIC...","validFrom":"...","expiryDate":"..."}]
-            emp_quals_raw = emp.get('qualifications', [])
-            emp_quals = set()
-            for qual in emp_quals_raw:
-                if isinstance(qual, dict) and 'code' in qual:
-                    emp_quals.add(qual['code'])
-                elif isinstance(qual, str):
-                    # Legacy format: flat list of strings
-                    emp_quals.add(qual)
-            
-            # Check if employee has at least one required qualification from each group
-            # For now, simplified: check if employee has ANY required qualification
-            if required_quals and not required_quals.intersection(emp_quals):
-                logger.debug(f"      Employee {emp['employeeId']} filtered: no matching qualifications")
-                logger.debug(f"        Required (any): {required_quals}")
-                logger.debug(f"        Employee has: {emp_quals}")
-                continue
-            
-            # Eligible - add deep copy to avoid mutating original
-            eligible.append(copy.deepcopy(emp))
+        # Criteria become set intersections over the request's employee pool
+        pool = self.employee_pool
+        candidates = pool.all()
+        
+        # Blacklist, then whitelist (by employee or team)
+        candidates -= pool.where_in('employeeId', blacklist_emp_ids)
+        if whitelist_emp_ids:
+            candidates &= (pool.where_in('employeeId', whitelist_emp_ids)
+                           | pool.where_in('teamId', whitelist_team_ids))
+        
+        # Basic criteria (v2: productTypeIds array is OR logic; v0.95: any of rankIds)
+        if use_product_types_array:
+            pool.narrow(candidates, 'productTypeId', lambda p: p in product_type_ids, default='')
+        elif product_type:
+            candidates &= pool.where_in('productTypeId', [product_type])
+        if ranks:
+            pool.narrow(candidates, 'rankId', lambda r: r in ranks)
+        if ou_id:
+            candidates &= pool.where_in('ouId', [ou_id])
+        if gender_req != 'Any':
+            candidates &= pool.where_in('gender', [gender_req])
+        
+        # Shift duration compatibility (MOM hour limits): drop employees whose
+        # scheme limit is below the longest shift
+        before_hour_filter = len(candidates)
+        pool.narrow(candidates, 'schemeCode',
+                    lambda code: max_shift_hours <= SCHEME_HOUR_LIMITS.get(code, 14))
+        filtered_count = before_hour_filter - len(candidates)
+        
+        # v0.96: Scheme compatibility (supports multiple schemes)
+        pool.narrow(candidates, 'schemeCode', lambda code: is_scheme_compatible(code, scheme_list))
+        
+        # Qualifications (v0.98: object or legacy string format): for now,
+        # simplified to ANY required qualification across groups
+        if required_quals:
+            candidates &= pool.with_qualification(required_quals)
+        
+        # Eligible employees are shared views of the input; selection copies
+        # the ones it assigns before writing offsets and patterns
+        eligible = pool.view(candidates)
+        logger.info(f"    Eligible: {len(eligible)} of {len(pool)} employees")
         
         # Log filtering summary
         if filtered_count > 0:
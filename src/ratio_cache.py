@@ -0,0 +1,429 @@
+"""
+Persistent ICPMP Configuration Cache
+
+ICPMP (config_optimizer_v3.calculate_optimal_with_u_slots) searches upwards
+from a lower bound for the minimal employee count of a requirement. The same
+requirement shapes come back on every roster run of a site, so results are
+stored in a SQLite file and reused across requests, worker processes and
+restarts.
+
+Key: canonical hash of every input the calculation depends on
+    workPattern, headcount (total per day) and headcount by shift, coverage
+    calendar (dates), pattern anchor date, scheme, OT-aware flag and
+    monthly OT cap, plus CACHE_VERSION so entries written by older sizing
+    code stop matching (and age out via TTL/LRU)
+
+Value: the calculation result as JSON (offsetDistribution keys are turned
+back into ints on load). Exports carry the same JSON, so importing a file
+never executes code from it.
+
+Eviction:
+- TTL: entries not used for RATIO_CACHE_TTL_DAYS days are dropped
+- LRU: at most RATIO_CACHE_MAX_ENTRIES entries; least recently used go first
+
+Hit / miss / eviction counters live in the same file, so `python
+src/manage_ratio_cache.py stats` shows them for all processes on the host.
+A cache hit returns the stored result with the caller's requirementId and
+computation.cached = True (its probes describe the run that stored it).
+
+Configuration (environment):
+    RATIO_CACHE_ENABLED      "false" disables the cache (default: true)
+    RATIO_CACHE_PATH         SQLite file (default: config/ratio_cache.db)
+    RATIO_CACHE_MAX_ENTRIES  LRU size (default: 2000)
+    RATIO_CACHE_TTL_DAYS     Idle lifetime of an entry (default: 30)
+
+Usage:
+    from src.ratio_cache import cached_optimal_with_u_slots
+    result = cached_optimal_with_u_slots(pattern=..., headcount=..., calendar=..., anchor_date=...)
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from context.engine.config_optimizer_v3 import calculate_optimal_with_u_slots
+
+logger = logging.getLogger(__name__)
+
+# Part of every key: bump whenever the sizing code or its result changes
+# (3.0: coverage kernel, galloping/bisect search, computation block;
+#  3.1: attemptsRequired counts search probes; 3.2: JSON-stored results)
+CACHE_VERSION = "3.2"
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[1] / "config" / "ratio_cache.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    hash TEXT PRIMARY KEY,
+    pattern TEXT NOT NULL,
+    params TEXT NOT NULL,
+    employees INTEGER,
+    result BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    usage_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def cache_key_params(
+    pattern: List[str],
+    headcount: int,
+    calendar: List[str],
+    anchor_date: str,
+    scheme: str = "A",
+    enable_ot_aware_icpmp: bool = False,
+    monthly_ot_cap: float = 72.0,
+    headcount_by_shift: Optional[Dict[str, int]] = None,
+) -> Dict[str, Any]:
+    """Canonical form of the inputs an ICPMP result depends on"""
+    return {
+        'version': CACHE_VERSION,
+        'workPattern': list(pattern),
+        'headcount': headcount,
+        'headcountByShift': dict(sorted((headcount_by_shift or {}).items())),
+        'calendar': sorted(calendar),
+        'anchorDate': str(anchor_date)[:10],
+        'scheme': scheme,
+        'otAware': bool(enable_ot_aware_icpmp),
+        'monthlyOtCap': float(monthly_ot_cap),
+    }
+
+
+def cache_key(params: Dict[str, Any]) -> str:
+    """16-hex hash of canonical key params"""
+    canonical = json.dumps(params, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode()).hexdigest()[:16]
+
+
+def _dump_result(result: Dict[str, Any]) -> str:
+    return json.dumps(result, separators=(',', ':'))
+
+
+def _load_result(stored: Any) -> Optional[Dict[str, Any]]:
+    """Stored JSON back to a result (None for unreadable rows, e.g. pickled by older versions)"""
+    try:
+        result = json.loads(stored)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(result, dict):
+        return None
+    configuration = result.get('configuration')
+    if isinstance(configuration, dict) and isinstance(configuration.get('offsetDistribution'), dict):
+        configuration['offsetDistribution'] = {
+            int(offset): count for offset, count in configuration['offsetDistribution'].items()
+        }
+    return result
+
+
+class RatioCache:
+    """SQLite-backed ICPMP result cache with LRU/TTL eviction and hit/miss counters"""
+
+    def __init__(self, path: Optional[str] = None, max_entries: Optional[int] = None,
+                 ttl_days: Optional[float] = None):
+        """
+        Args:
+            path: SQLite file (default: RATIO_CACHE_PATH or config/ratio_cache.db)
+            max_entries: LRU size (default: RATIO_CACHE_MAX_ENTRIES or 2000)
+            ttl_days: Idle lifetime in days, 0 = never expire
+                (default: RATIO_CACHE_TTL_DAYS or 30)
+        """
+        self.path = str(path or os.getenv('RATIO_CACHE_PATH') or DEFAULT_CACHE_PATH)
+        self.max_entries = int(max_entries if max_entries is not None
+                               else os.getenv('RATIO_CACHE_MAX_ENTRIES', '2000'))
+        self.ttl_days = float(ttl_days if ttl_days is not None
+                              else os.getenv('RATIO_CACHE_TTL_DAYS', '30'))
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived connection per operation: safe across forked workers
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _count(conn: sqlite3.Connection, name: str, amount: int = 1) -> None:
+        conn.execute(
+            "INSERT INTO counters (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, amount)
+        )
+
+    def _expiry_cutoff(self, now: float) -> Optional[float]:
+        return now - self.ttl_days * 86400 if self.ttl_days > 0 else None
+
+    # ---- Lookups ----
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached result for key (None on miss or expired entry)"""
+        now = time.time()
+        cutoff = self._expiry_cutoff(now)
+        with self._connect() as conn:
+            row = conn.execute("SELECT result, last_used FROM entries WHERE hash = ?", (key,)).fetchone()
+            result = _load_result(row[0]) if row is not None else None
+            if row is not None and (result is None or (cutoff is not None and row[1] < cutoff)):
+                conn.execute("DELETE FROM entries WHERE hash = ?", (key,))
+                self._count(conn, 'evictions')
+                result = None
+            if result is None:
+                self._count(conn, 'misses')
+                return None
+            conn.execute(
+                "UPDATE entries SET last_used = ?, usage_count = usage_count + 1 WHERE hash = ?",
+                (now, key)
+            )
+            self._count(conn, 'hits')
+        return result
+
+    def put(self, key: str, params: Dict[str, Any], result: Dict[str, Any]) -> None:
+        """Store a result and apply TTL/LRU eviction"""
+        now = time.time()
+        employees = (result.get('configuration') or {}).get('employeesRequired')
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(hash, pattern, params, employees, result, created_at, last_used, usage_count) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, 0)",
+                (key, ''.join(params['workPattern']), json.dumps(params, sort_keys=True), employees,
+                 _dump_result(result), now, now)
+            )
+            self._evict(conn, now)
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        evicted = 0
+        cutoff = self._expiry_cutoff(now)
+        if cutoff is not None:
+            evicted += conn.execute("DELETE FROM entries WHERE last_used < ?", (cutoff,)).rowcount
+        if self.max_entries > 0:
+            evicted += conn.execute(
+                "DELETE FROM entries WHERE hash IN ("
+                "  SELECT hash FROM entries ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            ).rowcount
+        if evicted:
+            self._count(conn, 'evictions', evicted)
+
+    def get_or_compute(self, params: Dict[str, Any], compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Cached result for params, computing and storing it on a miss.
+
+        Cache failures (locked or unwritable file) fall back to compute().
+        A hit is marked computation.cached = True.
+        """
+        key = cache_key(params)
+        try:
+            cached = self.get(key)
+        except sqlite3.Error as e:
+            logger.warning(f"Ratio cache lookup failed ({e}); computing without cache")
+            return compute()
+        if cached is not None:
+            cached['computation'] = {**cached.get('computation', {}), 'cached': True}
+            return cached
+        result = compute()
+        try:
+            self.put(key, params, result)
+        except sqlite3.Error as e:
+            logger.warning(f"Ratio cache store failed: {e}")
+        return result
+
+    # ---- Management (manage_ratio_cache.py) ----
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters, settings and one summary per entry (most recently used first)"""
+        with self._connect() as conn:
+            counters = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+            rows = conn.execute(
+                "SELECT hash, pattern, params, employees, usage_count, created_at, last_used "
+                "FROM entries ORDER BY last_used DESC"
+            ).fetchall()
+        hits, misses = counters.get('hits', 0), counters.get('misses', 0)
+        patterns = []
+        for key, pattern, params, employees, usage_count, created_at, last_used in rows:
+            params = json.loads(params)
+            patterns.append({
+                'hash': key,
+                'pattern': pattern,
+                'headcount': params['headcount'],
+                'headcountByShift': params['headcountByShift'],
+                'scheme': params['scheme'],
+                'otAware': params['otAware'],
+                'monthlyOtCap': params['monthlyOtCap'],
+                'coverageDays': len(params['calendar']),
+                'employees': employees,
+                'usageCount': usage_count,
+                'created': datetime.fromtimestamp(created_at).isoformat(timespec='seconds'),
+                'lastUsed': datetime.fromtimestamp(last_used).isoformat(timespec='seconds'),
+            })
+        return {
+            'path': self.path,
+            'maxEntries': self.max_entries,
+            'ttlDays': self.ttl_days,
+            'totalEntries': len(patterns),
+            'hits': hits,
+            'misses': misses,
+            'evictions': counters.get('evictions', 0),
+            'hitRate': hits / (hits + misses) if hits + misses else 0.0,
+            'patterns': patterns,
+        }
+
+    def print_stats(self) -> None:
+        stats = self.get_stats()
+        print(f"\n{'='*80}")
+        print("ICPMP RATIO CACHE")
+        print(f"{'='*80}")
+        print(f"  File:        {stats['path']}")
+        print(f"  Entries:     {stats['totalEntries']} (max {stats['maxEntries']}, TTL {stats['ttlDays']:g} days)")
+        print(f"  Hits/misses: {stats['hits']}/{stats['misses']} ({stats['hitRate']:.1%} hit rate)")
+        print(f"  Evictions:   {stats['evictions']}")
+        print(f"{'='*80}\n")
+
+    def invalidate(self, hash_prefix: str) -> List[str]:
+        """Delete entries whose hash starts with hash_prefix; returns deleted hashes"""
+        with self._connect() as conn:
+            keys = [row[0] for row in conn.execute(
+                "SELECT hash FROM entries WHERE hash LIKE ? || '%'", (hash_prefix,))]
+            conn.executemany("DELETE FROM entries WHERE hash = ?", [(k,) for k in keys])
+        return keys
+
+    def clear_cache(self) -> None:
+        """Delete all entries and reset the counters"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM entries")
+            conn.execute("DELETE FROM counters")
+
+    def export_entries(self) -> Dict[str, Any]:
+        """All entries as a JSON-serializable document (unreadable rows are left out)"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT hash, pattern, params, employees, result, created_at, last_used, usage_count "
+                "FROM entries"
+            ).fetchall()
+        entries = {}
+        for key, pattern, params, employees, result, created_at, last_used, usage_count in rows:
+            result = _load_result(result)
+            if result is None:
+                continue
+            entries[key] = {
+                'pattern': pattern,
+                'params': json.loads(params),
+                'employees': employees,
+                'createdAt': created_at,
+                'lastUsed': last_used,
+                'usageCount': usage_count,
+                'result': result,
+            }
+        return {'version': CACHE_VERSION, 'entries': entries}
+
+    def import_entries(self, document: Dict[str, Any]) -> Dict[str, int]:
+        """
+        Merge entries from an export_entries() document.
+
+        Entries without a JSON result object (e.g. from the old JSON ratio
+        cache, or base64-pickled exports of older versions) are skipped;
+        nothing in the document is unpickled or executed.
+
+        Returns:
+            {'new': n, 'updated': n, 'skipped': n}
+        """
+        counts = {'new': 0, 'updated': 0, 'skipped': 0}
+        with self._connect() as conn:
+            existing = {row[0] for row in conn.execute("SELECT hash FROM entries")}
+            for key, entry in document.get('entries', {}).items():
+                if not (isinstance(entry.get('result'), dict) and isinstance(entry.get('params'), dict)):
+                    counts['skipped'] += 1
+                    continue
+                counts['updated' if key in existing else 'new'] += 1
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries "
+                    "(hash, pattern, params, employees, result, created_at, last_used, usage_count) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, entry['pattern'], json.dumps(entry['params'], sort_keys=True),
+                     entry.get('employees'), _dump_result(entry['result']),
+                     entry.get('createdAt', time.time()), entry.get('lastUsed', time.time()),
+                     entry.get('usageCount', 0))
+                )
+            self._evict(conn, time.time())
+        return counts
+
+
+_cache: Optional[RatioCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_ratio_cache() -> Optional[RatioCache]:
+    """Process-wide cache, or None when disabled or the file cannot be opened"""
+    global _cache
+    if os.getenv('RATIO_CACHE_ENABLED', 'true').lower() in ('false', '0', 'no'):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = RatioCache()
+            except (sqlite3.Error, OSError) as e:
+                logger.warning(f"Ratio cache unavailable ({e}); ICPMP results will not be cached")
+                return None
+        return _cache
+
+
+def cached_optimal_with_u_slots(
+    pattern: List[str],
+    headcount: int,
+    calendar: List[str],
+    anchor_date: str,
+    requirement_id: str = "unknown",
+    scheme: str = "A",
+    enable_ot_aware_icpmp: bool = False,
+    monthly_ot_cap: float = 72.0,
+    headcount_by_shift: Optional[Dict[str, int]] = None,
+    cache: Optional[RatioCache] = None,
+) -> Dict[str, Any]:
+    """
+    calculate_optimal_with_u_slots() through the persistent cache.
+
+    Args:
+        Same as calculate_optimal_with_u_slots, plus:
+        headcount_by_shift: Per-shift headcount the total was derived from
+        cache: Cache to use (default: process-wide cache; None when disabled)
+
+    Returns:
+        ICPMP result dict (requirementId set to requirement_id)
+    """
+    def compute():
+        return calculate_optimal_with_u_slots(
+            pattern=pattern,
+            headcount=headcount,
+            calendar=calendar,
+            anchor_date=anchor_date,
+            requirement_id=requirement_id,
+            scheme=scheme,
+            enable_ot_aware_icpmp=enable_ot_aware_icpmp,
+            monthly_ot_cap=monthly_ot_cap
+        )
+
+    cache = cache or get_ratio_cache()
+    if cache is None:
+        return compute()
+    params = cache_key_params(pattern, headcount, calendar, anchor_date, scheme,
+                              enable_ot_aware_icpmp, monthly_ot_cap, headcount_by_shift)
+    result = cache.get_or_compute(params, compute)
+    result['requirementId'] = requirement_id
+    return result
@@ -5,16 +5,177 @@ Replaces in-memory JobManager with persistent Redis storage
 import uuid
 import time
 import json
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, Tuple, AsyncIterator, List
 from enum import Enum
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
+import asyncio
 import logging
 
-from src.redis_manager import get_redis_client
+from src.redis_manager import get_redis_client, get_async_redis_client
+from src.output_builder import compute_input_hash
+from src.result_index import (
+    ResultFilter, ResultIndex, STREAM_CHUNK_ROWS, build_result_index, select_rows,
+    trim_roster_line, end_line
+)
 
 logger = logging.getLogger(__name__)
 
+# Request envelope fields that never change the solve outcome
+DEDUP_EXCLUDED_FIELDS = {'webhook_url', 'webhookUrl', 'priority', 'ttl_seconds', 'dedup'}
+
+# Upper bound on how long an in-flight job can hold its dedup key
+DEDUP_INFLIGHT_TTL_SECONDS = 86400
+
+# Job hash fields needed for status polling (everything except input_data)
+JOB_META_FIELDS = (
+    'job_id', 'status', 'created_at', 'started_at', 'completed_at', 'error_message',
+    'result_size_bytes', 'webhook_url', 'dedup_key', 'result_ref'
+)
+
+# ---------------------------------------------------------------------------
+# Lua scripts: each job state transition is one atomic round trip.
+# Some keys (dedup refs, the job a ref points to) are derived inside the
+# scripts from key_prefix, which is fine for the single-instance Redis used
+# here but would need hash tags under Redis Cluster.
+# ---------------------------------------------------------------------------
+
+# KEYS: ref, job, jobs_index, jobs_status, status_counts, queue, total_jobs, results_index
+# ARGV: job_id, created_at, inflight_ttl, key_prefix, alias_job_id, webhook_url, field, value, ...
+SUBMIT_SCRIPT = """
+local existing = redis.call('GET', KEYS[1])
+if existing then
+    local existing_key = ARGV[4] .. ':job:' .. existing
+    local status = redis.call('HGET', existing_key, 'status')
+    if status == 'queued' or status == 'validating' or status == 'in_progress' then
+        return {'in_flight', existing}
+    end
+    local ttl_ms = redis.call('PTTL', ARGV[4] .. ':result:' .. existing)
+    if status == 'completed' and ttl_ms > 0 then
+        local alias_id = ARGV[5]
+        local alias_key = ARGV[4] .. ':job:' .. alias_id
+        local now = ARGV[2]
+        redis.call('HSET', alias_key,
+            'job_id', alias_id, 'status', 'completed', 'created_at', now,
+            'started_at', now, 'completed_at', now, 'input_data', '{}', 'error_message', '',
+            'result_size_bytes', redis.call('HGET', existing_key, 'result_size_bytes') or '',
+            'webhook_url', ARGV[6], 'dedup_key', redis.call('HGET', existing_key, 'dedup_key') or '',
+            'result_ref', existing)
+        redis.call('PEXPIRE', alias_key, ttl_ms)
+        redis.call('ZADD', KEYS[3], now, alias_id)
+        redis.call('HSET', KEYS[4], alias_id, 'completed')
+        redis.call('HINCRBY', KEYS[5], 'completed', 1)
+        redis.call('INCR', KEYS[7])
+        redis.call('ZADD', KEYS[8], tonumber(now) + ttl_ms / 1000, alias_id)
+        return {'cached_result', alias_id}
+    end
+    -- Failed, cancelled or expired: release the stale key
+    redis.call('DEL', KEYS[1])
+end
+redis.call('HSET', KEYS[2], unpack(ARGV, 7))
+redis.call('ZADD', KEYS[3], ARGV[2], ARGV[1])
+redis.call('HSET', KEYS[4], ARGV[1], 'queued')
+redis.call('HINCRBY', KEYS[5], 'queued', 1)
+redis.call('LPUSH', KEYS[6], ARGV[1])
+redis.call('INCR', KEYS[7])
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[3])
+return {'created', ARGV[1]}
+"""
+
+# KEYS: job, result, results_index
+# ARGV: job_id, result_json, result_ttl, now
+STORE_RESULT_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+local ttl = tonumber(ARGV[3])
+redis.call('SET', KEYS[2], ARGV[2], 'EX', ttl)
+redis.call('ZADD', KEYS[3], tonumber(ARGV[4]) + ttl, ARGV[1])
+redis.call('HSET', KEYS[1], 'result_size_bytes', string.len(ARGV[2]))
+redis.call('EXPIRE', KEYS[1], ttl)
+return 1
+"""
+
+# KEYS: job, jobs_status, status_counts, result, results_index, cancel
+# ARGV: job_id, status, error_message, timestamp_field, now, dedup_window,
+#       key_prefix, result_json, result_ttl, honour_cancel, return_job
+# Returns nil if the job does not exist, else the final status
+# (followed by the job hash fields when return_job is '1').
+TRANSITION_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return false
+end
+local job_id = ARGV[1]
+local status = ARGV[2]
+local timestamp_field = ARGV[4]
+
+if ARGV[10] == '1' and redis.call('EXISTS', KEYS[6]) == 1 then
+    -- Cancellation requested: discard any result and stop here
+    status = 'cancelled'
+    timestamp_field = ''
+    redis.call('DEL', KEYS[6])
+elseif ARGV[8] ~= '' then
+    local ttl = tonumber(ARGV[9])
+    redis.call('SET', KEYS[4], ARGV[8], 'EX', ttl)
+    redis.call('ZADD', KEYS[5], tonumber(ARGV[5]) + ttl, job_id)
+    redis.call('HSET', KEYS[1], 'result_size_bytes', string.len(ARGV[8]))
+    redis.call('EXPIRE', KEYS[1], ttl)
+end
+
+local previous = redis.call('HGET', KEYS[2], job_id)
+if not previous then
+    previous = redis.call('HGET', KEYS[1], 'status')
+end
+redis.call('HSET', KEYS[1], 'status', status)
+if timestamp_field ~= '' then
+    redis.call('HSET', KEYS[1], timestamp_field, ARGV[5])
+end
+if ARGV[3] ~= '' then
+    redis.call('HSET', KEYS[1], 'error_message', ARGV[3])
+end
+redis.call('HSET', KEYS[2], job_id, status)
+if previous ~= status then
+    if previous then
+        redis.call('HINCRBY', KEYS[3], previous, -1)
+    end
+    redis.call('HINCRBY', KEYS[3], status, 1)
+end
+
+-- Only the job that owns the dedup key may extend or release it
+if status ~= 'queued' and status ~= 'validating' and status ~= 'in_progress' then
+    local dedup_key = redis.call('HGET', KEYS[1], 'dedup_key')
+    local result_ref = redis.call('HGET', KEYS[1], 'result_ref')
+    if dedup_key and dedup_key ~= '' and (not result_ref or result_ref == '') then
+        local ref_key = ARGV[7] .. ':dedup:' .. string.match(dedup_key, '([^:]+)$')
+        if redis.call('GET', ref_key) == job_id then
+            if status == 'completed' and tonumber(ARGV[6]) > 0 then
+                redis.call('EXPIRE', ref_key, ARGV[6])
+            else
+                redis.call('DEL', ref_key)
+            end
+        end
+    end
+end
+
+if ARGV[11] == '1' then
+    local reply = redis.call('HGETALL', KEYS[1])
+    table.insert(reply, 1, status)
+    return reply
+end
+return status
+"""
+
+
+def compute_dedup_key(input_data: Dict[str, Any]) -> str:
+    """
+    Content hash identifying submissions that produce the same solve
+    
+    Uses the canonical compute_input_hash over the input with
+    DEDUP_EXCLUDED_FIELDS removed from the top level.
+    """
+    solve_input = {k: v for k, v in input_data.items() if k not in DEDUP_EXCLUDED_FIELDS}
+    return compute_input_hash(solve_input)
+
 
 class JobStatus(Enum):
     """Job execution states"""
@@ -40,6 +201,8 @@ class JobInfo:
     error_message: Optional[str] = None
     result_size_bytes: Optional[int] = None
     webhook_url: Optional[str] = None
+    dedup_key: Optional[str] = None
+    result_ref: Optional[str] = None  # job_id whose result this job reuses
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to JSON-serializable dict, filtering None values for Redis"""
@@ -57,7 +220,8 @@ class JobInfo:
         data = data.copy()
         data['status'] = JobStatus(data['status'])
         # Convert empty strings back to None
-        for key in ['started_at', 'completed_at', 'error_message', 'result_size_bytes']:
+        for key in ['started_at', 'completed_at', 'error_message', 'result_size_bytes',
+                    'webhook_url', 'dedup_key', 'result_ref']:
             if key in data and data[key] == '':
                 data[key] = None
             elif key in data and key in ['started_at', 'completed_at', 'result_size_bytes']:
@@ -73,7 +237,339 @@ class JobInfo:
         return cls(**data)
 
 
-class RedisJobManager:
+class RedisJobKeyspace:
+    """
+    Redis key layout and reply formatting shared by the sync
+    RedisJobManager (workers) and the asyncio AsyncRedisJobManager (API).
+    
+    Holds no connection: subclasses own the client and issue the commands,
+    this class only builds keys/script arguments and turns replies into
+    JobInfo objects and response dicts.
+    """
+    
+    def __init__(self, result_ttl_seconds: int = 3600, key_prefix: str = "ngrs",
+                 dedup_window_seconds: int = 3600):
+        self.result_ttl_seconds = result_ttl_seconds
+        self.key_prefix = key_prefix
+        self.dedup_window_seconds = dedup_window_seconds
+        
+        # Redis keys
+        self.queue_key = f"{key_prefix}:job:queue"
+        self.total_jobs_key = f"{key_prefix}:stats:total_jobs"
+        self.status_counts_key = f"{key_prefix}:stats:status_counts"
+        self.jobs_index_key = f"{key_prefix}:jobs:index"
+        self.jobs_status_key = f"{key_prefix}:jobs:status"
+        self.results_index_key = f"{key_prefix}:results:index"
+    
+    def _job_key(self, job_id: str) -> str:
+        """Generate Redis key for job metadata"""
+        return f"{self.key_prefix}:job:{job_id}"
+    
+    def _result_key(self, job_id: str) -> str:
+        """Generate Redis key for job result"""
+        return f"{self.key_prefix}:result:{job_id}"
+    
+    def _result_rows_key(self, job_id: str) -> str:
+        """Generate Redis key for the result's NDJSON rows (see src/result_index.py)"""
+        return f"{self.key_prefix}:result:{job_id}:rows"
+    
+    def _result_index_key(self, job_id: str) -> str:
+        """Generate Redis key for the result's meta, header and posting lists"""
+        return f"{self.key_prefix}:result:{job_id}:index"
+    
+    def _result_keys(self, job_id: str) -> list:
+        """Result plus its stream index keys"""
+        return [self._result_key(job_id), self._result_rows_key(job_id), self._result_index_key(job_id)]
+    
+    def _queue_store_index(self, pipe, job_id: str, index: ResultIndex, ttl_ms: int) -> None:
+        """Queue (re)writing a result's stream index with the given TTL"""
+        rows_key, index_key = self._result_rows_key(job_id), self._result_index_key(job_id)
+        pipe.delete(rows_key, index_key)
+        if index.rows:
+            pipe.hset(rows_key, mapping=index.rows)
+            pipe.pexpire(rows_key, ttl_ms)
+        pipe.hset(index_key, mapping=index.index_mapping())
+        pipe.pexpire(index_key, ttl_ms)
+    
+    def _cancel_key(self, job_id: str) -> str:
+        """Generate Redis key for job cancellation flag"""
+        return f"{self.key_prefix}:cancel:{job_id}"
+    
+    def _dedup_ref_key(self, dedup_key: str) -> str:
+        """Generate Redis key pointing from an input hash to its job"""
+        return f"{self.key_prefix}:dedup:{dedup_key.split(':')[-1]}"
+    
+    def _new_job(self, input_data: Dict[str, Any], webhook_url: Optional[str] = None,
+                 dedup_key: Optional[str] = None) -> JobInfo:
+        """Build metadata for a freshly queued job"""
+        return JobInfo(
+            job_id=str(uuid.uuid4()),
+            status=JobStatus.QUEUED,
+            created_at=time.time(),
+            input_data=input_data,
+            webhook_url=webhook_url,
+            dedup_key=dedup_key
+        )
+    
+    def _queue_create(self, pipe, job_info: JobInfo, enqueue: bool = True) -> None:
+        """Queue the commands that store and index a new job (inside MULTI)"""
+        job_id = job_info.job_id
+        status = job_info.status.value
+        
+        # Store job metadata
+        pipe.hset(self._job_key(job_id), mapping=job_info.to_dict())
+        
+        # Index job for stats and listings
+        pipe.zadd(self.jobs_index_key, {job_id: job_info.created_at})
+        pipe.hset(self.jobs_status_key, job_id, status)
+        pipe.hincrby(self.status_counts_key, status, 1)
+        
+        # Add to queue (LPUSH for FIFO with BRPOP)
+        if enqueue:
+            pipe.lpush(self.queue_key, job_id)
+        
+        # Increment total jobs counter
+        pipe.incr(self.total_jobs_key)
+    
+    def _submit_call(self, job_info: JobInfo, webhook_url: Optional[str]) -> Dict[str, list]:
+        """KEYS/ARGV for SUBMIT_SCRIPT"""
+        fields = []
+        for name, value in job_info.to_dict().items():
+            fields.extend((name, value))
+        
+        return {
+            'keys': [
+                self._dedup_ref_key(job_info.dedup_key), self._job_key(job_info.job_id),
+                self.jobs_index_key, self.jobs_status_key, self.status_counts_key,
+                self.queue_key, self.total_jobs_key, self.results_index_key
+            ],
+            'args': [
+                job_info.job_id, job_info.created_at, DEDUP_INFLIGHT_TTL_SECONDS,
+                self.key_prefix, str(uuid.uuid4()), webhook_url or '', *fields
+            ]
+        }
+    
+    def _submit_outcome(self, reply) -> Tuple[str, Optional[str]]:
+        """Interpret the SUBMIT_SCRIPT reply as (job_id, dedup_outcome)"""
+        outcome, job_id = reply
+        if outcome == 'created':
+            logger.info(f"Job created: {job_id}")
+            return job_id, None
+        if outcome == 'in_flight':
+            logger.info(f"Duplicate submission joined in-flight job {job_id}")
+        else:
+            logger.info(f"Job {job_id} reuses a cached result")
+        return job_id, outcome
+    
+    def _transition_call(self, job_id: str, status: JobStatus, error_message: Optional[str] = None,
+                         result_json: str = '', honour_cancel: bool = False,
+                         return_job: bool = False) -> Dict[str, list]:
+        """KEYS/ARGV for TRANSITION_SCRIPT"""
+        if status == JobStatus.IN_PROGRESS:
+            timestamp_field = 'started_at'
+        elif status in [JobStatus.COMPLETED, JobStatus.FAILED]:
+            timestamp_field = 'completed_at'
+        else:
+            timestamp_field = ''
+        
+        return {
+            'keys': [
+                self._job_key(job_id), self.jobs_status_key, self.status_counts_key,
+                self._result_key(job_id), self.results_index_key, self._cancel_key(job_id)
+            ],
+            'args': [
+                job_id, status.value, error_message or '', timestamp_field, time.time(),
+                self.dedup_window_seconds, self.key_prefix, result_json,
+                self.result_ttl_seconds, '1' if honour_cancel else '0',
+                '1' if return_job else '0'
+            ]
+        }
+    
+    def _parse_job(self, job_data: Dict[str, str]) -> JobInfo:
+        """Convert a Redis job hash to JobInfo"""
+        # Handle nested input_data JSON
+        if 'input_data' in job_data and isinstance(job_data['input_data'], str):
+            job_data['input_data'] = json.loads(job_data['input_data'])
+        
+        # Convert numeric strings back to numbers
+        for field in ['created_at', 'started_at', 'completed_at', 'result_size_bytes']:
+            if field in job_data and job_data[field]:
+                if field == 'result_size_bytes':
+                    job_data[field] = int(job_data[field]) if job_data[field] != 'None' else None
+                else:
+                    job_data[field] = float(job_data[field]) if job_data[field] != 'None' else None
+        
+        return JobInfo.from_dict(job_data)
+    
+    def _parse_claim(self, job_id: str, reply) -> Optional[JobInfo]:
+        """TRANSITION_SCRIPT reply with return_job → JobInfo"""
+        if reply is None:
+            return None
+        
+        status, flat = reply[0], reply[1:]
+        logger.info(f"Job {job_id}: {status}")
+        return self._parse_job(dict(zip(flat[::2], flat[1::2])))
+    
+    def _format_summary(self, status: Optional[str], created_at: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Status/created_at reply → job summary dict"""
+        if status is None:
+            return None
+        return {
+            'status': status,
+            'created_at': datetime.fromtimestamp(float(created_at)).isoformat() if created_at else None
+        }
+    
+    def _queue_stats(self, pipe) -> None:
+        """Queue the reads behind get_stats (one pipeline)"""
+        pipe.llen(self.queue_key)
+        pipe.get(self.total_jobs_key)
+        pipe.hgetall(self.status_counts_key)
+        pipe.zcard(self.jobs_index_key)
+        pipe.zcount(self.results_index_key, f"({time.time()}", '+inf')
+    
+    def _format_stats(self, replies: list, redis_connected: bool) -> Dict[str, Any]:
+        """Pipeline replies from _queue_stats → stats dict"""
+        queue_length, total_jobs, raw_counts, job_count, results_cached = replies
+        
+        status_counts = {
+            status: int(count) for status, count in raw_counts.items() if int(count) > 0
+        }
+        
+        return {
+            "total_jobs": int(total_jobs or 0),
+            "active_jobs": job_count,
+            "queue_length": queue_length,
+            "results_cached": results_cached,
+            "status_breakdown": status_counts,
+            "ttl_seconds": self.result_ttl_seconds,
+            "redis_connected": redis_connected
+        }
+    
+    def _queue_job_details(self, pipe, job_ids: list) -> None:
+        """Queue the per-job reads behind get_all_jobs_details"""
+        for job_id in job_ids:
+            pipe.hmget(self._job_key(job_id), 'status', 'created_at', 'completed_at')
+            pipe.exists(self._result_key(job_id))
+    
+    def _format_job_details(self, job_ids: list, replies: list) -> list:
+        """Pipeline replies from _queue_job_details → list of job detail dicts"""
+        jobs = []
+        for i, job_id in enumerate(job_ids):
+            status, created_at, completed_at = replies[2 * i]
+            if status is None:
+                # Metadata expired; cleanup_expired_jobs will drop the index entry
+                continue
+            
+            # Convert timestamps to ISO format
+            created_at_iso = None
+            if created_at:
+                try:
+                    created_at_iso = datetime.fromtimestamp(float(created_at)).isoformat()
+                except (ValueError, TypeError):
+                    created_at_iso = created_at
+            
+            completed_at_iso = None
+            if completed_at and completed_at != '':
+                try:
+                    completed_at_iso = datetime.fromtimestamp(float(completed_at)).isoformat()
+                except (ValueError, TypeError):
+                    completed_at_iso = None
+            
+            jobs.append({
+                'job_id': job_id,
+                'status': status or 'unknown',
+                'created_at': created_at_iso,
+                'completed_at': completed_at_iso,
+                'has_result': replies[2 * i + 1]
+            })
+        
+        return jobs
+    
+    def _cancel_method(self, previous_status: str) -> str:
+        """Cancellation strategy for a job in the given status"""
+        if previous_status == JobStatus.QUEUED.value:
+            return 'queue_removal'
+        if previous_status == JobStatus.IN_PROGRESS.value:
+            return 'cancellation_flag'
+        if previous_status in [JobStatus.COMPLETED.value, JobStatus.FAILED.value]:
+            return 'result_deletion'
+        if previous_status == JobStatus.CANCELLING.value:
+            return 'already_cancelling'
+        if previous_status == JobStatus.CANCELLED.value:
+            return 'already_cancelled'
+        return 'invalid'
+    
+    def _cancel_response(self, job_id: str, previous_status: str, method: str,
+                         result_deleted: bool = False) -> Dict[str, Any]:
+        """Response dict for the cancellation strategy that was applied"""
+        if method == 'queue_removal':
+            return {
+                "success": True,
+                "job_id": job_id,
+                "previous_status": previous_status,
+                "status": "cancelled",
+                "method": "queue_removal",
+                "immediate": True,
+                "message": "Job removed from queue immediately"
+            }
+        if method == 'flag_after_dequeue':
+            # Job not in queue (may have just been picked up by worker)
+            return {
+                "success": True,
+                "job_id": job_id,
+                "previous_status": previous_status,
+                "status": "cancelling",
+                "method": "cancellation_flag",
+                "immediate": False,
+                "message": "Job not in queue. Cancellation flag set for worker.",
+                "estimated_stop_time_seconds": 60
+            }
+        if method == 'cancellation_flag':
+            return {
+                "success": True,
+                "job_id": job_id,
+                "previous_status": previous_status,
+                "status": "cancelling",
+                "method": "cancellation_flag",
+                "immediate": False,
+                "message": "Cancellation requested. Solver will stop at next checkpoint.",
+                "estimated_stop_time_seconds": 60,
+                "note": "Worker checks flag before and after solver execution"
+            }
+        if method == 'result_deletion':
+            return {
+                "success": True,
+                "job_id": job_id,
+                "previous_status": previous_status,
+                "status": "cancelled",
+                "method": "result_deletion",
+                "immediate": True,
+                "message": "Job result deleted" if result_deleted else "Job marked as cancelled",
+                "result_deleted": result_deleted
+            }
+        if method == 'already_cancelling':
+            return {
+                "success": True,
+                "job_id": job_id,
+                "previous_status": previous_status,
+                "status": "cancelling",
+                "message": "Job cancellation already in progress"
+            }
+        if method == 'already_cancelled':
+            return {
+                "success": True,
+                "job_id": job_id,
+                "previous_status": previous_status,
+                "status": "cancelled",
+                "message": "Job already cancelled"
+            }
+        return {
+            "success": False,
+            "error": f"Cannot cancel job in state: {previous_status}"
+        }
+
+
+class RedisJobManager(RedisJobKeyspace):
     """
     Redis-based job manager for distributed async processing
     
@@ -85,37 +581,50 @@ class RedisJobManager:
     - Survives restarts: Jobs persist in Redis
     
     Redis Keys:
-    - ngrs:job:queue          : LIST - Job queue (LPUSH/BRPOP)
-    - ngrs:job:{uuid}         : HASH - Job metadata
-    - ngrs:result:{uuid}      : STRING - Job result (JSON)
-    - ngrs:stats:total_jobs   : STRING - Counter
+    - ngrs:job:queue            : LIST - Job queue (LPUSH/BRPOP)
+    - ngrs:job:{uuid}           : HASH - Job metadata
+    - ngrs:result:{uuid}        : STRING - Job result (JSON)
+    - ngrs:result:{uuid}:rows   : HASH - NDJSON stream rows (src/result_index.py)
+    - ngrs:result:{uuid}:index  : HASH - stream meta, header and posting lists
+    - ngrs:stats:total_jobs     : STRING - Counter
+    - ngrs:stats:status_counts  : HASH - status -> number of jobs in that status
+    - ngrs:jobs:index           : ZSET - job_id scored by created_at
+    - ngrs:jobs:status          : HASH - job_id -> last known status
+    - ngrs:results:index        : ZSET - job_id scored by result expiry time
+    - ngrs:dedup:{input hash}   : STRING - job_id of the latest solve for that input
+    
+    The counters and indexes are maintained inside the same MULTI/EXEC
+    transaction or Lua script as the job metadata they describe, so stats
+    and job listings never need to SCAN the keyspace. ``ngrs:jobs:status`` outlives the job
+    hash when it expires via TTL, which lets ``cleanup_expired_jobs``
+    decrement the right status counter.
     """
     
-    def __init__(self, result_ttl_seconds: int = 3600, key_prefix: str = "ngrs"):
+    def __init__(self, result_ttl_seconds: int = 3600, key_prefix: str = "ngrs",
+                 dedup_window_seconds: int = 3600):
         """
         Initialize Redis job manager
         
         Args:
             result_ttl_seconds: Time to keep results before expiration (default: 1 hour)
             key_prefix: Redis key prefix (default: "ngrs")
+            dedup_window_seconds: How long a completed result is reused for
+                identical submissions (default: 1 hour, 0 = in-flight dedup only)
         """
+        super().__init__(result_ttl_seconds, key_prefix, dedup_window_seconds)
         self.redis = get_redis_client()
-        self.result_ttl_seconds = result_ttl_seconds
-        self.key_prefix = key_prefix
         
-        # Redis keys
-        self.queue_key = f"{key_prefix}:job:queue"
+        # State transitions run as server-side scripts (one round trip each)
+        self._submit_script = self.redis.register_script(SUBMIT_SCRIPT)
+        self._transition_script = self.redis.register_script(TRANSITION_SCRIPT)
+        self._store_result_script = self.redis.register_script(STORE_RESULT_SCRIPT)
+        
+        # One-off backfill for job hashes written before the indexes existed
+        if not self.redis.exists(self.jobs_index_key):
+            self.rebuild_indexes()
         
         logger.info(f"RedisJobManager initialized (TTL: {result_ttl_seconds}s)")
     
-    def _job_key(self, job_id: str) -> str:
-        """Generate Redis key for job metadata"""
-        return f"{self.key_prefix}:job:{job_id}"
-    
-    def _result_key(self, job_id: str) -> str:
-        """Generate Redis key for job result"""
-        return f"{self.key_prefix}:result:{job_id}"
-    
     def create_job(self, input_data: Dict[str, Any], webhook_url: Optional[str] = None) -> str:
         """
         Create new job and add to queue
@@ -127,28 +636,46 @@ class RedisJobManager:
         Returns:
             job_id: UUID for tracking
         """
-        job_id = str(uuid.uuid4())
-        job_info = JobInfo(
-            job_id=job_id,
-            status=JobStatus.QUEUED,
-            created_at=time.time(),
-            input_data=input_data,
-            webhook_url=webhook_url
-        )
-        
-        # Store job metadata
-        job_key = self._job_key(job_id)
-        self.redis.hset(job_key, mapping=job_info.to_dict())
+        job_info = self._new_job(input_data, webhook_url=webhook_url)
+        job_id = job_info.job_id
         
-        # Add to queue (LPUSH for FIFO with BRPOP)
-        self.redis.lpush(self.queue_key, job_id)
-        
-        # Increment total jobs counter
-        self.redis.incr(f"{self.key_prefix}:stats:total_jobs")
+        pipe = self.redis.pipeline(transaction=True)
+        self._queue_create(pipe, job_info)
+        pipe.execute()
         
         logger.info(f"Job created: {job_id}")
         return job_id
     
+    def submit_job(self, input_data: Dict[str, Any], webhook_url: Optional[str] = None,
+                   dedup: bool = True) -> Tuple[str, Optional[str]]:
+        """
+        Create job unless an identical submission can be reused
+        
+        Identical inputs (see compute_dedup_key) are single-flighted:
+        - an identical queued/running job is returned as-is
+        - an identical job completed within the dedup window yields a new
+          job_id that is already COMPLETED and points at the cached result
+        
+        Lookup, stale-key release and creation run in one Lua script, so
+        concurrent identical submissions cannot both create a job.
+        
+        Args:
+            input_data: Solver input JSON
+            webhook_url: Optional URL to POST completion status
+            dedup: False to always create a fresh job
+            
+        Returns:
+            (job_id, dedup_outcome) where dedup_outcome is None for a new job,
+            'in_flight' or 'cached_result'
+        """
+        if not dedup:
+            return self.create_job(input_data, webhook_url=webhook_url), None
+        
+        job_info = self._new_job(input_data, webhook_url=webhook_url,
+                                 dedup_key=compute_dedup_key(input_data))
+        reply = self._submit_script(**self._submit_call(job_info, webhook_url))
+        return self._submit_outcome(reply)
+    
     def get_job(self, job_id: str) -> Optional[JobInfo]:
         """
         Retrieve job information
@@ -165,20 +692,20 @@ class RedisJobManager:
         if not job_data:
             return None
         
-        # Convert Redis hash to JobInfo
-        # Handle nested input_data JSON
-        if 'input_data' in job_data and isinstance(job_data['input_data'], str):
-            job_data['input_data'] = json.loads(job_data['input_data'])
-        
-        # Convert numeric strings back to numbers
-        for field in ['created_at', 'started_at', 'completed_at', 'result_size_bytes']:
-            if field in job_data and job_data[field]:
-                if field == 'result_size_bytes':
-                    job_data[field] = int(job_data[field]) if job_data[field] != 'None' else None
-                else:
-                    job_data[field] = float(job_data[field]) if job_data[field] != 'None' else None
+        return self._parse_job(job_data)
+    
+    def get_job_summary(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve status and creation time without loading input_data
         
-        return JobInfo.from_dict(job_data)
+        Args:
+            job_id: Job UUID
+            
+        Returns:
+            Dict with status and created_at (ISO format) or None if not found
+        """
+        status, created_at = self.redis.hmget(self._job_key(job_id), 'status', 'created_at')
+        return self._format_summary(status, created_at)
     
     def get_next_job(self, timeout: int = 0) -> Optional[str]:
         """
@@ -200,6 +727,24 @@ class RedisJobManager:
         
         return job_id
     
+    def _transition(self, job_id: str, status: JobStatus, error_message: Optional[str] = None,
+                    result_json: str = '', honour_cancel: bool = False,
+                    return_job: bool = False):
+        """
+        Apply one job state transition atomically (single round trip)
+        
+        Updates status, timestamps, error message, stats counters and the
+        dedup key, optionally storing a result in the same script.
+        
+        Returns:
+            None if the job does not exist, else the final status value
+            (with the job hash fields appended when return_job is set)
+        """
+        return self._transition_script(**self._transition_call(
+            job_id, status, error_message=error_message, result_json=result_json,
+            honour_cancel=honour_cancel, return_job=return_job
+        ))
+    
     def update_status(self, job_id: str, status: JobStatus, 
                      error_message: Optional[str] = None) -> bool:
         """
@@ -213,27 +758,60 @@ class RedisJobManager:
         Returns:
             True if updated, False if job not found
         """
-        job_key = self._job_key(job_id)
-        
-        if not self.redis.exists(job_key):
+        if self._transition(job_id, status, error_message=error_message) is None:
             return False
         
-        # Update status
-        self.redis.hset(job_key, 'status', status.value)
+        logger.info(f"Job {job_id}: {status.value}")
+        return True
+    
+    def claim_job(self, job_id: str) -> Optional[JobInfo]:
+        """
+        Start processing a dequeued job
         
-        # Update timestamps
-        current_time = time.time()
-        if status == JobStatus.IN_PROGRESS:
-            self.redis.hset(job_key, 'started_at', current_time)
-        elif status in [JobStatus.COMPLETED, JobStatus.FAILED]:
-            self.redis.hset(job_key, 'completed_at', current_time)
+        Checks the cancellation flag, marks the job IN_PROGRESS (or
+        CANCELLED if cancellation was requested while it was queued) and
+        returns its metadata, all in one round trip.
         
-        # Update error message
-        if error_message:
-            self.redis.hset(job_key, 'error_message', error_message)
+        Args:
+            job_id: Job UUID from get_next_job
+            
+        Returns:
+            JobInfo with status IN_PROGRESS or CANCELLED, None if not found
+        """
+        reply = self._transition(job_id, JobStatus.IN_PROGRESS, honour_cancel=True, return_job=True)
+        return self._parse_claim(job_id, reply)
+    
+    def complete_job(self, job_id: str, result: Dict[str, Any]) -> Optional[JobStatus]:
+        """
+        Store result and mark job COMPLETED in one round trip
         
-        logger.info(f"Job {job_id}: {status.value}")
-        return True
+        If cancellation was requested while solving, the result is discarded
+        and the job is marked CANCELLED instead.
+        
+        Args:
+            job_id: Job UUID
+            result: Solver output JSON
+            
+        Returns:
+            Final JobStatus (COMPLETED or CANCELLED), None if job not found
+        """
+        result_json = json.dumps(result)
+        
+        # The stream index goes in first so it exists as soon as the job reads COMPLETED
+        self._store_result_index(job_id, result)
+        status = self._transition(
+            job_id, JobStatus.COMPLETED, result_json=result_json, honour_cancel=True
+        )
+        if status != JobStatus.COMPLETED.value:
+            self.redis.delete(self._result_rows_key(job_id), self._result_index_key(job_id))
+        if status is None:
+            return None
+        
+        if status == JobStatus.COMPLETED.value:
+            logger.info(f"Result stored for {job_id}: {len(result_json.encode('utf-8'))} bytes "
+                        f"(TTL: {self.result_ttl_seconds}s)")
+        logger.info(f"Job {job_id}: {status}")
+        return JobStatus(status)
     
     def store_result(self, job_id: str, result: Dict[str, Any]) -> bool:
         """
@@ -246,26 +824,33 @@ class RedisJobManager:
         Returns:
             True if stored, False if job not found
         """
-        job_key = self._job_key(job_id)
-        
-        if not self.redis.exists(job_key):
-            return False
-        
-        # Store result as JSON with TTL
-        result_key = self._result_key(job_id)
+        # Store result as JSON with TTL, update size and metadata TTL atomically
         result_json = json.dumps(result)
-        self.redis.setex(result_key, self.result_ttl_seconds, result_json)
-        
-        # Update result size in job metadata
         result_size = len(result_json.encode('utf-8'))
-        self.redis.hset(job_key, 'result_size_bytes', result_size)
         
-        # Set TTL on job metadata as well (same as result TTL)
-        self.redis.expire(job_key, self.result_ttl_seconds)
+        stored = self._store_result_script(
+            keys=[self._job_key(job_id), self._result_key(job_id), self.results_index_key],
+            args=[job_id, result_json, self.result_ttl_seconds, time.time()]
+        )
+        if not stored:
+            return False
         
+        self._store_result_index(job_id, result)
         logger.info(f"Result stored for {job_id}: {result_size} bytes (TTL: {self.result_ttl_seconds}s)")
         return True
     
+    def _store_result_index(self, job_id: str, result: Dict[str, Any]) -> None:
+        """Write the per-result stream index (rows + posting lists) with the result TTL"""
+        try:
+            index = build_result_index(result)
+        except Exception as e:
+            # Streaming falls back to indexing on first request
+            logger.warning(f"Could not index result for {job_id}: {e}")
+            return
+        pipe = self.redis.pipeline(transaction=False)
+        self._queue_store_index(pipe, job_id, index, self.result_ttl_seconds * 1000)
+        pipe.execute()
+    
     def get_result(self, job_id: str) -> Optional[Dict[str, Any]]:
         """
         Retrieve job result
@@ -277,7 +862,14 @@ class RedisJobManager:
             Result JSON or None if not found/expired
         """
         result_key = self._result_key(job_id)
-        result_json = self.redis.get(result_key)
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.get(result_key)
+        pipe.hget(self._job_key(job_id), 'result_ref')
+        result_json, result_ref = pipe.execute()
+        
+        # Deduplicated jobs read the result of the job they were matched with
+        if not result_json and result_ref:
+            result_json = self.redis.get(self._result_key(result_ref))
         
         if not result_json:
             return None
@@ -297,172 +889,199 @@ class RedisJobManager:
         job_key = self._job_key(job_id)
         result_key = self._result_key(job_id)
         
-        # Delete from Redis
-        deleted_count = 0
-        deleted_count += self.redis.delete(job_key)
-        deleted_count += self.redis.delete(result_key)
-        
-        # Try to remove from queue (if still queued)
-        self.redis.lrem(self.queue_key, 0, job_id)
+        def _apply(pipe) -> int:
+            previous = pipe.hget(self.jobs_status_key, job_id)
+            
+            pipe.multi()
+            # Delete from Redis
+            pipe.delete(job_key)
+            pipe.delete(result_key)
+            pipe.delete(self._result_rows_key(job_id), self._result_index_key(job_id))
+            # Try to remove from queue (if still queued)
+            pipe.lrem(self.queue_key, 0, job_id)
+            self._queue_unindex(pipe, job_id, previous)
+        
+        results = self.redis.transaction(_apply, job_key, self.jobs_status_key)
+        deleted_count = results[0] + results[1]
         
         logger.info(f"Job {job_id} deleted ({deleted_count} keys)")
         return deleted_count > 0
     
-    def cleanup_expired_jobs(self) -> int:
+    def _queue_unindex(self, pipe, job_id: str, previous_status: Optional[str]) -> None:
+        """Queue removal of job_id from the stats counters and indexes (inside MULTI)"""
+        pipe.zrem(self.jobs_index_key, job_id)
+        pipe.zrem(self.results_index_key, job_id)
+        pipe.hdel(self.jobs_status_key, job_id)
+        if previous_status:
+            pipe.hincrby(self.status_counts_key, previous_status, -1)
+    
+    def rebuild_indexes(self) -> int:
+        """
+        Rebuild status counters and job indexes from the job hashes
+        
+        Needs one SCAN over the keyspace, so it only runs when the indexes
+        are missing (e.g. first start after upgrading) or on explicit request.
+        
+        Returns:
+            Number of jobs indexed
+        """
+        jobs = {}
+        cursor = 0
+        pattern = f"{self.key_prefix}:job:*"
+        
+        while True:
+            cursor, keys = self.redis.scan(cursor, match=pattern, count=500)
+            keys = [k for k in keys if k != self.queue_key]
+            
+            if keys:
+                pipe = self.redis.pipeline(transaction=False)
+                for key in keys:
+                    pipe.hmget(key, 'status', 'created_at')
+                for key, (status, created_at) in zip(keys, pipe.execute()):
+                    if status:
+                        jobs[key.split(':')[-1]] = (status, float(created_at or 0))
+            
+            if cursor == 0:
+                break
+        
+        status_counts = {}
+        for status, _ in jobs.values():
+            status_counts[status] = status_counts.get(status, 0) + 1
+        
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.delete(self.jobs_index_key, self.jobs_status_key, self.status_counts_key)
+        if jobs:
+            pipe.zadd(self.jobs_index_key, {job_id: created for job_id, (_, created) in jobs.items()})
+            pipe.hset(self.jobs_status_key, mapping={job_id: status for job_id, (status, _) in jobs.items()})
+            pipe.hset(self.status_counts_key, mapping=status_counts)
+        pipe.execute()
+        
+        if jobs:
+            logger.info(f"Rebuilt job indexes for {len(jobs)} jobs")
+        return len(jobs)
+    
+    def cleanup_expired_jobs(self, batch_size: int = 500) -> int:
         """
         Remove expired job metadata (jobs without results after TTL)
         Results auto-expire via Redis TTL
         
+        Only jobs created more than one TTL ago can have expired, so the
+        candidates come from a range query on the created_at index instead
+        of a keyspace SCAN.
+        
+        Args:
+            batch_size: Number of candidate jobs checked per pipeline round trip
+        
         Returns:
             Number of jobs cleaned up
         """
         current_time = time.time()
         expired_count = 0
         
-        # Scan for all job keys
-        cursor = 0
-        pattern = f"{self.key_prefix}:job:*"
+        # Drop expired entries from the result index
+        self.redis.zremrangebyscore(self.results_index_key, '-inf', current_time)
+        
+        cutoff = current_time - self.result_ttl_seconds
+        offset = 0
         
         while True:
-            cursor, keys = self.redis.scan(cursor, match=pattern, count=100)
+            candidates = self.redis.zrangebyscore(
+                self.jobs_index_key, '-inf', cutoff, start=offset, num=batch_size
+            )
+            if not candidates:
+                break
             
-            for key in keys:
-                if key == self.queue_key:  # Skip queue key
-                    continue
-                
-                job_data = self.redis.hgetall(key)
-                job_id = key.split(':')[-1]
+            pipe = self.redis.pipeline(transaction=False)
+            for job_id in candidates:
+                pipe.hmget(self._job_key(job_id), 'status', 'completed_at')
+                pipe.exists(self._result_key(job_id))
+            replies = pipe.execute()
+            
+            removed_in_batch = 0
+            for i, job_id in enumerate(candidates):
+                status, completed_at = replies[2 * i]
+                result_exists = replies[2 * i + 1]
                 
-                # Check if completed and result has expired
-                if job_data.get('status') in ['completed', 'failed']:
-                    completed_at = float(job_data.get('completed_at', 0))
-                    result_exists = self.redis.exists(self._result_key(job_id))
-                    
+                if status is None:
+                    # Job hash already expired via TTL - only the indexes remain
+                    expired = True
+                elif status in ['completed', 'failed'] and not result_exists:
                     # If completed more than TTL ago and no result, delete the job
-                    if completed_at and (current_time - completed_at) > self.result_ttl_seconds:
-                        if not result_exists:
-                            # Delete job metadata
-                            self.redis.delete(key)
-                            expired_count += 1
-                            logger.info(f"Cleaned up expired job: {job_id}")
+                    completed_at = float(completed_at or 0)
+                    expired = bool(completed_at) and (current_time - completed_at) > self.result_ttl_seconds
+                else:
+                    expired = False
+                
+                if expired and self._remove_expired_job(job_id):
+                    removed_in_batch += 1
+                    expired_count += 1
+                    logger.info(f"Cleaned up expired job: {job_id}")
             
-            if cursor == 0:
-                break
+            # Removed jobs shift the remaining candidates left in the index
+            offset += len(candidates) - removed_in_batch
         
         if expired_count > 0:
             logger.info(f"Cleaned up {expired_count} expired jobs")
         
         return expired_count
     
+    def _remove_expired_job(self, job_id: str) -> bool:
+        """Delete job metadata and its index entries in one transaction"""
+        job_key = self._job_key(job_id)
+        
+        def _apply(pipe) -> bool:
+            previous = pipe.hget(self.jobs_status_key, job_id)
+            if previous is None and not pipe.exists(job_key):
+                # Another worker already cleaned this job up
+                pipe.multi()
+                pipe.zrem(self.jobs_index_key, job_id)
+                return False
+            pipe.multi()
+            pipe.delete(job_key)
+            self._queue_unindex(pipe, job_id, previous)
+            return True
+        
+        return self.redis.transaction(_apply, job_key, self.jobs_status_key, value_from_callable=True)
+    
     def get_stats(self) -> Dict[str, Any]:
         """
         Get current queue and job statistics
         
+        Served from the maintained counters and indexes (O(1)/O(log n)).
+        
         Returns:
             Statistics dictionary
         """
-        # Queue length
-        queue_length = self.redis.llen(self.queue_key)
-        
-        # Total jobs created
-        total_jobs = int(self.redis.get(f"{self.key_prefix}:stats:total_jobs") or 0)
-        
-        # Count jobs by status (scan all job keys)
-        status_counts = {}
-        results_cached = 0
-        
-        cursor = 0
-        pattern = f"{self.key_prefix}:job:*"
-        job_count = 0
-        
-        while True:
-            cursor, keys = self.redis.scan(cursor, match=pattern, count=100)
-            
-            for key in keys:
-                if key == self.queue_key:
-                    continue
-                
-                job_count += 1
-                status = self.redis.hget(key, 'status')
-                if status:
-                    status_counts[status] = status_counts.get(status, 0) + 1
-                
-                # Check if result exists
-                job_id = key.split(':')[-1]
-                if self.redis.exists(self._result_key(job_id)):
-                    results_cached += 1
-            
-            if cursor == 0:
-                break
-        
-        return {
-            "total_jobs": total_jobs,
-            "active_jobs": job_count,
-            "queue_length": queue_length,
-            "results_cached": results_cached,
-            "status_breakdown": status_counts,
-            "ttl_seconds": self.result_ttl_seconds,
-            "redis_connected": self.redis.ping()
-        }
+        pipe = self.redis.pipeline(transaction=False)
+        self._queue_stats(pipe)
+        return self._format_stats(pipe.execute(), self.redis.ping())
     
     def get_queue_length(self) -> int:
         """Get current queue length"""
         return self.redis.llen(self.queue_key)
     
-    def get_all_jobs_details(self) -> list:
+    def get_all_jobs_details(self, offset: int = 0, limit: Optional[int] = None) -> list:
         """
-        Get detailed information about all jobs including UUIDs and timestamps
+        Get detailed information about jobs including UUIDs and timestamps
         
-        Returns:
-            List of job details with id, status, created_at (ISO format), updated_at
-        """
-        jobs = []
-        cursor = 0
-        pattern = f"{self.key_prefix}:job:*"
+        Jobs are read newest first from the created_at index, one page per
+        pipeline round trip.
         
-        while True:
-            cursor, keys = self.redis.scan(cursor, match=pattern, count=100)
-            
-            for key in keys:
-                if key == self.queue_key:
-                    continue
-                
-                job_id = key.split(':')[-1]
-                job_data = self.redis.hgetall(key)
-                
-                if job_data:
-                    # Convert timestamps to ISO format
-                    created_at = job_data.get('created_at')
-                    created_at_iso = None
-                    if created_at:
-                        try:
-                            created_at_iso = datetime.fromtimestamp(float(created_at)).isoformat()
-                        except (ValueError, TypeError):
-                            created_at_iso = created_at
-                    
-                    completed_at = job_data.get('completed_at')
-                    completed_at_iso = None
-                    if completed_at and completed_at != '':
-                        try:
-                            completed_at_iso = datetime.fromtimestamp(float(completed_at)).isoformat()
-                        except (ValueError, TypeError):
-                            completed_at_iso = None
-                    
-                    jobs.append({
-                        'job_id': job_id,
-                        'status': job_data.get('status', 'unknown'),
-                        'created_at': created_at_iso,
-                        'completed_at': completed_at_iso,
-                        'has_result': self.redis.exists(self._result_key(job_id))
-                    })
-            
-            if cursor == 0:
-                break
-        
-        # Sort by created_at (newest first)
-        jobs.sort(key=lambda x: x.get('created_at', ''), reverse=True)
+        Args:
+            offset: Number of newest jobs to skip
+            limit: Maximum number of jobs to return (None = all)
         
-        return jobs
+        Returns:
+            List of job details with id, status, created_at (ISO format), completed_at
+        """
+        stop = -1 if limit is None else offset + limit - 1
+        job_ids = self.redis.zrevrange(self.jobs_index_key, offset, stop)
+        if not job_ids:
+            return []
+        
+        pipe = self.redis.pipeline(transaction=False)
+        self._queue_job_details(pipe, job_ids)
+        return self._format_job_details(job_ids, pipe.execute())
     
     def send_webhook_notification(self, job_id: str, base_url: Optional[str] = None) -> bool:
         """
@@ -535,7 +1154,7 @@ class RedisJobManager:
         Returns:
             True if flag set successfully
         """
-        cancel_key = f"{self.key_prefix}:cancel:{job_id}"
+        cancel_key = self._cancel_key(job_id)
         self.redis.set(cancel_key, "1", ex=3600)  # TTL 1 hour
         logger.info(f"Cancellation flag set for job {job_id}")
         return True
@@ -550,7 +1169,7 @@ class RedisJobManager:
         Returns:
             True if cancellation requested
         """
-        cancel_key = f"{self.key_prefix}:cancel:{job_id}"
+        cancel_key = self._cancel_key(job_id)
         return bool(self.redis.get(cancel_key))
     
     def clear_cancellation_flag(self, job_id: str) -> bool:
@@ -563,7 +1182,7 @@ class RedisJobManager:
         Returns:
             True if flag cleared
         """
-        cancel_key = f"{self.key_prefix}:cancel:{job_id}"
+        cancel_key = self._cancel_key(job_id)
         deleted = self.redis.delete(cancel_key)
         return deleted > 0
     
@@ -577,105 +1196,323 @@ class RedisJobManager:
         Returns:
             Dict with cancellation status and details
         """
-        job_info = self.get_job(job_id)
+        previous_status = self.redis.hget(self._job_key(job_id), 'status')
         
-        if not job_info:
+        if previous_status is None:
             return {
                 "success": False,
                 "error": f"Job {job_id} not found"
             }
         
-        previous_status = job_info.status.value
+        method = self._cancel_method(previous_status)
+        result_deleted = False
         
-        if job_info.status == JobStatus.QUEUED:
+        if method == 'queue_removal':
             # Strategy 1: Remove from queue immediately
-            removed = self.redis.lrem(self.queue_key, 1, job_id)
-            
-            if removed > 0:
+            if self.redis.lrem(self.queue_key, 1, job_id) > 0:
                 self.update_status(job_id, JobStatus.CANCELLED)
                 logger.info(f"Job {job_id} removed from queue")
-                
-                return {
-                    "success": True,
-                    "job_id": job_id,
-                    "previous_status": previous_status,
-                    "status": "cancelled",
-                    "method": "queue_removal",
-                    "immediate": True,
-                    "message": "Job removed from queue immediately"
-                }
             else:
                 # Job not in queue (may have just been picked up by worker)
                 self.set_cancellation_flag(job_id)
                 self.update_status(job_id, JobStatus.CANCELLING)
-                
-                return {
-                    "success": True,
-                    "job_id": job_id,
-                    "previous_status": previous_status,
-                    "status": "cancelling",
-                    "method": "cancellation_flag",
-                    "immediate": False,
-                    "message": "Job not in queue. Cancellation flag set for worker.",
-                    "estimated_stop_time_seconds": 60
-                }
-        
-        elif job_info.status == JobStatus.IN_PROGRESS:
+                method = 'flag_after_dequeue'
+        
+        elif method == 'cancellation_flag':
             # Strategy 2: Set cancellation flag for worker to check
             self.set_cancellation_flag(job_id)
             self.update_status(job_id, JobStatus.CANCELLING)
-            
-            return {
-                "success": True,
-                "job_id": job_id,
-                "previous_status": previous_status,
-                "status": "cancelling",
-                "method": "cancellation_flag",
-                "immediate": False,
-                "message": "Cancellation requested. Solver will stop at next checkpoint.",
-                "estimated_stop_time_seconds": 60,
-                "note": "Worker checks flag before and after solver execution"
-            }
         
-        elif job_info.status in [JobStatus.COMPLETED, JobStatus.FAILED]:
+        elif method == 'result_deletion':
             # Strategy 3: Delete result
-            result_key = self._result_key(job_id)
-            result_deleted = self.redis.delete(result_key) > 0
+            result_deleted = self.redis.delete(*self._result_keys(job_id)) > 0
             self.update_status(job_id, JobStatus.CANCELLED)
+        
+        return self._cancel_response(job_id, previous_status, method, result_deleted)
+
+
+class AsyncRedisJobManager(RedisJobKeyspace):
+    """
+    asyncio counterpart of RedisJobManager for the FastAPI process
+    
+    Covers the API-side operations (submit, status polling, results, stats,
+    cancellation) with the same keys and Lua scripts as the sync manager,
+    over a redis.asyncio connection pool so no handler blocks the event
+    loop on a Redis round trip. Workers keep using RedisJobManager.
+    
+    Index backfill and expiry cleanup stay with the sync manager.
+    """
+    
+    def __init__(self, result_ttl_seconds: int = 3600, key_prefix: str = "ngrs",
+                 dedup_window_seconds: int = 3600):
+        """
+        Initialize async Redis job manager (no I/O until first call)
+        
+        Args:
+            result_ttl_seconds: Time to keep results before expiration (default: 1 hour)
+            key_prefix: Redis key prefix (default: "ngrs")
+            dedup_window_seconds: How long a completed result is reused for
+                identical submissions (default: 1 hour, 0 = in-flight dedup only)
+        """
+        super().__init__(result_ttl_seconds, key_prefix, dedup_window_seconds)
+        self.redis = get_async_redis_client()
+        
+        self._submit_script = self.redis.register_script(SUBMIT_SCRIPT)
+        self._transition_script = self.redis.register_script(TRANSITION_SCRIPT)
+    
+    async def create_job(self, input_data: Dict[str, Any], webhook_url: Optional[str] = None) -> str:
+        """Create new job and add to queue (see RedisJobManager.create_job)"""
+        job_info = self._new_job(input_data, webhook_url=webhook_url)
+        
+        pipe = self.redis.pipeline(transaction=True)
+        self._queue_create(pipe, job_info)
+        await pipe.execute()
+        
+        logger.info(f"Job created: {job_info.job_id}")
+        return job_info.job_id
+    
+    async def submit_job(self, input_data: Dict[str, Any], webhook_url: Optional[str] = None,
+                         dedup: bool = True) -> Tuple[str, Optional[str]]:
+        """
+        Create job unless an identical submission can be reused
+        
+        See RedisJobManager.submit_job.
+        
+        Returns:
+            (job_id, dedup_outcome) where dedup_outcome is None for a new job,
+            'in_flight' or 'cached_result'
+        """
+        if not dedup:
+            return await self.create_job(input_data, webhook_url=webhook_url), None
+        
+        job_info = self._new_job(input_data, webhook_url=webhook_url,
+                                 dedup_key=compute_dedup_key(input_data))
+        reply = await self._submit_script(**self._submit_call(job_info, webhook_url))
+        return self._submit_outcome(reply)
+    
+    async def get_job(self, job_id: str, include_input: bool = False) -> Optional[JobInfo]:
+        """
+        Retrieve job information
+        
+        Args:
+            job_id: Job UUID
+            include_input: Also load and parse input_data (skipped by default,
+                status polls never need it)
             
-            return {
-                "success": True,
-                "job_id": job_id,
-                "previous_status": previous_status,
-                "status": "cancelled",
-                "method": "result_deletion",
-                "immediate": True,
-                "message": "Job result deleted" if result_deleted else "Job marked as cancelled",
-                "result_deleted": result_deleted
-            }
+        Returns:
+            JobInfo or None if not found
+        """
+        job_key = self._job_key(job_id)
         
-        elif job_info.status == JobStatus.CANCELLING:
-            return {
-                "success": True,
-                "job_id": job_id,
-                "previous_status": previous_status,
-                "status": "cancelling",
-                "message": "Job cancellation already in progress"
-            }
+        if include_input:
+            job_data = await self.redis.hgetall(job_key)
+            return self._parse_job(job_data) if job_data else None
         
-        elif job_info.status == JobStatus.CANCELLED:
-            return {
-                "success": True,
-                "job_id": job_id,
-                "previous_status": previous_status,
-                "status": "cancelled",
-                "message": "Job already cancelled"
-            }
+        values = await self.redis.hmget(job_key, *JOB_META_FIELDS)
+        job_data = {name: value for name, value in zip(JOB_META_FIELDS, values) if value is not None}
+        if 'status' not in job_data:
+            return None
+        return self._parse_job(job_data)
+    
+    async def get_job_summary(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Retrieve status and creation time (see RedisJobManager.get_job_summary)"""
+        status, created_at = await self.redis.hmget(self._job_key(job_id), 'status', 'created_at')
+        return self._format_summary(status, created_at)
+    
+    async def update_status(self, job_id: str, status: JobStatus,
+                            error_message: Optional[str] = None) -> bool:
+        """
+        Update job status
         
-        else:
+        Returns:
+            True if updated, False if job not found
+        """
+        reply = await self._transition_script(**self._transition_call(
+            job_id, status, error_message=error_message
+        ))
+        if reply is None:
+            return False
+        
+        logger.info(f"Job {job_id}: {status.value}")
+        return True
+    
+    async def get_result_json(self, job_id: str) -> Optional[str]:
+        """
+        Retrieve job result as the stored JSON text
+        
+        Handlers can return it as-is instead of decoding and re-encoding
+        a potentially large document on the event loop.
+        
+        Returns:
+            Result JSON text or None if not found/expired
+        """
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.get(self._result_key(job_id))
+        pipe.hget(self._job_key(job_id), 'result_ref')
+        result_json, result_ref = await pipe.execute()
+        
+        # Deduplicated jobs read the result of the job they were matched with
+        if not result_json and result_ref:
+            result_json = await self.redis.get(self._result_key(result_ref))
+        
+        return result_json or None
+    
+    async def get_result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Retrieve job result (see RedisJobManager.get_result)"""
+        result_json = await self.get_result_json(job_id)
+        return json.loads(result_json) if result_json else None
+    
+    async def open_result_stream(self, job_id: str) -> Optional[Tuple[str, Dict[str, Any], str]]:
+        """
+        Locate the stream index of a completed job's result
+        
+        Deduplicated jobs resolve to the job whose result they reuse. Results
+        stored without an index (e.g. before indexing existed) are indexed
+        once here, off the event loop, and the index is saved with the
+        result's remaining TTL.
+        
+        Returns:
+            (source job_id, index meta, header line), or None if the result
+            is gone
+        """
+        result_ref = await self.redis.hget(self._job_key(job_id), 'result_ref')
+        source_id = result_ref or job_id
+        
+        meta_json, header = await self.redis.hmget(self._result_index_key(source_id), 'meta', 'header')
+        if meta_json:
+            return source_id, json.loads(meta_json), header
+        
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.get(self._result_key(source_id))
+        pipe.pttl(self._result_key(source_id))
+        result_json, ttl_ms = await pipe.execute()
+        if not result_json:
+            return None
+        
+        index = await asyncio.to_thread(lambda: build_result_index(json.loads(result_json)))
+        pipe = self.redis.pipeline(transaction=False)
+        self._queue_store_index(pipe, source_id, index,
+                                ttl_ms if ttl_ms and ttl_ms > 0 else self.result_ttl_seconds * 1000)
+        await pipe.execute()
+        logger.info(f"Stream index built on demand for {source_id}")
+        return source_id, index.meta, index.header
+    
+    async def iter_result_stream(self, source_id: str, meta: Dict[str, Any], header: str,
+                                 result_filter: ResultFilter,
+                                 include_header: bool = True) -> AsyncIterator[str]:
+        """
+        Yield the NDJSON stream for a result (header, matching rows, end marker)
+        
+        Only the posting lists named by the filter and the selected rows are
+        read from Redis, STREAM_CHUNK_ROWS rows per round trip.
+        """
+        if include_header:
+            yield header
+        
+        # One HMGET per filter dimension; a dimension with no candidate
+        # values (e.g. a date range outside the horizon) matches nothing
+        groups = result_filter.posting_groups(meta)
+        replies = iter(())
+        if any(groups):
+            pipe = self.redis.pipeline(transaction=False)
+            for group in filter(None, groups):
+                pipe.hmget(self._result_index_key(source_id), *group)
+            replies = iter(await pipe.execute())
+        posting_values: List[List[Optional[str]]] = [next(replies) if group else [] for group in groups]
+        
+        rows = select_rows(meta, result_filter, posting_values)
+        counts = {'assignment': 0, 'roster': 0}
+        rows_key = self._result_rows_key(source_id)
+        
+        for start in range(0, len(rows), STREAM_CHUNK_ROWS):
+            chunk = rows[start:start + STREAM_CHUNK_ROWS]
+            lines = await self.redis.hmget(rows_key, *[str(row) for row in chunk])
+            out = []
+            for row, line in zip(chunk, lines):
+                if line is None:
+                    # Result expired or was deleted mid-stream
+                    out.append(json.dumps({'type': 'error', 'message': 'Result no longer available'}) + '\n')
+                    yield ''.join(out)
+                    return
+                if row < meta['assignments']:
+                    counts['assignment'] += 1
+                else:
+                    if result_filter.trims_days:
+                        # Date and status may have matched on different days
+                        line = trim_roster_line(line, result_filter)
+                        if line is None:
+                            continue
+                    counts['roster'] += 1
+                out.append(line)
+            yield ''.join(out)
+        
+        yield end_line(counts)
+    
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get current queue and job statistics (see RedisJobManager.get_stats)"""
+        pipe = self.redis.pipeline(transaction=False)
+        self._queue_stats(pipe)
+        pipe.ping()
+        replies = await pipe.execute()
+        return self._format_stats(replies[:-1], bool(replies[-1]))
+    
+    async def get_queue_length(self) -> int:
+        """Get current queue length"""
+        return await self.redis.llen(self.queue_key)
+    
+    async def get_all_jobs_details(self, offset: int = 0, limit: Optional[int] = None) -> list:
+        """Paginated job list, newest first (see RedisJobManager.get_all_jobs_details)"""
+        stop = -1 if limit is None else offset + limit - 1
+        job_ids = await self.redis.zrevrange(self.jobs_index_key, offset, stop)
+        if not job_ids:
+            return []
+        
+        pipe = self.redis.pipeline(transaction=False)
+        self._queue_job_details(pipe, job_ids)
+        return self._format_job_details(job_ids, await pipe.execute())
+    
+    async def set_cancellation_flag(self, job_id: str) -> bool:
+        """Set cancellation flag for job"""
+        await self.redis.set(self._cancel_key(job_id), "1", ex=3600)  # TTL 1 hour
+        logger.info(f"Cancellation flag set for job {job_id}")
+        return True
+    
+    async def cancel_job(self, job_id: str) -> Dict[str, Any]:
+        """
+        Cancel job using appropriate strategy based on current state
+        
+        See RedisJobManager.cancel_job.
+        
+        Returns:
+            Dict with cancellation status and details
+        """
+        previous_status = await self.redis.hget(self._job_key(job_id), 'status')
+        
+        if previous_status is None:
             return {
                 "success": False,
-                "error": f"Cannot cancel job in state: {job_info.status.value}"
+                "error": f"Job {job_id} not found"
             }
-        jobs.sort(key=lambda x: x.get('created_at', ''), reverse=True)
-        return jobs
+        
+        method = self._cancel_method(previous_status)
+        result_deleted = False
+        
+        if method == 'queue_removal':
+            if await self.redis.lrem(self.queue_key, 1, job_id) > 0:
+                await self.update_status(job_id, JobStatus.CANCELLED)
+                logger.info(f"Job {job_id} removed from queue")
+            else:
+                # Job not in queue (may have just been picked up by worker)
+                await self.set_cancellation_flag(job_id)
+                await self.update_status(job_id, JobStatus.CANCELLING)
+                method = 'flag_after_dequeue'
+        
+        elif method == 'cancellation_flag':
+            await self.set_cancellation_flag(job_id)
+            await self.update_status(job_id, JobStatus.CANCELLING)
+        
+        elif method == 'result_deletion':
+            result_deleted = await self.redis.delete(*self._result_keys(job_id)) > 0
+            await self.update_status(job_id, JobStatus.CANCELLED)
+        
+        return self._cancel_response(job_id, previous_status, method, result_deleted)
@@ -1,15 +1,34 @@
 """
 Redis Connection Manager
 Provides singleton Redis client with connection pooling
+
+Two clients share the same settings:
+- get_redis_client(): blocking client for workers and scripts
+- get_async_redis_client(): redis.asyncio client for FastAPI handlers, so
+  Redis round trips never block the event loop
 """
 import os
 import redis
+import redis.asyncio
 from typing import Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _connection_kwargs() -> dict:
+    """Connection settings shared by the sync and asyncio pools"""
+    return {
+        'host': os.getenv('REDIS_HOST', 'localhost'),
+        'port': int(os.getenv('REDIS_PORT', '6379')),
+        'db': int(os.getenv('REDIS_DB', '0')),
+        'password': os.getenv('REDIS_PASSWORD', None),
+        'socket_timeout': float(os.getenv('REDIS_SOCKET_TIMEOUT', '5.0')),
+        'socket_connect_timeout': float(os.getenv('REDIS_CONNECT_TIMEOUT', '5.0')),
+        'decode_responses': True  # Auto-decode bytes to strings
+    }
+
+
 class RedisConnectionManager:
     """
     Singleton Redis connection manager
@@ -37,19 +56,11 @@ class RedisConnectionManager:
         
         # Connection pool settings
         max_connections = int(os.getenv('REDIS_MAX_CONNECTIONS', '10'))
-        socket_timeout = float(os.getenv('REDIS_SOCKET_TIMEOUT', '5.0'))
-        socket_connect_timeout = float(os.getenv('REDIS_CONNECT_TIMEOUT', '5.0'))
         
         try:
             pool = redis.ConnectionPool(
-                host=redis_host,
-                port=redis_port,
-                db=redis_db,
-                password=redis_password,
                 max_connections=max_connections,
-                socket_timeout=socket_timeout,
-                socket_connect_timeout=socket_connect_timeout,
-                decode_responses=True  # Auto-decode bytes to strings
+                **_connection_kwargs()
             )
             
             self._client = redis.Redis(connection_pool=pool)
@@ -109,3 +120,43 @@ def get_redis_client() -> redis.Redis:
     """
     manager = RedisConnectionManager()
     return manager.client
+
+
+# asyncio client for the API process (created lazily inside the event loop)
+_async_client: Optional[redis.asyncio.Redis] = None
+
+
+def get_async_redis_client() -> redis.asyncio.Redis:
+    """
+    Get asyncio Redis client instance
+    
+    Connections are opened lazily on first use, so the client can be created
+    at import time; the pool is sized independently of the sync pool because
+    each concurrent request holds a connection only for its own round trips.
+    
+    Returns:
+        redis.asyncio.Redis: Client backed by a shared connection pool
+    """
+    global _async_client
+    if _async_client is None:
+        max_connections = int(os.getenv('REDIS_ASYNC_MAX_CONNECTIONS', '50'))
+        pool = redis.asyncio.BlockingConnectionPool(
+            max_connections=max_connections,
+            timeout=float(os.getenv('REDIS_ASYNC_POOL_TIMEOUT', '5.0')),
+            **_connection_kwargs()
+        )
+        _async_client = redis.asyncio.Redis(connection_pool=pool)
+        logger.info(f"Async Redis pool created (max_connections={max_connections})")
+    return _async_client
+
+
+async def close_async_redis_client() -> None:
+    """
+    Disconnect the asyncio Redis pool (call on API shutdown)
+    
+    The client object stays valid and reconnects on next use, so managers
+    holding a reference to it keep working if the app is started again.
+    """
+    if _async_client is not None:
+        await _async_client.connection_pool.disconnect()
+        logger.info("Async Redis connection pool closed")
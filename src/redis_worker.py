@@ -6,7 +6,8 @@ import time
 import traceback
 import sys
 import pathlib
-from typing import List
+import threading
+from typing import List, Callable, Dict, Any, Optional
 from multiprocessing import Process, Event
 import signal
 from functools import wraps
@@ -18,6 +19,10 @@ sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
 
 from src.redis_job_manager import RedisJobManager, JobStatus
 from src.solver import solve_problem
+from context.engine.thread_budget import SearchThreadBudget, set_search_thread_budget
+
+# How often an idle worker prunes expired job metadata from the indexes
+CLEANUP_INTERVAL_SECONDS = int(os.getenv("JOB_CLEANUP_INTERVAL_SECONDS", "300"))
 
 
 class TimeoutError(Exception):
@@ -56,7 +61,8 @@ def with_timeout(timeout_seconds):
     return decorator
 
 
-def solver_worker(worker_id: int, stop_event: Event, ttl_seconds: int = 3600):
+def solver_worker(worker_id: int, stop_event: Event, ttl_seconds: int = 3600,
+                  thread_budget: Optional[SearchThreadBudget] = None):
     """
     Background worker that processes jobs from Redis queue
     
@@ -67,10 +73,14 @@ def solver_worker(worker_id: int, stop_event: Event, ttl_seconds: int = 3600):
         worker_id: Worker identifier (1, 2, ...)
         stop_event: Multiprocessing event to signal shutdown
         ttl_seconds: Result TTL for job manager
+        thread_budget: Host-wide CP-SAT thread budget shared with sibling workers
     """
     # Each process needs its own job manager instance
     job_manager = RedisJobManager(result_ttl_seconds=ttl_seconds)
     
+    # CP-SAT solves in this process draw search threads from the shared budget
+    set_search_thread_budget(thread_budget, owner=worker_id)
+    
     print(f"[WORKER-{worker_id}] Solver worker started (PID: {__import__('os').getpid()})")
     
     # Handle graceful shutdown
@@ -81,33 +91,32 @@ def solver_worker(worker_id: int, stop_event: Event, ttl_seconds: int = 3600):
     signal.signal(signal.SIGTERM, signal_handler)
     signal.signal(signal.SIGINT, signal_handler)
     
+    last_cleanup = 0.0
+    
     while not stop_event.is_set():
         try:
             # Get next job from Redis queue (blocking with 1 second timeout)
             job_id = job_manager.get_next_job(timeout=1)
             
             if not job_id:
-                # No jobs available, loop will retry
+                # No jobs available - use idle time to prune expired job metadata
+                if time.time() - last_cleanup >= CLEANUP_INTERVAL_SECONDS:
+                    last_cleanup = time.time()
+                    job_manager.cleanup_expired_jobs()
                 continue
             
             print(f"[WORKER-{worker_id}] Processing job {job_id}")
             
-            # Check if job was cancelled before we started
-            if job_manager.check_cancellation_flag(job_id):
-                print(f"[WORKER-{worker_id}] Job {job_id} was cancelled before processing")
-                job_manager.update_status(job_id, JobStatus.CANCELLED)
-                job_manager.clear_cancellation_flag(job_id)
-                continue
-            
-            # Update status to IN_PROGRESS
-            job_manager.update_status(job_id, JobStatus.IN_PROGRESS)
-            
-            # Get job details
-            job_info = job_manager.get_job(job_id)
+            # Cancellation check, IN_PROGRESS transition and job load in one round trip
+            job_info = job_manager.claim_job(job_id)
             if not job_info:
                 print(f"[WORKER-{worker_id}] Job {job_id} not found, skipping")
                 continue
             
+            if job_info.status == JobStatus.CANCELLED:
+                print(f"[WORKER-{worker_id}] Job {job_id} was cancelled before processing")
+                continue
+            
             input_data = job_info.input_data
             
             # Extract timeout from input (with safety buffer)
@@ -151,26 +160,12 @@ def solver_worker(worker_id: int, stop_event: Event, ttl_seconds: int = 3600):
                 
                 print(f"[WORKER-{worker_id}] Job {job_id} completed in {elapsed_time:.2f}s")
                 
-                # Check if job was cancelled during solving
-                if job_manager.check_cancellation_flag(job_id):
-                    print(f"[WORKER-{worker_id}] Job {job_id} was cancelled during solving - discarding result")
-                    job_manager.update_status(job_id, JobStatus.CANCELLED)
-                    job_manager.clear_cancellation_flag(job_id)
-                    
-                    # Send webhook notification for cancelled job
-                    try:
-                        base_url = __import__('os').getenv('API_BASE_URL')
-                        webhook_sent = job_manager.send_webhook_notification(job_id, base_url)
-                        if webhook_sent:
-                            print(f"[WORKER-{worker_id}] Webhook notification sent for cancelled job {job_id}")
-                    except Exception as webhook_error:
-                        print(f"[WORKER-{worker_id}] Webhook notification failed for job {job_id}: {webhook_error}")
-                    
-                    continue
+                # Store result and mark COMPLETED atomically, unless the job
+                # was cancelled during solving (result is then discarded)
+                final_status = job_manager.complete_job(job_id, result)
                 
-                # Store result in Redis
-                job_manager.store_result(job_id, result)
-                job_manager.update_status(job_id, JobStatus.COMPLETED)
+                if final_status == JobStatus.CANCELLED:
+                    print(f"[WORKER-{worker_id}] Job {job_id} was cancelled during solving - discarding result")
                 
                 # Send webhook notification if webhook_url provided
                 try:
@@ -299,3 +294,227 @@ def cleanup_worker_pool(processes: List[Process], stop_event: Event, timeout: in
                 process.join()
     
     print("[MANAGER] All workers terminated")
+
+
+class WorkerPoolController:
+    """
+    Autoscaling pool of solver worker processes
+    
+    Keeps between min_workers and max_workers processes alive. A monitor
+    thread in the API process checks queue length and host headroom
+    (psutil, same figures as /metrics) every check_interval seconds:
+    - Scale up by one worker while jobs are waiting, as long as free memory
+      and CPU leave room for another solve
+    - Scale down by one worker after the queue has been empty for
+      idle_seconds; the retired worker finishes its current job first
+    
+    All workers share one SearchThreadBudget so the CP-SAT search threads of
+    concurrently running jobs never exceed the host's core count. Threads held
+    by a worker that dies mid-solve are returned when it is reaped.
+    """
+    
+    def __init__(
+        self,
+        min_workers: int,
+        max_workers: int,
+        queue_length_fn: Callable[[], int],
+        ttl_seconds: int = 3600,
+        thread_capacity: Optional[int] = None,
+        min_free_memory_gb: float = 1.0,
+        max_cpu_percent: float = 85.0,
+        idle_seconds: int = 300,
+        check_interval: float = 10.0
+    ):
+        """
+        Args:
+            min_workers: Processes kept alive when idle
+            max_workers: Upper bound on processes
+            queue_length_fn: Returns the number of queued jobs
+            ttl_seconds: Result TTL for worker job managers
+            thread_capacity: CP-SAT thread budget (default: logical core count)
+            min_free_memory_gb: Free memory required before adding a worker
+            max_cpu_percent: CPU usage above which no worker is added
+            idle_seconds: Empty-queue time before retiring a worker
+            check_interval: Seconds between scaling decisions
+        """
+        import psutil
+        
+        self.min_workers = max(1, min_workers)
+        self.max_workers = max(self.min_workers, max_workers)
+        self.queue_length_fn = queue_length_fn
+        self.ttl_seconds = ttl_seconds
+        self.min_free_memory_gb = min_free_memory_gb
+        self.max_cpu_percent = max_cpu_percent
+        self.idle_seconds = idle_seconds
+        self.check_interval = check_interval
+        
+        capacity = thread_capacity or psutil.cpu_count(logical=True) or 2
+        self.thread_budget = SearchThreadBudget(capacity, live_workers=self.min_workers)
+        
+        self._workers: List[tuple] = []  # (worker_id, Process, stop Event)
+        self._retiring: List[tuple] = []  # Retired, finishing their current job
+        self._next_worker_id = 1
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+        self._idle_since: Optional[float] = None
+        self.last_decision: Dict[str, Any] = {}
+    
+    @property
+    def size(self) -> int:
+        """Number of live worker processes"""
+        with self._lock:
+            return len(self._workers)
+    
+    def start(self):
+        """Start min_workers processes and the monitor thread"""
+        with self._lock:
+            for _ in range(self.min_workers):
+                self._spawn_locked()
+        
+        self._stop.clear()
+        self._monitor = threading.Thread(target=self._monitor_loop, name="WorkerPoolMonitor", daemon=True)
+        self._monitor.start()
+        print(f"[MANAGER] Worker pool started ({self.min_workers}-{self.max_workers} workers, "
+              f"{self.thread_budget.capacity} CP-SAT threads)")
+    
+    def stop(self, timeout: int = 10):
+        """Stop the monitor thread and all workers"""
+        self._stop.set()
+        if self._monitor:
+            self._monitor.join(timeout=self.check_interval + 1)
+        
+        with self._lock:
+            workers = self._workers + self._retiring
+            self._workers, self._retiring = [], []
+        for _, process, stop_event in workers:
+            cleanup_worker_pool([process], stop_event, timeout=timeout)
+    
+    def restart(self):
+        """Stop all workers and start a fresh pool"""
+        self.stop()
+        self.start()
+    
+    def _spawn_locked(self):
+        """Start one worker process (caller holds self._lock)"""
+        worker_id = self._next_worker_id
+        self._next_worker_id += 1
+        stop_event = Event()
+        process = Process(
+            target=solver_worker,
+            args=(worker_id, stop_event, self.ttl_seconds, self.thread_budget),
+            name=f"SolverWorker-{worker_id}",
+            daemon=False  # Allow graceful shutdown
+        )
+        process.start()
+        self._workers.append((worker_id, process, stop_event))
+        self.thread_budget.set_live_workers(len(self._workers))
+        print(f"[MANAGER] Started worker {worker_id} (PID: {process.pid}, pool size: {len(self._workers)})")
+    
+    def _retire_locked(self):
+        """Signal the newest worker to exit after its current job (caller holds self._lock)"""
+        worker_id, process, stop_event = self._workers.pop()
+        stop_event.set()
+        self._retiring.append((worker_id, process, stop_event))
+        self.thread_budget.set_live_workers(len(self._workers))
+        print(f"[MANAGER] Retiring worker {worker_id} (PID: {process.pid}, pool size: {len(self._workers)})")
+    
+    def _reap_dead_locked(self):
+        """Drop workers that exited unexpectedly and return their search threads"""
+        alive = []
+        for worker_id, process, stop_event in self._workers:
+            if process.is_alive():
+                alive.append((worker_id, process, stop_event))
+            else:
+                recovered = self.thread_budget.release_owner(worker_id)
+                print(f"[MANAGER] Worker {worker_id} exited (code {process.exitcode}, "
+                      f"{recovered} CP-SAT threads recovered)")
+        self._workers = alive
+        self.thread_budget.set_live_workers(len(self._workers))
+        
+        # A retired worker can still be killed while finishing its last job
+        retiring = []
+        for worker_id, process, stop_event in self._retiring:
+            if process.is_alive():
+                retiring.append((worker_id, process, stop_event))
+            else:
+                self.thread_budget.release_owner(worker_id)
+        self._retiring = retiring
+    
+    def _headroom(self) -> Dict[str, Any]:
+        """Free memory and CPU usage of the host"""
+        import psutil
+        memory = psutil.virtual_memory()
+        return {
+            'memory_available_gb': round(memory.available / (1024 ** 3), 2),
+            'cpu_percent': psutil.cpu_percent(interval=None)
+        }
+    
+    def evaluate(self) -> Dict[str, Any]:
+        """
+        Make one scaling decision
+        
+        Returns:
+            Decision record with action ('scale_up', 'scale_down', 'hold'),
+            reason, pool size and the inputs used
+        """
+        queue_length = self.queue_length_fn()
+        headroom = self._headroom()
+        now = time.time()
+        
+        with self._lock:
+            self._reap_dead_locked()
+            action, reason = 'hold', 'steady'
+            
+            if len(self._workers) < self.min_workers:
+                action, reason = 'scale_up', 'below minimum'
+            elif queue_length > 0:
+                self._idle_since = None
+                if len(self._workers) >= self.max_workers:
+                    reason = 'at maximum'
+                elif headroom['memory_available_gb'] < self.min_free_memory_gb:
+                    reason = f"free memory {headroom['memory_available_gb']}GB < {self.min_free_memory_gb}GB"
+                elif headroom['cpu_percent'] > self.max_cpu_percent:
+                    reason = f"CPU {headroom['cpu_percent']}% > {self.max_cpu_percent}%"
+                else:
+                    action, reason = 'scale_up', f"{queue_length} jobs queued"
+            else:
+                if self._idle_since is None:
+                    self._idle_since = now
+                if len(self._workers) > self.min_workers and now - self._idle_since >= self.idle_seconds:
+                    action, reason = 'scale_down', f"queue empty for {int(now - self._idle_since)}s"
+                    self._idle_since = now
+            
+            if action == 'scale_up':
+                self._spawn_locked()
+            elif action == 'scale_down':
+                self._retire_locked()
+            
+            self.last_decision = {
+                'action': action,
+                'reason': reason,
+                'workers': len(self._workers),
+                'queue_length': queue_length,
+                'timestamp': now,
+                **headroom
+            }
+        
+        return self.last_decision
+    
+    def _monitor_loop(self):
+        """Periodically evaluate scaling until stopped"""
+        while not self._stop.wait(self.check_interval):
+            try:
+                self.evaluate()
+            except Exception as e:
+                print(f"[MANAGER] Pool scaling check failed: {type(e).__name__}: {e}")
+    
+    def status(self) -> Dict[str, Any]:
+        """Pool configuration, size and thread budget usage"""
+        return {
+            'workers': self.size,
+            'min_workers': self.min_workers,
+            'max_workers': self.max_workers,
+            'thread_budget': self.thread_budget.snapshot(),
+            'last_decision': self.last_decision
+        }
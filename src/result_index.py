@@ -0,0 +1,217 @@
+"""
+Per-Result Record Index for Streaming Job Results
+
+GET /solve/async/{job_id}/result/stream serves a completed result as NDJSON:
+
+    {"type": "header", "data": {...top-level fields except assignments/employeeRoster}}
+                                                   (optional, includeHeader)
+    {"type": "assignment", "data": {...}}          one per matching assignment
+    {"type": "roster", "data": {...}}              one per matching employeeRoster row
+    {"type": "end", "counts": {"assignment": n, "roster": m}}
+
+So that a filtered request never loads the whole result, the worker also
+stores an index next to the result (same TTL) when it completes a job:
+
+- rows:  HASH row number -> ready-to-send NDJSON line (assignments first,
+         then roster rows)
+- index: HASH with "meta" (row counts, distinct dates), "header" (header
+         line) and one posting list per filter value: "emp:<employeeId>",
+         "ou:<ouId>", "status:<status>", "date:<YYYY-MM-DD>" -> row numbers
+
+A request fetches only the posting lists for its filter values, intersects
+them across dimensions (values within one dimension are OR-ed) and then
+reads the selected rows in chunks. Assignments get their OU from the
+employee's roster row. Roster rows are posted per date and per status, so
+a row can match a date filter on one day and a status filter on another;
+when a date or status filter is given its dailyStatus is trimmed to the
+days matching both, and rows left without days are not sent (the
+per-employee totals still cover the whole horizon).
+
+Compact results (outputFormat "compact") are decoded before indexing, so
+the stream always carries standard records.
+"""
+
+import json
+from datetime import date
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from src.compact_output import decode_compact_output
+
+# Rows read from Redis per round trip while streaming
+STREAM_CHUNK_ROWS = 200
+
+_DUMPS = dict(separators=(',', ':'), ensure_ascii=False)
+
+
+@dataclass
+class ResultFilter:
+    """Stream filters; empty lists / None mean "no restriction" """
+    employee_ids: List[str] = field(default_factory=list)
+    statuses: List[str] = field(default_factory=list)
+    ou_ids: List[str] = field(default_factory=list)
+    date_from: Optional[str] = None
+    date_to: Optional[str] = None
+
+    def __post_init__(self):
+        for value in (self.date_from, self.date_to):
+            if value is not None:
+                date.fromisoformat(value)  # ValueError on malformed dates
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.employee_ids or self.statuses or self.ou_ids
+                    or self.date_from or self.date_to)
+
+    @property
+    def trims_days(self) -> bool:
+        return bool(self.statuses or self.date_from or self.date_to)
+
+    def in_date_range(self, day: Optional[str]) -> bool:
+        if day is None:
+            return not (self.date_from or self.date_to)
+        day = day[:10]
+        if self.date_from and day < self.date_from:
+            return False
+        if self.date_to and day > self.date_to:
+            return False
+        return True
+
+    def posting_groups(self, meta: Dict[str, Any]) -> List[List[str]]:
+        """Posting-list fields to fetch: OR within a group, AND across groups"""
+        groups = []
+        if self.employee_ids:
+            groups.append([f'emp:{v}' for v in self.employee_ids])
+        if self.ou_ids:
+            groups.append([f'ou:{v}' for v in self.ou_ids])
+        if self.statuses:
+            groups.append([f'status:{v}' for v in self.statuses])
+        if self.date_from or self.date_to:
+            groups.append([f'date:{d}' for d in meta.get('dates', []) if self.in_date_range(d)])
+        return groups
+
+
+@dataclass
+class ResultIndex:
+    """Everything stored alongside a result for streaming"""
+    meta: Dict[str, Any]
+    header: str
+    rows: Dict[str, str]
+    postings: Dict[str, str]
+
+    def index_mapping(self) -> Dict[str, str]:
+        """Fields of the index HASH"""
+        return {'meta': json.dumps(self.meta), 'header': self.header, **self.postings}
+
+
+def _line(record_type: str, record: Any) -> str:
+    return f'{{"type":"{record_type}","data":{json.dumps(record, **_DUMPS)}}}\n'
+
+
+def build_result_index(result: Dict[str, Any]) -> ResultIndex:
+    """
+    Split a solver result into NDJSON rows and per-value posting lists.
+
+    Args:
+        result: Solver output as stored for the job (standard or compact)
+
+    Returns:
+        ResultIndex ready to be written next to the result
+    """
+    result = decode_compact_output(result)
+    assignments = result.get('assignments') or []
+    roster = result.get('employeeRoster') or []
+
+    postings: Dict[str, List[int]] = {}
+
+    def post(key: str, row: int):
+        rows = postings.setdefault(key, [])
+        if not rows or rows[-1] != row:
+            rows.append(row)
+
+    employee_ou = {r.get('employeeId'): r.get('ouId') for r in roster}
+    rows: Dict[str, str] = {}
+    dates: Set[str] = set()
+
+    for row, assignment in enumerate(assignments):
+        rows[str(row)] = _line('assignment', assignment)
+        emp_id = assignment.get('employeeId')
+        if emp_id is not None:
+            post(f'emp:{emp_id}', row)
+            if employee_ou.get(emp_id) is not None:
+                post(f'ou:{employee_ou[emp_id]}', row)
+        if assignment.get('status') is not None:
+            post(f"status:{assignment['status']}", row)
+        if assignment.get('date'):
+            day = assignment['date'][:10]
+            dates.add(day)
+            post(f'date:{day}', row)
+
+    offset = len(assignments)
+    for i, entry in enumerate(roster):
+        row = offset + i
+        rows[str(row)] = _line('roster', entry)
+        if entry.get('employeeId') is not None:
+            post(f"emp:{entry['employeeId']}", row)
+        if entry.get('ouId') is not None:
+            post(f"ou:{entry['ouId']}", row)
+        for status in sorted({d.get('status') for d in entry.get('dailyStatus') or []} - {None}):
+            post(f'status:{status}', row)
+        for day in entry.get('dailyStatus') or []:
+            if day.get('date'):
+                dates.add(day['date'][:10])
+                post(f"date:{day['date'][:10]}", row)
+
+    header = {k: v for k, v in result.items() if k not in ('assignments', 'employeeRoster')}
+    meta = {'assignments': len(assignments), 'roster': len(roster), 'dates': sorted(dates)}
+    return ResultIndex(
+        meta=meta,
+        header=_line('header', header),
+        rows=rows,
+        postings={key: ','.join(map(str, ids)) for key, ids in postings.items()}
+    )
+
+
+def select_rows(meta: Dict[str, Any], result_filter: ResultFilter,
+                posting_values: Iterable[List[Optional[str]]]) -> List[int]:
+    """
+    Row numbers matching result_filter, in stream order.
+
+    Args:
+        meta: Index meta (row counts)
+        result_filter: Requested filters
+        posting_values: For each group from result_filter.posting_groups(meta),
+            the fetched posting lists (None where a value has no rows)
+    """
+    total = meta['assignments'] + meta['roster']
+    if result_filter.is_empty:
+        return list(range(total))
+
+    selected: Optional[Set[int]] = None
+    for group in posting_values:
+        matched = set()
+        for posting in group:
+            if posting:
+                matched.update(int(row) for row in posting.split(','))
+        selected = matched if selected is None else selected & matched
+        if not selected:
+            return []
+    return sorted(selected)
+
+
+def trim_roster_line(line: str, result_filter: ResultFilter) -> Optional[str]:
+    """Keep only the dailyStatus days matching the date/status filters (None if no day does)"""
+    record = json.loads(line)
+    entry = record['data']
+    entry['dailyStatus'] = [
+        day for day in entry.get('dailyStatus') or []
+        if result_filter.in_date_range(day.get('date'))
+        and (not result_filter.statuses or day.get('status') in result_filter.statuses)
+    ]
+    if not entry['dailyStatus']:
+        return None
+    return _line('roster', entry)
+
+
+def end_line(counts: Dict[str, int]) -> str:
+    return json.dumps({'type': 'end', 'counts': counts}, **_DUMPS) + '\n'
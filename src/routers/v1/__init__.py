@@ -9,6 +9,7 @@ Endpoints:
 - POST /solve/async - Asynchronous solve with Redis queue
 - GET /solve/async/{job_id} - Get job status
 - GET /solve/async/{job_id}/result - Get job result
+- GET /solve/async/{job_id}/result/stream - Stream filtered result as NDJSON
 - POST /configure - ICPMP configuration optimizer
 """
 
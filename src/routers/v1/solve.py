@@ -10,32 +10,33 @@ import json
 import uuid
 import time
 import logging
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
-from fastapi import APIRouter, Request, HTTPException, File, UploadFile
-from fastapi.responses import ORJSONResponse
+from fastapi import APIRouter, Request, HTTPException, File, UploadFile, BackgroundTasks, Query
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 
-from context.engine.data_loader import load_input
-from context.engine.solver_engine import solve
 from src.models import (
     SolveRequest, AsyncJobRequest, AsyncJobResponse, JobStatusResponse
 )
-from src.output_builder import build_output
-from src.redis_job_manager import RedisJobManager
+from src.redis_job_manager import RedisJobManager, AsyncRedisJobManager
 from src.feasibility_checker import quick_feasibility_check
-from src.offset_manager import ensure_staggered_offsets
 from src.input_validator import validate_input
+from src.result_index import ResultFilter
+from src.solve_pool import get_solve_pool, SolvePoolBusyError, solve_v1_task
 
 logger = logging.getLogger("ngrs.api.v1")
 
 router = APIRouter()
 
-# Initialize Redis job manager (shared with main app)
-job_manager = RedisJobManager(
+# Initialize Redis job managers (shared with main app) (async for handlers, sync for background tasks)
+JOB_MANAGER_SETTINGS = dict(
     result_ttl_seconds=int(os.getenv("RESULT_TTL_SECONDS", "3600")),
-    key_prefix=os.getenv("REDIS_KEY_PREFIX", "ngrs")
+    key_prefix=os.getenv("REDIS_KEY_PREFIX", "ngrs"),
+    dedup_window_seconds=int(os.getenv("DEDUP_WINDOW_SECONDS", "3600"))
 )
+job_manager = RedisJobManager(**JOB_MANAGER_SETTINGS)
+async_job_manager = AsyncRedisJobManager(**JOB_MANAGER_SETTINGS)
 
 
 async def load_json_from_upload(file: UploadFile) -> dict:
@@ -118,21 +119,17 @@ async def solve_sync(
         
         input_json, warnings = get_input_json(payload, uploaded_json, raw_body_json)
         
-        # Ensure staggered offsets for rotation patterns
-        input_json = ensure_staggered_offsets(input_json)
-        
-        # Load and solve
-        ctx = load_input(input_json)
-        result = solve(ctx)
-        
-        # Build output
-        output = build_output(ctx, result, input_json)
+        # Offsets → load → solve → build output in a solver process
+        output, status = await get_solve_pool().run(solve_v1_task, input_json)
         
         elapsed_ms = int((time.perf_counter() - start_time) * 1000)
-        logger.info(f"v1_solve requestId={request_id} status={result.get('status')} durMs={elapsed_ms}")
+        logger.info(f"v1_solve requestId={request_id} status={status} durMs={elapsed_ms}")
         
         return output
         
+    except SolvePoolBusyError as e:
+        logger.warning(f"v1_solve rejected requestId={request_id}: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
     except Exception as e:
         logger.error(f"v1_solve error requestId={request_id}: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -141,6 +138,7 @@ async def solve_sync(
 @router.post("/solve/async", response_model=AsyncJobResponse)
 async def solve_async(
     request: Request,
+    background_tasks: BackgroundTasks,
     payload: Optional[AsyncJobRequest] = None
 ):
     """
@@ -175,15 +173,18 @@ async def solve_async(
         priority = 0
         ttl_seconds = None
         webhook_url = None
+        dedup = True
         
         if payload:
             priority = payload.priority or 0
             ttl_seconds = payload.ttl_seconds
             webhook_url = payload.webhook_url
+            dedup = payload.dedup is not False
         elif raw_body_json:
             priority = raw_body_json.get("priority", 0)
             ttl_seconds = raw_body_json.get("ttl_seconds")
             webhook_url = raw_body_json.get("webhook_url")
+            dedup = raw_body_json.get("dedup", True) is not False
         
         # Validate input
         validation_result = validate_input(input_json)
@@ -200,15 +201,37 @@ async def solve_async(
         # Quick feasibility check
         feasibility_result = None
         try:
-            feasibility_result = quick_feasibility_check(input_json)
+            feasibility_result = quick_feasibility_check(input_json, validation_result.employee_pool)
         except Exception as check_error:
             logger.warning(f"Feasibility check failed: {check_error}")
         
         # Mark as v1 for worker to use correct slot builder
         input_json['_apiVersion'] = 'v1'
         
-        # Create job
-        job_id = job_manager.create_job(input_json, webhook_url=webhook_url)
+        # Create job (identical submissions are deduplicated)
+        job_id, dedup_outcome = await async_job_manager.submit_job(
+            input_json, webhook_url=webhook_url, dedup=dedup
+        )
+        
+        if dedup_outcome:
+            job_summary = await async_job_manager.get_job_summary(job_id) or {}
+            if dedup_outcome == 'in_flight':
+                job_message = "Identical job already in progress - returning existing job"
+            else:
+                job_message = "Identical job completed recently - result available immediately"
+                background_tasks.add_task(
+                    job_manager.send_webhook_notification, job_id, os.getenv('API_BASE_URL')
+                )
+            logger.info(f"v1_async_job_deduplicated requestId={request_id} jobId={job_id} outcome={dedup_outcome}")
+            
+            return AsyncJobResponse(
+                job_id=job_id,
+                status=job_summary.get('status', 'queued'),
+                created_at=job_summary.get('created_at') or datetime.now().isoformat(),
+                message=job_message,
+                feasibility_check=feasibility_result,
+                deduplicated=dedup_outcome
+            )
         
         logger.info(f"v1_async_job_created requestId={request_id} jobId={job_id}")
         
@@ -230,7 +253,7 @@ async def solve_async(
 @router.get("/solve/async/{job_id}", response_model=JobStatusResponse)
 async def get_job_status(job_id: str):
     """Get status of asynchronous solver job."""
-    job_info = job_manager.get_job(job_id)
+    job_info = await async_job_manager.get_job(job_id)
     
     if not job_info:
         raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
@@ -250,7 +273,7 @@ async def get_job_status(job_id: str):
 @router.get("/solve/async/{job_id}/result")
 async def get_job_result(job_id: str):
     """Download result of completed solver job."""
-    job_info = job_manager.get_job(job_id)
+    job_info = await async_job_manager.get_job(job_id)
     
     if not job_info:
         raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
@@ -264,9 +287,54 @@ async def get_job_result(job_id: str):
     if job_info.status.value != "completed":
         raise HTTPException(status_code=425, detail=f"Job not completed (status: {job_info.status.value})")
     
-    result = job_manager.get_result(job_id)
+    # Stored JSON is returned verbatim (no decode/re-encode on the event loop)
+    result_json = await async_job_manager.get_result_json(job_id)
     
-    if not result:
+    if not result_json:
         raise HTTPException(status_code=410, detail="Result no longer available")
     
-    return ORJSONResponse(content=result)
+    return Response(content=result_json, media_type="application/json")
+
+
+@router.get("/solve/async/{job_id}/result/stream")
+async def stream_job_result(
+    job_id: str,
+    employeeId: Optional[List[str]] = Query(None),
+    dateFrom: Optional[str] = Query(None),
+    dateTo: Optional[str] = Query(None),
+    status: Optional[List[str]] = Query(None),
+    ouId: Optional[List[str]] = Query(None),
+    includeHeader: bool = Query(True)
+):
+    """Stream result of completed solver job as filtered NDJSON. See GET /solve/async/{job_id}/result/stream."""
+    try:
+        result_filter = ResultFilter(
+            employee_ids=employeeId or [], statuses=status or [], ou_ids=ouId or [],
+            date_from=dateFrom, date_to=dateTo
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid date filter: {e}")
+    
+    job_info = await async_job_manager.get_job(job_id)
+    
+    if not job_info:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    
+    if job_info.status.value == "failed":
+        raise HTTPException(status_code=410, detail=f"Job failed: {job_info.error_message}")
+    
+    if job_info.status.value == "expired":
+        raise HTTPException(status_code=410, detail="Job result expired")
+    
+    if job_info.status.value != "completed":
+        raise HTTPException(status_code=425, detail=f"Job not completed (status: {job_info.status.value})")
+    
+    stream = await async_job_manager.open_result_stream(job_id)
+    
+    if not stream:
+        raise HTTPException(status_code=410, detail="Result no longer available")
+    
+    return StreamingResponse(
+        async_job_manager.iter_result_stream(*stream, result_filter, include_header=includeHeader),
+        media_type="application/x-ndjson"
+    )
@@ -17,6 +17,7 @@ Endpoints:
 - POST /solve/async - Asynchronous solve with dailyHeadcount support
 - GET /solve/async/{job_id} - Get job status
 - GET /solve/async/{job_id}/result - Get job result
+- GET /solve/async/{job_id}/result/stream - Stream filtered result as NDJSON
 """
 
 from fastapi import APIRouter
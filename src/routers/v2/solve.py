@@ -14,33 +14,33 @@ import json
 import uuid
 import time
 import logging
-from typing import Optional, List, Dict, Any
+from typing import List, Optional
 from datetime import datetime
 
-from fastapi import APIRouter, Request, HTTPException, File, UploadFile
-from fastapi.responses import ORJSONResponse
+from fastapi import APIRouter, Request, HTTPException, File, UploadFile, BackgroundTasks, Query
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 
-from context.engine.data_loader import load_input
-from context.engine.solver_engine import solve
-from context.engine.slot_builder_v2 import build_slots_v2
 from src.models import (
     SolveRequest, AsyncJobRequest, AsyncJobResponse, JobStatusResponse
 )
-from src.output_builder import build_output
-from src.redis_job_manager import RedisJobManager
+from src.redis_job_manager import RedisJobManager, AsyncRedisJobManager
 from src.feasibility_checker import quick_feasibility_check
-from src.offset_manager import ensure_staggered_offsets
 from src.input_validator import validate_input
+from src.result_index import ResultFilter
+from src.solve_pool import get_solve_pool, SolvePoolBusyError, solve_v2_task
 
 logger = logging.getLogger("ngrs.api.v2")
 
 router = APIRouter()
 
-# Initialize Redis job manager
-job_manager = RedisJobManager(
+# Initialize Redis job managers (async for handlers, sync for background tasks)
+JOB_MANAGER_SETTINGS = dict(
     result_ttl_seconds=int(os.getenv("RESULT_TTL_SECONDS", "3600")),
-    key_prefix=os.getenv("REDIS_KEY_PREFIX", "ngrs")
+    key_prefix=os.getenv("REDIS_KEY_PREFIX", "ngrs"),
+    dedup_window_seconds=int(os.getenv("DEDUP_WINDOW_SECONDS", "3600"))
 )
+job_manager = RedisJobManager(**JOB_MANAGER_SETTINGS)
+async_job_manager = AsyncRedisJobManager(**JOB_MANAGER_SETTINGS)
 
 
 async def load_json_from_upload(file: UploadFile) -> dict:
@@ -84,81 +84,6 @@ def get_input_json(request_obj: Optional[SolveRequest], uploaded_file_json: Opti
     return input_json, warnings
 
 
-def build_daily_coverage_summary(slots: List[Any], assignments: List[Dict]) -> List[Dict]:
-    """
-    Build dailyCoverage summary showing target vs actual headcount per day.
-    
-    Args:
-        slots: List of Slot objects with _dayType attribute
-        assignments: List of assignment dicts from output
-        
-    Returns:
-        List of daily coverage entries
-    """
-    # Build target headcount from slots
-    target_by_key = {}  # (date, shiftCode) -> {headcount, dayType}
-    for slot in slots:
-        key = (slot.date.isoformat(), slot.shiftCode)
-        if key not in target_by_key:
-            day_type = getattr(slot, '_dayType', 'Normal')
-            target_by_key[key] = {'headcount': 0, 'dayType': day_type}
-        target_by_key[key]['headcount'] += 1
-    
-    # Build assigned count from assignments
-    assigned_by_key = {}  # (date, shiftCode) -> count
-    for asgn in assignments:
-        if asgn.get('status') == 'ASSIGNED':
-            key = (asgn.get('date'), asgn.get('shiftCode'))
-            assigned_by_key[key] = assigned_by_key.get(key, 0) + 1
-    
-    # Build coverage summary
-    coverage = []
-    for key in sorted(target_by_key.keys()):
-        date_str, shift_code = key
-        target = target_by_key[key]['headcount']
-        day_type = target_by_key[key]['dayType']
-        assigned = assigned_by_key.get(key, 0)
-        
-        coverage.append({
-            'date': date_str,
-            'shiftCode': shift_code,
-            'dayType': day_type,
-            'targetHeadcount': target,
-            'assignedCount': assigned,
-            'coverageRate': round((assigned / target * 100), 1) if target > 0 else 0.0
-        })
-    
-    return coverage
-
-
-def enrich_assignments_with_daytype(assignments: List[Dict], slots: List[Any]) -> List[Dict]:
-    """
-    Add dayType to assignments based on slot metadata.
-    
-    Args:
-        assignments: List of assignment dicts
-        slots: List of Slot objects with _dayType attribute
-        
-    Returns:
-        Assignments with dayType field added
-    """
-    # Build slot lookup
-    slot_lookup = {}
-    for slot in slots:
-        slot_lookup[slot.slot_id] = slot
-    
-    for asgn in assignments:
-        slot_id = asgn.get('slotId')
-        if slot_id and slot_id in slot_lookup:
-            slot = slot_lookup[slot_id]
-            asgn['dayType'] = getattr(slot, '_dayType', 'Normal')
-        else:
-            # Infer from date if slot not found
-            asgn['dayType'] = 'Normal'
-    
-    return assignments
-
-
 @router.post("/solve", response_class=ORJSONResponse)
 async def solve_sync_v2(
     request: Request,
@@ -215,67 +140,18 @@ async def solve_sync_v2(
         
         input_json, warnings = get_input_json(payload, uploaded_json, raw_body_json)
         
-        # Ensure staggered offsets
-        input_json = ensure_staggered_offsets(input_json)
-        
-        # Mark as v2 API
-        input_json['_apiVersion'] = 'v2'
-        
-        # Load context
-        ctx = load_input(input_json)
-        
-        # Check if this is demandBased with dailyHeadcount
-        rostering_basis = ctx.get('_rosteringBasis', 'demandBased')
-        has_daily_headcount = False
-        
-        for dmd in input_json.get('demandItems', []):
-            for req in dmd.get('requirements', []):
-                if req.get('dailyHeadcount'):
-                    has_daily_headcount = True
-                    break
-        
-        # Use v2 slot builder if demandBased with dailyHeadcount
-        if rostering_basis == 'demandBased' and has_daily_headcount:
-            logger.info(f"[v2] Using v2 slot builder with dailyHeadcount support")
-            slots = build_slots_v2(ctx)
-            ctx['slots'] = slots
-            ctx['_usedV2SlotBuilder'] = True
-        else:
-            logger.info(f"[v2] Using standard slot builder (no dailyHeadcount)")
-            ctx['_usedV2SlotBuilder'] = False
-        
-        # Solve
-        result = solve(ctx)
-        
-        # Build output
-        output = build_output(ctx, result, input_json)
-        
-        # v2 enhancements: Add dayType and dailyCoverage
-        if ctx.get('_usedV2SlotBuilder') and ctx.get('slots'):
-            # Add dayType to assignments
-            if 'assignments' in output:
-                output['assignments'] = enrich_assignments_with_daytype(
-                    output['assignments'], 
-                    ctx['slots']
-                )
-            
-            # Add dailyCoverage summary
-            output['dailyCoverage'] = build_daily_coverage_summary(
-                ctx['slots'],
-                output.get('assignments', [])
-            )
-        
-        # Add v2 metadata
-        output['meta'] = output.get('meta', {})
-        output['meta']['apiVersion'] = 'v2'
-        output['meta']['usedDailyHeadcount'] = has_daily_headcount
+        # Offsets → load → v2 slots → solve → build output in a solver process
+        output, status, has_daily_headcount = await get_solve_pool().run(solve_v2_task, input_json)
         
         elapsed_ms = int((time.perf_counter() - start_time) * 1000)
-        logger.info(f"v2_solve requestId={request_id} status={result.get('status')} "
+        logger.info(f"v2_solve requestId={request_id} status={status} "
                    f"dailyHeadcount={has_daily_headcount} durMs={elapsed_ms}")
         
         return output
         
+    except SolvePoolBusyError as e:
+        logger.warning(f"v2_solve rejected requestId={request_id}: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
     except Exception as e:
         logger.error(f"v2_solve error requestId={request_id}: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -284,6 +160,7 @@ async def solve_sync_v2(
 @router.post("/solve/async", response_model=AsyncJobResponse)
 async def solve_async_v2(
     request: Request,
+    background_tasks: BackgroundTasks,
     payload: Optional[AsyncJobRequest] = None
 ):
     """
@@ -325,13 +202,16 @@ async def solve_async_v2(
         # Extract optional parameters
         priority = 0
         webhook_url = None
+        dedup = True
         
         if payload:
             priority = payload.priority or 0
             webhook_url = payload.webhook_url
+            dedup = payload.dedup is not False
         elif raw_body_json:
             priority = raw_body_json.get("priority", 0)
             webhook_url = raw_body_json.get("webhook_url")
+            dedup = raw_body_json.get("dedup", True) is not False
         
         # Validate input
         validation_result = validate_input(input_json)
@@ -356,7 +236,7 @@ async def solve_async_v2(
         # Quick feasibility check
         feasibility_result = None
         try:
-            feasibility_result = quick_feasibility_check(input_json)
+            feasibility_result = quick_feasibility_check(input_json, validation_result.employee_pool)
         except Exception as check_error:
             logger.warning(f"Feasibility check failed: {check_error}")
         
@@ -364,8 +244,30 @@ async def solve_async_v2(
         input_json['_apiVersion'] = 'v2'
         input_json['_hasDailyHeadcount'] = has_daily_headcount
         
-        # Create job
-        job_id = job_manager.create_job(input_json, webhook_url=webhook_url)
+        # Create job (identical submissions are deduplicated)
+        job_id, dedup_outcome = await async_job_manager.submit_job(
+            input_json, webhook_url=webhook_url, dedup=dedup
+        )
+        
+        if dedup_outcome:
+            job_summary = await async_job_manager.get_job_summary(job_id) or {}
+            if dedup_outcome == 'in_flight':
+                job_message = "Identical job already in progress - returning existing job"
+            else:
+                job_message = "Identical job completed recently - result available immediately"
+                background_tasks.add_task(
+                    job_manager.send_webhook_notification, job_id, os.getenv('API_BASE_URL')
+                )
+            logger.info(f"v2_async_job_deduplicated requestId={request_id} jobId={job_id} outcome={dedup_outcome}")
+            
+            return AsyncJobResponse(
+                job_id=job_id,
+                status=job_summary.get('status', 'queued'),
+                created_at=job_summary.get('created_at') or datetime.now().isoformat(),
+                message=job_message,
+                feasibility_check=feasibility_result,
+                deduplicated=dedup_outcome
+            )
         
         logger.info(f"v2_async_job_created requestId={request_id} jobId={job_id} "
                    f"dailyHeadcount={has_daily_headcount}")
@@ -388,7 +290,7 @@ async def solve_async_v2(
 @router.get("/solve/async/{job_id}", response_model=JobStatusResponse)
 async def get_job_status_v2(job_id: str):
     """Get status of asynchronous solver job (v2)."""
-    job_info = job_manager.get_job(job_id)
+    job_info = await async_job_manager.get_job(job_id)
     
     if not job_info:
         raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
@@ -408,7 +310,49 @@ async def get_job_status_v2(job_id: str):
 @router.get("/solve/async/{job_id}/result")
 async def get_job_result_v2(job_id: str):
     """Download result of completed solver job (v2)."""
-    job_info = job_manager.get_job(job_id)
+    job_info = await async_job_manager.get_job(job_id)
+    
+    if not job_info:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    
+    if job_info.status.value == "failed":
+        raise HTTPException(status_code=410, detail=f"Job failed: {job_info.error_message}")
+    
+    if job_info.status.value == "expired":
+        raise HTTPException(status_code=410, detail="Job result expired")
+    
+    if job_info.status.value != "completed":
+        raise HTTPException(status_code=425, detail=f"Job not completed (status: {job_info.status.value})")
+    
+    # Stored JSON is returned verbatim (no decode/re-encode on the event loop)
+    result_json = await async_job_manager.get_result_json(job_id)
+    
+    if not result_json:
+        raise HTTPException(status_code=410, detail="Result no longer available")
+    
+    return Response(content=result_json, media_type="application/json")
+
+
+@router.get("/solve/async/{job_id}/result/stream")
+async def stream_job_result_v2(
+    job_id: str,
+    employeeId: Optional[List[str]] = Query(None),
+    dateFrom: Optional[str] = Query(None),
+    dateTo: Optional[str] = Query(None),
+    status: Optional[List[str]] = Query(None),
+    ouId: Optional[List[str]] = Query(None),
+    includeHeader: bool = Query(True)
+):
+    """Stream result of completed solver job as filtered NDJSON (v2). See GET /solve/async/{job_id}/result/stream."""
+    try:
+        result_filter = ResultFilter(
+            employee_ids=employeeId or [], statuses=status or [], ou_ids=ouId or [],
+            date_from=dateFrom, date_to=dateTo
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid date filter: {e}")
+    
+    job_info = await async_job_manager.get_job(job_id)
     
     if not job_info:
         raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
@@ -422,9 +366,12 @@ async def get_job_result_v2(job_id: str):
     if job_info.status.value != "completed":
         raise HTTPException(status_code=425, detail=f"Job not completed (status: {job_info.status.value})")
     
-    result = job_manager.get_result(job_id)
+    stream = await async_job_manager.open_result_stream(job_id)
     
-    if not result:
+    if not stream:
         raise HTTPException(status_code=410, detail="Result no longer available")
     
-    return ORJSONResponse(content=result)
+    return StreamingResponse(
+        async_job_manager.iter_result_stream(*stream, result_filter, include_header=includeHeader),
+        media_type="application/x-ndjson"
+    )
@@ -0,0 +1,406 @@
+"""
+Process Pool for Synchronous Solve Endpoints
+
+The synchronous endpoints (/v1/solve, /v2/solve, /solve/incremental,
+/solve/fill-slots-mixed, /solve/empty-slots, /icpmp/v3/batch) used to run load_input → solve()
+→ build_output directly inside their async handlers, freezing the uvicorn
+worker (including /health and status polls) for the whole CP-SAT run.
+
+They now dispatch to a bounded pool of pre-imported solver subprocesses via
+run_in_executor. Admission control keeps at most
+SOLVE_POOL_WORKERS + SOLVE_POOL_QUEUE_DEPTH solves per API process; further
+requests are rejected with SolvePoolBusyError (HTTP 503 + Retry-After).
+
+The task functions below are module-level so they can be pickled to the
+pool; each returns plain JSON-serialisable data.
+"""
+
+import os
+import time
+import asyncio
+import logging
+import functools
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SolvePoolBusyError(Exception):
+    """Raised when every solve slot is taken; maps to HTTP 503"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+# ============================================================================
+# TASKS (run inside pool processes)
+# ============================================================================
+
+def _preload_solver_modules() -> None:
+    """Pool initializer: import the solver stack once per process"""
+    import context.engine.solver_engine  # noqa: F401
+    import context.engine.data_loader  # noqa: F401
+    import context.engine.slot_builder_v2  # noqa: F401
+    import src.output_builder  # noqa: F401
+    import src.offset_manager  # noqa: F401
+
+
+def build_daily_coverage_summary(slots: List[Any], assignments: List[Dict]) -> List[Dict]:
+    """
+    Build dailyCoverage summary showing target vs actual headcount per day.
+
+    Args:
+        slots: List of Slot objects with _dayType attribute
+        assignments: List of assignment dicts from output
+
+    Returns:
+        List of daily coverage entries
+    """
+    # Build target headcount from slots
+    target_by_key = {}  # (date, shiftCode) -> {headcount, dayType}
+    for slot in slots:
+        key = (slot.date.isoformat(), slot.shiftCode)
+        if key not in target_by_key:
+            day_type = getattr(slot, '_dayType', 'Normal')
+            target_by_key[key] = {'headcount': 0, 'dayType': day_type}
+        target_by_key[key]['headcount'] += 1
+
+    # Build assigned count from assignments
+    assigned_by_key = {}  # (date, shiftCode) -> count
+    for asgn in assignments:
+        if asgn.get('status') == 'ASSIGNED':
+            key = (asgn.get('date'), asgn.get('shiftCode'))
+            assigned_by_key[key] = assigned_by_key.get(key, 0) + 1
+
+    # Build coverage summary
+    coverage = []
+    for key in sorted(target_by_key.keys()):
+        date_str, shift_code = key
+        target = target_by_key[key]['headcount']
+        day_type = target_by_key[key]['dayType']
+        assigned = assigned_by_key.get(key, 0)
+
+        coverage.append({
+            'date': date_str,
+            'shiftCode': shift_code,
+            'dayType': day_type,
+            'targetHeadcount': target,
+            'assignedCount': assigned,
+            'coverageRate': round((assigned / target * 100), 1) if target > 0 else 0.0
+        })
+
+    return coverage
+
+
+def enrich_assignments_with_daytype(assignments: List[Dict], slots: List[Any]) -> List[Dict]:
+    """
+    Add dayType to assignments based on slot metadata.
+
+    Args:
+        assignments: List of assignment dicts
+        slots: List of Slot objects with _dayType attribute
+
+    Returns:
+        Assignments with dayType field added
+    """
+    # Build slot lookup
+    slot_lookup = {}
+    for slot in slots:
+        slot_lookup[slot.slot_id] = slot
+
+    for asgn in assignments:
+        slot_id = asgn.get('slotId')
+        if slot_id and slot_id in slot_lookup:
+            slot = slot_lookup[slot_id]
+            asgn['dayType'] = getattr(slot, '_dayType', 'Normal')
+        else:
+            # Infer from date if slot not found
+            asgn['dayType'] = 'Normal'
+
+    return assignments
+
+
+def solve_v1_task(input_json: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[str]]:
+    """
+    v1 solve: static headcount slot builder.
+
+    Returns:
+        (output, solver status)
+    """
+    from context.engine.data_loader import load_input
+    from context.engine.solver_engine import solve
+    from src.output_builder import build_output
+    from src.compact_output import apply_output_format
+    from src.offset_manager import ensure_staggered_offsets
+
+    # Ensure staggered offsets for rotation patterns
+    input_json = ensure_staggered_offsets(input_json)
+
+    # Load and solve
+    ctx = load_input(input_json)
+    status, solver_result, assignments, violations = solve(ctx)
+
+    # Build output
+    output = build_output(input_json, ctx, status, solver_result, assignments, violations)
+    return apply_output_format(output, input_json), status
+
+
+def solve_v2_task(input_json: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[str], bool]:
+    """
+    v2 solve: dailyHeadcount slot builder for demandBased inputs.
+
+    Returns:
+        (output, solver status, whether dailyHeadcount was present)
+    """
+    from context.engine.data_loader import load_input
+    from context.engine.solver_engine import solve
+    from context.engine.slot_cache import cached_build_slots
+    from src.output_builder import build_output
+    from src.compact_output import apply_output_format
+    from src.offset_manager import ensure_staggered_offsets
+
+    # Ensure staggered offsets
+    input_json = ensure_staggered_offsets(input_json)
+
+    # Mark as v2 API
+    input_json['_apiVersion'] = 'v2'
+
+    # Load context
+    ctx = load_input(input_json)
+
+    # Check if this is demandBased with dailyHeadcount
+    rostering_basis = ctx.get('_rosteringBasis', 'demandBased')
+    has_daily_headcount = False
+
+    for dmd in input_json.get('demandItems', []):
+        for req in dmd.get('requirements', []):
+            if req.get('dailyHeadcount'):
+                has_daily_headcount = True
+                break
+
+    # Use v2 slot builder if demandBased with dailyHeadcount
+    if rostering_basis == 'demandBased' and has_daily_headcount:
+        logger.info(f"[v2] Using v2 slot builder with dailyHeadcount support")
+        slots = cached_build_slots(ctx, 'v2')
+        ctx['slots'] = slots
+        ctx['_usedV2SlotBuilder'] = True
+    else:
+        logger.info(f"[v2] Using standard slot builder (no dailyHeadcount)")
+        ctx['_usedV2SlotBuilder'] = False
+
+    # Solve
+    status, solver_result, assignments, violations = solve(ctx)
+
+    # Build output
+    output = build_output(input_json, ctx, status, solver_result, assignments, violations)
+
+    # v2 enhancements: Add dayType and dailyCoverage
+    if ctx.get('_usedV2SlotBuilder') and ctx.get('slots'):
+        # Add dayType to assignments
+        if 'assignments' in output:
+            output['assignments'] = enrich_assignments_with_daytype(
+                output['assignments'],
+                ctx['slots']
+            )
+
+        # Add dailyCoverage summary
+        output['dailyCoverage'] = build_daily_coverage_summary(
+            ctx['slots'],
+            output.get('assignments', [])
+        )
+
+    # Add v2 metadata
+    output['meta'] = output.get('meta', {})
+    output['meta']['apiVersion'] = 'v2'
+    output['meta']['usedDailyHeadcount'] = has_daily_headcount
+
+    return apply_output_format(output, input_json), status, has_daily_headcount
+
+
+def solve_incremental_task(request_data: Dict[str, Any], run_id: str) -> Dict[str, Any]:
+    """Incremental (mid-month) solve; see src.incremental_solver"""
+    from context.engine.solver_engine import solve
+    from src.incremental_solver import solve_incremental
+
+    return solve_incremental(request_data=request_data, solver_engine=solve, run_id=run_id)
+
+
+def fill_slots_task(request_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Greedy slot filling; see src.fill_slots_solver"""
+    from src.fill_slots_solver import solve_fill_slots
+
+    return solve_fill_slots(request_data)
+
+
+def empty_slots_task(request_data: Dict[str, Any], run_id: str) -> Dict[str, Any]:
+    """Empty-slots solve; see src.empty_slots_solver"""
+    from context.engine.solver_engine import solve
+    from src.empty_slots_solver import solve_empty_slots
+
+    return solve_empty_slots(request_data=request_data, solver_engine=solve, run_id=run_id)
+
+
+def icpmp_whatif_task(base: Dict[str, Any], scenarios: Any, rank_by: str) -> Dict[str, Any]:
+    """ICPMP what-if batch; see src.icpmp_whatif"""
+    from src.icpmp_whatif import evaluate_scenarios
+
+    return evaluate_scenarios(base=base, scenarios=scenarios, rank_by=rank_by)
+
+
+# ============================================================================
+# POOL
+# ============================================================================
+
+class SolvePool:
+    """
+    Bounded process pool with admission control.
+
+    At most `max_workers` solves run at once; up to `queue_depth` more may
+    wait for a free process. Anything beyond that is rejected immediately so
+    the API stays responsive instead of piling up work it cannot serve.
+    """
+
+    def __init__(self, max_workers: int = 1, queue_depth: int = 0,
+                 retry_after_seconds: int = 30):
+        """
+        Args:
+            max_workers: Solver processes in the pool
+            queue_depth: Extra solves allowed to wait for a free process
+            retry_after_seconds: Retry-After hint before any solve has finished
+        """
+        self.max_workers = max(1, max_workers)
+        self.queue_depth = max(0, queue_depth)
+        self.retry_after_seconds = max(1, retry_after_seconds)
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._avg_duration: Optional[float] = None
+        self._completed = 0
+        self._rejected = 0
+        self._failed = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.queue_depth
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: never fork the API process (event loop, Redis sockets, threads)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_preload_solver_modules
+            )
+            logger.info(f"Solve pool started ({self.max_workers} processes, queue depth {self.queue_depth})")
+        return self._executor
+
+    def start(self) -> None:
+        """Create the pool and warm up its processes"""
+        with self._lock:
+            executor = self._get_executor()
+        # Submitting no-ops forces the processes (and initializer imports) to start now
+        for _ in range(self.max_workers):
+            executor.submit(time.sleep, 0)
+
+    def shutdown(self) -> None:
+        """Stop pool processes (running solves are abandoned)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+            logger.info("Solve pool stopped")
+
+    def retry_after(self) -> int:
+        """Seconds a rejected client should wait before retrying"""
+        if self._avg_duration is None:
+            return self.retry_after_seconds
+        return max(1, int(round(self._avg_duration)))
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self._rejected += 1
+                raise SolvePoolBusyError(
+                    f"All {self.max_workers} solver processes are busy "
+                    f"({self._in_flight} solves in flight). Retry later or use /solve/async.",
+                    retry_after=self.retry_after()
+                )
+            self._in_flight += 1
+
+    def _release(self, duration: Optional[float]) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if duration is None:
+                self._failed += 1
+                return
+            self._completed += 1
+            # Exponential moving average drives the Retry-After hint
+            if self._avg_duration is None:
+                self._avg_duration = duration
+            else:
+                self._avg_duration = 0.8 * self._avg_duration + 0.2 * duration
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """
+        Run fn(*args) in a pool process without blocking the event loop.
+
+        Raises:
+            SolvePoolBusyError: Pool and its wait queue are full
+            Exception: Whatever fn raised in the pool process
+        """
+        self._admit()
+        started = time.perf_counter()
+        duration = None
+        try:
+            with self._lock:
+                executor = self._get_executor()
+            loop = asyncio.get_running_loop()
+            try:
+                result = await loop.run_in_executor(executor, functools.partial(fn, *args))
+            except BrokenProcessPool:
+                # A pool process died (e.g. OOM kill); replace the pool for later requests
+                logger.error("Solve pool process died; restarting pool")
+                with self._lock:
+                    if self._executor is executor:
+                        self._executor = None
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+            duration = time.perf_counter() - started
+            return result
+        finally:
+            self._release(duration)
+
+    def status(self) -> Dict[str, Any]:
+        """Pool usage for /metrics"""
+        with self._lock:
+            return {
+                'max_workers': self.max_workers,
+                'queue_depth': self.queue_depth,
+                'in_flight': self._in_flight,
+                'completed': self._completed,
+                'failed': self._failed,
+                'rejected': self._rejected,
+                'avg_solve_seconds': round(self._avg_duration, 2) if self._avg_duration is not None else None,
+                'retry_after_seconds': self.retry_after()
+            }
+
+
+_pool: Optional[SolvePool] = None
+
+
+def get_solve_pool() -> SolvePool:
+    """Solve pool shared by all synchronous endpoints of this API process"""
+    global _pool
+    if _pool is None:
+        _pool = SolvePool(
+            max_workers=int(os.getenv("SOLVE_POOL_WORKERS", "1")),
+            queue_depth=int(os.getenv("SOLVE_POOL_QUEUE_DEPTH", "2")),
+            retry_after_seconds=int(os.getenv("SOLVE_POOL_RETRY_AFTER_SECONDS", "30"))
+        )
+    return _pool
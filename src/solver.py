@@ -30,6 +30,7 @@ from context.engine.data_loader import load_input
 from context.engine.solver_engine import solve
 from context.engine.template_roster import generate_template_validated_roster
 from src.output_builder import build_output
+from src.compact_output import apply_output_format
 from src.preprocessing.icpmp_integration import ICPMPPreprocessor
 from src.offset_manager import ensure_staggered_offsets
 
@@ -190,6 +191,7 @@ def solve_problem(input_data: Dict[str, Any], log_prefix: str = "[SOLVER]") -> D
                     'selected_employee_count': filtered_count,
                     'utilization_percentage': preprocessing_result['summary']['utilization_rate'] * 100,
                     'requirements': preprocessing_result['icpmp_metadata'],
+                    'sizing': preprocessing_result['summary'].get('sizing'),
                     'warnings': preprocessing_result.get('warnings', [])
                 }
                 
@@ -682,6 +684,7 @@ def solve_problem(input_data: Dict[str, Any], log_prefix: str = "[SOLVER]") -> D
     result = build_output(
         input_data, ctx, status_code, solver_result, assignments, violations
     )
+    result = apply_output_format(result, input_data)
     
     total_time = time.time() - overall_start
     print(f"{log_prefix} ✓ Total time: {total_time:.2f}s (ICPMP: {preprocessing_time:.2f}s, Solve: {solver_time:.2f}s)")
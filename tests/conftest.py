@@ -0,0 +1,34 @@
+"""
+Shared fixtures for the test suite.
+"""
+
+import pytest
+
+
+def _slot_inputs(headcount=2):
+    return {
+        'planningHorizon': {'startDate': '2026-03-02', 'endDate': '2026-03-08'},
+        'publicHolidays': [],
+        'employees': [],
+        'demandItems': [{
+            'demandId': 'D1', 'locationId': 'L1', 'ouId': 'OU1', 'shiftStartDate': '2026-03-02',
+            'shifts': [{
+                'coverageDays': ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'],
+                'shiftDetails': [
+                    {'shiftCode': 'D', 'start': '08:00', 'end': '20:00'},
+                    {'shiftCode': 'N', 'start': '20:00', 'end': '08:00', 'nextDay': True},
+                ],
+                'blacklist': {'employeeIds': []},
+            }],
+            'requirements': [{
+                'requirementId': 'R1', 'productTypeId': 'APO', 'rankIds': ['SER'],
+                'headcount': headcount, 'workPattern': ['D', 'D', 'N', 'N', 'O', 'O'],
+            }],
+        }],
+    }
+
+
+@pytest.fixture
+def make_inputs():
+    """Builds a fresh one-week, one-requirement (D and N shifts) solver input per call"""
+    return _slot_inputs
@@ -0,0 +1,150 @@
+"""
+Tests for the per-employee availability calendar used to prune work on
+unavailable days.
+
+Run with: pytest tests/test_availability.py -v
+"""
+
+import sys
+import pathlib
+
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from context.engine.availability import (
+    AvailabilityCalendar,
+    build_availability_calendar,
+    get_availability_calendar,
+)
+from context.engine.cpsat_template_generator import _replicate_template_to_employee
+
+
+def make_ctx(**extra):
+    ctx = {
+        'planningHorizon': {'startDate': '2026-03-01', 'endDate': '2026-03-31'},
+        'employees': [
+            {'employeeId': 'E1', 'unavailability': [
+                '2026-03-05',
+                {'date': '2026-03-10'},
+                {'startDate': '2026-03-20', 'endDate': '2026-03-22'},
+            ]},
+            {'employeeId': 'E2', 'unavailability': []},
+        ],
+    }
+    ctx.update(extra)
+    return ctx
+
+
+class TestAvailabilityCalendar:
+    """Bitset semantics of employee unavailability"""
+
+    def test_unavailability_formats(self):
+        """Strings, {date} entries and {startDate, endDate} ranges are all blocked"""
+        calendar = build_availability_calendar(make_ctx())
+
+        assert calendar.blocked_dates('E1') == {
+            '2026-03-05', '2026-03-10', '2026-03-20', '2026-03-21', '2026-03-22'
+        }
+        assert not calendar.is_available('E1', '2026-03-21')
+        assert calendar.is_available('E1', '2026-03-23')
+        assert calendar.is_available('E2', '2026-03-05')
+        assert calendar.is_available('UNKNOWN', '2026-03-05')
+        assert calendar.blocked_employee_count == 1
+
+    def test_blocking_before_base_date_rebases(self):
+        """Earlier days move the base back without losing existing blocks"""
+        calendar = AvailabilityCalendar('2026-03-01')
+        calendar.block('E1', '2026-03-02')
+        calendar.block('E2', '2026-02-25', '2026-02-26')
+
+        assert calendar.base_date.isoformat() == '2026-02-25'
+        assert calendar.blocked_dates('E1') == {'2026-03-02'}
+        assert not calendar.is_available('E2', '2026-02-26')
+        assert calendar.is_available('E2', '2026-02-24')
+
+    def test_incremental_leave_and_joiners(self):
+        """Long leave ranges and days before a new joiner starts are blocked"""
+        ctx = make_ctx(_incremental={'employeeChanges': {
+            'longLeave': [{'employeeId': 'E2', 'leaveFrom': '2026-03-15', 'leaveTo': '2026-03-16'}],
+            'newJoiners': [{'employee': {'employeeId': 'E3'}, 'availableFrom': '2026-03-03'}],
+        }})
+        calendar = build_availability_calendar(ctx)
+
+        assert calendar.blocked_dates('E2') == {'2026-03-15', '2026-03-16'}
+        assert calendar.blocked_dates('E3') == {'2026-03-01', '2026-03-02'}
+
+    def test_cached_on_context(self):
+        """Later callers reuse the calendar and can register extra employees"""
+        ctx = make_ctx()
+        calendar = get_availability_calendar(ctx)
+        extra = [{'employeeId': 'E9', 'unavailability': ['2026-03-02']}]
+
+        assert get_availability_calendar(ctx, extra) is calendar
+        assert not calendar.is_available('E9', '2026-03-02')
+
+
+class TestBlacklist:
+    """Shift blacklists are kept apart from general unavailability"""
+
+    def test_date_window(self):
+        calendar = AvailabilityCalendar('2026-03-01')
+        blacklist = {'employeeIds': [
+            {'employeeId': 'E1', 'blacklistStartDate': '2026-03-03', 'blacklistEndDate': '2026-03-04'},
+            {'employeeId': 'E2', 'blacklistStartDate': '2026-03-03'},
+        ]}
+
+        assert calendar.is_blacklisted('E1', '2026-03-04', blacklist)
+        assert not calendar.is_blacklisted('E1', '2026-03-05', blacklist)
+        assert not calendar.is_blacklisted('E2', '2026-03-03', blacklist)
+        assert not calendar.is_available('E1', '2026-03-03', blacklist=blacklist)
+        assert calendar.is_available('E1', '2026-03-03')
+
+    def test_legacy_entry_blocks_every_day(self):
+        calendar = AvailabilityCalendar('2026-03-01')
+        blacklist = {'employeeIds': ['E1']}
+
+        assert calendar.is_blacklisted('E1', '2027-01-01', blacklist)
+        assert len(calendar.blocked_dates('E1', blacklist, until='2026-03-31')) == 31
+        with pytest.raises(ValueError):
+            calendar.blocked_dates('E1', blacklist)
+
+    def test_entries_before_base_date_out_of_order(self):
+        calendar = AvailabilityCalendar('2026-01-10')
+        blacklist = {'employeeIds': [
+            {'employeeId': 'A', 'blacklistStartDate': '2026-01-12', 'blacklistEndDate': '2026-01-12'},
+            {'employeeId': 'B', 'blacklistStartDate': '2026-01-05', 'blacklistEndDate': '2026-01-06'},
+        ]}
+
+        assert calendar.blocked_dates('A', blacklist) == {'2026-01-12'}
+        assert calendar.blocked_dates('B', blacklist) == {'2026-01-05', '2026-01-06'}
+        assert not calendar.is_available('A', '2026-01-12', blacklist=blacklist)
+        assert calendar.is_available('A', '2026-01-07', blacklist=blacklist)
+
+    def test_masks_memoized_per_blacklist(self):
+        calendar = AvailabilityCalendar('2026-03-01')
+        blacklist = {'employeeIds': ['E1']}
+
+        assert calendar.blacklist_masks(blacklist) is calendar.blacklist_masks(blacklist)
+        assert calendar.blacklist_masks({'employeeIds': []}) == {}
+
+
+class TestTemplateReplication:
+    """CP-SAT template replication leaves unavailable days unassigned"""
+
+    def test_unavailable_day_becomes_unassigned(self):
+        calendar = build_availability_calendar(make_ctx())
+        template = [
+            {'date': day, 'shiftCode': 'D', 'status': 'ASSIGNED', 'employeeId': 'T'}
+            for day in ('2026-03-04', '2026-03-05')
+        ]
+
+        result = _replicate_template_to_employee(
+            {'employeeId': 'E1'}, template, {'id': 'DI1'}, {}, {}, calendar
+        )
+
+        assert [a['status'] for a in result] == ['ASSIGNED', 'UNASSIGNED']
+        assert result[0]['employeeId'] == 'E1'
+        assert result[1]['employeeId'] is None
+        assert result[1]['reason'] == 'Employee unavailable'
@@ -0,0 +1,102 @@
+"""
+Tests for the compact columnar output format and its standalone decoder.
+
+Run with: pytest tests/test_compact_output.py -v
+"""
+
+import sys
+import json
+import pathlib
+
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'scripts'))
+
+from src.compact_output import encode_compact_output, apply_output_format
+from src.input_validator import validate_input
+from decode_compact_output import decode_compact_output
+
+SAMPLES = sorted((ROOT / 'input').glob('*_Solver_Output.json'))
+
+
+def round_trip(output):
+    """Encode, serialize and decode like an API client would"""
+    return decode_compact_output(json.loads(json.dumps(encode_compact_output(output))))
+
+
+class TestRoundTrip:
+    """decode(encode(output)) must reproduce the standard document"""
+
+    @pytest.mark.parametrize('path', SAMPLES, ids=[p.name[:21] for p in SAMPLES])
+    def test_sample_outputs(self, path):
+        """Every shipped sample decodes back unchanged and is smaller"""
+        output = json.loads(path.read_text())
+        compact = encode_compact_output(output)
+
+        assert round_trip(output) == output
+        assert len(json.dumps(compact)) < len(json.dumps(output))
+
+    def test_ragged_records_and_nulls(self):
+        """Optional fields, nulls, mixed types and nested lists survive"""
+        output = {
+            'assignments': [
+                {'employeeId': 'E1', 'date': '2026-01-01', 'startDateTime': '2026-01-01T08:00:00',
+                 'hours': {'gross': 12.0, 'normal': 8.8}, 'tags': ['a']},
+                {'employeeId': None, 'date': '2026-01-03', 'startDateTime': None,
+                 'hours': {'gross': 0, 'normal': 0}, 'reason': 'UNASSIGNED'},
+                {'employeeId': 'E1', 'date': None, 'startDateTime': '2025-12-31T20:00:00',
+                 'hours': None, 'tags': []},
+            ],
+            'employeeRoster': [
+                {'employeeId': 'E1', 'dailyStatus': [
+                    {'date': '2026-01-01', 'status': 'ASSIGNED'},
+                    {'date': '2026-01-02', 'status': 'OFF_DAY'},
+                ]},
+            ],
+            'score': {'hard': 0, 'soft': 1.5},
+            'flag': True,
+        }
+
+        assert round_trip(output) == output
+
+    def test_dates_stored_as_offsets(self):
+        """Consecutive dailyStatus dates collapse to a start offset"""
+        output = {'employeeRoster': [
+            {'employeeId': 'E1', 'dailyStatus': [
+                {'date': f'2026-01-0{d}', 'status': 'OFF_DAY'} for d in range(1, 8)
+            ]},
+            {'employeeId': 'E2', 'dailyStatus': []},
+        ]}
+
+        compact = encode_compact_output(output)
+        columns = compact['employeeRoster']['$t']['columns']
+        daily = columns['dailyStatus']['values'][0]['$t']['columns']
+
+        assert compact['baseDate'] == '2026-01-01'
+        assert daily['date'] == {'kind': 'day', 'start': 0}
+        assert daily['status']['kind'] == 'str' and 'const' in daily['status']
+
+
+class TestOutputFormatOption:
+    """outputFormat input field"""
+
+    def test_standard_is_default(self):
+        output = {'assignments': []}
+        assert apply_output_format(output, {}) is output
+        assert apply_output_format(output, {'outputFormat': 'standard'}) is output
+
+    def test_compact_requested(self):
+        output = apply_output_format({'assignments': []}, {'outputFormat': 'compact'})
+        assert output['outputFormat'] == 'compact'
+        assert output['compactVersion'] == 1
+
+    def test_invalid_format_rejected(self):
+        data = {
+            'schemaVersion': '0.98', 'planningReference': 'X',
+            'planningHorizon': {'startDate': '2026-01-01', 'endDate': '2026-01-31'},
+            'demandItems': [], 'employees': [], 'outputFormat': 'columnar',
+        }
+        result = validate_input(data)
+        assert any(e.field == 'outputFormat' for e in result.errors)
@@ -0,0 +1,58 @@
+"""
+Tests for the vectorized coverage kernel shared by ICPMP and the rotation pre-processor.
+
+Run with: pytest tests/test_coverage_kernel.py -v
+"""
+
+import sys
+import pathlib
+from datetime import datetime
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from context.engine.config_optimizer_v3 import (
+    calculate_pattern_day, distribute_offsets_evenly, generate_coverage_calendar,
+    try_placement_with_n_employees
+)
+from context.engine.coverage_kernel import calendar_day_numbers, kernel_for_calendar
+from context.engine.coverage_simulator import simulate_coverage
+
+PATTERN = ['D', 'D', 'N', 'N', 'O', 'O', 'O']
+CALENDAR = generate_coverage_calendar('2026-01-01', '2026-02-28', ['Monday', 'Wednesday', 'Friday'])
+
+
+class TestCoverageKernel:
+    """Kernel rows agree with the per-date pattern-day formula"""
+
+    def test_rows_match_calculate_pattern_day(self):
+        for anchor in ('2026-01-01', '2025-12-29', '2026-01-03T08:00:00'):
+            kernel = kernel_for_calendar(PATTERN, CALENDAR, anchor)
+            anchor_dt = datetime.fromisoformat(anchor)
+            for offset in range(len(PATTERN)):
+                expected = [
+                    PATTERN[calculate_pattern_day(datetime.fromisoformat(d), offset, anchor_dt, len(PATTERN))]
+                    for d in CALENDAR
+                ]
+                assert kernel.employee_codes(offset) == expected
+
+    def test_day_numbers_floor_anchor_time(self):
+        assert calendar_day_numbers(['2026-01-05'], '2026-01-01').tolist() == [4]
+        assert calendar_day_numbers(['2026-01-05'], '2026-01-01T08:00:00').tolist() == [3]
+
+    def test_placement_totals(self):
+        offsets = distribute_offsets_evenly(17, len(PATTERN))
+        kernel = kernel_for_calendar(PATTERN, CALENDAR, '2026-01-01')
+        result = try_placement_with_n_employees(17, PATTERN, 5, CALENDAR, '2026-01-01', len(PATTERN))
+
+        assert result['total_work_days'] == kernel.total_work_days(offsets)
+        assert result['total_work_days'] == int(kernel.coverage(offsets).sum())
+        assert all(len(e['pattern']) == len(CALENDAR) for e in result['employees'])
+        assert result['employees'][3]['workDays'] + result['employees'][3]['restDays'] == len(CALENDAR)
+
+    def test_simulate_coverage_counts(self):
+        result = simulate_coverage(PATTERN, 3, [0, 2], {'D': 1, 'N': 1}, 7, datetime(2026, 1, 1))
+
+        # Employees at offsets 0, 2, 2 (third one staggered by index): cycle day is day - offset
+        assert result['shiftCoverageMap'][0] == {'D': 1}
+        assert result['shiftCoverageMap'][2] == {'N': 1, 'D': 2}
+        assert result['coverageMap'] == {0: 1, 1: 1, 2: 3, 3: 3, 4: 2, 5: 2, 6: 0}
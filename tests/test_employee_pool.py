@@ -0,0 +1,75 @@
+"""
+Tests for the attribute-indexed employee pool.
+
+Run with: pytest tests/test_employee_pool.py -v
+"""
+
+import sys
+import pathlib
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from src.employee_pool import EmployeePool
+from src.preprocessing.icpmp_integration import ICPMPPreprocessor
+
+EMPLOYEES = [
+    {'employeeId': 'E1', 'productTypeId': 'APO', 'rankId': 'SER', 'ouId': 'OU1', 'gender': 'M', 'scheme': 'Scheme A',
+     'qualifications': [{'code': 'FRISK', 'validFrom': '2025-01-01', 'expiryDate': '2026-01-15'}]},
+    {'employeeId': 'E2', 'productTypeId': 'APO', 'rankId': 'COR', 'ouId': 'OU2', 'gender': 'F', 'scheme': 'P',
+     'qualifications': ['FRISK']},
+    {'employeeId': 'E3', 'productTypeId': 'AVSO', 'rankId': 'SER', 'ouId': 'OU1', 'scheme': 'A'},
+]
+
+
+class TestEmployeePool:
+    """Index lookups match a scan of the employee list"""
+
+    def test_where_and_where_in(self):
+        pool = EmployeePool(EMPLOYEES)
+
+        assert pool.where_in('productTypeId', ['APO']) == {0, 1}
+        assert pool.where_in('schemeCode', ['A']) == {0, 2}
+        assert pool.where('gender', lambda g: g in ('M', 'Any'), default='Any') == {0, 2}
+        assert pool.where_in('productTypeId', ['APO']) & pool.where_in('rankId', ['SER']) == {0}
+
+    def test_narrow_matches_where(self):
+        pool = EmployeePool(EMPLOYEES)
+        for predicate in (lambda code: code == 'A', lambda code: code != 'A', lambda code: False):
+            candidates = pool.all()
+            assert pool.narrow(candidates, 'schemeCode', predicate) is candidates
+            assert candidates == pool.where('schemeCode', predicate)
+
+    def test_qualification_expiry_ranges(self):
+        pool = EmployeePool(EMPLOYEES)
+
+        assert pool.with_qualification(['FRISK']) == {0, 1}
+        assert pool.with_qualification(['FRISK'], '2026-01-01', '2026-01-31') == {0, 1}
+        assert pool.with_qualification(['FRISK'], '2026-02-01', '2026-02-28') == {1}
+
+    def test_view_shares_input_dicts_in_order(self):
+        pool = EmployeePool(EMPLOYEES)
+        view = pool.view({2, 0})
+
+        assert [e['employeeId'] for e in view] == ['E1', 'E3']
+        assert view[0] is EMPLOYEES[0]
+
+
+class TestICPMPFiltering:
+    """ICPMP eligibility uses the pool and leaves input employees untouched"""
+
+    def test_filter_eligible_employees(self):
+        data = {
+            'planningHorizon': {'startDate': '2026-01-01', 'endDate': '2026-01-31'},
+            'employees': [dict(e) for e in EMPLOYEES],
+            'demandItems': [],
+        }
+        preprocessor = ICPMPPreprocessor(data)
+        demand = {'ouId': 'OU1', 'shifts': [{'shiftDetails': [{'start': '08:00', 'end': '20:00'}],
+                                              'blacklist': {'employeeIds': ['E3']}}]}
+        requirement = {'requirementId': 'R1', 'productTypeIds': ['APO', 'AVSO'], 'rankIds': ['SER'],
+                       'gender': 'Any', 'schemes': ['A'], 'workPattern': ['D', 'O']}
+
+        eligible = preprocessor._filter_eligible_employees(requirement, demand)
+
+        assert [e['employeeId'] for e in eligible] == ['E1']
+        assert eligible[0] is data['employees'][0]
@@ -0,0 +1,100 @@
+"""
+Tests for the memoized shift-hour breakdowns shared by constraints, scoring
+and output assembly.
+
+Run with: pytest tests/test_hour_cache.py -v
+"""
+
+import sys
+import pathlib
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from context.engine import hour_cache
+from context.engine.hour_cache import mom_hours, shift_breakdown, shift_shape, split_hours
+from context.engine.time_utils import calculate_mom_compliant_hours, split_shift_hours
+
+HOUR_KEYS = ('gross', 'lunch', 'normal', 'ot', 'restDayPay', 'paid')
+
+
+def shift(start_minute, duration_minutes, day=datetime(2026, 3, 2)):
+    start = day + timedelta(minutes=start_minute)
+    return start, start + timedelta(minutes=duration_minutes)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    hour_cache.clear_caches()
+    yield
+    hour_cache.clear_caches()
+
+
+class TestShiftBreakdown:
+    """Cached breakdowns equal split_shift_hours and are shared per shape"""
+
+    @pytest.mark.parametrize('start_minute,duration', [(480, 720), (1200, 720), (1320, 480), (600, 270)])
+    def test_matches_uncached(self, start_minute, duration):
+        start, end = shift(start_minute, duration)
+        breakdown = shift_breakdown(start, end)
+
+        assert dict(breakdown.hours) == split_shift_hours(start, end)
+        assert breakdown.gross_minutes == duration
+        assert breakdown.net_minutes == duration - round(breakdown.lunch * 60)
+
+    def test_same_shape_on_other_days_hits_cache(self):
+        split_hours(*shift(480, 720))
+        split_hours(*shift(480, 720, day=datetime(2026, 7, 15)))
+
+        stats = hour_cache.cache_stats()['shape']
+        assert (stats['hits'], stats['misses']) == (1, 1)
+        assert shift_shape(*shift(480, 720)) == (480, 720)
+
+    def test_non_minute_shift_bypasses_cache(self):
+        start, end = shift(480, 720)
+        end += timedelta(seconds=30)
+
+        assert dict(split_hours(start, end)) == split_shift_hours(start, end)
+        assert hour_cache.cache_stats()['shape']['size'] == 0
+
+    def test_cached_hours_are_read_only(self):
+        with pytest.raises(TypeError):
+            split_hours(*shift(480, 720))['gross'] = 0
+
+
+class TestMomHours:
+    """Cached MOM split equals calculate_mom_compliant_hours"""
+
+    @pytest.mark.parametrize('scheme', ['A', 'B', 'P'])
+    @pytest.mark.parametrize('work_days', [4, 5, 6, 7])
+    def test_matches_uncached(self, scheme, work_days):
+        start, end = shift(480, 720)
+        reference = calculate_mom_compliant_hours(start, end, 'E1', start.date(), [], scheme, work_days)
+        cached = mom_hours(start, end, scheme, work_days)
+
+        assert {k: cached[k] for k in HOUR_KEYS} == reference
+        assert cached['publicHolidayHours'] == 0.0
+
+    def test_scheme_p_fifth_consecutive_day_is_ot(self):
+        start, end = shift(480, 360)
+        context = [{'employeeId': 'E1', 'date': f'2026-03-0{d}', 'shiftCode': 'D'} for d in range(2, 7)]
+        fifth = datetime(2026, 3, 6, 8)
+
+        reference = calculate_mom_compliant_hours(
+            fifth, fifth + timedelta(hours=6), 'E1', fifth.date(), context, 'P', 5
+        )
+        cached = mom_hours(fifth, fifth + timedelta(hours=6), 'P', 5, consecutive_position=5)
+
+        assert cached['normal'] == reference['normal'] == 0.0
+        assert mom_hours(start, end, 'P', 5, consecutive_position=2)['normal'] > 0
+
+    def test_public_holiday_hours(self):
+        hours = mom_hours(*shift(480, 720), 'A', 6, is_public_holiday=True)
+        assert hours['publicHolidayHours'] == hours['gross'] - hours['lunch']
+
+    def test_returns_independent_records(self):
+        first = mom_hours(*shift(480, 720), 'A', 6)
+        first['ot'] = 99
+        assert mom_hours(*shift(480, 720), 'A', 6)['ot'] != 99
@@ -0,0 +1,75 @@
+"""
+Tests for the exponential/binary employee-count search in ICPMP sizing.
+
+Run with: pytest tests/test_icpmp_search.py -v
+"""
+
+import sys
+import pathlib
+
+import pytest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from context.engine.config_optimizer_v3 import (
+    calculate_optimal_with_u_slots, find_min_feasible_count, generate_coverage_calendar
+)
+from src.preprocessing import icpmp_integration
+
+CALENDAR = generate_coverage_calendar('2026-01-01', '2026-01-31')
+
+
+class TestFindMinFeasibleCount:
+    """Bisect finds the linear answer and proves it minimal"""
+
+    @pytest.mark.parametrize('threshold', [3, 10, 11, 37, 60, 61, 99])
+    def test_matches_linear(self, threshold):
+        feasible = lambda n: n >= threshold
+        found, probed = find_min_feasible_count(feasible, 10, 60, 'bisect')
+
+        assert found == find_min_feasible_count(feasible, 10, 60, 'linear')[0]
+        if found is not None and found > 10:
+            assert found - 1 in probed
+        assert len(probed) <= 13
+
+    def test_unknown_search(self):
+        with pytest.raises(ValueError):
+            find_min_feasible_count(lambda n: True, 1, 2, 'ternary')
+
+
+class TestSearchMetrics:
+    """Both searches size identically; probes are reported"""
+
+    def test_ot_aware_requirement(self):
+        kwargs = dict(enable_ot_aware_icpmp=True, monthly_ot_cap=124.0)
+        linear = calculate_optimal_with_u_slots(['D', 'O'], 100, CALENDAR, '2026-01-01', search='linear', **kwargs)
+        bisect = calculate_optimal_with_u_slots(['D', 'O'], 100, CALENDAR, '2026-01-01', **kwargs)
+
+        for result in (linear, bisect):
+            assert result['configuration'].pop('attemptsRequired') == result['computation']['probes']
+        assert bisect['configuration'] == linear['configuration']
+        assert bisect['configuration']['optimality'] == 'PROVEN_MINIMAL'
+        assert bisect['computation']['search'] == 'bisect'
+        assert bisect['computation']['probes'] < linear['computation']['probes']
+        assert bisect['configuration']['employeesRequired'] - 1 in bisect['computation']['probedEmployeeCounts']
+
+    def test_forced_full_offset_coverage(self, monkeypatch):
+        sized = icpmp_integration.cached_optimal_with_u_slots
+
+        def drop_offset(**kwargs):
+            result = sized(**kwargs)
+            result['configuration']['offsetDistribution'].pop(max(result['configuration']['offsetDistribution']))
+            return result
+
+        monkeypatch.setenv('RATIO_CACHE_ENABLED', 'false')
+        monkeypatch.setattr(icpmp_integration, 'cached_optimal_with_u_slots', drop_offset)
+        preprocessor = icpmp_integration.ICPMPPreprocessor(
+            {'planningHorizon': {'startDate': '2026-01-01', 'endDate': '2026-01-31'}, 'employees': []}
+        )
+        result = preprocessor._run_icpmp_for_requirement(
+            {'shiftStartDate': '2026-01-01', 'shifts': [{}]},
+            {'requirementId': 'R1', 'workPattern': ['D', 'D', 'O'], 'headcount': 1}
+        )
+
+        assert result['configuration']['optimality'] == 'FORCED_FULL_OFFSET_COVERAGE'
+        assert result['configuration']['attemptsRequired'] == result['computation']['probes'] > 0
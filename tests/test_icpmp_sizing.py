@@ -0,0 +1,64 @@
+"""
+Tests for the two-stage ICPMP preprocessing (parallel sizing, sequential
+employee selection).
+
+Run with: pytest tests/test_icpmp_sizing.py -v
+"""
+
+import sys
+import copy
+import json
+import pathlib
+
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.preprocessing.icpmp_integration import ICPMPPreprocessor
+
+# demandBased fixture with three requirements sharing one employee pool
+FIXTURE = ROOT / 'input' / 'RST-20260113-AECA74BF_Solver_Input.json'
+
+
+def preprocess(monkeypatch, workers, min_ms=0):
+    monkeypatch.setenv('ICPMP_SIZING_WORKERS', str(workers))
+    monkeypatch.setenv('ICPMP_PARALLEL_MIN_MS', str(min_ms))
+    monkeypatch.setenv('RATIO_CACHE_ENABLED', 'false')
+    data = json.loads(FIXTURE.read_text())
+    return ICPMPPreprocessor(copy.deepcopy(data)).preprocess_all_requirements()
+
+
+def without_timings(metadata):
+    return {
+        req_id: {k: v for k, v in meta.items() if not k.endswith('_ms')}
+        for req_id, meta in metadata.items()
+    }
+
+
+@pytest.mark.skipif(not FIXTURE.exists(), reason='fixture not available')
+class TestICPMPSizing:
+    """Parallel sizing selects exactly what sequential sizing selects"""
+
+    def test_parallel_matches_sequential(self, monkeypatch):
+        sequential = preprocess(monkeypatch, 1)
+        parallel = preprocess(monkeypatch, 3)
+
+        assert sequential['summary']['sizing']['mode'] == 'sequential'
+        assert parallel['summary']['sizing']['mode'] == 'parallel'
+        assert parallel['summary']['sizing']['workers'] == 2  # First requirement sized in-process
+        assert parallel['filtered_employees'] == sequential['filtered_employees']
+        assert without_timings(parallel['icpmp_metadata']) == without_timings(sequential['icpmp_metadata'])
+        assert parallel['warnings'] == sequential['warnings']
+
+    def test_small_requirements_stay_in_process(self, monkeypatch):
+        result = preprocess(monkeypatch, 3, min_ms=60_000)
+
+        assert result['summary']['sizing']['mode'] == 'sequential'
+
+    def test_per_requirement_timings(self, monkeypatch):
+        result = preprocess(monkeypatch, 1)
+
+        assert len(result['icpmp_metadata']) == 3
+        for meta in result['icpmp_metadata'].values():
+            assert meta['sizing_ms'] >= 0 and meta['selection_ms'] >= 0
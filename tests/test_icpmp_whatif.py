@@ -0,0 +1,94 @@
+"""
+Tests for batched ICPMP what-if scenarios.
+
+Run with: pytest tests/test_icpmp_whatif.py -v
+"""
+
+import sys
+import pathlib
+
+import pytest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from src.icpmp_whatif import evaluate_scenarios
+
+BASE = {
+    'planningHorizon': {'startDate': '2026-01-01', 'endDate': '2026-01-31'},
+    'publicHolidays': ['2026-01-01'],
+    'workPattern': ['D', 'D', 'D', 'D', 'O', 'O'],
+    'headcount': 5,
+    'scheme': 'A',
+}
+
+SCENARIOS = [
+    {'scenarioId': 'base'},
+    {'scenarioId': 'hc3', 'headcount': 3},
+    {'scenarioId': 'base-again', 'scheme': 'A'},
+    {'scenarioId': 'weekdays', 'coverageDays': ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']},
+    {'scenarioId': 'five-on', 'workPattern': ['D', 'D', 'D', 'D', 'D', 'O', 'O']},
+    {'scenarioId': 'no-work', 'workPattern': ['O', 'O']},
+]
+
+
+def without_timings(report):
+    return [{k: v for k, v in row.items() if k != 'computeMs'} for row in report['scenarios']]
+
+
+@pytest.fixture(autouse=True)
+def no_ratio_cache(monkeypatch):
+    monkeypatch.setenv('RATIO_CACHE_ENABLED', 'false')
+
+
+class TestICPMPWhatIf:
+    """Scenarios share calendars and evaluations and come back ranked"""
+
+    def test_ranked_comparison(self):
+        report = evaluate_scenarios(BASE, SCENARIOS)
+        rows = {row['scenarioId']: row for row in report['scenarios']}
+
+        employees = [row['employeesRequired'] for row in report['scenarios'] if row['status'] == 'OK']
+        assert employees == sorted(employees)
+        assert [row['rank'] for row in report['scenarios']] == [1, 2, 3, 4, 5, None]
+        assert rows['no-work']['status'] == 'FAILED'
+        assert rows['base-again']['sharedEvaluation'] is True
+        assert rows['base-again']['employeesRequired'] == rows['base']['employeesRequired']
+        assert rows['hc3']['employeesRequired'] < rows['base']['employeesRequired']
+        assert rows['five-on']['otHours'] > rows['base']['otHours'] == 0.0
+
+        summary = report['summary']
+        assert summary['successfulScenarios'] == 5
+        assert summary['failedScenarios'] == 1
+        assert summary['distinctEvaluations'] == 4
+        assert summary['distinctCalendars'] == 2
+
+    def test_parallel_matches_sequential(self, monkeypatch):
+        monkeypatch.setenv('ICPMP_WHATIF_WORKERS', '1')
+        sequential = evaluate_scenarios(BASE, SCENARIOS, rank_by='coverageRate')
+
+        monkeypatch.setenv('ICPMP_WHATIF_WORKERS', '2')
+        monkeypatch.setenv('ICPMP_PARALLEL_MIN_MS', '0')
+        parallel = evaluate_scenarios(BASE, SCENARIOS, rank_by='coverageRate')
+
+        assert sequential['summary']['mode'] == 'sequential'
+        assert parallel['summary']['mode'] == 'parallel'
+        assert without_timings(parallel) == without_timings(sequential)
+
+    def test_invalid_batch(self):
+        with pytest.raises(ValueError):
+            evaluate_scenarios(BASE, [])
+        with pytest.raises(ValueError):
+            evaluate_scenarios(BASE, SCENARIOS, rank_by='cost')
+
+    def test_mixed_value_types_fail_per_scenario(self):
+        report = evaluate_scenarios(BASE, SCENARIOS + [
+            {'scenarioId': 'int-days', 'coverageDays': [1, 2, 3]},
+            {'scenarioId': 'nested-pattern', 'workPattern': [['D'], 'O']},
+            {'scenarioId': 'scheme-list', 'scheme': ['A']},
+        ])
+        rows = {row['scenarioId']: row for row in report['scenarios']}
+
+        assert rows['weekdays']['status'] == 'OK'
+        assert rows['int-days']['status'] == 'FAILED'
+        assert rows['nested-pattern']['status'] == 'FAILED'
+        assert rows['scheme-list']['status'] == 'FAILED'
@@ -0,0 +1,128 @@
+"""
+Tests for heap-based balanced slot assignment.
+
+Run with: pytest tests/test_load_heap.py -v
+"""
+
+import sys
+import copy
+import random
+import pathlib
+from datetime import date, timedelta
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from context.engine.load_heap import LoadHeap
+from context.engine.outcome_based_with_slots import (
+    _assign_employees_to_slots_balanced,
+    _build_employee_licenses_map,
+)
+from src.fill_slots_solver import (
+    assign_slot_to_employee,
+    can_assign_employee_to_slot,
+    parse_date,
+    simple_greedy_assignment,
+)
+
+
+def outcome_slot(slot_id, slot_date):
+    return {'id': slot_id, 'demandId': 'D1', 'requirementId': 'R1', 'date': slot_date, 'shiftCode': 'D',
+            'start': '08:00:00', 'end': '20:00:00', 'nextDay': False, 'position': 0,
+            'rotationOffset': 0, 'patternDay': 0}
+
+
+def fill_pool(rng, size):
+    pool = {}
+    for i in range(size):
+        if rng.random() < 0.3:
+            pool[f'N{i}'] = {
+                'employeeId': f'N{i}', 'type': 'new_joiner',
+                'availableFrom': date(2026, 1, 1) + timedelta(days=rng.randint(0, 10)),
+                'availableHours': {'weekly': 44.0, 'monthly': float(rng.choice([24, 48, 176]))},
+                'currentState': {'consecutiveDaysWorked': 0, 'lastWorkDate': None},
+                'availabilityMap': {}, 'assignedSlots': [],
+            }
+        else:
+            pool[f'E{i}'] = {
+                'employeeId': f'E{i}', 'type': 'existing',
+                'availableHours': {'weekly': 44.0, 'monthly': float(rng.choice([0, 12, 36, 96]))},
+                'currentState': {'consecutiveDaysWorked': rng.choice([0, 11, 12]), 'lastWorkDate': '2025-12-31'},
+                'availabilityMap': {date(2026, 1, 1) + timedelta(days=d): rng.random() < 0.5
+                                    for d in rng.sample(range(14), 4)},
+                'assignedSlots': [],
+            }
+    return pool
+
+
+def most_hours_first(slots, pool):
+    """Reference: scan every employee per slot, take the most hours remaining"""
+    assignments, unmet = [], []
+    for slot in sorted(slots, key=lambda s: s['date']):
+        slot_date = parse_date(slot['date'])
+        candidates = [emp for emp in pool.values() if can_assign_employee_to_slot(emp, slot, slot_date)[0]]
+        if candidates:
+            best = max(candidates, key=lambda emp: emp['availableHours']['monthly'])
+            assignments.append(assign_slot_to_employee(best, slot, slot_date))
+        else:
+            unmet.append(slot)
+    return assignments, unmet
+
+
+class TestLoadHeap:
+    """Lowest load first, rejected entries kept"""
+
+    def test_pop_first_pushes_back_rejected(self):
+        heap = LoadHeap([(2, 0, 'a'), (1, 2, 'c'), (1, 1, 'b')])
+
+        assert heap.pop_first(lambda item: item != 'b') == (1, 2, 'c')
+        assert heap.pop_first(lambda item: True, stop=lambda load: load > 1) == (1, 1, 'b')
+        assert heap.pop_first(lambda item: True, stop=lambda load: load > 1) is None
+        assert len(heap) == 1
+
+        parked = []
+        assert heap.pop_first(lambda item: False, parked=parked) is None
+        assert parked == [(2, 0, 'a')] and len(heap) == 0
+
+
+class TestBalancedSlotAssignment:
+    """Least-loaded employee per slot, one slot per employee per day"""
+
+    def test_least_loaded_and_qualification_expiry(self):
+        employees = [
+            {'employeeId': 'E1', 'rankId': 'SER', 'productTypeId': 'CVSO',
+             'qualifications': [{'code': 'Q1', 'expiryDate': '2026-03-02'}]},
+            {'employeeId': 'E2', 'rankId': 'SER', 'productTypeId': 'CVSO',
+             'qualifications': [{'code': 'Q1', 'expiryDate': None}]},
+            {'employeeId': 'E3', 'rankId': 'COR', 'productTypeId': 'CVSO', 'qualifications': ['Q1']},
+        ]
+        requirement = {'rankIds': ['SER'], 'productTypeId': 'CVSO', 'requiredQualifications': ['Q1']}
+        days = ['2026-03-01', '2026-03-02', '2026-03-03']
+        templates = {emp['employeeId']: {'valid_work_days': set(days), 'template_result': {}} for emp in employees}
+        slots = [outcome_slot(f'S{i}', day) for i, day in enumerate(days + days)]
+
+        assignments = _assign_employees_to_slots_balanced(
+            slots, employees, templates, requirement, _build_employee_licenses_map(employees), {}
+        )
+
+        assigned = [(a['date'], a['employeeId']) for a in assignments]
+        assert assigned == [
+            ('2026-03-01', 'E1'), ('2026-03-01', 'E2'),
+            ('2026-03-02', 'E1'), ('2026-03-02', 'E2'),
+            ('2026-03-03', 'E2'), ('2026-03-03', None),  # E1 expired, E3 wrong rank
+        ]
+
+
+class TestFillSlotsAssignment:
+    """The heap picks what a full scan with can_assign_employee_to_slot picks"""
+
+    def test_matches_full_scan(self):
+        rng = random.Random(7)
+        for _ in range(50):
+            pool = fill_pool(rng, rng.randint(1, 12))
+            slots = [{'slotId': f'S{i}', 'date': (date(2026, 1, 1) + timedelta(days=rng.randint(0, 13))).isoformat(),
+                      'shiftCode': 'D', 'startTime': '08:00:00', 'endTime': '20:00:00',
+                      'hours': {'normal': float(rng.choice([8, 11, 12]))}}
+                     for i in range(rng.randint(1, 40))]
+
+            expected = most_hours_first(copy.deepcopy(slots), copy.deepcopy(pool))
+            assert simple_greedy_assignment(copy.deepcopy(slots), copy.deepcopy(pool)) == expected
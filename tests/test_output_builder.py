@@ -0,0 +1,100 @@
+"""
+Tests for output assembly over the shared AssignmentGrid.
+
+Run with: pytest tests/test_output_builder.py -v
+"""
+
+import sys
+import pathlib
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from src.output_builder import AssignmentGrid, build_output
+
+
+def make_assignment(emp_id, date, shift_code='D'):
+    start, end = ('08:00:00', '20:00:00') if shift_code == 'D' else ('20:00:00', '08:00:00')
+    return {
+        'assignmentId': f'A-{emp_id}-{date}',
+        'demandId': 'DI-1',
+        'requirementId': 'R-1',
+        'slotId': f'S-{emp_id}-{date}',
+        'employeeId': emp_id,
+        'date': date,
+        'startDateTime': f'{date}T{start}',
+        'endDateTime': f'{date}T{end}',
+        'shiftCode': shift_code,
+        'status': 'ASSIGNED',
+    }
+
+
+def make_case():
+    input_data = {
+        'planningHorizon': {'startDate': '2026-03-02', 'endDate': '2026-03-07'},
+        'publicHolidays': [],
+        'demandItems': [{
+            'demandId': 'DI-1',
+            'shiftStartDate': '2026-03-02',
+            'rosteringBasis': 'demandBased',
+            'shifts': [{'includePublicHolidays': True}],
+            'requirements': [{'requirementId': 'R-1', 'workPattern': ['D', 'D', 'O']}],
+        }],
+    }
+    ctx = {
+        'employees': [
+            {'employeeId': 'E1', 'scheme': 'A', 'productTypeId': 'SO', 'unavailability': ['2026-03-03']},
+            {'employeeId': 'E2', 'scheme': 'B', 'productTypeId': 'SO'},
+            {'employeeId': 'E3', 'scheme': 'B', 'productTypeId': 'SO'},
+        ],
+        'optimized_offsets': {'E1': 0, 'E2': 1, 'E3': 0},
+        'slots': [],
+    }
+    assignments = [
+        make_assignment('E1', '2026-03-02'),
+        make_assignment('E1', '2026-03-03'),  # unavailable → UNASSIGNED
+        make_assignment('E1', '2026-03-05'),
+        make_assignment('E2', '2026-03-02'),
+        make_assignment('E2', '2026-03-04'),
+        make_assignment('E2', '2026-03-05'),
+    ]
+    solver_result = {'status': 'FEASIBLE', 'scores': {'hard': 0, 'soft': 0, 'overall': 0}}
+    return input_data, ctx, solver_result, assignments
+
+
+class TestAssignmentGrid:
+    """The grid mirrors the assignment list as stages modify it"""
+
+    def test_replace_moves_assignment_between_buckets(self):
+        original = make_assignment('E1', '2026-03-02')
+        grid = AssignmentGrid([original, make_assignment('E1', '2026-03-03')])
+
+        converted = {**original, 'employeeId': None, 'status': 'UNASSIGNED'}
+        grid.replace(original, converted)
+
+        assert [a['date'] for a in grid.for_employee('E1')] == ['2026-03-03']
+        assert grid.for_employee(None) == [converted]
+        assert '2026-03-02' not in grid.cells['E1']
+        assert grid.date_range()[0].isoformat() == '2026-03-02'
+
+
+class TestBuildOutput:
+    """End-to-end assembly on a small roster"""
+
+    def test_roster_and_assignments_agree(self):
+        input_data, ctx, solver_result, assignments = make_case()
+
+        output = build_output(input_data, ctx, 'FEASIBLE', solver_result, assignments, [])
+
+        roster = {emp['employeeId']: emp for emp in output['employeeRoster']}
+        e1_days = {day['date']: day['status'] for day in roster['E1']['dailyStatus']}
+        assert e1_days['2026-03-02'] == 'ASSIGNED'
+        assert e1_days['2026-03-03'] != 'ASSIGNED'  # removed by the unavailability fix
+        assert e1_days['2026-03-04'] == 'OFF_DAY'  # pattern D,D,O
+        assert {day['status'] for day in roster['E3']['dailyStatus']} <= {'NOT_USED', 'OFF_DAY'}
+
+        unavailable = [a for a in output['assignments'] if a.get('reason') == 'Employee unavailable']
+        assert unavailable and all(a['employeeId'] is None for a in unavailable)
+
+        worked = [a for a in output['assignments'] if a.get('status') == 'ASSIGNED']
+        assert len(worked) == 5
+        assert all(a['hours']['gross'] == 12.0 for a in worked)
+        assert output['meta']['outputBuildSeconds'] >= 0
@@ -0,0 +1,108 @@
+"""
+Tests for the persistent ICPMP configuration cache.
+
+Run with: pytest tests/test_ratio_cache.py -v
+"""
+
+import sys
+import json
+import time
+import pathlib
+
+import pytest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from context.engine.config_optimizer_v3 import calculate_optimal_with_u_slots, generate_coverage_calendar
+from src import ratio_cache
+from src.ratio_cache import RatioCache, cache_key, cache_key_params, cached_optimal_with_u_slots
+
+CALENDAR = generate_coverage_calendar('2026-01-01', '2026-01-31')
+
+
+def icpmp(cache, pattern=('D', 'D', 'D', 'D', 'O', 'O'), headcount=5, **kwargs):
+    return cached_optimal_with_u_slots(
+        pattern=list(pattern), headcount=headcount, calendar=CALENDAR,
+        anchor_date='2026-01-01', cache=cache, **kwargs
+    )
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return RatioCache(path=str(tmp_path / 'ratio_cache.db'), max_entries=10, ttl_days=30)
+
+
+class TestRatioCache:
+    """Cached results equal computed ones and are keyed by every input"""
+
+    def test_hit_matches_uncached_result(self, cache):
+        first = icpmp(cache, requirement_id='48_1')
+        second = icpmp(cache, requirement_id='49_1')
+        reference = calculate_optimal_with_u_slots(
+            ['D', 'D', 'D', 'D', 'O', 'O'], 5, CALENDAR, '2026-01-01', '49_1'
+        )
+
+        assert second['computation'] == {**reference['computation'], 'cached': True}
+        assert {**second, 'computation': reference['computation']} == reference
+        assert first['requirementId'] == '48_1'
+        assert 'cached' not in first['computation']
+        stats = cache.get_stats()
+        assert (stats['hits'], stats['misses'], stats['totalEntries']) == (1, 1, 1)
+        assert stats['patterns'][0]['usageCount'] == 1
+
+    @pytest.mark.parametrize('change', [
+        dict(headcount=6),
+        dict(scheme='P'),
+        dict(enable_ot_aware_icpmp=True),
+        dict(monthly_ot_cap=124.0),
+        dict(headcount_by_shift={'D': 5}),
+    ])
+    def test_key_covers_inputs(self, change):
+        base = dict(pattern=['D', 'O'], headcount=5, calendar=CALENDAR, anchor_date='2026-01-01')
+        assert cache_key(cache_key_params(**base)) != cache_key(cache_key_params(**{**base, **change}))
+
+    def test_key_covers_version(self, monkeypatch):
+        base = dict(pattern=['D', 'O'], headcount=5, calendar=CALENDAR, anchor_date='2026-01-01')
+        key = cache_key(cache_key_params(**base))
+        monkeypatch.setattr(ratio_cache, 'CACHE_VERSION', 'older')
+
+        assert cache_key(cache_key_params(**base)) != key
+
+    def test_lru_eviction(self, tmp_path):
+        cache = RatioCache(path=str(tmp_path / 'lru.db'), max_entries=2, ttl_days=0)
+        for headcount in (1, 2, 3):
+            icpmp(cache, headcount=headcount)
+            time.sleep(0.01)
+
+        stats = cache.get_stats()
+        assert [p['headcount'] for p in stats['patterns']] == [3, 2]
+        assert stats['evictions'] == 1
+
+    def test_ttl_expiry(self, cache):
+        icpmp(cache)
+        cache.ttl_days = 1e-9
+        time.sleep(0.01)
+        icpmp(cache)
+
+        assert cache.get_stats()['misses'] == 2
+
+    def test_export_import_round_trip(self, cache, tmp_path):
+        icpmp(cache)
+        exported = json.loads(json.dumps(cache.export_entries()))
+        exported['entries']['legacy'] = {'pattern': 'DDDDOO', 'optimalRatio': 0.8}
+        exported['entries']['pickled'] = {'pattern': 'DDDDOO', 'params': {}, 'result': 'gASVAAAAAAAAAACMAi4='}
+
+        other = RatioCache(path=str(tmp_path / 'other.db'))
+        assert other.import_entries(exported) == {'new': 1, 'updated': 0, 'skipped': 2}
+        assert icpmp(other) == icpmp(cache)
+        assert other.get_stats()['hits'] == 1
+
+    def test_invalidate_and_clear(self, cache):
+        icpmp(cache, headcount=1)
+        icpmp(cache, headcount=2)
+        key = cache.get_stats()['patterns'][0]['hash']
+
+        assert cache.invalidate(key[:6]) == [key]
+        assert cache.get_stats()['totalEntries'] == 1
+        cache.clear_cache()
+        assert cache.get_stats()['totalEntries'] == 0
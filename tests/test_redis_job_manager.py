@@ -0,0 +1,341 @@
+"""
+Tests for RedisJobManager counters and indexes.
+
+Runs against fakeredis so no Redis server is needed.
+
+Run with: pytest tests/test_redis_job_manager.py -v
+"""
+
+import sys
+import json
+import time
+import asyncio
+import pathlib
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+import src.redis_job_manager as redis_job_manager
+from src.redis_job_manager import RedisJobManager, AsyncRedisJobManager, JobStatus
+from src.result_index import ResultFilter
+from src.compact_output import encode_compact_output
+
+
+@pytest.fixture
+def redis_client(monkeypatch):
+    server = fakeredis.FakeServer()
+    client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    monkeypatch.setattr(redis_job_manager, "get_redis_client", lambda: client)
+    monkeypatch.setattr(
+        redis_job_manager, "get_async_redis_client",
+        lambda: fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    )
+    return client
+
+
+class TestStatusCounters:
+    """Stats are served from counters maintained on every transition"""
+
+    def test_counts_follow_transitions(self, redis_client):
+        manager = RedisJobManager()
+        job_ids = [manager.create_job({"n": i}) for i in range(3)]
+
+        manager.update_status(job_ids[0], JobStatus.IN_PROGRESS)
+        manager.update_status(job_ids[0], JobStatus.COMPLETED)
+        manager.store_result(job_ids[0], {"ok": True})
+        manager.update_status(job_ids[1], JobStatus.FAILED, error_message="boom")
+
+        stats = manager.get_stats()
+        assert stats["total_jobs"] == 3
+        assert stats["active_jobs"] == 3
+        assert stats["results_cached"] == 1
+        assert stats["status_breakdown"] == {"queued": 1, "completed": 1, "failed": 1}
+
+    def test_delete_job_decrements(self, redis_client):
+        manager = RedisJobManager()
+        job_id = manager.create_job({})
+
+        assert manager.delete_job(job_id)
+
+        stats = manager.get_stats()
+        assert stats["active_jobs"] == 0
+        assert stats["queue_length"] == 0
+        assert stats["status_breakdown"] == {}
+
+    def test_update_unknown_job(self, redis_client):
+        manager = RedisJobManager()
+        assert manager.update_status("missing", JobStatus.COMPLETED) is False
+        assert manager.get_stats()["status_breakdown"] == {}
+
+    def test_rebuild_indexes_backfills_existing_jobs(self, redis_client):
+        manager = RedisJobManager()
+        manager.create_job({})
+        manager.update_status(manager.create_job({}), JobStatus.IN_PROGRESS)
+        redis_client.delete(manager.jobs_index_key, manager.jobs_status_key, manager.status_counts_key)
+
+        rebuilt = RedisJobManager()
+
+        stats = rebuilt.get_stats()
+        assert stats["active_jobs"] == 2
+        assert stats["status_breakdown"] == {"queued": 1, "in_progress": 1}
+
+
+class TestListingAndCleanup:
+    """Paginated listings and expiry cleanup use the created_at index"""
+
+    def test_job_details_newest_first_paginated(self, redis_client):
+        manager = RedisJobManager()
+        job_ids = []
+        for i in range(5):
+            job_ids.append(manager.create_job({"n": i}))
+            time.sleep(0.001)
+
+        page = manager.get_all_jobs_details(offset=1, limit=2)
+        assert [job["job_id"] for job in page] == [job_ids[3], job_ids[2]]
+
+    def test_cleanup_drops_expired_metadata(self, redis_client):
+        manager = RedisJobManager(result_ttl_seconds=60)
+        done = manager.create_job({})
+        manager.update_status(done, JobStatus.COMPLETED)
+        manager.store_result(done, {"ok": True})
+        pending = manager.create_job({})
+
+        # Simulate the job hash and result expiring via TTL
+        redis_client.delete(manager._job_key(done), manager._result_key(done))
+        redis_client.zadd(manager.jobs_index_key, {done: time.time() - 120, pending: time.time() - 120})
+
+        assert manager.cleanup_expired_jobs() == 1
+
+        stats = manager.get_stats()
+        assert stats["active_jobs"] == 1
+        assert stats["status_breakdown"] == {"queued": 1}
+
+
+class TestSubmissionDedup:
+    """Identical submissions reuse in-flight jobs and cached results"""
+
+    def test_in_flight_duplicate_returns_same_job(self, redis_client):
+        manager = RedisJobManager()
+        job_id, outcome = manager.submit_job({"schemaVersion": "0.95", "n": 1}, webhook_url="https://a")
+        dup_id, dup_outcome = manager.submit_job({"schemaVersion": "0.95", "n": 1}, webhook_url="https://b")
+
+        assert outcome is None
+        assert dup_outcome == "in_flight"
+        assert dup_id == job_id
+        assert manager.get_queue_length() == 1
+
+    def test_completed_duplicate_points_at_cached_result(self, redis_client):
+        manager = RedisJobManager()
+        job_id, _ = manager.submit_job({"n": 1})
+        manager.update_status(job_id, JobStatus.COMPLETED)
+        manager.store_result(job_id, {"assignments": [1, 2]})
+
+        alias_id, outcome = manager.submit_job({"n": 1, "priority": 5})
+
+        assert outcome == "cached_result"
+        assert alias_id != job_id
+        assert manager.get_job(alias_id).status == JobStatus.COMPLETED
+        assert manager.get_result(alias_id) == {"assignments": [1, 2]}
+        assert manager.get_queue_length() == 1
+
+    def test_failed_job_is_not_reused(self, redis_client):
+        manager = RedisJobManager()
+        job_id, _ = manager.submit_job({"n": 1})
+        manager.update_status(job_id, JobStatus.FAILED, error_message="boom")
+
+        retry_id, outcome = manager.submit_job({"n": 1})
+
+        assert outcome is None
+        assert retry_id != job_id
+
+    def test_opt_out_and_zero_window(self, redis_client):
+        manager = RedisJobManager(dedup_window_seconds=0)
+        job_id, _ = manager.submit_job({"n": 1})
+        forced_id, outcome = manager.submit_job({"n": 1}, dedup=False)
+        assert outcome is None and forced_id != job_id
+
+        manager.update_status(job_id, JobStatus.COMPLETED)
+        manager.store_result(job_id, {"ok": True})
+        fresh_id, outcome = manager.submit_job({"n": 1})
+        assert outcome is None and fresh_id not in (job_id, forced_id)
+
+
+class TestWorkerTransitions:
+    """Worker claim/complete are single atomic transitions honouring cancellation"""
+
+    def test_claim_and_complete(self, redis_client):
+        manager = RedisJobManager()
+        job_id = manager.create_job({"n": 1})
+        assert manager.get_next_job(0) == job_id
+
+        job_info = manager.claim_job(job_id)
+        assert job_info.status == JobStatus.IN_PROGRESS
+        assert job_info.input_data == {"n": 1}
+        assert job_info.started_at is not None
+
+        assert manager.complete_job(job_id, {"ok": True}) == JobStatus.COMPLETED
+        assert manager.get_result(job_id) == {"ok": True}
+        assert manager.get_job(job_id).result_size_bytes == len('{"ok": true}')
+        assert manager.get_stats()["status_breakdown"] == {"completed": 1}
+
+    def test_cancel_before_claim(self, redis_client):
+        manager = RedisJobManager()
+        job_id = manager.create_job({})
+        manager.set_cancellation_flag(job_id)
+
+        assert manager.claim_job(job_id).status == JobStatus.CANCELLED
+        assert manager.check_cancellation_flag(job_id) is False
+        assert manager.get_stats()["status_breakdown"] == {"cancelled": 1}
+
+    def test_cancel_during_solve_discards_result(self, redis_client):
+        manager = RedisJobManager()
+        job_id, _ = manager.submit_job({"n": 1})
+        manager.claim_job(job_id)
+        manager.set_cancellation_flag(job_id)
+
+        assert manager.complete_job(job_id, {"ok": True}) == JobStatus.CANCELLED
+        assert manager.get_result(job_id) is None
+        assert not redis_client.exists(manager._result_index_key(job_id))
+        # The dedup key is released so a resubmission starts a fresh job
+        assert manager.submit_job({"n": 1})[1] is None
+
+    def test_unknown_job(self, redis_client):
+        manager = RedisJobManager()
+        assert manager.claim_job("missing") is None
+        assert manager.complete_job("missing", {}) is None
+        assert manager.store_result("missing", {}) is False
+
+
+class TestAsyncJobManager:
+    """The asyncio manager shares keys and scripts with the sync worker side"""
+
+    def test_submit_poll_and_fetch(self, redis_client):
+        worker = RedisJobManager()
+        api = AsyncRedisJobManager()
+
+        async def scenario():
+            job_id, outcome = await api.submit_job({"n": 1})
+            assert outcome is None
+            assert await api.submit_job({"n": 1}) == (job_id, "in_flight")
+
+            worker.claim_job(worker.get_next_job(0))
+            job_info = await api.get_job(job_id)
+            assert job_info.status == JobStatus.IN_PROGRESS
+            assert job_info.input_data == {}
+            assert (await api.get_job(job_id, include_input=True)).input_data == {"n": 1}
+
+            worker.complete_job(job_id, {"ok": True})
+            assert await api.get_result_json(job_id) == '{"ok": true}'
+            alias_id, outcome = await api.submit_job({"n": 1})
+            assert outcome == "cached_result"
+            assert await api.get_result(alias_id) == {"ok": True}
+
+            stats = await api.get_stats()
+            assert stats == worker.get_stats()
+            assert stats["status_breakdown"] == {"completed": 2}
+            details = await api.get_all_jobs_details(limit=1)
+            assert [job["job_id"] for job in details] == [alias_id]
+
+        asyncio.run(scenario())
+
+    def test_cancel_matches_sync_manager(self, redis_client):
+        api = AsyncRedisJobManager()
+
+        async def scenario():
+            queued = await api.create_job({})
+            result = await api.cancel_job(queued)
+            assert result["method"] == "queue_removal"
+            assert (await api.cancel_job(queued))["message"] == "Job already cancelled"
+            assert (await api.cancel_job("missing"))["success"] is False
+            assert await api.get_queue_length() == 0
+
+        asyncio.run(scenario())
+
+
+def make_result():
+    days = ['2026-03-01', '2026-03-02', '2026-03-03']
+    assignments = [
+        {'assignmentId': f'A-{emp}-{day}', 'employeeId': emp, 'date': day,
+         'startDateTime': f'{day}T08:00:00', 'status': 'ASSIGNED'}
+        for emp in ('E1', 'E2') for day in days[:2]
+    ] + [{'assignmentId': 'U-1', 'employeeId': None, 'date': days[2], 'status': 'UNASSIGNED'}]
+    roster = [
+        {'employeeId': emp, 'ouId': ou, 'totalHours': 24, 'dailyStatus': [
+            {'date': day, 'status': 'ASSIGNED' if day != days[2] else 'OFF_DAY'} for day in days
+        ]}
+        for emp, ou in (('E1', 'OU-A'), ('E2', 'OU-B'))
+    ]
+    return {'schemaVersion': '0.98', 'score': {'hard': 0}, 'assignments': assignments, 'employeeRoster': roster}
+
+
+def stream(api, job_id, **filters):
+    """Collect the NDJSON stream for job_id as parsed records"""
+    async def collect():
+        opened = await api.open_result_stream(job_id)
+        if opened is None:
+            return None
+        text = ''.join([chunk async for chunk in api.iter_result_stream(*opened, ResultFilter(**filters))])
+        return [json.loads(line) for line in text.splitlines()]
+    return asyncio.run(collect())
+
+
+class TestResultStream:
+    """NDJSON result stream served from the per-result index"""
+
+    def complete(self, worker, result):
+        job_id = worker.create_job({})
+        worker.claim_job(worker.get_next_job(0))
+        worker.complete_job(job_id, result)
+        return job_id
+
+    def test_unfiltered_stream_matches_result(self, redis_client):
+        worker, api = RedisJobManager(), AsyncRedisJobManager()
+        result = make_result()
+        records = stream(api, self.complete(worker, result))
+
+        assert records[0] == {'type': 'header', 'data': {'schemaVersion': '0.98', 'score': {'hard': 0}}}
+        assert [r['data'] for r in records if r['type'] == 'assignment'] == result['assignments']
+        assert [r['data'] for r in records if r['type'] == 'roster'] == result['employeeRoster']
+        assert records[-1] == {'type': 'end', 'counts': {'assignment': 5, 'roster': 2}}
+
+    def test_filters_combine(self, redis_client):
+        worker, api = RedisJobManager(), AsyncRedisJobManager()
+        job_id = self.complete(worker, make_result())
+
+        records = stream(api, job_id, employee_ids=['E2'], date_from='2026-03-02', date_to='2026-03-02')
+        assert [r['data']['assignmentId'] for r in records if r['type'] == 'assignment'] == ['A-E2-2026-03-02']
+        roster = [r['data'] for r in records if r['type'] == 'roster']
+        assert [r['employeeId'] for r in roster] == ['E2']
+        assert roster[0]['dailyStatus'] == [{'date': '2026-03-02', 'status': 'ASSIGNED'}]
+
+        records = stream(api, job_id, ou_ids=['OU-A'], statuses=['OFF_DAY'])
+        assert records[-1]['counts'] == {'assignment': 0, 'roster': 1}
+        assert records[-2]['data']['dailyStatus'] == [{'date': '2026-03-03', 'status': 'OFF_DAY'}]
+
+        assert stream(api, job_id, date_from='2027-01-01')[-1]['counts'] == {'assignment': 0, 'roster': 0}
+
+        # ASSIGNED on 03-01 and OFF_DAY on 03-03: no single day matches both
+        records = stream(api, job_id, statuses=['OFF_DAY'], date_from='2026-03-01', date_to='2026-03-01')
+        assert records[-1]['counts'] == {'assignment': 0, 'roster': 0}
+        assert [r for r in records if r['type'] == 'roster'] == []
+
+    def test_compact_result_streams_standard_records(self, redis_client):
+        worker, api = RedisJobManager(), AsyncRedisJobManager()
+        result = make_result()
+        records = stream(api, self.complete(worker, encode_compact_output(result)), statuses=['UNASSIGNED'])
+
+        assert [r['data'] for r in records if r['type'] == 'assignment'] == [result['assignments'][-1]]
+
+    def test_index_built_on_demand_and_removed_with_job(self, redis_client):
+        worker, api = RedisJobManager(), AsyncRedisJobManager()
+        job_id = self.complete(worker, make_result())
+        redis_client.delete(worker._result_rows_key(job_id), worker._result_index_key(job_id))
+
+        assert len(stream(api, job_id, employee_ids=['E1'])) == 5
+        assert redis_client.ttl(worker._result_index_key(job_id)) > 0
+
+        worker.delete_job(job_id)
+        assert not redis_client.exists(worker._result_rows_key(job_id), worker._result_index_key(job_id))
+        assert stream(api, job_id) is None
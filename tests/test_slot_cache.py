@@ -0,0 +1,82 @@
+"""
+Tests for the content-hashed slot expansion cache and stable slot ids.
+
+Run with: pytest tests/test_slot_cache.py -v
+"""
+
+import sys
+import copy
+import pathlib
+from datetime import date
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from context.engine.slot_builder import build_slots
+from context.engine.slot_cache import SlotCache, cached_build_slots, expansion_key
+
+
+class TestStableSlotIds:
+    """The same demand expands to the same slot ids"""
+
+    def test_ids_repeat_across_builds(self, make_inputs):
+        first = [s.slot_id for s in build_slots(make_inputs())]
+
+        assert first == [s.slot_id for s in build_slots(make_inputs())]
+        assert len(set(first)) == len(first)
+        assert first[0].startswith('D1-R1-D-P0-2026-03-02-')
+
+
+class TestSlotCache:
+    """Hits, keys, windows and the on-disk store"""
+
+    def test_hit_returns_same_slots(self, make_inputs):
+        cache = SlotCache(max_entries=4)
+        first = cached_build_slots(make_inputs(), cache=cache)
+        second = cached_build_slots(make_inputs(), cache=cache)
+
+        assert second == first and second is not first
+        assert cache.stats() == {'hits': 1, 'disk_hits': 0, 'misses': 1, 'size': 1}
+
+    def test_key_follows_demand_definition(self, make_inputs):
+        inputs = make_inputs()
+        changed = copy.deepcopy(inputs)
+        changed['demandItems'][0]['requirements'][0]['headcount'] = 3
+
+        assert expansion_key(inputs) == expansion_key(copy.deepcopy(inputs))
+        assert expansion_key(inputs) != expansion_key(changed)
+        assert expansion_key(inputs, 'v1') != expansion_key(inputs, 'v2')
+        # Employees only matter for employee-dependent expansions
+        inputs['employees'] = [{'employeeId': 'E1'}]
+        assert expansion_key(inputs) == expansion_key(make_inputs())
+
+    def test_date_window(self, make_inputs):
+        cache = SlotCache(max_entries=4)
+        full = cached_build_slots(make_inputs(), cache=cache)
+        window = cached_build_slots(make_inputs(), cache=cache,
+                                    start=date(2026, 3, 4), end=date(2026, 3, 5))
+
+        assert window == [s for s in full if date(2026, 3, 4) <= s.date <= date(2026, 3, 5)]
+        assert cache.stats()['misses'] == 1
+
+    def test_lru_eviction(self, make_inputs):
+        cache = SlotCache(max_entries=1)
+        cached_build_slots(make_inputs(headcount=1), cache=cache)
+        cached_build_slots(make_inputs(headcount=2), cache=cache)
+        cached_build_slots(make_inputs(headcount=1), cache=cache)
+
+        assert cache.stats()['misses'] == 3
+
+    def test_disk_store_shared_between_caches(self, make_inputs, tmp_path):
+        slots = cached_build_slots(make_inputs(), cache=SlotCache(4, str(tmp_path)))
+        other_process = SlotCache(4, str(tmp_path))
+
+        reloaded = cached_build_slots(make_inputs(), cache=other_process)
+        assert [s.slot_id for s in reloaded] == [s.slot_id for s in slots]
+        assert other_process.stats()['disk_hits'] == 1
+
+    def test_disabled_cache_always_builds(self, make_inputs):
+        cache = SlotCache(max_entries=0)
+        cached_build_slots(make_inputs(), cache=cache)
+        cached_build_slots(make_inputs(), cache=cache)
+
+        assert cache.stats()['size'] == 0
@@ -0,0 +1,61 @@
+"""
+Tests for the slotted Slot representation and its struct-of-arrays view.
+
+Run with: pytest tests/test_slot_storage.py -v
+"""
+
+import sys
+import pickle
+import pathlib
+from datetime import date, datetime
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from context.engine.slot_builder import Slot, SlotRequirement, build_slots, slot_columns
+
+
+class TestSlotStorage:
+    """Requirement-level fields live once per requirement"""
+
+    def test_slots_share_one_descriptor(self, make_inputs):
+        slots = build_slots(make_inputs())
+
+        assert len(slots) == 2 * 2 * 7  # 2 shift codes x headcount 2 x 7 days
+        assert len({id(s.requirement) for s in slots}) == 1
+        assert all(s.blacklist is slots[0].blacklist for s in slots)
+        assert slots[0].demandId == 'D1' and slots[0].rankIds == ['SER']
+        assert not hasattr(slots[0], '__dict__')
+
+    def test_forwarded_fields_and_defaults(self):
+        requirement = SlotRequirement(
+            'D1', 'R1', 'L1', 'OU1', 'APO', [], 'Any', 'Global', [], ['D'],
+            date(2026, 3, 2), date(2026, 3, 2), ['Mon'], [], {}, {}, productTypeIds=['APO', 'AVSO']
+        )
+        slot = Slot('S1', date(2026, 3, 2), 'D', datetime(2026, 3, 2, 8), datetime(2026, 3, 2, 20), requirement)
+
+        assert getattr(slot, '_productTypeIds') == ['APO', 'AVSO']
+        assert getattr(slot, '_dayType') == 'Normal'
+        assert getattr(slot, 'rankId', None) is None
+
+    def test_pickle_round_trip(self, make_inputs):
+        slots = pickle.loads(pickle.dumps(build_slots(make_inputs(headcount=1))))
+
+        assert slots[0].requirement is slots[-1].requirement
+        assert slots[0].requirementId == 'R1'
+
+
+class TestSlotColumns:
+    """Struct-of-arrays view matches the slot objects"""
+
+    def test_columns(self, make_inputs):
+        slots = build_slots(make_inputs(headcount=1))
+        columns = slot_columns(slots)
+
+        assert len(columns) == len(slots)
+        assert columns.requirements == [slots[0].requirement]
+        assert set(columns.requirement_index) == {0}
+        for k, slot in enumerate(slots):
+            assert columns.shift_codes[columns.shift_code_index[k]] == slot.shiftCode
+            assert date.fromordinal(columns.day_ordinal[k]) == slot.date
+            assert columns.end_minute[k] - columns.start_minute[k] == 720
+        assert memoryview(columns.start_minute).format == 'q'
@@ -0,0 +1,73 @@
+"""
+Tests for the synchronous-solve process pool.
+
+Uses time.sleep as the pool task so no solver run is needed.
+
+Run with: pytest tests/test_solve_pool.py -v
+"""
+
+import sys
+import time
+import asyncio
+import pathlib
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+import pytest
+
+from src.solve_pool import SolvePool, SolvePoolBusyError
+
+
+@pytest.fixture
+def pool():
+    pool = SolvePool(max_workers=1, queue_depth=1, retry_after_seconds=7)
+    pool.start()
+    yield pool
+    pool.shutdown()
+
+
+class TestAdmissionControl:
+    """Solves beyond workers + queue depth are rejected, not queued"""
+
+    def test_rejects_when_saturated(self, pool):
+        async def scenario():
+            running = [asyncio.create_task(pool.run(time.sleep, 0.5)) for _ in range(pool.capacity)]
+            await asyncio.sleep(0.05)
+            with pytest.raises(SolvePoolBusyError) as excinfo:
+                await pool.run(time.sleep, 0)
+            await asyncio.gather(*running)
+            return excinfo.value
+
+        error = asyncio.run(scenario())
+
+        assert error.retry_after == 7
+        status = pool.status()
+        assert status['rejected'] == 1
+        assert status['completed'] == 2
+        assert status['in_flight'] == 0
+
+    def test_retry_after_tracks_solve_duration(self, pool):
+        asyncio.run(pool.run(time.sleep, 1.2))
+
+        status = pool.status()
+        assert status['avg_solve_seconds'] >= 1.2
+        assert abs(pool.retry_after() - status['avg_solve_seconds']) <= 0.51
+
+    def test_event_loop_stays_free_during_solve(self, pool):
+        async def scenario():
+            solve = asyncio.create_task(pool.run(time.sleep, 1.0))
+            ticks = 0
+            while not solve.done():
+                await asyncio.sleep(0.01)
+                ticks += 1
+            await solve
+            return ticks
+
+        assert asyncio.run(scenario()) > 10
+
+    def test_task_errors_release_slot(self, pool):
+        with pytest.raises(ValueError):
+            asyncio.run(pool.run(time.sleep, -1))
+
+        status = pool.status()
+        assert status['failed'] == 1
+        assert status['in_flight'] == 0
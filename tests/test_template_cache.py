@@ -0,0 +1,83 @@
+"""
+Tests for memoized outcome-based templates.
+
+Run with: pytest tests/test_template_cache.py -v
+"""
+
+import sys
+import pathlib
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from context.engine import template_cache
+from context.engine.cpsat_template_generator import generate_template_with_cpsat
+from context.engine.template_cache import TemplateCache, new_template_stats, template_key
+
+CTX = {
+    'planningHorizon': {'startDate': '2026-03-01', 'endDate': '2026-03-14'},
+    'publicHolidays': [],
+    'demandItems': [{
+        'id': 'D1',
+        'shifts': [{'shiftDetails': [{'shiftCode': 'D', 'start': '08:00:00', 'end': '20:00:00'}]}],
+    }],
+}
+REQUIREMENT = {'requirementId': 'R1', 'demandId': 'D1', 'workPattern': ['D', 'D', 'D', 'D', 'O', 'O'], 'headcount': 0}
+
+
+def employee(emp_id, ou_id, offset=0, scheme='Scheme A'):
+    return {'employeeId': emp_id, 'ouId': ou_id, 'rotationOffset': offset, 'scheme': scheme,
+            'productTypeId': 'CVSO', 'rankId': 'SER', 'unavailability': []}
+
+
+def cpsat_roster(employees, stats):
+    return generate_template_with_cpsat(
+        CTX, REQUIREMENT, employees, (datetime(2026, 3, 1), datetime(2026, 3, 14)), template_stats=stats
+    )
+
+
+class TestTemplateCache:
+    """Identical OUs share a template without changing the roster"""
+
+    def test_key_ignores_identity_fields(self):
+        base = template_key('cpsat', employee('E1', 'OU1'), {'workPattern': ['D', 'O']}, CTX)
+
+        assert template_key('cpsat', employee('E2', 'OU2'), {'workPattern': ['D', 'O']}, CTX) == base
+        assert template_key('cpsat', employee('E1', 'OU1', offset=1), {'workPattern': ['D', 'O']}, CTX) != base
+        assert template_key('cpsat', employee('E1', 'OU1', scheme='Scheme P'), {'workPattern': ['D', 'O']}, CTX) != base
+        assert template_key('incremental', employee('E1', 'OU1'), {'workPattern': ['D', 'O']}, CTX) != base
+
+    def test_identical_ous_reuse_one_template(self, monkeypatch):
+        employees = [employee('E1', 'OU1', 2), employee('E2', 'OU1', 2), employee('E3', 'OU2', 2),
+                     employee('E4', 'OU3', 3)]
+        monkeypatch.setenv('TEMPLATE_POOL_WORKERS', '1')
+
+        monkeypatch.setattr(template_cache, '_default_cache', TemplateCache(0))
+        uncached_stats = new_template_stats()
+        uncached = cpsat_roster(employees, uncached_stats)
+
+        monkeypatch.setattr(template_cache, '_default_cache', TemplateCache(8))
+        stats = new_template_stats()
+        cached = cpsat_roster(employees, stats)
+
+        assert cached == uncached
+        assert uncached_stats == {'templates': 3, 'solved': 3, 'hits': 0, 'persistentHits': 0, 'workers': 1}
+        assert stats == {'templates': 3, 'solved': 2, 'hits': 1, 'persistentHits': 0, 'workers': 1}
+        assert {a['employeeId'] for a in cached if a['status'] == 'ASSIGNED'} == {'E1', 'E2', 'E3', 'E4'}
+
+    def test_persistent_store(self, tmp_path):
+        TemplateCache(4, str(tmp_path)).get_or_build('k', lambda: ['template'])
+
+        stats = new_template_stats()
+        template = TemplateCache(4, str(tmp_path)).get_or_build('k', lambda: pytest.fail('rebuilt'), stats)
+
+        assert template == ['template']
+        assert stats == {'templates': 1, 'solved': 0, 'hits': 1, 'persistentHits': 1, 'workers': 1}
+
+    def test_empty_templates_are_not_cached(self):
+        cache = TemplateCache(4)
+        cache.get_or_build('k', lambda: [])
+
+        assert cache.get('k') is None
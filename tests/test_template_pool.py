@@ -0,0 +1,80 @@
+"""
+Tests for parallel per-OU template generation.
+
+Run with: pytest tests/test_template_pool.py -v
+"""
+
+import sys
+import pathlib
+from datetime import datetime
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from context.engine import template_cache
+from context.engine.cpsat_template_generator import generate_template_with_cpsat
+from context.engine.template_cache import TemplateCache, new_template_stats
+from context.engine.template_pool import TemplateJob, build_templates, template_pool_workers
+from context.engine.thread_budget import SearchThreadBudget, set_search_thread_budget
+
+CTX = {
+    'planningHorizon': {'startDate': '2026-03-01', 'endDate': '2026-03-14'},
+    'publicHolidays': [],
+    'demandItems': [{
+        'id': 'D1',
+        'shifts': [{'shiftDetails': [{'shiftCode': 'D', 'start': '08:00:00', 'end': '20:00:00'}]}],
+    }],
+}
+REQUIREMENT = {'requirementId': 'R1', 'demandId': 'D1', 'workPattern': ['D', 'D', 'D', 'D', 'O', 'O'], 'headcount': 0}
+
+
+def employee(emp_id, ou_id, offset):
+    return {'employeeId': emp_id, 'ouId': ou_id, 'rotationOffset': offset, 'scheme': 'Scheme A',
+            'productTypeId': 'CVSO', 'rankId': 'SER', 'unavailability': []}
+
+
+def square(value):
+    return [value * value]
+
+
+class TestTemplatePool:
+    """Templates built in a process pool come back in OU order, as in a sequential run"""
+
+    def test_parallel_roster_matches_sequential(self, monkeypatch):
+        employees = [employee(f'E{i}', f'OU{i}', i % 6) for i in range(6)]
+        monkeypatch.setattr(template_cache, '_default_cache', TemplateCache(0))
+        monkeypatch.setenv('TEMPLATE_PARALLEL_MIN_MS', '0')
+
+        monkeypatch.setenv('TEMPLATE_POOL_WORKERS', '1')
+        sequential_stats = new_template_stats()
+        sequential = generate_template_with_cpsat(
+            CTX, REQUIREMENT, employees, (datetime(2026, 3, 1), datetime(2026, 3, 14)), template_stats=sequential_stats
+        )
+
+        monkeypatch.setenv('TEMPLATE_POOL_WORKERS', '3')
+        stats = new_template_stats()
+        parallel = generate_template_with_cpsat(
+            CTX, REQUIREMENT, employees, (datetime(2026, 3, 1), datetime(2026, 3, 14)), template_stats=stats
+        )
+
+        assert parallel == sequential
+        assert sequential_stats['workers'] == 1
+        assert stats['workers'] == 3
+
+    def test_duplicate_keys_built_once(self, monkeypatch):
+        monkeypatch.setenv('TEMPLATE_POOL_WORKERS', '1')
+        jobs = [TemplateJob(key, square, {'value': value}) for key, value in (('a', 2), ('b', 3), ('a', 2))]
+        stats = new_template_stats()
+
+        assert build_templates(jobs, stats, TemplateCache(8)) == [[4], [9], [4]]
+        assert stats == {'templates': 3, 'solved': 2, 'hits': 1, 'persistentHits': 0, 'workers': 1}
+
+    def test_workers_capped_by_thread_budget(self, monkeypatch):
+        monkeypatch.setenv('TEMPLATE_POOL_WORKERS', '8')
+        assert template_pool_workers(2) == 8
+
+        set_search_thread_budget(SearchThreadBudget(4))
+        try:
+            assert template_pool_workers(2) == 2
+            assert template_pool_workers(1) == 4
+        finally:
+            set_search_thread_budget(None)
@@ -0,0 +1,52 @@
+"""
+Tests for the incremental template validation state.
+
+Run with: pytest tests/test_template_state.py -v
+"""
+
+import sys
+import pathlib
+from datetime import date
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from context.engine.template_roster import EmployeeTemplateState, _generate_validated_template
+
+SHIFT = {'start': '08:00:00', 'end': '20:00:00', 'nextDay': False}
+ALL_DAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+
+def employee(**overrides):
+    return {'employeeId': 'E1', 'scheme': 'Scheme A', 'productTypeId': 'CVSO', 'rankId': 'SER',
+            'rotationOffset': 0, **overrides}
+
+
+class TestEmployeeTemplateState:
+    """Rolling week state and employee-level checks"""
+
+    def test_weekly_hours_reset_on_monday(self):
+        state = EmployeeTemplateState(employee(), ['D'] * 7, SHIFT, {}, ALL_DAYS)
+        assignment = {'hours': {'normal': 11.0, 'ot': 0.0}}
+
+        for day in range(2, 6):  # Mon 2 Mar - Thu 5 Mar 2026
+            state.start_day(date(2026, 3, day))
+            assert state.validate(date(2026, 3, day))['valid']
+            state.record_work_day(date(2026, 3, day), assignment)
+
+        state.start_day(date(2026, 3, 6))
+        assert state.week_normal_hours == 44.0
+        assert state.validate(date(2026, 3, 6))['reason'].startswith('C2:')
+
+        state.start_day(date(2026, 3, 9))
+        assert state.work_day_position_in_week == 1
+        assert state.validate(date(2026, 3, 9))['valid']
+
+    def test_ineligible_employee_rejected_every_day(self):
+        requirement = {'productTypeId': 'APO', 'requiredQualifications': ['XRAY']}
+        template = _generate_validated_template(
+            employee(), ['D', 'D', 'O'], date(2026, 3, 1), date(2026, 3, 7), SHIFT, {}, {'id': 'D1'},
+            requirement, ALL_DAYS
+        )
+
+        work_days = [day for day in template.values() if day['is_work_day']]
+        assert work_days and all(day['reason'].startswith('C11: Product type CVSO') for day in work_days)
@@ -0,0 +1,112 @@
+"""
+Tests for the integer-minute slot timeline used by constraint modules and
+scoring.
+
+Run with: pytest tests/test_timeline.py -v
+"""
+
+import sys
+import pathlib
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from ortools.sat.python import cp_model
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from context.constraints import C4_rest_period, C16_no_overlap
+from context.engine.timeline import SlotTimeline, cap_minutes, get_slot_timeline
+
+
+def make_slot(slot_id, day, start_hhmm, hours):
+    start = datetime.combine(day, datetime.min.time()) + timedelta(
+        hours=int(start_hhmm[:2]), minutes=int(start_hhmm[3:])
+    )
+    return SimpleNamespace(slot_id=slot_id, date=day, start=start, end=start + timedelta(hours=hours))
+
+
+class TestSlotTimeline:
+    """Integer positions relative to the planning horizon start"""
+
+    def test_slot_arrays(self):
+        # 2025-12-29 is a Monday in ISO week 2026-W01
+        night = make_slot('N', date(2026, 1, 2), '20:00', 12)
+        timeline = SlotTimeline('2025-12-29', [night])
+
+        assert (timeline.start_min[0], timeline.end_min[0]) == (4 * 1440 + 1200, 5 * 1440 + 480)
+        assert timeline.day_index[0] == 4
+        assert timeline.iso_week_index[0] == 0
+        assert timeline.month_index[0] == 1
+        assert timeline.lunch_min[0] == 60
+        assert timeline.net_minutes(0) == 660
+        assert timeline.breakdown(0).hours['gross'] == 12.0
+
+    def test_week_and_month_labels(self):
+        timeline = SlotTimeline('2025-12-29')
+
+        assert timeline.week('2026-01-04') == 0
+        assert timeline.week('2026-01-05') == 1
+        assert timeline.week_label(0) == (2026, 1)
+        assert timeline.week_label(-1) == (2025, 52)
+        assert timeline.month_label(timeline.month('2026-03-15')) == (2026, 3)
+
+    def test_candidates_grouped_in_slot_order(self):
+        slots = [make_slot(f"S{k}", date(2026, 3, 1 + k), '08:00', 12) for k in range(3)]
+        timeline = SlotTimeline('2026-03-01', slots)
+        x = {('S2', 'E1'): 1, ('S0', 'E1'): 1, ('S1', 'E2'): 1}
+
+        assert timeline.candidates(x) == {'E1': [0, 2], 'E2': [1]}
+        assert timeline.candidates(x) is timeline.candidates(x)
+
+    def test_cached_on_context(self):
+        ctx = {'slots': [make_slot('S0', date(2026, 3, 2), '08:00', 12)]}
+        timeline = get_slot_timeline(ctx)
+
+        assert timeline.anchor == date(2026, 3, 2)
+        assert get_slot_timeline(ctx) is timeline
+        ctx['slots'] = list(ctx['slots'])
+        assert get_slot_timeline(ctx) is not timeline
+
+    @pytest.mark.parametrize('hours,scale,expected', [(44.0, 1, 2640), (34.98, 1, 2098), (44.0, 7, 18480)])
+    def test_cap_minutes(self, hours, scale, expected):
+        assert cap_minutes(hours, scale) == expected
+
+
+def pair_constraints(module, slots, ctx_extra=None):
+    """Slot-id pairs the module forbids for employee E1"""
+    model = cp_model.CpModel()
+    x = {(s.slot_id, 'E1'): model.NewBoolVar(s.slot_id) for s in slots}
+    names = {var.Index(): slot_id for (slot_id, _), var in x.items()}
+    ctx = {
+        'slots': slots, 'x': x, 'employees': [{'employeeId': 'E1', 'scheme': 'A'}],
+        'planningHorizon': {'startDate': '2026-03-01'},
+    }
+    ctx.update(ctx_extra or {})
+    module.add_constraints(model, ctx)
+    return {
+        frozenset(names[v] for v in c.linear.vars)
+        for c in model.Proto().constraints
+    }
+
+
+class TestTimelineConstraints:
+    """C4 and C16 built from integer minutes"""
+
+    def test_no_overlap_pairs(self):
+        slots = [
+            make_slot('D1', date(2026, 3, 2), '08:00', 12),
+            make_slot('M1', date(2026, 3, 2), '12:00', 8),
+            make_slot('N1', date(2026, 3, 2), '20:00', 12),
+        ]
+
+        assert pair_constraints(C16_no_overlap, slots) == {frozenset({'D1', 'M1'})}
+
+    def test_rest_period_pairs(self):
+        slots = [
+            make_slot('N1', date(2026, 3, 2), '20:00', 12),
+            make_slot('D2', date(2026, 3, 3), '12:00', 8),   # 4h after N1
+            make_slot('D3', date(2026, 3, 4), '08:00', 12),  # 12h after D2
+        ]
+
+        assert pair_constraints(C4_rest_period, slots) == {frozenset({'N1', 'D2'})}
@@ -0,0 +1,138 @@
+"""
+Tests for the autoscaling worker pool and the shared CP-SAT thread budget.
+
+Run with: pytest tests/test_worker_pool.py -v
+"""
+
+import sys
+import time
+import pathlib
+import multiprocessing
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+import pytest
+
+from context.engine.thread_budget import SearchThreadBudget, search_threads, set_search_thread_budget
+
+
+def hold_threads(budget, worker_id, acquired):
+    """Worker stand-in: take a grant and keep it until killed"""
+    set_search_thread_budget(budget, owner=worker_id)
+    with search_threads(8):
+        acquired.set()
+        time.sleep(60)
+
+
+class TestSearchThreadBudget:
+    """Grants never exceed capacity and leave room for idle workers"""
+
+    def test_lone_job_keeps_threads_for_idle_workers(self):
+        budget = SearchThreadBudget(capacity=8, live_workers=2)
+        assert budget.acquire(16) == 7
+        assert budget.acquire(16) == 1
+        assert budget.snapshot()['in_use'] == 8
+
+    def test_release_returns_threads(self):
+        budget = SearchThreadBudget(capacity=4, live_workers=1)
+        granted = budget.acquire(4)
+        budget.release(granted)
+        assert budget.snapshot() == {'capacity': 4, 'in_use': 0, 'active_solves': 0, 'live_workers': 1}
+
+    def test_release_owner_returns_only_that_workers_grants(self):
+        budget = SearchThreadBudget(capacity=8, live_workers=2)
+        budget.acquire(4, owner=1)
+        budget.acquire(2, owner=2)
+
+        assert budget.release_owner(1) == 4
+        assert budget.release_owner(1) == 0
+        assert budget.snapshot()['in_use'] == 2 and budget.snapshot()['active_solves'] == 1
+
+    def test_search_threads_without_budget_is_passthrough(self):
+        set_search_thread_budget(None)
+        with search_threads(6) as granted:
+            assert granted == 6
+        with search_threads(None) as granted:
+            assert granted is None
+
+    def test_search_threads_with_budget(self):
+        budget = SearchThreadBudget(capacity=2, live_workers=1)
+        set_search_thread_budget(budget)
+        try:
+            with search_threads(16) as granted:
+                assert granted == 2
+                assert budget.snapshot()['in_use'] == 2
+            assert budget.snapshot()['in_use'] == 0
+        finally:
+            set_search_thread_budget(None)
+
+
+class TestWorkerPoolController:
+    """Scaling decisions from queue length and host headroom"""
+
+    @pytest.fixture
+    def make_pool(self, monkeypatch):
+        from src.redis_worker import WorkerPoolController
+
+        def _make(queue, memory_gb=8.0, cpu=10.0, **kwargs):
+            pool = WorkerPoolController(
+                queue_length_fn=lambda: queue[0], thread_capacity=4, **kwargs
+            )
+
+            def fake_spawn():
+                pool._workers.append((pool._next_worker_id, None, None))
+                pool._next_worker_id += 1
+
+            def fake_retire():
+                pool._workers.pop()
+
+            monkeypatch.setattr(pool, '_spawn_locked', fake_spawn)
+            monkeypatch.setattr(pool, '_retire_locked', fake_retire)
+            monkeypatch.setattr(pool, '_reap_dead_locked', lambda: None)
+            monkeypatch.setattr(pool, '_headroom', lambda: {'memory_available_gb': memory_gb, 'cpu_percent': cpu})
+            return pool
+        return _make
+
+    def test_scales_up_while_queue_not_empty(self, make_pool):
+        queue = [3]
+        pool = make_pool(queue, min_workers=1, max_workers=3)
+        decisions = [pool.evaluate()['action'] for _ in range(4)]
+        assert decisions == ['scale_up', 'scale_up', 'scale_up', 'hold']
+        assert pool.size == 3
+
+    def test_no_scale_up_without_memory(self, make_pool):
+        pool = make_pool([5], memory_gb=0.5, min_workers=1, max_workers=3)
+        pool.evaluate()  # reach minimum
+        decision = pool.evaluate()
+        assert decision['action'] == 'hold'
+        assert 'free memory' in decision['reason']
+
+    def test_scales_down_after_idle(self, make_pool):
+        queue = [2]
+        pool = make_pool(queue, min_workers=1, max_workers=2, idle_seconds=0)
+        pool.evaluate()
+        pool.evaluate()
+        assert pool.size == 2
+
+        queue[0] = 0
+        assert pool.evaluate()['action'] == 'scale_down'
+        assert pool.size == 1
+        assert pool.evaluate()['action'] == 'hold'
+
+    def test_killed_worker_grant_recovered(self):
+        from src.redis_worker import WorkerPoolController
+
+        pool = WorkerPoolController(min_workers=1, max_workers=2, queue_length_fn=lambda: 0, thread_capacity=4)
+        acquired = multiprocessing.Event()
+        process = multiprocessing.Process(target=hold_threads, args=(pool.thread_budget, 1, acquired))
+        process.start()
+        pool._workers = [(1, process, multiprocessing.Event())]
+        assert acquired.wait(10)
+        assert pool.thread_budget.snapshot()['in_use'] == 4
+
+        process.kill()
+        process.join()
+        with pool._lock:
+            pool._reap_dead_locked()
+
+        assert pool.thread_budget.snapshot() == {'capacity': 4, 'in_use': 0, 'active_solves': 0, 'live_workers': 1}
+        assert pool.thread_budget.acquire(4) == 4